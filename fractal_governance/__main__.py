@@ -0,0 +1,6 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Run the fractal governance command-line interface (see `fractal_governance.cli`)"""
+
+from fractal_governance.cli import main
+
+main()
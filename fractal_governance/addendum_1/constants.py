@@ -8,9 +8,11 @@ and
 """
 
 
+from typing import Dict, Optional
+
 import attrs
 import fractal_governance.dataset
-import fractal_governance.math
+import fractal_governance.result_cache
 import fractal_governance.util
 from fractal_governance.addendum_1.token_supply import TokenSupply
 from fractal_governance.constants import (
@@ -28,7 +30,8 @@ class Addendum1Constants:
 
     The arguments `total_respect_before_addendum_1_individual` and
     `total_respect_before_addendum_1_team` are useful for highlighting issues in Team
-    fractally's spreadsheet.
+    fractally's spreadsheet. If `result_cache` is given then the constants are only
+    calculated if they are not in the cache (see `fractal_governance.result_cache`).
     """
 
     dataset: fractal_governance.dataset.Dataset = attrs.field(repr=False)
@@ -37,6 +40,10 @@ class Addendum1Constants:
 
     total_respect_before_addendum_1_team: float = attrs.field(default=None)
 
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
     total_respect_before_addendum_1: float = attrs.field(default=None, init=False)
 
     token_supply_before_addendum_1_individual: float = attrs.field(
@@ -49,6 +56,20 @@ class Addendum1Constants:
     pro_rata_respect: float = attrs.field(default=None, init=False)
 
     def __attrs_post_init__(self) -> None:
+        result = fractal_governance.result_cache.get_or_compute(
+            self.result_cache,
+            lambda: fractal_governance.result_cache.make_result_key(
+                "Addendum1Constants",
+                self.dataset,
+                self.total_respect_before_addendum_1_individual,
+                self.total_respect_before_addendum_1_team,
+            ),
+            self._create_constants,
+        )
+        for name, value in result.items():
+            object.__setattr__(self, name, value)
+
+    def _create_constants(self) -> Dict[str, float]:
         DATE_WHEN_ADDENDUM_1_GOES_INTO_EFFECT = (
             fractal_governance.util.meeting_id_to_timestamp(
                 MEETING_ID_WHEN_ADDENDUM_1_GOES_INTO_EFFECT
@@ -81,11 +102,6 @@ class Addendum1Constants:
                 .sum()
                 .iloc[0]
             )
-            object.__setattr__(
-                self,
-                "total_respect_before_addendum_1_individual",
-                total_respect_before_addendum_1_individual,
-            )
 
         total_respect_before_addendum_1_team = self.total_respect_before_addendum_1_team
         if not total_respect_before_addendum_1_team:
@@ -97,54 +113,34 @@ class Addendum1Constants:
                 .sum()
                 .iloc[0]
             )
-            object.__setattr__(
-                self,
-                "total_respect_before_addendum_1_team",
-                total_respect_before_addendum_1_team,
-            )
 
         total_respect_before_addendum_1 = (
             total_respect_before_addendum_1_individual
             + total_respect_before_addendum_1_team
         )
-        object.__setattr__(
-            self,
-            "total_respect_before_addendum_1",
-            total_respect_before_addendum_1,
-        )
 
         token_supply_before_addendum_1 = TokenSupply(
             time=(MEETING_ID_WHEN_ADDENDUM_1_GOES_INTO_EFFECT - 1)
         ).token_supply
-        object.__setattr__(
-            self,
-            "token_supply_before_addendum_1",
-            token_supply_before_addendum_1,
-        )
 
         token_supply_before_addendum_1_individual = (
             total_respect_before_addendum_1_individual / total_respect_before_addendum_1
         ) * token_supply_before_addendum_1
-        object.__setattr__(
-            self,
-            "token_supply_before_addendum_1_individual",
-            token_supply_before_addendum_1_individual,
-        )
 
         token_supply_before_addendum_1_team = (
             total_respect_before_addendum_1_team / total_respect_before_addendum_1
         ) * token_supply_before_addendum_1
-        object.__setattr__(
-            self,
-            "token_supply_before_addendum_1_team",
-            token_supply_before_addendum_1_team,
-        )
 
         pro_rata_respect = (
             token_supply_before_addendum_1 / total_respect_before_addendum_1
         )
-        object.__setattr__(
-            self,
-            "pro_rata_respect",
-            pro_rata_respect,
-        )
+
+        return {
+            "total_respect_before_addendum_1_individual": total_respect_before_addendum_1_individual,  # noqa: E501
+            "total_respect_before_addendum_1_team": total_respect_before_addendum_1_team,  # noqa: E501
+            "total_respect_before_addendum_1": total_respect_before_addendum_1,
+            "token_supply_before_addendum_1": token_supply_before_addendum_1,
+            "token_supply_before_addendum_1_individual": token_supply_before_addendum_1_individual,  # noqa: E501
+            "token_supply_before_addendum_1_team": token_supply_before_addendum_1_team,
+            "pro_rata_respect": pro_rata_respect,
+        }
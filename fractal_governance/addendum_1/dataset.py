@@ -2,17 +2,19 @@
 """Dataset for Fractally White Paper Addendum 1"""
 
 from enum import Enum, auto
-from typing import List
+from typing import Dict, Optional
 
 import attrs
 import fractal_governance.dataset
+import fractal_governance.memory
+import fractal_governance.progress
+import fractal_governance.read_only
+import fractal_governance.render_cache
+import fractal_governance.result_cache
 import pandas as pd
 import uncertainties
+import uncertainties.unumpy
 from fractal_governance.constants import (
-    GROUP_COLUMN_NAME,
-    INTEGRAL_COLUMN_NAME,
-    INTEGRAL_END_COLUMN_NAME,
-    INTEGRAL_START_COLUMN_NAME,
     LEVEL_COLUMN_NAME,
     MEETING_ID_COLUMN_NAME,
     MEETING_ID_WHEN_ADDENDUM_1_GOES_INTO_EFFECT,
@@ -21,16 +23,13 @@ from fractal_governance.constants import (
     RESPECT_PRO_RATA_COLUMN_NAME,
     TEAM_ID_COLUMN_NAME,
     TOKEN_INTEGRAL_COLUMN_NAME,
-    TOKEN_SUPPLY_AFTER_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME,
-    TOKEN_SUPPLY_BEFORE_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME,
-    TOKEN_SUPPLY_COLUMN_NAME,
     TOKENS_INDIVIDUAL,
     TOKENS_TEAM,
     WEIGHTED_MEAN_RESPECT_COLUMN_NAME,
 )
 
 from .constants import Addendum1Constants
-from .token_supply import TokenSupply
+from .token_supply import get_token_supply_schedule
 from .weighted_means import WeightedMeans
 
 
@@ -39,7 +38,16 @@ class Addendum1Dataset:
     """A wrapper around `fractal_governance.dataset.Dataset` with the *Fractally White
     Paper Addendum 1* changes.
 
-    The only required argument to the constructor is `dataset`.
+    The only required argument to the constructor is `dataset`. Every DataFrame is
+    read-only.
+
+    If `progress` is given then the calculation reports its progress through it and
+    raises `fractal_governance.progress.CancelledError` if it is cancelled. The
+    `progress` token is also used for the `WeightedMeans` created when
+    `weighted_means` is not given. If `result_cache` is given then the DataFrames
+    are only calculated if they are not in the cache (see
+    `fractal_governance.result_cache`), and it is also used for the
+    `Addendum1Constants` and `WeightedMeans` created when they are not given.
     """
 
     dataset: fractal_governance.dataset.Dataset = attrs.field(repr=False)
@@ -48,6 +56,14 @@ class Addendum1Dataset:
 
     addendum_1_constants: Addendum1Constants = attrs.field(default=None)
 
+    progress: Optional[fractal_governance.progress.ProgressToken] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
     dataset_with_addendum_1_respect: fractal_governance.dataset.Dataset = attrs.field(
         repr=False, default=None, init=False
     )
@@ -62,55 +78,77 @@ class Addendum1Dataset:
 
     df_token_supply: pd.DataFrame = attrs.field(default=None, init=False)
 
+    def memory_report(
+        self, *, trace_construction: bool = False
+    ) -> fractal_governance.memory.MemoryReport:
+        """Return the memory used by the frames of this Addendum1Dataset, its
+        WeightedMeans, the Dataset it wraps and the Dataset with the Addendum 1
+        Respect, which shares the unchanged frames of the wrapped Dataset (see
+        `fractal_governance.memory.get_memory_report`)"""
+        return fractal_governance.memory.get_memory_report(
+            self, trace_construction=trace_construction
+        )
+
     def __attrs_post_init__(self) -> None:
+        addendum_1_constants = self.addendum_1_constants
+        if not addendum_1_constants:
+            addendum_1_constants = Addendum1Constants(
+                dataset=self.dataset, result_cache=self.result_cache
+            )
+            object.__setattr__(self, "addendum_1_constants", addendum_1_constants)
+
+        weighted_means = self.weighted_means
+        if not weighted_means:
+            weighted_means = WeightedMeans(
+                dataset=self.dataset,
+                progress=self.progress,
+                result_cache=self.result_cache,
+            )
+            object.__setattr__(self, "weighted_means", weighted_means)
+
+        result = fractal_governance.result_cache.get_or_compute(
+            self.result_cache,
+            lambda: fractal_governance.result_cache.make_result_key(
+                "Addendum1Dataset",
+                self.dataset,
+                addendum_1_constants.total_respect_before_addendum_1_individual,
+                addendum_1_constants.total_respect_before_addendum_1_team,
+                fractal_governance.render_cache.fingerprint(weighted_means.dataset.df),
+                weighted_means.parameters,
+            ),
+            self._create_frames,
+        )
+        for name in [
+            "df",
+            "df_weighted_means",
+            "df_token_distribution_per_meeting",
+            "df_token_supply",
+        ]:
+            object.__setattr__(
+                self, name, fractal_governance.read_only.freeze(result[name])
+            )
+
         #
-        # Make copies of the original required DataFrame because it will be augmented
-        # with columns that could be different if this class is instantiated with
-        # different initial state.
+        # Only the Respect aggregates are recomputed. The attendance and membership
+        # aggregates are shared with the original dataset.
         #
-        df = self.dataset.df.copy()
+        fractal_governance.progress.report(self.progress, "Respect ledger", 0, 1)
+        dataset_with_addendum_1_respect = self.dataset.derive(respect=result["respect"])
+        object.__setattr__(
+            self, "dataset_with_addendum_1_respect", dataset_with_addendum_1_respect
+        )
+
+    def _create_frames(self) -> Dict[str, pd.DataFrame]:
+        df = self.dataset.df
 
         #
         # Create a DataFrame for the token supply that spans the meeting dates from the
         # given dataset.
         #
-        meeting_id_list: List[float] = []
-        integral_start_list: List[float] = []
-        integral_end_list: List[float] = []
-        integral_list: List[float] = []
-        token_integral_list: List[float] = []
-        token_supply_before_transition_to_constant_inflation_list: List[float] = []
-        token_supply_after_transition_to_constant_inflation_list: List[float] = []
-        token_supply_list: List[float] = []
-        for meeting_id in range(1, df[MEETING_ID_COLUMN_NAME].max() + 1):
-            token_supply = TokenSupply(time=meeting_id)
-            assert meeting_id == token_supply.time
-            meeting_id_list.append(meeting_id)
-            integral_start_list.append(token_supply.integral_start)
-            integral_end_list.append(token_supply.integral_end)
-            integral_list.append(token_supply.integral)
-            token_integral_list.append(token_supply.token_integral)
-            token_supply_before_transition_to_constant_inflation_list.append(
-                token_supply.token_supply_before_transition_to_constant_inflation
-            )
-            token_supply_after_transition_to_constant_inflation_list.append(
-                token_supply.token_supply_after_transition_to_constant_inflation
-            )
-            token_supply_list.append(token_supply.token_supply)
-        df_token_supply = pd.DataFrame(
-            {
-                MEETING_ID_COLUMN_NAME: meeting_id_list,
-                INTEGRAL_START_COLUMN_NAME: integral_start_list,
-                INTEGRAL_END_COLUMN_NAME: integral_end_list,
-                INTEGRAL_COLUMN_NAME: integral_list,
-                TOKEN_INTEGRAL_COLUMN_NAME: token_integral_list,
-                TOKEN_SUPPLY_BEFORE_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME: token_supply_before_transition_to_constant_inflation_list,  # noqa: E501
-                TOKEN_SUPPLY_AFTER_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME: token_supply_after_transition_to_constant_inflation_list,  # noqa: E501
-                TOKEN_SUPPLY_COLUMN_NAME: token_supply_list,
-            }
+        meeting_count = int(df[MEETING_ID_COLUMN_NAME].max())
+        df_token_supply = get_token_supply_schedule(
+            meeting_count, progress=self.progress
         )
-        df_token_supply.set_index(MEETING_ID_COLUMN_NAME, inplace=True)
-        object.__setattr__(self, "df_token_supply", df_token_supply)
 
         #
         # Add pro-rata Respect tokens for both individuals and teams. These are Respect
@@ -118,40 +156,25 @@ class Addendum1Dataset:
         # adjusted for the Addendum 1 token supply that went into effect at the time of
         # the first meeting.
         #
-        addendum_1_constants = self.addendum_1_constants
-        if not addendum_1_constants:
-            addendum_1_constants = Addendum1Constants(dataset=self.dataset)
-            object.__setattr__(self, "addendum_1_constants", addendum_1_constants)
-
-        df[RESPECT_PRO_RATA_COLUMN_NAME] = (
-            df[RESPECT_COLUMN_NAME] * addendum_1_constants.pro_rata_respect
-        )
         # Pro-rata Respect is only non-zero for meetings before Addendum 1 went into
         # effect.
-        df.loc[
-            df[MEETING_ID_COLUMN_NAME] >= MEETING_ID_WHEN_ADDENDUM_1_GOES_INTO_EFFECT,
-            RESPECT_PRO_RATA_COLUMN_NAME,
-        ] = 0
-        # Move the new column from the back to the front.
-        columns = list(df.columns)
-        columns = columns[-1:] + columns[:-1]
-        df = df[columns]
-        object.__setattr__(self, "df", df)
+        respect_pro_rata = (
+            df[RESPECT_COLUMN_NAME] * self.addendum_1_constants.pro_rata_respect
+        ).where(
+            df[MEETING_ID_COLUMN_NAME] < MEETING_ID_WHEN_ADDENDUM_1_GOES_INTO_EFFECT, 0
+        )
+        # Prepend the new column without copying the columns of the read-only
+        # dataset.
+        df = pd.concat(
+            [respect_pro_rata.rename(RESPECT_PRO_RATA_COLUMN_NAME), df],
+            axis=1,
+            copy=False,
+        )
 
         #
         # Respect tokens earned after Addendum 1 went into effect.
         #
-        weighted_means = self.weighted_means
-        if not weighted_means:
-            weighted_means = WeightedMeans(dataset=self.dataset)
-            object.__setattr__(self, "weighted_means", weighted_means)
-
-        #
-        # Make copies of the original required DataFrame because it will be augmented
-        # with columns that could be different if this class is instantiated with
-        # different initial state.
-        #
-        df_weighted_means = self.weighted_means.df.copy()
+        df_weighted_means = self.weighted_means.df
 
         class WeightedMeanRespectFraction(Enum):
             """The various weighted mean Respect fractions"""
@@ -164,6 +187,12 @@ class Addendum1Dataset:
             weighted_mean_respect_fraction: WeightedMeanRespectFraction,
         ) -> pd.Series:
             meeting_id = df.iloc[0][MEETING_ID_COLUMN_NAME]
+            fractal_governance.progress.report(
+                self.progress,
+                f"{weighted_mean_respect_fraction.name.lower()} tokens",
+                int(meeting_id) - 1,
+                meeting_count,
+            )
             token_integral = df_token_supply.loc[meeting_id, TOKEN_INTEGRAL_COLUMN_NAME]
 
             weighted_mean_respect_individual = df[WEIGHTED_MEAN_RESPECT_COLUMN_NAME]
@@ -191,39 +220,46 @@ class Addendum1Dataset:
         tokens_individual = df_weighted_means.groupby(MEETING_ID_COLUMN_NAME).apply(
             calculate_tokens, WeightedMeanRespectFraction.Individual
         )
-        df_weighted_means[TOKENS_INDIVIDUAL] = tokens_individual.reset_index(level=0)[
-            WEIGHTED_MEAN_RESPECT_COLUMN_NAME
-        ]
-
         tokens_team = df_weighted_means.groupby(MEETING_ID_COLUMN_NAME).apply(
             calculate_tokens, WeightedMeanRespectFraction.Team
         )
-        df_weighted_means[TOKENS_TEAM] = tokens_team.reset_index(level=0)[
-            WEIGHTED_MEAN_RESPECT_COLUMN_NAME
-        ]
 
-        # Move the two new columns from the back to the front.
-        columns = list(df_weighted_means.columns)
-        columns = columns[-2:] + columns[:-2]
-        df_weighted_means = df_weighted_means[columns]
-        object.__setattr__(self, "df_weighted_means", df_weighted_means)
+        # Prepend the two new columns without copying the columns of the read-only
+        # weighted means.
+        df_weighted_means = pd.concat(
+            [
+                tokens_individual.reset_index(level=0, drop=True)
+                .reindex(df_weighted_means.index)
+                .rename(TOKENS_INDIVIDUAL),
+                tokens_team.reset_index(level=0, drop=True)
+                .reindex(df_weighted_means.index)
+                .rename(TOKENS_TEAM),
+                df_weighted_means,
+            ],
+            axis=1,
+            copy=False,
+        )
+        df_weighted_means_with_tokens = df_weighted_means
 
         #
         # Create a `fractal_governance.dataset.Dataset` that replaces the values in the
         # *Respect* token column with the values using the Addendum 1 calculations.
         #
-        df_addendum_1 = df.copy()
-
-        #
-        # Replace the *Respect* values before the date when Addendum 1 went into effect
-        # with the pro-rata *Respect* values.
+        # The Respect ledger before the date when Addendum 1 went into effect uses the
+        # pro-rata *Respect* values of each member in attendance.
         #
-        df_addendum_1[RESPECT_COLUMN_NAME] = df_addendum_1[RESPECT_PRO_RATA_COLUMN_NAME]
-        df_addendum_1 = df_addendum_1.drop(RESPECT_PRO_RATA_COLUMN_NAME, axis=1)
+        df_pro_rata = df[
+            df[LEVEL_COLUMN_NAME].notna()
+            & (df[MEETING_ID_COLUMN_NAME] < MEETING_ID_WHEN_ADDENDUM_1_GOES_INTO_EFFECT)
+        ]
+        respect_pro_rata = df_pro_rata.set_index(
+            [MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]
+        )[RESPECT_PRO_RATA_COLUMN_NAME]
 
         #
-        # Replace the *Respect* values after the date when Addendum 1 went into effect
-        # with the weighted mean *Respect* values.
+        # The Respect ledger after the date when Addendum 1 went into effect uses the
+        # weighted mean *Respect* values, which members earn whether or not they
+        # attended a meeting.
         #
         df_weighted_means = df_weighted_means[
             df_weighted_means[MEETING_ID_COLUMN_NAME]
@@ -240,31 +276,9 @@ class Addendum1Dataset:
         df_weighted_means[[TOKENS_INDIVIDUAL, TOKENS_TEAM]] = df_weighted_means[
             [TOKENS_INDIVIDUAL, TOKENS_TEAM]
         ].apply(lambda series: uncertainties.unumpy.nominal_values(series))
-
-        df_addendum_1 = (
-            df_addendum_1.set_index([MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME])
-            .join(
-                df_weighted_means.set_index(
-                    [MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]
-                ),
-                how="outer",
-            )
-            .reset_index()
-        )
-        rows = (
-            df_addendum_1[LEVEL_COLUMN_NAME].notna()
-            | df_addendum_1[GROUP_COLUMN_NAME].isna()
-        ) & df_addendum_1[TOKENS_INDIVIDUAL].notna()
-        df_addendum_1.loc[rows, RESPECT_COLUMN_NAME] = df_addendum_1.loc[
-            rows, TOKENS_INDIVIDUAL
-        ]
-        df_addendum_1 = df_addendum_1.drop(TOKENS_INDIVIDUAL, axis=1)
-        dataset_with_addendum_1_respect = fractal_governance.dataset.Dataset(
-            df=df_addendum_1
-        )
-        object.__setattr__(
-            self, "dataset_with_addendum_1_respect", dataset_with_addendum_1_respect
-        )
+        respect_weighted_mean = df_weighted_means.set_index(
+            [MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]
+        )[TOKENS_INDIVIDUAL]
 
         #
         # Create a DataFrame for the aggregate weekly token distributions for both
@@ -273,6 +287,11 @@ class Addendum1Dataset:
         df_token_distribution_per_meeting = df_weighted_means.groupby(
             MEETING_ID_COLUMN_NAME
         ).sum(numeric_only=True)
-        object.__setattr__(
-            self, "df_token_distribution_per_meeting", df_token_distribution_per_meeting
-        )
+
+        return {
+            "df": df,
+            "df_weighted_means": df_weighted_means_with_tokens,
+            "df_token_distribution_per_meeting": df_token_distribution_per_meeting,
+            "df_token_supply": df_token_supply,
+            "respect": pd.concat([respect_pro_rata, respect_weighted_mean]),
+        }
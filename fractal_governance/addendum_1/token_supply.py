@@ -9,9 +9,22 @@ and
 """
 
 import math
+from typing import List, Optional
 
 import attrs
+import fractal_governance.progress
 import numpy as np
+import pandas as pd
+from fractal_governance.constants import (
+    INTEGRAL_COLUMN_NAME,
+    INTEGRAL_END_COLUMN_NAME,
+    INTEGRAL_START_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    TOKEN_INTEGRAL_COLUMN_NAME,
+    TOKEN_SUPPLY_AFTER_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME,
+    TOKEN_SUPPLY_BEFORE_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME,
+    TOKEN_SUPPLY_COLUMN_NAME,
+)
 
 
 @attrs.frozen(kw_only=True)
@@ -202,3 +215,52 @@ class TokenSupply:
             "token_supply",
             token_supply,
         )
+
+
+def get_token_supply_schedule(
+    meeting_count: int,
+    *,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
+) -> pd.DataFrame:
+    """Return the TokenSupply of each of the given number of meetings, indexed by
+    meeting ID"""
+    meeting_id_list: List[float] = []
+    integral_start_list: List[float] = []
+    integral_end_list: List[float] = []
+    integral_list: List[float] = []
+    token_integral_list: List[float] = []
+    token_supply_before_transition_to_constant_inflation_list: List[float] = []
+    token_supply_after_transition_to_constant_inflation_list: List[float] = []
+    token_supply_list: List[float] = []
+    for meeting_id in range(1, meeting_count + 1):
+        fractal_governance.progress.report(
+            progress, "token supply", meeting_id - 1, meeting_count
+        )
+        token_supply = TokenSupply(time=meeting_id)
+        assert meeting_id == token_supply.time
+        meeting_id_list.append(meeting_id)
+        integral_start_list.append(token_supply.integral_start)
+        integral_end_list.append(token_supply.integral_end)
+        integral_list.append(token_supply.integral)
+        token_integral_list.append(token_supply.token_integral)
+        token_supply_before_transition_to_constant_inflation_list.append(
+            token_supply.token_supply_before_transition_to_constant_inflation
+        )
+        token_supply_after_transition_to_constant_inflation_list.append(
+            token_supply.token_supply_after_transition_to_constant_inflation
+        )
+        token_supply_list.append(token_supply.token_supply)
+    df_token_supply = pd.DataFrame(
+        {
+            MEETING_ID_COLUMN_NAME: meeting_id_list,
+            INTEGRAL_START_COLUMN_NAME: integral_start_list,
+            INTEGRAL_END_COLUMN_NAME: integral_end_list,
+            INTEGRAL_COLUMN_NAME: integral_list,
+            TOKEN_INTEGRAL_COLUMN_NAME: token_integral_list,
+            TOKEN_SUPPLY_BEFORE_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME: token_supply_before_transition_to_constant_inflation_list,  # noqa: E501
+            TOKEN_SUPPLY_AFTER_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME: token_supply_after_transition_to_constant_inflation_list,  # noqa: E501
+            TOKEN_SUPPLY_COLUMN_NAME: token_supply_list,
+        }
+    )
+    df_token_supply.set_index(MEETING_ID_COLUMN_NAME, inplace=True)
+    return df_token_supply
@@ -9,15 +9,20 @@ and
 
 import functools
 from enum import Enum, auto
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import attrs
 import fractal_governance.dataset
 import fractal_governance.math
+import fractal_governance.memory
+import fractal_governance.progress
+import fractal_governance.read_only
+import fractal_governance.result_cache
 import fractal_governance.util
 import numpy as np
 import pandas as pd
 import uncertainties
+import uncertainties.unumpy
 from fractal_governance.constants import (
     LEVEL_COLUMN_NAME,
     MEETING_ID_COLUMN_NAME,
@@ -82,12 +87,35 @@ class WeightedMeans:
     *weighted mean Respect* using an approximation to the continuous Fibonacci
     function as well as artificially clamping *weighted mean Respect* to zero when the
     *weighted mean Level* is zero.
+
+    `df` is read-only. If `progress` is given then the calculation reports its
+    progress through it and raises `fractal_governance.progress.CancelledError` if
+    it is cancelled, with the weighted mean levels of the members finished so far as
+    the partial result. If `result_cache` is given then `df` is only calculated if
+    it is not in the cache (see `fractal_governance.result_cache`).
+
+    If `df_before` is given then it holds rows of an earlier `df`, calculated with
+    the same parameters, for the earliest meetings of each member that did not change
+    since, e.g. before new meetings were added. Those rows are reused and only the
+    weighted means of each member's later meetings are calculated.
     """
 
     dataset: fractal_governance.dataset.Dataset = attrs.field(repr=False)
 
     parameters: WeightedMeanParameters = WeightedMeanParameters()
 
+    progress: Optional[fractal_governance.progress.ProgressToken] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    df_before: Optional[pd.DataFrame] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
     df: pd.DataFrame = attrs.field(default=None, init=False)
 
     def get_pivot_table(
@@ -96,18 +124,45 @@ class WeightedMeans:
         weighted_mean_column_name: str = WEIGHTED_MEAN_RESPECT_COLUMN_NAME,
     ) -> pd.DataFrame:
         return get_pivot_table(
-            self.df.copy(),
+            self.df,
             value_column_name=value_column_name,
             weighted_mean_column_name=weighted_mean_column_name,
         )
 
+    def memory_report(
+        self, *, trace_construction: bool = False
+    ) -> fractal_governance.memory.MemoryReport:
+        """Return the memory used by `df`, whose weighted means are `uncertainties`
+        values, and by the Dataset it was calculated from (see
+        `fractal_governance.memory.get_memory_report`)"""
+        return fractal_governance.memory.get_memory_report(
+            self, trace_construction=trace_construction
+        )
+
     def __attrs_post_init__(self) -> None:
+        result = fractal_governance.result_cache.get_or_compute(
+            self.result_cache,
+            lambda: fractal_governance.result_cache.make_result_key(
+                "WeightedMeans", self.dataset, self.parameters
+            ),
+            lambda: {"df": self._create_df()},
+        )
+        object.__setattr__(
+            self, "df", fractal_governance.read_only.freeze(result["df"])
+        )
+
+    def _create_df(self) -> pd.DataFrame:
+        tables = self.dataset.tables
         df = get_weighted_mean_levels(
-            self.dataset.df,
+            tables.df_attendance,
             window_size=self.parameters.window_size,
             meeting_attendance_requirement_for_members=self.parameters.meeting_attendance_requirement_for_members,  # noqa: E501
             weighted_mean_level_algorithm=self.parameters.weighted_mean_level_algorithm,
+            progress=self.progress,
+            df_before=self.df_before,
         ).set_index(MEMBER_ID_COLUMN_NAME)
+        if self.df_before is not None and df.empty:
+            return self.df_before
 
         df[WEIGHTED_MEAN_RESPECT_COLUMN_NAME] = df[
             WEIGHTED_MEAN_LEVEL_COLUMN_NAME
@@ -123,29 +178,26 @@ class WeightedMeans:
                 WEIGHTED_MEAN_RESPECT_COLUMN_NAME,
             ] = 0
 
-        df_account_status = (
-            self.dataset.df[[MEMBER_ID_COLUMN_NAME, SIGNATURE_ON_FILE_COLUMN_NAME]]
-            .drop_duplicates(ignore_index=True)
-            .set_index(MEMBER_ID_COLUMN_NAME)
-        )
+        df_account_status = tables.df_members[[SIGNATURE_ON_FILE_COLUMN_NAME]]
         df = df.join(df_account_status)
 
-        df_team_status = (
-            self.dataset.df[
-                [
-                    MEMBER_ID_COLUMN_NAME,
-                    MEETING_ID_COLUMN_NAME,
-                    TEAM_ID_COLUMN_NAME,
-                    TEAM_NAME_COLUMN_NAME,
-                ]
+        df_team_status = tables.df_attendance[
+            [
+                MEMBER_ID_COLUMN_NAME,
+                MEETING_ID_COLUMN_NAME,
+                TEAM_ID_COLUMN_NAME,
+                TEAM_NAME_COLUMN_NAME,
             ]
-            .drop_duplicates()
-            .set_index([MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME])
-        )
+        ].set_index([MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME])
         df = df.set_index(MEETING_ID_COLUMN_NAME, append=True).join(df_team_status)
 
         df = df.reset_index()
 
+        df_before = self.df_before
+        if df_before is not None:
+            # Label the new rows after the rows before so that the labels are unique.
+            df.index += df_before.index.max() + 1 if len(df_before) else 0
+
         if (
             self.parameters.clamp_mean_respect_to_zero_when_fractal_contributor_agreement_not_signed  # noqa: E501
         ):
@@ -158,6 +210,19 @@ class WeightedMeans:
                 [WEIGHTED_MEAN_RESPECT_COLUMN_NAME],
             ] = 0
 
+        if df_before is not None:
+            # The last row before of each member starts its group, so that a team it
+            # joined before is propagated to its later meetings.
+            df_last_before = (
+                df_before[
+                    df_before[MEMBER_ID_COLUMN_NAME].isin(df[MEMBER_ID_COLUMN_NAME])
+                ]
+                .sort_values(by=MEETING_ID_COLUMN_NAME, kind="mergesort")
+                .groupby(MEMBER_ID_COLUMN_NAME)
+                .tail(1)
+            )
+            df = pd.concat([df_last_before, df])
+
         df = df.sort_values(
             by=[MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME],
             key=_sort_by_member_id_lower_case,
@@ -166,7 +231,18 @@ class WeightedMeans:
         def individual_respect_per_meeting(df: pd.DataFrame) -> pd.DataFrame:
             return df[WEIGHTED_MEAN_RESPECT_COLUMN_NAME].sum()
 
+        member_count = df[MEMBER_ID_COLUMN_NAME].nunique()
+        completed_member_count = 0
+
         def propagate_team_membership(df: pd.DataFrame) -> pd.DataFrame:
+            nonlocal completed_member_count
+            fractal_governance.progress.report(
+                self.progress,
+                "team membership",
+                min(completed_member_count, member_count),
+                member_count,
+            )
+            completed_member_count += 1
             team_rows = df[df[TEAM_ID_COLUMN_NAME].notna()]
             if team_rows[TEAM_ID_COLUMN_NAME].any():
                 row_of_joining_team = team_rows.iloc[0]
@@ -186,7 +262,15 @@ class WeightedMeans:
             propagate_team_membership
         )
 
-        object.__setattr__(self, "df", df)
+        if df_before is not None:
+            df = pd.concat([df_before, df[~df.index.isin(df_last_before.index)]])
+            df = df.sort_values(
+                by=[MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME],
+                key=_sort_by_member_id_lower_case,
+                kind="mergesort",
+            )
+
+        return df
 
 
 def _get_mean_levels(*, levels: pd.Series, window_size: int) -> pd.Series:
@@ -246,6 +330,7 @@ def _get_weighted_mean_levels_fractally(
     levels: pd.Series,
     window_size: int,
     meeting_attendance_requirement_for_members: int,
+    weighted_mean_level_before: Optional[Tuple[int, uncertainties.UFloat]] = None,
 ) -> pd.Series:
     """Return Team fractally's so-called *5xn6* value for the given `levels`
 
@@ -259,18 +344,26 @@ def _get_weighted_mean_levels_fractally(
     2. Calculate the next value by taking the previous value as calculated in step
     #1 and multiplying it by `window_size - 1`, adding this result to the current
     value of `level` and then dividing this result by `window_size`.
+
+    If `weighted_mean_level_before` is given then it is the meeting ID, which must be
+    after the first `window_size` meetings, and the value of an earlier result to
+    continue from, and only the values after that meeting are returned.
     """
     lookback_window_size = window_size - 1
 
-    mean_level = levels.iloc[:window_size].mean()
-    standard_deviation_level = np.mean(levels.iloc[:window_size]).mean()
-
     weighted_mean_levels = pd.Series(levels, dtype=object)
-    weighted_mean_levels.loc[window_size] = uncertainties.ufloat(
-        mean_level, standard_deviation_level
-    )
+    if weighted_mean_level_before is None:
+        mean_level = levels.iloc[:window_size].mean()
+        standard_deviation_level = np.mean(levels.iloc[:window_size]).mean()
+        first_meeting_id = window_size
+        weighted_mean_levels.loc[first_meeting_id] = uncertainties.ufloat(
+            mean_level, standard_deviation_level
+        )
+    else:
+        first_meeting_id, weighted_mean_level = weighted_mean_level_before
+        weighted_mean_levels.loc[first_meeting_id] = weighted_mean_level
 
-    for meeting_id in np.arange(window_size, len(weighted_mean_levels)) + 1:
+    for meeting_id in np.arange(first_meeting_id, len(weighted_mean_levels)) + 1:
         previous, current = weighted_mean_levels.loc[meeting_id - 1 : meeting_id]
         mean_level = (lookback_window_size * previous + current) / window_size
         weighted_mean_levels.loc[meeting_id] = mean_level
@@ -280,7 +373,7 @@ def _get_weighted_mean_levels_fractally(
             # the previous required number of meetings, thus making them new members.
             weighted_mean_levels.loc[meeting_id] = uncertainties.ufloat(0, 0)
 
-    return weighted_mean_levels.iloc[window_size:]
+    return weighted_mean_levels.iloc[first_meeting_id:]
 
 
 def get_weighted_mean_levels(
@@ -289,12 +382,22 @@ def get_weighted_mean_levels(
     window_size: int,
     meeting_attendance_requirement_for_members: int,
     weighted_mean_level_algorithm: WeightedMeanLevelAlgorithm,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
+    df_before: Optional[pd.DataFrame] = None,
 ) -> pd.DataFrame:
     """Return a DataFrame of weighted mean levels
 
     See section "Initial Average" in the article
     [Refinement of Token Distribution Math]
     (https://hive.blog/fractally/@dan/refinement-of-token-distribution-math)
+
+    If `progress` is cancelled then `fractal_governance.progress.CancelledError` is
+    raised with the DataFrame of weighted mean levels of the members finished so far
+    as the partial result.
+
+    If `df_before` is given then it holds the weighted mean levels of the earliest
+    meetings of each member that did not change since they were calculated, and only
+    the weighted mean levels of each member's later meetings are returned.
     """
 
     if weighted_mean_level_algorithm == WeightedMeanLevelAlgorithm.RollingMean:
@@ -322,10 +425,28 @@ def get_weighted_mean_levels(
 
     # The (MEETING_DATE_COLUMN_NAME, MEMBER_ID_COLUMN_NAME) tuple is degenerate
     # after the addition of multiple rounds, which is the reason for the `notna` on
-    # LEVEL_COLUMN_NAME.
+    # LEVEL_COLUMN_NAME. This is a no-op for the attendance table.
     df = df[df[LEVEL_COLUMN_NAME].notna()]
+    weighted_mean_levels_before_by_member_id: Dict[str, pd.Series] = dict()
+    if df_before is not None:
+        weighted_mean_levels_before_by_member_id = {
+            member_id: dfx.set_index(MEETING_ID_COLUMN_NAME)[
+                WEIGHTED_MEAN_LEVEL_COLUMN_NAME
+            ].sort_index()
+            for member_id, dfx in df_before.groupby(MEMBER_ID_COLUMN_NAME)
+        }
     weighted_mean_levels_by_member_id: Dict[str, pd.Series] = dict()
-    for member_id, dfx in df.groupby(MEMBER_ID_COLUMN_NAME):
+    groupby = df.groupby(MEMBER_ID_COLUMN_NAME)
+    for member_id, dfx in groupby:
+        fractal_governance.progress.report(
+            progress,
+            "weighted mean levels",
+            len(weighted_mean_levels_by_member_id),
+            groupby.ngroups,
+            lambda: _create_weighted_mean_levels_dataframe(
+                weighted_mean_levels_by_member_id
+            ),
+        )
         # Insert a level of 0 for each meeting for which they were not in
         # attendance.
         levels = (
@@ -334,22 +455,70 @@ def get_weighted_mean_levels(
         )
         levels = levels.fillna(0)
 
-        weighted_mean_levels = _weighted_mean_level_algorithm(
-            levels=levels, window_size=window_size
+        weighted_mean_levels_before = weighted_mean_levels_before_by_member_id.get(
+            member_id
         )
-
-        # Team fractally uses a progressive mean for the first `window_size` levels so
-        # that there is a *weighted_mean_level* value for for every meeting_id.
-        _levels = pd.Series(
-            [uncertainties.ufloat(level, 0) for level in levels.iloc[:window_size]]
+        last_meeting_id_before = (
+            0
+            if weighted_mean_levels_before is None
+            else weighted_mean_levels_before.index[-1]
         )
-        _levels.index = levels.index[:window_size]
-        _levels = _levels.cumsum() / window_size
-        _levels
-        weighted_mean_levels = pd.concat([_levels, weighted_mean_levels])
+        if (
+            weighted_mean_level_algorithm
+            == WeightedMeanLevelAlgorithm.WeightedRollingMeanWithHysteresis
+            and last_meeting_id_before > window_size
+        ):
+            # Continue from the last weighted mean level before.
+            weighted_mean_levels = _weighted_mean_level_algorithm(
+                levels=levels,
+                window_size=window_size,
+                weighted_mean_level_before=(
+                    last_meeting_id_before,
+                    weighted_mean_levels_before.iloc[-1],  # type: ignore
+                ),
+            )
+        else:
+            weighted_mean_levels = _weighted_mean_level_algorithm(
+                levels=levels, window_size=window_size
+            )
+
+            # Team fractally uses a progressive mean for the first `window_size`
+            # levels so that there is a *weighted_mean_level* value for for every
+            # meeting_id.
+            _levels = pd.Series(
+                [uncertainties.ufloat(level, 0) for level in levels.iloc[:window_size]]
+            )
+            _levels.index = levels.index[:window_size]
+            _levels = _levels.cumsum() / window_size
+            weighted_mean_levels = pd.concat([_levels, weighted_mean_levels])
+            weighted_mean_levels = weighted_mean_levels[
+                weighted_mean_levels.index > last_meeting_id_before
+            ]
 
         weighted_mean_levels_by_member_id[member_id] = weighted_mean_levels
 
+    df_weighted_mean_levels = _create_weighted_mean_levels_dataframe(
+        weighted_mean_levels_by_member_id
+    )
+    if df_before is not None:
+        # The members whose weighted mean levels start at different meetings are
+        # aligned with missing values.
+        df_weighted_mean_levels = df_weighted_mean_levels[
+            df_weighted_mean_levels[WEIGHTED_MEAN_LEVEL_COLUMN_NAME].notna()
+        ]
+    fractal_governance.progress.report(
+        progress,
+        "weighted mean levels",
+        groupby.ngroups,
+        groupby.ngroups,
+        lambda: df_weighted_mean_levels,
+    )
+    return df_weighted_mean_levels
+
+
+def _create_weighted_mean_levels_dataframe(
+    weighted_mean_levels_by_member_id: Dict[str, pd.Series]
+) -> pd.DataFrame:
     s_weighted_mean_levels = pd.DataFrame.from_dict(
         weighted_mean_levels_by_member_id, orient="index"
     ).unstack()
@@ -386,12 +555,21 @@ def get_pivot_table(
     value_column_name: str = "Value",
     weighted_mean_column_name: str = WEIGHTED_MEAN_LEVEL_COLUMN_NAME,
 ) -> pd.DataFrame:
-    column_names = [value_column_name, MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME]
-    df[value_column_name] = df[weighted_mean_column_name].apply(
-        lambda series: uncertainties.unumpy.nominal_values(series)
+    """Return a pivot table of the nominal values of the given weighted mean column
+    indexed by member and with one column per meeting
+
+    The given DataFrame is not modified."""
+    df_values = pd.DataFrame(
+        {
+            value_column_name: df[weighted_mean_column_name].apply(
+                lambda series: uncertainties.unumpy.nominal_values(series)
+            ),
+            MEMBER_ID_COLUMN_NAME: df[MEMBER_ID_COLUMN_NAME],
+            MEETING_ID_COLUMN_NAME: df[MEETING_ID_COLUMN_NAME],
+        }
     )
     pivot_table = pd.pivot_table(
-        df[column_names],
+        df_values,
         values=value_column_name,
         index=MEMBER_ID_COLUMN_NAME,
         columns=MEETING_ID_COLUMN_NAME,
@@ -0,0 +1,232 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Altair charts for fractal governance data analysis
+
+The charts draw the same tidy plot data as the matplotlib renderers of
+`fractal_governance.plots` and `fractal_governance.measurement_uncertainty.plots`,
+but as Vega-Lite specifications that the browser renders, which are smaller than the
+equivalent PNG images and are interactive.
+"""
+
+from typing import Callable, Dict, Union
+
+import altair
+import pandas as pd
+
+from .constants import (
+    BIN_END_COLUMN_NAME,
+    BIN_START_COLUMN_NAME,
+    ERROR_COLUMN_NAME,
+    FIT_COLUMN_NAME,
+    PERIOD_COLUMN_NAME,
+    PERIOD_LABEL_COLUMN_NAME,
+    SERIES_COLUMN_NAME,
+    VALUE_COLUMN_NAME,
+    X_COLUMN_NAME,
+    X_ERROR_COLUMN_NAME,
+)
+from .plot_data import PlotData
+
+Chart = Union[altair.Chart, altair.LayerChart]
+
+_LOWER_COLUMN_NAME = "Lower"
+_UPPER_COLUMN_NAME = "Upper"
+_X_LOWER_COLUMN_NAME = "XLower"
+_X_UPPER_COLUMN_NAME = "XUpper"
+
+
+def _get_series_color(plot_data: PlotData) -> altair.Color:
+    """Internal helper method that returns the color encoding of the Series column
+    with the series in category order"""
+    series = plot_data.df[SERIES_COLUMN_NAME]
+    return altair.Color(
+        f"{SERIES_COLUMN_NAME}:N",
+        sort=list(series.cat.categories),
+        title=None,
+        legend=altair.Legend(orient="top-left"),
+    )
+
+
+def _get_period_x(plot_data: PlotData) -> altair.X:
+    """Internal helper method that returns the x encoding of a bar per time period in
+    time order"""
+    return altair.X(
+        f"{PERIOD_LABEL_COLUMN_NAME}:O",
+        sort=altair.EncodingSortField(PERIOD_COLUMN_NAME),
+        title=plot_data.x_label,
+    )
+
+
+def _properties(chart: Chart, plot_data: PlotData) -> Chart:
+    """Internal helper method that sets the title and width of the given chart"""
+    return chart.properties(title=plot_data.title, width="container")
+
+
+def create_bar_chart(plot_data: PlotData) -> Chart:
+    """Return a bar chart of the Value in each time period"""
+    chart = (
+        altair.Chart(pd.DataFrame(plot_data.df))
+        .mark_bar()
+        .encode(
+            x=_get_period_x(plot_data),
+            y=altair.Y(f"{VALUE_COLUMN_NAME}:Q", title=plot_data.y_label),
+            tooltip=[PERIOD_LABEL_COLUMN_NAME, VALUE_COLUMN_NAME],
+        )
+    )
+    return _properties(chart, plot_data)
+
+
+def create_stacked_bar_chart(plot_data: PlotData) -> Chart:
+    """Return a bar chart of the Value in each time period stacked by Series"""
+    df = pd.DataFrame(plot_data.df).assign(
+        _order=lambda df: df[SERIES_COLUMN_NAME].cat.codes
+    )
+    chart = (
+        altair.Chart(df)
+        .mark_bar()
+        .encode(
+            x=_get_period_x(plot_data),
+            y=altair.Y(f"{VALUE_COLUMN_NAME}:Q", title=plot_data.y_label),
+            color=_get_series_color(plot_data),
+            order=altair.Order("_order:Q"),
+            tooltip=[PERIOD_LABEL_COLUMN_NAME, SERIES_COLUMN_NAME, VALUE_COLUMN_NAME],
+        )
+    )
+    return _properties(chart, plot_data)
+
+
+def create_line_chart(plot_data: PlotData) -> Chart:
+    """Return a line chart of the Value of each Series vs time"""
+    chart = (
+        altair.Chart(pd.DataFrame(plot_data.df))
+        .mark_line(point=True)
+        .encode(
+            x=altair.X(f"{PERIOD_COLUMN_NAME}:T", title=plot_data.x_label),
+            y=altair.Y(f"{VALUE_COLUMN_NAME}:Q", title=plot_data.y_label),
+            color=_get_series_color(plot_data),
+            tooltip=[PERIOD_LABEL_COLUMN_NAME, SERIES_COLUMN_NAME, VALUE_COLUMN_NAME],
+        )
+    )
+    return _properties(chart, plot_data)
+
+
+def create_histogram(plot_data: PlotData) -> Chart:
+    """Return a histogram whose bins are already counted"""
+    chart = (
+        altair.Chart(pd.DataFrame(plot_data.df))
+        .mark_bar()
+        .encode(
+            x=altair.X(f"{BIN_START_COLUMN_NAME}:Q", title=plot_data.x_label),
+            x2=f"{BIN_END_COLUMN_NAME}:Q",
+            y=altair.Y(f"{VALUE_COLUMN_NAME}:Q", title=plot_data.y_label),
+        )
+    )
+    return _properties(chart, plot_data)
+
+
+def _create_error_bar_layers(plot_data: PlotData) -> altair.LayerChart:
+    """Internal helper method that returns the points of the Value vs X with their
+    error bars, colored by Series if there is more than one series"""
+    df = pd.DataFrame(plot_data.df)
+    base = altair.Chart(df).transform_calculate(
+        **{
+            _LOWER_COLUMN_NAME: f"datum.{VALUE_COLUMN_NAME} - datum.{ERROR_COLUMN_NAME}",  # noqa: E501
+            _UPPER_COLUMN_NAME: f"datum.{VALUE_COLUMN_NAME} + datum.{ERROR_COLUMN_NAME}",  # noqa: E501
+        }
+    )
+    color = {}
+    if SERIES_COLUMN_NAME in df:
+        color = dict(color=_get_series_color(plot_data))
+    x = altair.X(f"{X_COLUMN_NAME}:Q", title=plot_data.x_label)
+    points = base.mark_point(filled=True).encode(
+        x=x,
+        y=altair.Y(f"{VALUE_COLUMN_NAME}:Q", title=plot_data.y_label),
+        tooltip=list(df.columns),
+        **color,
+    )
+    y_error_bars = base.mark_rule().encode(
+        x=x, y=f"{_LOWER_COLUMN_NAME}:Q", y2=f"{_UPPER_COLUMN_NAME}:Q", **color
+    )
+    layers = [points, y_error_bars]
+    if X_ERROR_COLUMN_NAME in df:
+        x_error_bars = (
+            base.transform_calculate(
+                **{
+                    _X_LOWER_COLUMN_NAME: f"datum.{X_COLUMN_NAME} - datum.{X_ERROR_COLUMN_NAME}",  # noqa: E501
+                    _X_UPPER_COLUMN_NAME: f"datum.{X_COLUMN_NAME} + datum.{X_ERROR_COLUMN_NAME}",  # noqa: E501
+                }
+            )
+            .mark_rule()
+            .encode(
+                x=f"{_X_LOWER_COLUMN_NAME}:Q",
+                x2=f"{_X_UPPER_COLUMN_NAME}:Q",
+                y=f"{VALUE_COLUMN_NAME}:Q",
+                **color,
+            )
+        )
+        layers.append(x_error_bars)
+    return altair.layer(*layers)
+
+
+def create_error_bar_chart(plot_data: PlotData) -> Chart:
+    """Return a chart of the Value vs X with error bars"""
+    return _properties(_create_error_bar_layers(plot_data), plot_data)
+
+
+def create_regression_chart(plot_data: PlotData) -> Chart:
+    """Return a chart of the Value vs X with error bars and the linear regression
+    whose slope and intercept are in the annotations"""
+    x = plot_data.df[X_COLUMN_NAME]
+    df_fit = pd.DataFrame({X_COLUMN_NAME: [x.min() - 1, x.max() + 1]})
+    df_fit[FIT_COLUMN_NAME] = (
+        plot_data.annotations["slope"] * df_fit[X_COLUMN_NAME]
+        + plot_data.annotations["intercept"]
+    )
+    fit = (
+        altair.Chart(df_fit)
+        .mark_line(color="red")
+        .encode(x=f"{X_COLUMN_NAME}:Q", y=f"{FIT_COLUMN_NAME}:Q")
+    )
+    return _properties(_create_error_bar_layers(plot_data) + fit, plot_data)
+
+
+def create_distribution_chart(plot_data: PlotData) -> Chart:
+    """Return the histogram of each Series overlaid with its fit"""
+    base = altair.Chart(pd.DataFrame(plot_data.df))
+    color = _get_series_color(plot_data)
+    bars = base.mark_bar(opacity=0.5).encode(
+        x=altair.X(f"{BIN_START_COLUMN_NAME}:Q", title=plot_data.x_label),
+        x2=f"{BIN_END_COLUMN_NAME}:Q",
+        y=altair.Y(f"{VALUE_COLUMN_NAME}:Q", title=plot_data.y_label, stack=None),
+        color=color,
+    )
+    fit = base.mark_line().encode(
+        x=f"{X_COLUMN_NAME}:Q", y=f"{FIT_COLUMN_NAME}:Q", color=color
+    )
+    return _properties(bars + fit, plot_data)
+
+
+# The chart function of each plot of `fractal_governance.plots.Plots` and
+# `fractal_governance.measurement_uncertainty.plots.Plots`.
+CHART_FUNCTION_BY_PLOT_NAME: Dict[str, Callable[[PlotData], Chart]] = {
+    "attendance_vs_time": create_bar_chart,
+    "attendance_vs_time_stacked": create_stacked_bar_chart,
+    "attendance_consistency_histogram": create_histogram,
+    "accumulated_member_respect_vs_time": create_bar_chart,
+    "accumulated_member_respect_vs_time_stacked": create_stacked_bar_chart,
+    "accumulated_team_respect_vs_time": create_line_chart,
+    "accumulated_team_respect_vs_time_stacked": create_stacked_bar_chart,
+    "team_representation_vs_time": create_bar_chart,
+    "attendance_count_vs_level": create_regression_chart,
+    "group_size_histogram": create_histogram,
+    "ranking_stability_histogram": create_histogram,
+    "measurement_uncertainty": create_error_bar_chart,
+    "measurement_uncertainty_distribution": create_distribution_chart,
+    "measurement_uncertainty_correlation": create_error_bar_chart,
+}
+
+
+def create_chart(plot_name: str, plot_data: PlotData) -> Chart:
+    """Return the Altair chart of the named plot for the given plot data"""
+    if plot_name not in CHART_FUNCTION_BY_PLOT_NAME:
+        raise ValueError(f"Unknown plot_name {plot_name}")
+    return CHART_FUNCTION_BY_PLOT_NAME[plot_name](plot_data)
@@ -0,0 +1,503 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A command-line interface to the fractal governance analytics
+
+Each subcommand writes a table as CSV, JSON or Apache Parquet, or exports the plots
+of the dashboards as images, without starting a dashboard:
+
+    fractal_governance leaderboard --view addendum1 --as-of 2022-09-01
+    fractal_governance token-supply --format json
+    fractal_governance weighted-means --column respect --output means.parquet
+    fractal_governance uncertainty-leaderboard --include-self-measurement
+    fractal_governance export-figures OUTPUT_DIR --format svg
+    fractal_governance perf --max-time-ratio 2
+
+Every table is cached in a ResultCache keyed by the fingerprints of the .csv files
+and by the arguments of the subcommand (see `fractal_governance.result_cache`). If
+the ResultCache has a directory, given by `--cache-directory` or by the
+FRACTAL_GOVERNANCE_RESULT_CACHE_DIR environment variable, then a repeated query is
+read from disk without reading the .csv files into a Dataset. The modules that
+calculate the tables and draw the plots are only imported by the subcommands that
+need them, so that a cached query starts quickly.
+
+Usage: python -m fractal_governance SUBCOMMAND [OPTIONS]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import attrs
+import pandas as pd
+
+import fractal_governance.render_cache
+import fractal_governance.result_cache
+import fractal_governance.util
+from fractal_governance.constants import (
+    MEETING_DATE_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    RANK_COLUMN_NAME,
+    WEIGHTED_MEAN_LEVEL_COLUMN_NAME,
+    WEIGHTED_MEAN_RESPECT_COLUMN_NAME,
+)
+from fractal_governance.result_cache import DEFAULT_RESULT_CACHE, ResultCache
+
+# The lower case names of `fractal_governance.dashboard.DashboardView`, so that the
+# arguments are parsed without importing the dashboard.
+DASHBOARD_VIEW_NAMES = ("classic", "addendum1", "teamfractallyspreadsheet")
+
+OUTPUT_FORMATS = ("csv", "json", "parquet")
+
+FIGURE_FORMATS = ("png", "svg")
+
+# The weighted mean column of each `--column` of the weighted-means subcommand.
+WEIGHTED_MEAN_COLUMN_NAME_BY_NAME = {
+    "level": WEIGHTED_MEAN_LEVEL_COLUMN_NAME,
+    "respect": WEIGHTED_MEAN_RESPECT_COLUMN_NAME,
+}
+
+
+def get_csv_paths(
+    directory: Optional[os.PathLike] = None,
+) -> fractal_governance.util.FractalDatasetCSVPaths:
+    """Return the paths of the Genesis fractal's .csv files in the given directory, or
+    of the Genesis fractal's own .csv files if `directory` is None"""
+    fractal_dataset_csv_paths = fractal_governance.util.FractalDatasetCSVPaths()
+    if directory is None:
+        return fractal_dataset_csv_paths
+    return fractal_governance.util.FractalDatasetCSVPaths(
+        **{
+            name: Path(directory) / path.name
+            for name, path in attrs.asdict(
+                fractal_dataset_csv_paths, recurse=False
+            ).items()
+        }
+    )
+
+
+def get_leader_board(
+    dashboard_view_name: str,
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    as_of: Optional[datetime.date] = None,
+    teams: bool = False,
+    result_cache: ResultCache = DEFAULT_RESULT_CACHE,
+) -> pd.DataFrame:
+    """Return the member leaderboard, or the team leaderboard if `teams` is True, of
+    the named DashboardView of the meetings held on or before `as_of`
+
+    Raises ValueError if no meeting was held on or before `as_of`."""
+
+    def compute() -> fractal_governance.result_cache.Result:
+        import fractal_governance.dashboard
+        import fractal_governance.dataset
+
+        dashboard_view_by_name = {
+            dashboard_view.name.lower(): dashboard_view
+            for dashboard_view in fractal_governance.dashboard.DashboardView
+        }
+        dataset = fractal_governance.dataset.Dataset.from_csv(fractal_dataset_csv_paths)
+        if as_of is not None:
+            df = dataset.df[dataset.df[MEETING_DATE_COLUMN_NAME] <= pd.Timestamp(as_of)]
+            if df.empty:
+                raise ValueError(f"No meeting was held on or before {as_of}")
+            dataset = fractal_governance.dataset.Dataset(df=df)
+        dataset = fractal_governance.dashboard.create_dataset(
+            dashboard_view_by_name[dashboard_view_name],
+            dataset,
+            result_cache=result_cache,
+        )
+        if teams:
+            return {"df": dataset.df_team_leader_board}
+        return {"df": dataset.df_member_leader_board.rename_axis(RANK_COLUMN_NAME)}
+
+    key = fractal_governance.result_cache.make_csv_result_key(
+        "leader_board",
+        fractal_dataset_csv_paths,
+        dashboard_view_name,
+        None if as_of is None else as_of.isoformat(),
+        teams,
+    )
+    return result_cache.get_or_compute(key, compute)["df"]  # type: ignore
+
+
+def get_token_supply(
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    meeting_count: Optional[int] = None,
+    result_cache: ResultCache = DEFAULT_RESULT_CACHE,
+) -> pd.DataFrame:
+    """Return the *Fractally White Paper Addendum 1* token supply schedule of the
+    given number of meetings, or of every meeting held if `meeting_count` is None"""
+
+    def compute() -> fractal_governance.result_cache.Result:
+        import fractal_governance.addendum_1.token_supply
+
+        count = meeting_count
+        if count is None:
+            df = fractal_governance.util.read_csv(fractal_dataset_csv_paths)
+            count = int(df[MEETING_ID_COLUMN_NAME].max())
+        return {
+            "df": fractal_governance.addendum_1.token_supply.get_token_supply_schedule(
+                count
+            )
+        }
+
+    key = fractal_governance.result_cache.make_csv_result_key(
+        "token_supply", fractal_dataset_csv_paths, meeting_count
+    )
+    return result_cache.get_or_compute(key, compute)["df"]  # type: ignore
+
+
+def get_weighted_means(
+    weighted_mean_column_name: str,
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    result_cache: ResultCache = DEFAULT_RESULT_CACHE,
+) -> pd.DataFrame:
+    """Return the pivot table of the given weighted mean column, indexed by member and
+    with one column per meeting (see
+    `fractal_governance.addendum_1.weighted_means.get_pivot_table`)"""
+
+    def compute() -> fractal_governance.result_cache.Result:
+        import fractal_governance.addendum_1.weighted_means
+        import fractal_governance.dataset
+
+        weighted_means = fractal_governance.addendum_1.weighted_means.WeightedMeans(
+            fractal_governance.dataset.Dataset.from_csv(fractal_dataset_csv_paths),
+            result_cache=result_cache,
+        )
+        df = weighted_means.get_pivot_table(
+            weighted_mean_column_name=weighted_mean_column_name
+        )
+        # Parquet requires string column names.
+        return {"df": df.rename(columns=str)}
+
+    key = fractal_governance.result_cache.make_csv_result_key(
+        "weighted_means", fractal_dataset_csv_paths, weighted_mean_column_name
+    )
+    return result_cache.get_or_compute(key, compute)["df"]  # type: ignore
+
+
+def get_uncertainty_leader_board(
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    include_self_measurement: bool = False,
+    result_cache: ResultCache = DEFAULT_RESULT_CACHE,
+) -> pd.DataFrame:
+    """Return the leaderboard of the members who make the highest quality
+    measurements"""
+
+    def compute() -> fractal_governance.result_cache.Result:
+        import fractal_governance.dataset
+        import fractal_governance.measurement_uncertainty.dataset
+
+        measurement_uncertainty_dataset = (
+            fractal_governance.measurement_uncertainty.dataset.Dataset(
+                dataset=fractal_governance.dataset.Dataset.from_csv(
+                    fractal_dataset_csv_paths
+                ),
+                result_cache=result_cache,
+            )
+        )
+        df = measurement_uncertainty_dataset.get_member_leader_board(
+            include_self_measurement=include_self_measurement
+        )
+        return {"df": df.rename_axis(RANK_COLUMN_NAME)}
+
+    key = fractal_governance.result_cache.make_csv_result_key(
+        "uncertainty_leader_board",
+        fractal_dataset_csv_paths,
+        include_self_measurement,
+    )
+    return result_cache.get_or_compute(key, compute)["df"]  # type: ignore
+
+
+def export_figures(
+    output_dir: os.PathLike,
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    format: str = "png",
+    dpi: float = fractal_governance.render_cache.DEFAULT_DPI,
+    cache_directory: Optional[os.PathLike] = None,
+    result_cache: ResultCache = DEFAULT_RESULT_CACHE,
+) -> List[Path]:
+    """Write every plot of the static site (see `fractal_governance.static_site`) in
+    the given format to `output_dir` and return the paths of the files written
+
+    If `cache_directory` is given then rendered plots are stored there and only the
+    plots whose input data changed are rendered again."""
+    import fractal_governance.dashboard
+    import fractal_governance.dataset
+    import fractal_governance.measurement_uncertainty.dataset
+    import fractal_governance.static_site
+
+    output_dir = Path(output_dir)
+    dataset = fractal_governance.dataset.Dataset.from_csv(fractal_dataset_csv_paths)
+    plots_by_page_name = fractal_governance.static_site.create_plots_by_page_name(
+        {
+            fractal_governance.static_site.get_page_name(
+                dashboard_view
+            ): fractal_governance.dashboard.create_dataset(
+                dashboard_view, dataset, result_cache=result_cache
+            )
+            for dashboard_view in fractal_governance.dashboard.DashboardView
+        },
+        fractal_governance.measurement_uncertainty.dataset.Dataset(
+            dataset=dataset, result_cache=result_cache
+        ),
+        fractal_governance.render_cache.RenderCache(
+            max_entries=0, directory=cache_directory
+        ),
+    )
+    paths = []
+    for plot_job in fractal_governance.static_site.get_plot_jobs():
+        path = output_dir / plot_job.path.relative_to(
+            fractal_governance.static_site.IMAGES_DIRECTORY_NAME
+        ).with_suffix(f".{format}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(
+            plots_by_page_name[plot_job.page_name].render(
+                plot_job.plot_name, *plot_job.args, format=format, dpi=dpi
+            )
+        )
+        paths.append(path)
+    return paths
+
+
+def write_table(
+    df: pd.DataFrame, output_format: str, output: Optional[os.PathLike] = None
+) -> None:
+    """Write the given DataFrame and its index in the given format to `output`, or to
+    stdout if `output` is None
+
+    The JSON format is a list with one object per row."""
+    df = pd.DataFrame(df)
+    if output_format == "csv":
+        df.to_csv(sys.stdout if output is None else output)
+    elif output_format == "json":
+        df.reset_index().to_json(
+            sys.stdout if output is None else output,
+            orient="records",
+            date_format="iso",
+        )
+    elif output_format == "parquet":
+        df.to_parquet(sys.stdout.buffer if output is None else output)
+    else:
+        raise ValueError(f"Unknown output_format {output_format}")
+
+
+def _create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="fractal_governance",
+        description="Calculate the fractal governance tables and plots",
+    )
+    parser.add_argument(
+        "--data-directory",
+        type=Path,
+        default=None,
+        help="the directory of the fractal's .csv files (default: the Genesis "
+        "fractal's)",
+    )
+    parser.add_argument(
+        "--cache-directory",
+        type=Path,
+        default=None,
+        help="the directory of the cached tables and plots",
+    )
+    subparsers = parser.add_subparsers(dest="subcommand", required=True)
+
+    table_parser = argparse.ArgumentParser(add_help=False)
+    table_parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    table_parser.add_argument(
+        "--output", "-o", type=Path, default=None, help="(default: stdout)"
+    )
+
+    leader_board_parser = subparsers.add_parser(
+        "leaderboard", parents=[table_parser], help="the member or team leaderboard"
+    )
+    leader_board_parser.add_argument(
+        "--view", choices=DASHBOARD_VIEW_NAMES, default=DASHBOARD_VIEW_NAMES[0]
+    )
+    leader_board_parser.add_argument(
+        "--as-of",
+        type=datetime.date.fromisoformat,
+        default=None,
+        help="only include the meetings held on or before this YYYY-MM-DD date",
+    )
+    leader_board_parser.add_argument("--teams", action="store_true")
+
+    token_supply_parser = subparsers.add_parser(
+        "token-supply",
+        parents=[table_parser],
+        help="the Addendum 1 token supply schedule",
+    )
+    token_supply_parser.add_argument(
+        "--meetings",
+        type=int,
+        default=None,
+        help="the number of meetings (default: the number of meetings held)",
+    )
+
+    weighted_means_parser = subparsers.add_parser(
+        "weighted-means",
+        parents=[table_parser],
+        help="the Addendum 1 weighted means of each member and meeting",
+    )
+    weighted_means_parser.add_argument(
+        "--column", choices=tuple(WEIGHTED_MEAN_COLUMN_NAME_BY_NAME), default="level"
+    )
+
+    uncertainty_leader_board_parser = subparsers.add_parser(
+        "uncertainty-leaderboard",
+        parents=[table_parser],
+        help="the measurement uncertainty leaderboard",
+    )
+    uncertainty_leader_board_parser.add_argument(
+        "--include-self-measurement", action="store_true"
+    )
+
+    export_figures_parser = subparsers.add_parser(
+        "export-figures", help="the plots of the dashboards"
+    )
+    export_figures_parser.add_argument("output_dir", type=Path)
+    export_figures_parser.add_argument(
+        "--format", choices=FIGURE_FORMATS, default=FIGURE_FORMATS[0]
+    )
+    export_figures_parser.add_argument(
+        "--dpi", type=float, default=fractal_governance.render_cache.DEFAULT_DPI
+    )
+
+    perf_parser = subparsers.add_parser(
+        "perf",
+        help="compare the time and peak memory of the pipeline stages on synthetic "
+        "datasets to their baselines",
+    )
+    perf_parser.add_argument(
+        "--baselines",
+        type=Path,
+        default=None,
+        help="the baselines .json file (default: the committed baselines)",
+    )
+    perf_parser.add_argument(
+        "--update-baselines",
+        action="store_true",
+        help="write the measurements to the baselines .json file instead",
+    )
+    perf_parser.add_argument("--repeat", type=int, default=5)
+    perf_parser.add_argument("--max-time-ratio", type=float, default=None)
+    perf_parser.add_argument("--max-peak-bytes-ratio", type=float, default=None)
+    perf_parser.add_argument("--max-growth", type=float, default=None)
+    return parser
+
+
+def run_perf(
+    baselines_path: Optional[Path] = None,
+    *,
+    update_baselines: bool = False,
+    repeat: int = 5,
+    max_time_ratio: Optional[float] = None,
+    max_peak_bytes_ratio: Optional[float] = None,
+    max_growth: Optional[float] = None,
+) -> bool:
+    """Print the PerfReport of the pipeline stages compared to the given baselines,
+    or write the baselines if `update_baselines` is True, and return True if there
+    is no regression (see `fractal_governance.perf`)"""
+    import fractal_governance.perf
+
+    if baselines_path is None:
+        baselines_path = fractal_governance.perf.DEFAULT_BASELINES_PATH
+    perf_results = fractal_governance.perf.run(repeat=repeat)
+    if update_baselines:
+        perf_results.write(baselines_path)
+        print(baselines_path)
+        return True
+    tolerances = fractal_governance.perf.Tolerances()
+    tolerances = attrs.evolve(
+        tolerances,
+        max_time_ratio=max_time_ratio or tolerances.max_time_ratio,
+        max_peak_bytes_ratio=max_peak_bytes_ratio or tolerances.max_peak_bytes_ratio,
+        max_growth=max_growth or tolerances.max_growth,
+    )
+    perf_report = fractal_governance.perf.compare(
+        fractal_governance.perf.PerfResults.read(baselines_path),
+        perf_results,
+        tolerances,
+    )
+    print(perf_report.to_text())
+    return not perf_report.regressions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = _create_parser()
+    args = parser.parse_args(argv)
+    fractal_dataset_csv_paths = get_csv_paths(args.data_directory)
+    result_cache = DEFAULT_RESULT_CACHE
+    if args.cache_directory is not None:
+        result_cache = ResultCache(
+            directory=args.cache_directory
+            / fractal_governance.result_cache.RESULT_CACHE_DIRECTORY_NAME
+        )
+
+    if args.subcommand == "export-figures":
+        for path in export_figures(
+            args.output_dir,
+            fractal_dataset_csv_paths,
+            format=args.format,
+            dpi=args.dpi,
+            cache_directory=args.cache_directory,
+            result_cache=result_cache,
+        ):
+            print(path)
+        return
+
+    if args.subcommand == "perf":
+        if not run_perf(
+            args.baselines,
+            update_baselines=args.update_baselines,
+            repeat=args.repeat,
+            max_time_ratio=args.max_time_ratio,
+            max_peak_bytes_ratio=args.max_peak_bytes_ratio,
+            max_growth=args.max_growth,
+        ):
+            sys.exit(1)
+        return
+
+    if args.subcommand == "leaderboard":
+        try:
+            df = get_leader_board(
+                args.view,
+                fractal_dataset_csv_paths,
+                as_of=args.as_of,
+                teams=args.teams,
+                result_cache=result_cache,
+            )
+        except ValueError as error:
+            parser.error(str(error))
+    elif args.subcommand == "token-supply":
+        df = get_token_supply(
+            fractal_dataset_csv_paths,
+            meeting_count=args.meetings,
+            result_cache=result_cache,
+        )
+    elif args.subcommand == "weighted-means":
+        df = get_weighted_means(
+            WEIGHTED_MEAN_COLUMN_NAME_BY_NAME[args.column],
+            fractal_dataset_csv_paths,
+            result_cache=result_cache,
+        )
+    elif args.subcommand == "uncertainty-leaderboard":
+        df = get_uncertainty_leader_board(
+            fractal_dataset_csv_paths,
+            include_self_measurement=args.include_self_measurement,
+            result_cache=result_cache,
+        )
+    else:
+        raise RuntimeError(f"LOGIC ERROR: unexpected subcommand={args.subcommand}")
+    write_table(df, args.format, args.output)
+
+
+if __name__ == "__main__":
+    main()
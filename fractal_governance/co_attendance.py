@@ -0,0 +1,256 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A sparse graph of the members who sat together in a consensus group
+
+The co-attendance matrix has one row and one column per member, and the count of
+the groups each pair of members sat in together. It is the product B Bᵀ of the
+sparse member × group incidence matrix B, so the diagonal is the number of groups
+each member sat in, and a pair of members who sat together in both rounds of a
+meeting counts both groups.
+
+The matrix is stored as a scipy.sparse CSR matrix whose size grows with the number
+of pairs of members who actually sat together rather than with the square of the
+number of members. Since the matrix is a sum over groups, the groups of new
+meetings are added by `CoAttendanceGraph.add_meetings` without revisiting the
+groups of the meetings already in the graph.
+
+The graph summarizes its members' degrees, centralities and connected components,
+and how often the same pairs of members were grouped together.
+"""
+
+from typing import FrozenSet, Optional
+
+import attrs
+import numpy as np
+import pandas as pd
+import scipy.sparse
+import scipy.sparse.csgraph
+
+from .constants import (
+    COMPONENT_COLUMN_NAME,
+    COMPONENT_SIZE_COLUMN_NAME,
+    DEGREE_CENTRALITY_COLUMN_NAME,
+    DEGREE_COLUMN_NAME,
+    EIGENVECTOR_CENTRALITY_COLUMN_NAME,
+    GROUP_COUNT_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID1_COLUMN_NAME,
+    MEMBER_ID2_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    PAIR_COUNT_COLUMN_NAME,
+    PAIRING_COUNT_COLUMN_NAME,
+    WEIGHTED_DEGREE_COLUMN_NAME,
+)
+from .group_cube import GROUP_KEY_COLUMN_NAMES
+
+# The maximum number of power iterations of the eigenvector centrality, and the
+# change in the centrality vector at which it has converged.
+EIGENVECTOR_CENTRALITY_MAX_ITERATIONS = 1000
+EIGENVECTOR_CENTRALITY_TOLERANCE = 1e-10
+
+
+@attrs.frozen(kw_only=True, eq=False)
+class CoAttendanceGraph:
+    """The co-attendance matrix of the members of a fractal, along with the
+    MemberID of each of its rows and the MeetingIDs of the groups it counts
+
+    Use `CoAttendanceGraph.from_group_members` to create one from a group members
+    frame (see `fractal_governance.group_cube`)."""
+
+    member_ids: pd.Index
+    meeting_ids: FrozenSet[int]
+    matrix: scipy.sparse.csr_matrix
+
+    @property
+    def member_count(self) -> int:
+        """Return the number of members of the graph"""
+        return len(self.member_ids)
+
+    @classmethod
+    def from_group_members(cls, df_group_members: pd.DataFrame) -> "CoAttendanceGraph":
+        """Return the co-attendance graph of the members of every group of the given
+        group members frame"""
+        empty_graph = cls(
+            member_ids=pd.Index([], dtype=object, name=MEMBER_ID_COLUMN_NAME),
+            meeting_ids=frozenset(),
+            matrix=scipy.sparse.csr_matrix((0, 0), dtype=np.int64),
+        )
+        return empty_graph.add_meetings(df_group_members)
+
+    def add_meetings(self, df_group_members: pd.DataFrame) -> "CoAttendanceGraph":
+        """Return a new graph that also counts the groups of the meetings of the
+        given group members frame that are not already in this graph
+
+        The meetings already in this graph are skipped, so the group members frame
+        of an updated Dataset can be passed as is. The members who are new to the
+        graph are appended to its rows in the order they first appear."""
+        df = df_group_members[
+            ~df_group_members[MEETING_ID_COLUMN_NAME].isin(self.meeting_ids)
+        ].drop_duplicates(GROUP_KEY_COLUMN_NAMES + [MEMBER_ID_COLUMN_NAME])
+        if df.empty:
+            return self
+
+        new_member_ids = pd.Index(df[MEMBER_ID_COLUMN_NAME].unique()).difference(
+            self.member_ids, sort=False
+        )
+        member_ids = self.member_ids.append(new_member_ids).rename(
+            MEMBER_ID_COLUMN_NAME
+        )
+        member_codes = member_ids.get_indexer(df[MEMBER_ID_COLUMN_NAME])
+        group_codes = df.groupby(GROUP_KEY_COLUMN_NAMES, sort=False).ngroup()
+        incidence = scipy.sparse.csr_matrix(
+            (
+                np.ones(len(df), dtype=np.int64),
+                (member_codes, group_codes.to_numpy()),
+            ),
+            shape=(len(member_ids), group_codes.max() + 1),
+        )
+
+        # The new members' rows of the existing matrix are empty, so its row
+        # pointers are extended with the row pointer of its last row.
+        matrix = scipy.sparse.csr_matrix(
+            (
+                self.matrix.data,
+                self.matrix.indices,
+                np.pad(
+                    self.matrix.indptr,
+                    (0, len(new_member_ids)),
+                    mode="edge",
+                ),
+            ),
+            shape=(len(member_ids), len(member_ids)),
+        )
+        matrix = matrix + (incidence @ incidence.T).tocsr()
+        matrix.sort_indices()
+        return CoAttendanceGraph(
+            member_ids=member_ids,
+            meeting_ids=self.meeting_ids
+            | frozenset(df[MEETING_ID_COLUMN_NAME].unique().tolist()),
+            matrix=matrix,
+        )
+
+    def get_adjacency_matrix(self) -> scipy.sparse.csr_matrix:
+        """Return the co-attendance matrix without its diagonal, i.e. the weighted
+        adjacency matrix of the graph"""
+        adjacency_matrix = self.matrix - scipy.sparse.diags(
+            self.matrix.diagonal(), format="csr"
+        )
+        adjacency_matrix.eliminate_zeros()
+        return adjacency_matrix
+
+    def get_eigenvector_centralities(self) -> np.ndarray:
+        """Return the eigenvector centrality of each member, scaled so the most
+        central member of the graph has a centrality of 1
+
+        The centralities are found by power iteration on the adjacency matrix plus
+        the identity, whose leading eigenvector is the same but which converges for
+        graphs whose components are bipartite."""
+        if self.member_count == 0:
+            return np.zeros(0)
+        adjacency_matrix = self.get_adjacency_matrix().astype(float)
+        centralities = np.ones(self.member_count) / self.member_count
+        for _ in range(EIGENVECTOR_CENTRALITY_MAX_ITERATIONS):
+            next_centralities = adjacency_matrix @ centralities + centralities
+            next_centralities /= np.abs(next_centralities).max()
+            converged = (
+                np.abs(next_centralities - centralities).max()
+                < EIGENVECTOR_CENTRALITY_TOLERANCE
+            )
+            centralities = next_centralities
+            if converged:
+                break
+        return centralities
+
+    def get_components(self) -> np.ndarray:
+        """Return the connected component of each member, numbered from 0 in the
+        order of their first members"""
+        _, components = scipy.sparse.csgraph.connected_components(
+            self.matrix, directed=False
+        )
+        return components
+
+    def get_member_statistics(self) -> pd.DataFrame:
+        """Return the co-attendance of each member, indexed by MemberID in sorted
+        order
+
+        GroupCount is the number of groups the member sat in, Degree the number of
+        other members they sat with, WeightedDegree the number of times they sat
+        with another member and DegreeCentrality their Degree divided by the number
+        of other members of the graph."""
+        adjacency_matrix = self.get_adjacency_matrix()
+        degrees = np.diff(adjacency_matrix.indptr)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            degree_centralities = degrees / (self.member_count - 1)
+        df = pd.DataFrame(
+            {
+                GROUP_COUNT_COLUMN_NAME: self.matrix.diagonal(),
+                DEGREE_COLUMN_NAME: degrees,
+                WEIGHTED_DEGREE_COLUMN_NAME: np.asarray(
+                    adjacency_matrix.sum(axis=1)
+                ).ravel(),
+                DEGREE_CENTRALITY_COLUMN_NAME: degree_centralities,
+                EIGENVECTOR_CENTRALITY_COLUMN_NAME: self.get_eigenvector_centralities(),
+                COMPONENT_COLUMN_NAME: self.get_components(),
+            },
+            index=self.member_ids,
+        )
+        return df.sort_index()
+
+    def get_component_sizes(self) -> pd.Series:
+        """Return the number of members of each connected component, indexed by
+        component and sorted by size in descending order"""
+        return (
+            pd.Series(
+                np.bincount(self.get_components()), name=COMPONENT_SIZE_COLUMN_NAME
+            )
+            .rename_axis(COMPONENT_COLUMN_NAME)
+            .sort_values(ascending=False, kind="mergesort")
+        )
+
+    def _get_pair_counts(self) -> scipy.sparse.coo_matrix:
+        """Internal helper method that returns the upper triangle of the adjacency
+        matrix, i.e. the PairingCount of each pair of members once"""
+        return scipy.sparse.triu(self.matrix, k=1, format="coo")
+
+    def get_pairing_counts(self) -> pd.Series:
+        """Return the number of pairs of members who sat together in each number of
+        groups, indexed by PairingCount
+
+        The pairs of members who never sat together are not counted."""
+        pair_counts = np.bincount(self._get_pair_counts().data)
+        pairing_counts = np.flatnonzero(pair_counts)
+        return pd.Series(
+            pair_counts[pairing_counts],
+            index=pd.Index(pairing_counts, name=PAIRING_COUNT_COLUMN_NAME),
+            name=PAIR_COUNT_COLUMN_NAME,
+        )
+
+    def get_pairs(
+        self, min_pairing_count: int = 2, max_pair_count: Optional[int] = None
+    ) -> pd.DataFrame:
+        """Return the pairs of members who sat together in at least
+        `min_pairing_count` groups, sorted by PairingCount in descending order
+
+        MemberID1 sorts before MemberID2, and at most `max_pair_count` pairs are
+        returned if it is given."""
+        pair_counts = self._get_pair_counts()
+        is_repeated = pair_counts.data >= min_pairing_count
+        member_ids1 = self.member_ids[pair_counts.row[is_repeated]].to_numpy()
+        member_ids2 = self.member_ids[pair_counts.col[is_repeated]].to_numpy()
+        is_swapped = member_ids1 > member_ids2
+        df = pd.DataFrame(
+            {
+                MEMBER_ID1_COLUMN_NAME: np.where(is_swapped, member_ids2, member_ids1),
+                MEMBER_ID2_COLUMN_NAME: np.where(is_swapped, member_ids1, member_ids2),
+                PAIRING_COUNT_COLUMN_NAME: pair_counts.data[is_repeated],
+            }
+        )
+        df = df.sort_values(
+            by=[
+                PAIRING_COUNT_COLUMN_NAME,
+                MEMBER_ID1_COLUMN_NAME,
+                MEMBER_ID2_COLUMN_NAME,
+            ],
+            ascending=[False, True, True],
+            ignore_index=True,
+        )
+        return df if max_pair_count is None else df.head(max_pair_count)
@@ -1,10 +1,9 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
 """Constants for fractal governance data analysis"""
 
+import datetime
 from pathlib import Path
 
-import pandas as pd
-
 import fractal_governance
 
 PROJECT_DIR = Path(fractal_governance.__file__).parent.parent
@@ -16,7 +15,7 @@ GENESIS_WEEKLY_MEASUREMENTS_CSV_PATH = (
 )
 
 
-DATE_OF_FIRST_GENESIS_FRACTAL_MEETING = pd.to_datetime("2/26/2022")
+DATE_OF_FIRST_GENESIS_FRACTAL_MEETING = datetime.datetime(2022, 2, 26)
 
 MEETING_ID_WHEN_HIVE_SIGNATURE_REQUIRED = 17
 MEETING_ID_WHEN_ADDENDUM_1_GOES_INTO_EFFECT = 23
@@ -26,29 +25,68 @@ ACCUMULATED_RESPECT_COLUMN_NAME = "AccumulatedRespect"
 ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME = "AccumulatedRespectNewMember"
 ACCUMULATED_RESPECT_PRO_RATA_COLUMN_NAME = "AccumulatedRespectProRata"
 ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME = "AccumulatedRespectReturningMember"
+ADVANCED_MEMBER_COUNT_COLUMN_NAME = "AdvancedMemberCount"
 ATTENDANCE_COUNT_COLUMN_NAME = "AttendanceCount"
 ATTENDANCE_COUNT_NEW_MEMBER_COLUMN_NAME = "AttendanceCountNewMember"
 ATTENDANCE_COUNT_RETURNING_MEMBER_COLUMN_NAME = "AttendanceCountReturningMember"
+BIN_END_COLUMN_NAME = "BinEnd"
+BIN_START_COLUMN_NAME = "BinStart"
+COMPONENT_COLUMN_NAME = "Component"
+COMPONENT_SIZE_COLUMN_NAME = "ComponentSize"
+DEGREE_CENTRALITY_COLUMN_NAME = "DegreeCentrality"
+DEGREE_COLUMN_NAME = "Degree"
+EIGENVECTOR_CENTRALITY_COLUMN_NAME = "EigenvectorCentrality"
+ERROR_COLUMN_NAME = "Error"
+FIT_COLUMN_NAME = "Fit"
+FRACTAL_COUNT_COLUMN_NAME = "FractalCount"
+FRACTAL_NAME_COLUMN_NAME = "FractalName"
+GRANULARITY_COLUMN_NAME = "Granularity"
 GROUP_COLUMN_NAME = "Group"
+GROUP_COUNT_COLUMN_NAME = "GroupCount"
+GROUP_SIZE_COLUMN_NAME = "GroupSize"
 HIVE_ACCOUNT_NAME_COLUMN_NAME = "HiveAccountName"
 INDEX_COLUMN_NAME = "Index"
 INTEGRAL_COLUMN_NAME = "Integral"
 INTEGRAL_END_COLUMN_NAME = "IntegralEnd"
 INTEGRAL_START_COLUMN_NAME = "IntegralStart"
+IS_NEW_MEMBER_COLUMN_NAME = "IsNewMember"
+KENDALLS_W_COLUMN_NAME = "KendallsW"
+KENDALL_TAU_COLUMN_NAME = "KendallTau"
 LEVEL_COLUMN_NAME = "Level"
+LEVEL_RANGE_COLUMN_NAME = "LevelRange"
+LEVEL_STANDARD_DEVIATION_COLUMN_NAME = "LevelStandardDeviation"
 MEAN_COLUMN_NAME = "Mean"
+MEAN_LEVEL_COLUMN_NAME = "MeanLevel"
+MEAN_RANK_CHANGE_COLUMN_NAME = "MeanRankChange"
 MEETING_DATE_COLUMN_NAME = "MeetingDate"
+MEETING_COUNT_COLUMN_NAME = "MeetingCount"
 MEETING_ID_COLUMN_NAME = "MeetingID"
+MEMBER_ID1_COLUMN_NAME = "MemberID1"
+MEMBER_ID2_COLUMN_NAME = "MemberID2"
 MEMBER_ID_COLUMN_NAME = "MemberID"
 MEMBER_NAME_COLUMN_NAME = "Name"
 NEW_MEMBER_COUNT_COLUMN_NAME = "NewMemberCount"
+NEW_MEMBER_SHARE_COLUMN_NAME = "NewMemberShare"
+NORMALIZED_RANK_COLUMN_NAME = "NormalizedRank"
+PAIRED_MEMBER_COUNT_COLUMN_NAME = "PairedMemberCount"
+PAIRING_COUNT_COLUMN_NAME = "PairingCount"
+PAIR_COUNT_COLUMN_NAME = "PairCount"
+PERIOD_COLUMN_NAME = "Period"
+PERIOD_LABEL_COLUMN_NAME = "PeriodLabel"
+RANK_COLUMN_NAME = "Rank"
+RANK_VOLATILITY_COLUMN_NAME = "RankVolatility"
+RATED_MEMBER_COUNT_COLUMN_NAME = "RatedMemberCount"
 RESPECT_COLUMN_NAME = "Respect"
 RESPECT_PRO_RATA_COLUMN_NAME = "RespectProRata"
 RETURNING_MEMBER_COUNT_COLUMN_NAME = "ReturningMemberCount"
 ROUND_COLUMN_NAME = "Round"
+SERIES_COLUMN_NAME = "Series"
 SIGNATURE_ON_FILE_COLUMN_NAME = "SignatureOnFile"
+SPEARMAN_RHO_COLUMN_NAME = "SpearmanRho"
 STANDARD_DEVIATION_COLUMN_NAME = "StandardDeviation"
+TEAM_COUNT_COLUMN_NAME = "TeamCount"
 TEAM_ID_COLUMN_NAME = "TeamID"
+TEAM_MEMBER_COUNT_COLUMN_NAME = "TeamMemberCount"
 TEAM_NAME_COLUMN_NAME = "TeamName"
 TIME_COLUMN_NAME = "Time"
 TOKENS_INDIVIDUAL = "TokensIndividual"
@@ -61,5 +99,9 @@ TOKEN_SUPPLY_BEFORE_TRANSITION_TO_CONSTANT_INFLATION_COLUMN_NAME = (
     "TokenSupplyBeforeTransitionToConstantInflation"
 )
 TOKEN_SUPPLY_COLUMN_NAME = "TokenSupply"
+VALUE_COLUMN_NAME = "Value"
+WEIGHTED_DEGREE_COLUMN_NAME = "WeightedDegree"
 WEIGHTED_MEAN_LEVEL_COLUMN_NAME = "WeightedMeanLevel"
 WEIGHTED_MEAN_RESPECT_COLUMN_NAME = "WeightedMeanRespect"
+X_COLUMN_NAME = "X"
+X_ERROR_COLUMN_NAME = "XError"
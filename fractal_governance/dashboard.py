@@ -0,0 +1,186 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""The views, datasets and table styles shared by the Streamlit dashboards and the
+static site exporter (see `fractal_governance.static_site`)"""
+
+import functools
+from enum import Enum, auto
+from typing import TYPE_CHECKING, Any, Optional
+
+import pandas as pd
+import uncertainties
+
+import fractal_governance.dataset
+import fractal_governance.progress
+import fractal_governance.result_cache
+from fractal_governance.addendum_1.dataset import Addendum1Dataset
+from fractal_governance.leader_board import LeaderBoard, SortKey
+from fractal_governance.measurement_uncertainty.dataset import (
+    ACCURACY_COLUMN_NAME,
+    PRECISION_COLUMN_NAME,
+    UncertaintyType,
+)
+
+from .constants import (
+    ACCUMULATED_RESPECT_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+)
+
+if TYPE_CHECKING:
+    import matplotlib.colors
+    from pandas.io.formats.style import Styler
+
+# The page sizes of the paginated leaderboards.
+PAGE_SIZES = (10, 25, 50, 100)
+
+# The printf-style format of the Respect columns of a leaderboard page converted to
+# Arrow, the same number of decimals as `format_value`.
+RESPECT_COLUMN_FORMAT = "%.2f"
+
+
+@functools.lru_cache(maxsize=None)
+def get_cmap() -> "matplotlib.colors.Colormap":
+    """Return the colormap of the leaderboards, importing seaborn on first use"""
+    import seaborn as sns
+
+    return sns.light_palette("#34A853", as_cmap=True)
+
+
+def __getattr__(name: str) -> Any:
+    # `CMAP` is created on first use so that importing this module does not import
+    # seaborn and matplotlib.
+    if name == "CMAP":
+        return get_cmap()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class DashboardView(Enum):
+    Classic = auto()
+    Addendum1 = auto()
+    TeamFractallySpreadsheet = auto()
+
+
+def create_dataset(
+    dashboard_view: DashboardView,
+    dataset: fractal_governance.dataset.Dataset,
+    *,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = None,
+) -> fractal_governance.dataset.Dataset:
+    """Return the Dataset for the given DashboardView of the given Dataset
+
+    If `result_cache` is given then the *Addendum 1* calculations are only done if
+    their results are not in it."""
+    if dashboard_view == DashboardView.Classic:
+        return dataset
+    elif dashboard_view == DashboardView.Addendum1:
+        return Addendum1Dataset(
+            dataset=dataset, progress=progress, result_cache=result_cache
+        ).dataset_with_addendum_1_respect
+    elif dashboard_view == DashboardView.TeamFractallySpreadsheet:
+        # Team fractally's spreadsheet came into alignment with this dashboard on
+        # 2022.09.02 so that now there are no differences. However, I am keeping this
+        # logic here to help highlight any future divergences.
+        return Addendum1Dataset(
+            dataset=dataset, progress=progress, result_cache=result_cache
+        ).dataset_with_addendum_1_respect
+    else:
+        raise RuntimeError(f"LOGIC ERROR: Unknown enum {dashboard_view}")
+
+
+def format_value(data: Any) -> Any:
+    """Return the given table cell value formatted for display"""
+    if isinstance(data, uncertainties.UFloat):
+        return f"{data.nominal_value:,.2f}"
+    if isinstance(data, float):
+        return f"{data:,.2f}"
+    return data
+
+
+def create_member_leader_board(df: pd.DataFrame) -> LeaderBoard:
+    """Return the LeaderBoard of the given member leaderboard DataFrame"""
+    return LeaderBoard(
+        df,
+        [ACCUMULATED_RESPECT_COLUMN_NAME, ATTENDANCE_COUNT_COLUMN_NAME],
+        cmap=get_cmap(),
+        formatter=format_value,
+        column_formats={ACCUMULATED_RESPECT_COLUMN_NAME: RESPECT_COLUMN_FORMAT},
+    )
+
+
+def style_member_leader_board(df: pd.DataFrame) -> "Styler":
+    """Return the styled member leaderboard"""
+    return create_member_leader_board(df).style()
+
+
+def create_team_leader_board(df: pd.DataFrame) -> LeaderBoard:
+    """Return the LeaderBoard of the given team leaderboard DataFrame"""
+    return LeaderBoard(
+        df,
+        [ACCUMULATED_RESPECT_COLUMN_NAME],
+        cmap=get_cmap(),
+        formatter=format_value,
+        column_formats={ACCUMULATED_RESPECT_COLUMN_NAME: RESPECT_COLUMN_FORMAT},
+    )
+
+
+def style_team_leader_board(df: pd.DataFrame) -> "Styler":
+    """Return the styled team leaderboard"""
+    return create_team_leader_board(df).style()
+
+
+def get_attendance_table(dataset: fractal_governance.dataset.Dataset) -> pd.DataFrame:
+    """Return the new and returning member attendance by meeting with the most recent
+    meeting first"""
+    df = dataset.df_member_attendance_new_and_returning_by_meeting
+    return (
+        df.assign(
+            **{
+                MEETING_DATE_COLUMN_NAME: df[MEETING_DATE_COLUMN_NAME].dt.strftime(
+                    "%b %d, %Y"
+                )
+            }
+        )
+        .set_axis(df.index + 1)
+        .iloc[::-1]
+    )
+
+
+def get_measurement_uncertainty_sort_key(
+    sort_by: UncertaintyType = UncertaintyType.StdDev,
+) -> SortKey:
+    """Return the SortKey of the measurement uncertainty member leaderboard sorted
+    first by the given UncertaintyType and then by the other one, by Respect
+    (descending), by attendance (descending) and finally by member ID"""
+    sort_key = [(ACCURACY_COLUMN_NAME, True), (PRECISION_COLUMN_NAME, True)]
+    if sort_by == UncertaintyType.StdDev:
+        sort_key.reverse()
+    sort_key += [
+        (ACCUMULATED_RESPECT_COLUMN_NAME, False),
+        (ATTENDANCE_COUNT_COLUMN_NAME, False),
+        (MEMBER_ID_COLUMN_NAME, True),
+    ]
+    return tuple(sort_key)
+
+
+def create_measurement_uncertainty_leader_board(df: pd.DataFrame) -> LeaderBoard:
+    """Return the LeaderBoard of the given measurement uncertainty member leaderboard
+    DataFrame, whose numeric columns are sorted by their absolute value"""
+    return LeaderBoard(
+        df,
+        [ACCURACY_COLUMN_NAME, PRECISION_COLUMN_NAME],
+        cmap=get_cmap(),
+        sort_by_absolute_value=True,
+    )
+
+
+def style_measurement_uncertainty_leader_board(
+    df: pd.DataFrame, sort_by: UncertaintyType = UncertaintyType.StdDev
+) -> "Styler":
+    """Return the measurement uncertainty member leaderboard sorted first by the
+    given UncertaintyType and then by the other one, by Respect (descending), by
+    attendance (descending) and finally by member ID"""
+    return create_measurement_uncertainty_leader_board(df).style(
+        sort_key=get_measurement_uncertainty_sort_key(sort_by)
+    )
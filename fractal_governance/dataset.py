@@ -1,20 +1,41 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
 """Dataset for fractal governance data analysis"""
 
-from typing import List
+import functools
+import time
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 import attrs
+import numpy as np
 import pandas as pd
 
-import fractal_governance.math
+import fractal_governance.group_cube
+import fractal_governance.memory
+import fractal_governance.ranking_stability
+import fractal_governance.read_only
+import fractal_governance.rollups
+import fractal_governance.scheduler
 import fractal_governance.statistics
+import fractal_governance.tables
 import fractal_governance.util
 
 from .constants import (
+    ACCUMULATED_LEVEL_COLUMN_NAME,
     ACCUMULATED_RESPECT_COLUMN_NAME,
     ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
     ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
     ATTENDANCE_COUNT_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
     LEVEL_COLUMN_NAME,
     MEAN_COLUMN_NAME,
     MEETING_DATE_COLUMN_NAME,
@@ -24,7 +45,9 @@ from .constants import (
     NEW_MEMBER_COUNT_COLUMN_NAME,
     RESPECT_COLUMN_NAME,
     RETURNING_MEMBER_COUNT_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
     STANDARD_DEVIATION_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
     TEAM_NAME_COLUMN_NAME,
 )
 
@@ -42,9 +65,13 @@ class Dataset:
     """A wrapper around the fractal governance dataset
 
     The only required argument to the constructor is `df`.
+
+    `df`, the frames of `tables` and every derived DataFrame are read-only (see
+    `fractal_governance.read_only`) so that they can be shared between callers
+    without defensive copies.
     """
 
-    df: pd.DataFrame
+    df: pd.DataFrame = attrs.field(converter=fractal_governance.read_only.freeze)
 
     df_member_summary_stats_by_member_id: pd.DataFrame = attrs.field(
         default=None, init=False
@@ -64,6 +91,32 @@ class Dataset:
     )
     df_team_representation_by_date: pd.DataFrame = attrs.field(default=None, init=False)
     df_team_leader_board: pd.DataFrame = attrs.field(default=None, init=False)
+    df_member_respect_new_and_returning_by_period: pd.DataFrame = attrs.field(
+        default=None, init=False
+    )
+    df_member_attendance_new_and_returning_by_period: pd.DataFrame = attrs.field(
+        default=None, init=False
+    )
+    df_team_respect_by_period: pd.DataFrame = attrs.field(default=None, init=False)
+    df_team_representation_by_period: pd.Series = attrs.field(default=None, init=False)
+    df_group_ranks: pd.DataFrame = attrs.field(default=None, init=False)
+    df_group_members: pd.DataFrame = attrs.field(default=None, init=False)
+    df_group_cube: pd.DataFrame = attrs.field(default=None, init=False)
+    df_group_level_histogram: pd.DataFrame = attrs.field(default=None, init=False)
+    df_ranking_stability: pd.DataFrame = attrs.field(default=None, init=False)
+    df_member_rank_volatility: pd.DataFrame = attrs.field(default=None, init=False)
+
+    tables: fractal_governance.tables.Tables = attrs.field(
+        repr=False, default=None, init=False
+    )
+
+    max_workers: Optional[int] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    build_timings: Dict[str, float] = attrs.field(
+        factory=dict, init=False, repr=False, eq=False
+    )
 
     @property
     def total_respect(self) -> int:
@@ -73,7 +126,7 @@ class Dataset:
     @property
     def total_member_respect(self) -> int:
         """Return the total respect earned by individual members"""
-        return self.df[RESPECT_COLUMN_NAME].sum()  # type: ignore
+        return self.tables.df_respect[RESPECT_COLUMN_NAME].sum()  # type: ignore
 
     @property
     def total_team_respect(self) -> int:
@@ -90,23 +143,17 @@ class Dataset:
     @property
     def total_meetings(self) -> int:
         """Return the total number weekly consensus meetings"""
-        return len(self.df.groupby(MEETING_ID_COLUMN_NAME))
+        return len(self.tables.df_meetings)
 
     @property
     def last_meeting_date(self) -> pd.Timestamp:
         """Return the last meeting date for this dataset"""
-        return self.df.sort_values(by=MEETING_DATE_COLUMN_NAME, ascending=True).iloc[
-            -1
-        ][MEETING_DATE_COLUMN_NAME]
+        return self.tables.df_meetings[MEETING_DATE_COLUMN_NAME].max()
 
     @property
     def attendance_stats(self) -> Statistics:
         """Return the mean and standard deviation for attendance from this dataset"""
-        # The (MEETING_DATE_COLUMN_NAME, MEMBER_ID_COLUMN_NAME) tuple is degenerate
-        # after the addition of multiple rounds, which is the reason for the `notna` on
-        # LEVEL_COLUMN_NAME.
-        df = self.df[self.df[LEVEL_COLUMN_NAME].notna()]
-        groupby = df.groupby(MEETING_DATE_COLUMN_NAME).size()
+        groupby = self.tables.df_attendance.groupby(MEETING_DATE_COLUMN_NAME).size()
         return Statistics(mean=groupby.mean(), standard_deviation=groupby.std())
 
     @property
@@ -167,178 +214,428 @@ class Dataset:
     def from_csv(
         cls,
         fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+        *,
+        fractal_calendar: fractal_governance.util.FractalCalendar = fractal_governance.util.FractalCalendar(),  # noqa: E501
+        fractal_rules: fractal_governance.util.FractalRules = fractal_governance.util.FractalRules(),  # noqa: E501
     ) -> "Dataset":
-        """Return a Dataset for the given Fractal's .csv file paths"""
-        return cls(df=fractal_governance.util.read_csv(fractal_dataset_csv_paths))
-
-    def __attrs_post_init__(self) -> None:
-        df = self.df
-        df_member_summary_stats_by_member_id = df.groupby(MEMBER_ID_COLUMN_NAME).agg(
-            AttendanceCount=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="count"),
-            AccumulatedLevel=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="sum"),
-            AccumulatedRespect=pd.NamedAgg(column=RESPECT_COLUMN_NAME, aggfunc="sum"),
-            Mean=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="mean"),
-            StandardDeviation=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="std"),
+        """Return a Dataset for the given Fractal's .csv file paths, calendar and
+        rules"""
+        return cls(
+            df=fractal_governance.util.read_csv(
+                fractal_dataset_csv_paths,
+                fractal_calendar=fractal_calendar,
+                fractal_rules=fractal_rules,
+            )
         )
 
-        df_member_level_by_attendance_count = (
-            df_member_summary_stats_by_member_id.groupby(ATTENDANCE_COUNT_COLUMN_NAME)
-            .apply(combined_statistics)
-            .reset_index()
-        )
+    def derive(self, *, respect: pd.Series) -> "Dataset":
+        """Return a new Dataset whose Respect is replaced with the given `respect`
 
-        df_member_leader_board = df_member_summary_stats_by_member_id.join(
-            df.groupby(MEMBER_ID_COLUMN_NAME).first()[[MEMBER_NAME_COLUMN_NAME]]
-        ).sort_values(
-            by=[
-                ACCUMULATED_RESPECT_COLUMN_NAME,
-                ATTENDANCE_COUNT_COLUMN_NAME,
-                MEMBER_ID_COLUMN_NAME,
-            ],
-            ascending=[False, False, True],
+        The argument `respect` is a Respect ledger indexed by (MeetingID, MemberID)
+        that may include meetings a member did not attend. Members that attended a
+        meeting that is missing from the ledger earn zero Respect for that meeting.
+
+        Only the derived frames that depend on the Respect column (see
+        `DERIVED_FRAMES`) are recomputed. Every other table and derived frame is
+        shared by reference with this Dataset."""
+        respect = respect.dropna().rename_axis(
+            [MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]
         )
-        column_names = [
-            MEMBER_NAME_COLUMN_NAME,
-            ACCUMULATED_RESPECT_COLUMN_NAME,
-            ATTENDANCE_COUNT_COLUMN_NAME,
-        ]
-        df_member_leader_board = df_member_leader_board[column_names].reset_index()
-        df_member_leader_board.index += 1
-
-        df_team_respect_by_meeting_date = (
-            df[df[TEAM_NAME_COLUMN_NAME].notna()]
-            .groupby([TEAM_NAME_COLUMN_NAME, MEETING_DATE_COLUMN_NAME])
-            .agg(
-                AccumulatedRespect=pd.NamedAgg(
-                    column=RESPECT_COLUMN_NAME, aggfunc="sum"
-                )
+        unknown_member_ids = set(
+            respect.index.get_level_values(MEMBER_ID_COLUMN_NAME)
+        ).difference(self.tables.df_members.index)
+        if unknown_member_ids:
+            raise ValueError(
+                f"respect contains unknown member IDs {sorted(unknown_member_ids)}"
             )
-            .reset_index()
-        )
+        df_respect = respect.rename(RESPECT_COLUMN_NAME).sort_index().reset_index()
 
-        # The (MEETING_DATE_COLUMN_NAME, MEMBER_ID_COLUMN_NAME) tuple is degenerate
-        # after the addition of multiple rounds, which is the reason for the `notna` on
-        # LEVEL_COLUMN_NAME.
-        _df = df[df[LEVEL_COLUMN_NAME].notna()]
-        df_team_representation_by_date = (
-            _df[_df[TEAM_NAME_COLUMN_NAME].notna()]
-            .groupby(MEETING_DATE_COLUMN_NAME)
-            .size()
-            / _df.groupby(MEETING_DATE_COLUMN_NAME).size()
+        df_attendance = self.tables.df_attendance.copy()
+        attendance_index = pd.MultiIndex.from_frame(
+            df_attendance[[MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]]
+        )
+        df_attendance[RESPECT_COLUMN_NAME] = (
+            respect.reindex(attendance_index).fillna(0).to_numpy()
+        )
+        tables = attrs.evolve(
+            self.tables, df_attendance=df_attendance, df_respect=df_respect
         )
 
-        df_team_leader_board = (
-            df_team_respect_by_meeting_date.groupby(TEAM_NAME_COLUMN_NAME)
-            .agg(
-                AccumulatedRespect=pd.NamedAgg(
-                    column=ACCUMULATED_RESPECT_COLUMN_NAME, aggfunc="sum"
-                )
-            )
-            .sort_values(by=ACCUMULATED_RESPECT_COLUMN_NAME, ascending=False)
+        # Keep the denormalized DataFrame consistent with the tables. Rows that are
+        # not attendance rows (i.e. earlier rounds) earn no Respect, and the ledger
+        # entries for meetings a member did not attend are appended as new rows.
+        df = self.df.copy()
+        is_attendance = df[LEVEL_COLUMN_NAME].notna()
+        respect_values = np.full(len(df), np.nan)
+        respect_values[is_attendance.to_numpy()] = df_attendance[
+            RESPECT_COLUMN_NAME
+        ].to_numpy()
+        df[RESPECT_COLUMN_NAME] = respect_values
+        df_absent = df_respect[
+            ~pd.MultiIndex.from_frame(
+                df_respect[[MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]]
+            ).isin(attendance_index)
+        ].join(self.tables.df_meetings, on=MEETING_ID_COLUMN_NAME)
+        df = pd.concat([df, df_absent], ignore_index=True)
+
+        return self._from_tables(
+            df=df,
+            tables=tables,
+            changed_column_names=frozenset([RESPECT_COLUMN_NAME]),
         )
 
-        object.__setattr__(self, "df", df)
-        object.__setattr__(
-            self,
-            "df_member_summary_stats_by_member_id",
-            df_member_summary_stats_by_member_id,
+    def memory_report(
+        self, *, trace_construction: bool = False
+    ) -> fractal_governance.memory.MemoryReport:
+        """Return the memory used by the DataFrame, the Tables and the derived frames
+        of this Dataset (see `fractal_governance.memory.get_memory_report`)"""
+        return fractal_governance.memory.get_memory_report(
+            self, trace_construction=trace_construction
         )
+
+    def _from_tables(
+        self,
+        *,
+        df: pd.DataFrame,
+        tables: fractal_governance.tables.Tables,
+        changed_column_names: FrozenSet[str],
+    ) -> "Dataset":
+        """Internal helper method that returns a new Dataset for the given `df` and
+        `tables` that recomputes only the derived frames that depend on
+        `changed_column_names`, either directly or through another derived frame."""
+        dataset = object.__new__(type(self))
+        object.__setattr__(dataset, "df", fractal_governance.read_only.freeze(df))
+        object.__setattr__(dataset, "tables", tables)
+        object.__setattr__(dataset, "max_workers", self.max_workers)
+        changed_derived_frames: List[DerivedFrame] = []
+        changed_frame_names: Set[str] = set()
+        for derived_frame in DERIVED_FRAMES:
+            if derived_frame.column_names & changed_column_names or any(
+                frame_name in changed_frame_names
+                for frame_name in derived_frame.frame_names
+            ):
+                changed_derived_frames.append(derived_frame)
+                changed_frame_names.add(derived_frame.name)
+            else:
+                value = getattr(self, derived_frame.name)
+                object.__setattr__(dataset, derived_frame.name, value)
         object.__setattr__(
-            self,
-            "df_member_level_by_attendance_count",
-            df_member_level_by_attendance_count,
+            dataset,
+            "build_timings",
+            dataset._create_derived_frames(changed_derived_frames),
         )
+        return dataset
+
+    def _create_derived_frames(
+        self, derived_frames: Sequence["DerivedFrame"]
+    ) -> Dict[str, float]:
+        """Internal helper method that creates the given derived frames concurrently
+        in dependency order and returns the run time in seconds of each one."""
+
+        def create(derived_frame: DerivedFrame) -> None:
+            object.__setattr__(
+                self,
+                derived_frame.name,
+                fractal_governance.read_only.freeze(derived_frame.create(self)),
+            )
+
+        frame_names = {derived_frame.name for derived_frame in derived_frames}
+        nodes = [
+            fractal_governance.scheduler.Node(
+                name=derived_frame.name,
+                run=functools.partial(create, derived_frame),
+                dependencies=tuple(
+                    frame_name
+                    for frame_name in derived_frame.frame_names
+                    if frame_name in frame_names
+                ),
+            )
+            for derived_frame in derived_frames
+        ]
+        return fractal_governance.scheduler.run(
+            nodes, max_workers=self.max_workers
+        ).timings
+
+    def __attrs_post_init__(self) -> None:
+        start = time.perf_counter()
         object.__setattr__(
-            self,
-            "df_member_respect_new_and_returning_by_meeting",
-            _create_df_member_respect_new_and_returning_by_meeting(df),
+            self, "tables", fractal_governance.tables.Tables.from_dataframe(self.df)
         )
-        object.__setattr__(
-            self,
-            "df_member_attendance_new_and_returning_by_meeting",
-            _create_df_member_attendance_new_and_returning_by_meeting(df),
+        build_timings = {"tables": time.perf_counter() - start}
+        build_timings.update(self._create_derived_frames(DERIVED_FRAMES))
+        object.__setattr__(self, "build_timings", build_timings)
+
+
+def _to_frozenset(column_names: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(column_names)
+
+
+@attrs.frozen(kw_only=True)
+class DerivedFrame:
+    """A derived frame of a Dataset and the inputs it depends on
+
+    `column_names` are the columns of the Dataset's tables that `create` reads, and
+    `frame_names` are the other derived frames that `create` reads."""
+
+    name: str
+    create: Callable[[Dataset], pd.DataFrame] = attrs.field(repr=False)
+    column_names: FrozenSet[str] = attrs.field(converter=_to_frozenset)
+    frame_names: Tuple[str, ...] = ()
+
+
+def _create_df_member_summary_stats_by_member_id(dataset: Dataset) -> pd.DataFrame:
+    """Return a DataFrame of the attendance, Level and Respect summary statistics for
+    each member"""
+    tables = dataset.tables
+    df = (
+        tables.df_attendance.groupby(MEMBER_ID_COLUMN_NAME)
+        .agg(
+            AttendanceCount=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="count"),
+            AccumulatedLevel=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="sum"),
+            Mean=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="mean"),
+            StandardDeviation=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="std"),
         )
-        object.__setattr__(self, "df_member_leader_board", df_member_leader_board)
-        object.__setattr__(
-            self, "df_team_respect_by_meeting_date", df_team_respect_by_meeting_date
+        .reindex(tables.df_members.index)
+    )
+    df[[ATTENDANCE_COUNT_COLUMN_NAME, ACCUMULATED_LEVEL_COLUMN_NAME]] = (
+        df[[ATTENDANCE_COUNT_COLUMN_NAME, ACCUMULATED_LEVEL_COLUMN_NAME]]
+        .fillna(0)
+        .astype({ATTENDANCE_COUNT_COLUMN_NAME: int})
+    )
+    df.insert(
+        2,
+        ACCUMULATED_RESPECT_COLUMN_NAME,
+        tables.df_respect.groupby(MEMBER_ID_COLUMN_NAME)[RESPECT_COLUMN_NAME]
+        .sum()
+        .reindex(tables.df_members.index, fill_value=0),
+    )
+    return df
+
+
+def _create_df_member_level_by_attendance_count(dataset: Dataset) -> pd.DataFrame:
+    """Return a DataFrame of the combined Level statistics for each attendance count"""
+    return (
+        dataset.df_member_summary_stats_by_member_id.groupby(
+            ATTENDANCE_COUNT_COLUMN_NAME
         )
-        object.__setattr__(
-            self, "df_team_representation_by_date", df_team_representation_by_date
+        .apply(combined_statistics)
+        .reset_index()
+    )
+
+
+def _create_df_member_leader_board(dataset: Dataset) -> pd.DataFrame:
+    """Return a DataFrame of members sorted by Respect and then by attendance"""
+    df = dataset.df_member_summary_stats_by_member_id.join(
+        dataset.tables.df_members[[MEMBER_NAME_COLUMN_NAME]]
+    ).sort_values(
+        by=[
+            ACCUMULATED_RESPECT_COLUMN_NAME,
+            ATTENDANCE_COUNT_COLUMN_NAME,
+            MEMBER_ID_COLUMN_NAME,
+        ],
+        ascending=[False, False, True],
+    )
+    column_names = [
+        MEMBER_NAME_COLUMN_NAME,
+        ACCUMULATED_RESPECT_COLUMN_NAME,
+        ATTENDANCE_COUNT_COLUMN_NAME,
+    ]
+    df = df[column_names].reset_index()
+    df.index += 1
+    return df
+
+
+def _get_df_team_attendance(dataset: Dataset) -> pd.DataFrame:
+    """Return the rows of the attendance table for members of a team"""
+    df_attendance = dataset.tables.df_attendance
+    return df_attendance[df_attendance[TEAM_NAME_COLUMN_NAME].notna()]
+
+
+def _create_df_team_respect_by_meeting_date(dataset: Dataset) -> pd.DataFrame:
+    """Return a DataFrame of the Respect earned by each team at each meeting"""
+    return (
+        _get_df_team_attendance(dataset)
+        .groupby([TEAM_NAME_COLUMN_NAME, MEETING_DATE_COLUMN_NAME])
+        .agg(AccumulatedRespect=pd.NamedAgg(column=RESPECT_COLUMN_NAME, aggfunc="sum"))
+        .reset_index()
+    )
+
+
+def _create_df_team_representation_by_date(dataset: Dataset) -> pd.DataFrame:
+    """Return the fraction of attendees that are members of a team at each meeting"""
+    return (
+        _get_df_team_attendance(dataset).groupby(MEETING_DATE_COLUMN_NAME).size()
+        / dataset.tables.df_attendance.groupby(MEETING_DATE_COLUMN_NAME).size()
+    )
+
+
+def _create_df_team_leader_board(dataset: Dataset) -> pd.DataFrame:
+    """Return a DataFrame of teams sorted by Respect"""
+    return (
+        dataset.df_team_respect_by_meeting_date.groupby(TEAM_NAME_COLUMN_NAME)
+        .agg(
+            AccumulatedRespect=pd.NamedAgg(
+                column=ACCUMULATED_RESPECT_COLUMN_NAME, aggfunc="sum"
+            )
         )
-        object.__setattr__(self, "df_team_leader_board", df_team_leader_board)
+        .sort_values(by=ACCUMULATED_RESPECT_COLUMN_NAME, ascending=False)
+    )
+
+
+def _is_returning_member(df_attendance: pd.DataFrame) -> pd.Series:
+    """Return a boolean Series that is True for each row of the attendance table whose
+    member attended an earlier meeting"""
+    first_meeting_date = df_attendance.groupby(MEMBER_ID_COLUMN_NAME)[
+        MEETING_DATE_COLUMN_NAME
+    ].transform("min")
+    return df_attendance[MEETING_DATE_COLUMN_NAME] > first_meeting_date
 
 
 def _create_df_member_respect_new_and_returning_by_meeting(
-    df: pd.DataFrame,
+    dataset: Dataset,
 ) -> pd.DataFrame:
     """Return a DataFrame containing aggregate member attendance and respect for each
     meeting"""
-    meeting_dates: List[pd.Timestamp] = []
-    meeting_ids: List[int] = []
-    accumulated_respect_total: List[int] = []
-    accumulated_respect_new_member: List[int] = []
-    accumulated_respect_returning_member: List[int] = []
-    # The (MEETING_DATE_COLUMN_NAME, MEMBER_ID_COLUMN_NAME) tuple is degenerate after
-    # the addition of multiple rounds, which is the reason for the `notna` on
-    # LEVEL_COLUMN_NAME.
-    df = df[df[LEVEL_COLUMN_NAME].notna()]
-    for ((meeting_date, meeting_id), dfx) in df.groupby(
-        [MEETING_DATE_COLUMN_NAME, MEETING_ID_COLUMN_NAME]
-    ):
-        total_respect = dfx[RESPECT_COLUMN_NAME].sum()
-        accumulated_respect_total.append(total_respect)
-        df_previous = df[df[MEETING_DATE_COLUMN_NAME] < meeting_date]
-        df_filter = dfx[MEMBER_ID_COLUMN_NAME].isin(df_previous[MEMBER_ID_COLUMN_NAME])
-        df_new_member = dfx[~df_filter]
-        df_returning_member = dfx[df_filter]
-        new_member_respect = df_new_member[RESPECT_COLUMN_NAME].sum()
-        returning_member_respect = df_returning_member[RESPECT_COLUMN_NAME].sum()
-        meeting_dates.append(meeting_date)
-        meeting_ids.append(meeting_id)
-        accumulated_respect_new_member.append(new_member_respect)
-        accumulated_respect_returning_member.append(returning_member_respect)
-    return pd.DataFrame(
+    df_attendance = dataset.tables.df_attendance
+    is_returning_member = _is_returning_member(df_attendance)
+    respect = df_attendance[RESPECT_COLUMN_NAME]
+    df = pd.DataFrame(
         {
-            MEETING_DATE_COLUMN_NAME: meeting_dates,
-            MEETING_ID_COLUMN_NAME: meeting_ids,
-            ACCUMULATED_RESPECT_COLUMN_NAME: accumulated_respect_total,
-            ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME: accumulated_respect_new_member,
-            ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME: accumulated_respect_returning_member,  # noqa: E501
+            MEETING_DATE_COLUMN_NAME: df_attendance[MEETING_DATE_COLUMN_NAME],
+            MEETING_ID_COLUMN_NAME: df_attendance[MEETING_ID_COLUMN_NAME],
+            ACCUMULATED_RESPECT_COLUMN_NAME: respect,
+            ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME: respect.where(
+                ~is_returning_member, 0
+            ),
+            ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME: respect.where(
+                is_returning_member, 0
+            ),
         }
-    ).sort_index()
+    )
+    return (
+        df.groupby([MEETING_DATE_COLUMN_NAME, MEETING_ID_COLUMN_NAME])
+        .sum()
+        .reset_index()
+    )
 
 
 def _create_df_member_attendance_new_and_returning_by_meeting(
-    df: pd.DataFrame,
+    dataset: Dataset,
 ) -> pd.DataFrame:
     """Return a DataFrame containing aggregate member attendance for each meeting"""
-    meeting_dates = []
-    meeting_ids = []
-    new_member_counts = []
-    returning_member_counts = []
-    # The (MEETING_DATE_COLUMN_NAME, MEMBER_ID_COLUMN_NAME) tuple is degenerate after
-    # the addition of multiple rounds, which is the reason for the `notna` on
-    # LEVEL_COLUMN_NAME.
-    df = df[df[LEVEL_COLUMN_NAME].notna()]
-    for ((meeting_date, meeting_id), dfx) in df.groupby(
-        [MEETING_DATE_COLUMN_NAME, MEETING_ID_COLUMN_NAME]
-    ):
-        df_previous = df[df[MEETING_DATE_COLUMN_NAME] < meeting_date]
-        df_filter = dfx[MEMBER_ID_COLUMN_NAME].isin(df_previous[MEMBER_ID_COLUMN_NAME])
-        df_new_member = dfx[~df_filter]
-        df_returning_member = dfx[df_filter]
-        meeting_dates.append(meeting_date)
-        meeting_ids.append(meeting_id)
-        new_member_counts.append(len(df_new_member))
-        returning_member_counts.append(len(df_returning_member))
-    return pd.DataFrame(
+    df_attendance = dataset.tables.df_attendance
+    is_returning_member = _is_returning_member(df_attendance)
+    df = pd.DataFrame(
         {
-            MEETING_DATE_COLUMN_NAME: meeting_dates,
-            MEETING_ID_COLUMN_NAME: meeting_ids,
-            NEW_MEMBER_COUNT_COLUMN_NAME: new_member_counts,
-            RETURNING_MEMBER_COUNT_COLUMN_NAME: returning_member_counts,
+            MEETING_DATE_COLUMN_NAME: df_attendance[MEETING_DATE_COLUMN_NAME],
+            MEETING_ID_COLUMN_NAME: df_attendance[MEETING_ID_COLUMN_NAME],
+            NEW_MEMBER_COUNT_COLUMN_NAME: ~is_returning_member,
+            RETURNING_MEMBER_COUNT_COLUMN_NAME: is_returning_member,
         }
     )
+    return (
+        df.groupby([MEETING_DATE_COLUMN_NAME, MEETING_ID_COLUMN_NAME])
+        .sum()
+        .astype(int)
+        .reset_index()
+    )
+
+
+def _create_df_member_respect_new_and_returning_by_period(
+    dataset: Dataset,
+) -> pd.DataFrame:
+    """Return the total member Respect earned in each time period (see
+    `fractal_governance.rollups`)"""
+    df = dataset.df_member_respect_new_and_returning_by_meeting
+    return fractal_governance.rollups.roll_up(
+        df[
+            [
+                ACCUMULATED_RESPECT_COLUMN_NAME,
+                ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
+                ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
+            ]
+        ],
+        "sum",
+        meeting_dates=df[MEETING_DATE_COLUMN_NAME],
+    )
+
+
+def _create_df_member_attendance_new_and_returning_by_period(
+    dataset: Dataset,
+) -> pd.DataFrame:
+    """Return the mean member attendance per meeting in each time period (see
+    `fractal_governance.rollups`)"""
+    df = dataset.df_member_attendance_new_and_returning_by_meeting
+    return fractal_governance.rollups.roll_up(
+        df[[NEW_MEMBER_COUNT_COLUMN_NAME, RETURNING_MEMBER_COUNT_COLUMN_NAME]],
+        "mean",
+        meeting_dates=df[MEETING_DATE_COLUMN_NAME],
+    )
+
+
+def _create_df_team_respect_by_period(dataset: Dataset) -> pd.DataFrame:
+    """Return the Respect earned by each team in each time period (see
+    `fractal_governance.rollups`)"""
+    df = dataset.df_team_respect_by_meeting_date
+    return fractal_governance.rollups.roll_up(
+        df[[TEAM_NAME_COLUMN_NAME, ACCUMULATED_RESPECT_COLUMN_NAME]],
+        {ACCUMULATED_RESPECT_COLUMN_NAME: "sum"},
+        meeting_dates=df[MEETING_DATE_COLUMN_NAME],
+        group_by=[TEAM_NAME_COLUMN_NAME],
+    )
+
+
+def _create_df_team_representation_by_period(dataset: Dataset) -> pd.Series:
+    """Return the mean team representation per meeting in each time period (see
+    `fractal_governance.rollups`)"""
+    df = dataset.df_team_representation_by_date
+    return fractal_governance.rollups.roll_up(
+        df, "mean", meeting_dates=df.index.to_series()
+    )
+
+
+def _create_df_group_ranks(dataset: Dataset) -> pd.DataFrame:
+    """Return the members of each group of each round of each meeting and their
+    Levels (see `fractal_governance.group_cube`)"""
+    return fractal_governance.group_cube.create_group_ranks(dataset.tables)
+
+
+def _create_df_group_members(dataset: Dataset) -> pd.DataFrame:
+    """Return the members of each group of each round of each meeting, their Levels
+    and their Respect (see `fractal_governance.group_cube`)"""
+    return fractal_governance.group_cube.create_group_members(
+        dataset.tables, dataset.df_group_ranks
+    )
+
+
+def _create_df_group_cube(dataset: Dataset) -> pd.DataFrame:
+    """Return the size, Respect, team mix, new member share and Level dispersion of
+    each group of each round of each meeting (see `fractal_governance.group_cube`)"""
+    return fractal_governance.group_cube.create_group_cube(dataset.df_group_members)
+
+
+def _create_df_group_level_histogram(dataset: Dataset) -> pd.DataFrame:
+    """Return the number of members of each group of each round of each meeting
+    measured at each Level (see `fractal_governance.group_cube`)"""
+    return fractal_governance.group_cube.create_group_level_histogram(
+        dataset.df_group_ranks
+    )
+
+
+def _create_df_ranking_stability(dataset: Dataset) -> pd.DataFrame:
+    """Return the correlation of the Levels of each group's members with their
+    Levels at previous meetings (see `fractal_governance.ranking_stability`)"""
+    return fractal_governance.ranking_stability.create_ranking_stability(
+        dataset.df_group_ranks
+    )
+
+
+def _create_df_member_rank_volatility(dataset: Dataset) -> pd.DataFrame:
+    """Return the volatility of each member's rank among the attendees of the
+    meetings they attended (see `fractal_governance.ranking_stability`)"""
+    return fractal_governance.ranking_stability.create_member_rank_volatility(
+        dataset.df_group_ranks
+    )
 
 
 def combined_statistics(df: pd.DataFrame) -> pd.Series:
@@ -361,3 +658,133 @@ def combined_statistics(df: pd.DataFrame) -> pd.Series:
             STANDARD_DEVIATION_COLUMN_NAME: standard_deviation,
         }
     )
+
+
+# The derived frames of a Dataset in dependency order. Frames that do not depend on
+# each other are created concurrently.
+DERIVED_FRAMES: Tuple[DerivedFrame, ...] = (
+    DerivedFrame(
+        name="df_member_summary_stats_by_member_id",
+        create=_create_df_member_summary_stats_by_member_id,
+        column_names=[MEMBER_ID_COLUMN_NAME, LEVEL_COLUMN_NAME, RESPECT_COLUMN_NAME],
+    ),
+    DerivedFrame(
+        name="df_member_level_by_attendance_count",
+        create=_create_df_member_level_by_attendance_count,
+        column_names=[],
+        frame_names=("df_member_summary_stats_by_member_id",),
+    ),
+    DerivedFrame(
+        name="df_member_respect_new_and_returning_by_meeting",
+        create=_create_df_member_respect_new_and_returning_by_meeting,
+        column_names=[
+            MEMBER_ID_COLUMN_NAME,
+            MEETING_ID_COLUMN_NAME,
+            MEETING_DATE_COLUMN_NAME,
+            RESPECT_COLUMN_NAME,
+        ],
+    ),
+    DerivedFrame(
+        name="df_member_attendance_new_and_returning_by_meeting",
+        create=_create_df_member_attendance_new_and_returning_by_meeting,
+        column_names=[
+            MEMBER_ID_COLUMN_NAME,
+            MEETING_ID_COLUMN_NAME,
+            MEETING_DATE_COLUMN_NAME,
+        ],
+    ),
+    DerivedFrame(
+        name="df_member_leader_board",
+        create=_create_df_member_leader_board,
+        column_names=[MEMBER_NAME_COLUMN_NAME],
+        frame_names=("df_member_summary_stats_by_member_id",),
+    ),
+    DerivedFrame(
+        name="df_team_respect_by_meeting_date",
+        create=_create_df_team_respect_by_meeting_date,
+        column_names=[
+            TEAM_NAME_COLUMN_NAME,
+            MEETING_DATE_COLUMN_NAME,
+            RESPECT_COLUMN_NAME,
+        ],
+    ),
+    DerivedFrame(
+        name="df_team_representation_by_date",
+        create=_create_df_team_representation_by_date,
+        column_names=[TEAM_NAME_COLUMN_NAME, MEETING_DATE_COLUMN_NAME],
+    ),
+    DerivedFrame(
+        name="df_team_leader_board",
+        create=_create_df_team_leader_board,
+        column_names=[],
+        frame_names=("df_team_respect_by_meeting_date",),
+    ),
+    DerivedFrame(
+        name="df_member_respect_new_and_returning_by_period",
+        create=_create_df_member_respect_new_and_returning_by_period,
+        column_names=[],
+        frame_names=("df_member_respect_new_and_returning_by_meeting",),
+    ),
+    DerivedFrame(
+        name="df_member_attendance_new_and_returning_by_period",
+        create=_create_df_member_attendance_new_and_returning_by_period,
+        column_names=[],
+        frame_names=("df_member_attendance_new_and_returning_by_meeting",),
+    ),
+    DerivedFrame(
+        name="df_team_respect_by_period",
+        create=_create_df_team_respect_by_period,
+        column_names=[],
+        frame_names=("df_team_respect_by_meeting_date",),
+    ),
+    DerivedFrame(
+        name="df_team_representation_by_period",
+        create=_create_df_team_representation_by_period,
+        column_names=[],
+        frame_names=("df_team_representation_by_date",),
+    ),
+    DerivedFrame(
+        name="df_group_ranks",
+        create=_create_df_group_ranks,
+        column_names=[
+            MEMBER_ID_COLUMN_NAME,
+            MEETING_ID_COLUMN_NAME,
+            MEETING_DATE_COLUMN_NAME,
+            GROUP_COLUMN_NAME,
+            ROUND_COLUMN_NAME,
+            LEVEL_COLUMN_NAME,
+            TEAM_ID_COLUMN_NAME,
+            TEAM_NAME_COLUMN_NAME,
+        ],
+    ),
+    DerivedFrame(
+        name="df_group_members",
+        create=_create_df_group_members,
+        column_names=[RESPECT_COLUMN_NAME],
+        frame_names=("df_group_ranks",),
+    ),
+    DerivedFrame(
+        name="df_group_cube",
+        create=_create_df_group_cube,
+        column_names=[],
+        frame_names=("df_group_members",),
+    ),
+    DerivedFrame(
+        name="df_group_level_histogram",
+        create=_create_df_group_level_histogram,
+        column_names=[],
+        frame_names=("df_group_ranks",),
+    ),
+    DerivedFrame(
+        name="df_ranking_stability",
+        create=_create_df_ranking_stability,
+        column_names=[],
+        frame_names=("df_group_ranks",),
+    ),
+    DerivedFrame(
+        name="df_member_rank_volatility",
+        create=_create_df_member_rank_volatility,
+        column_names=[],
+        frame_names=("df_group_ranks",),
+    ),
+)
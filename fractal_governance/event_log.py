@@ -0,0 +1,663 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""An append-only log of the events that change a Fractal's dataset
+
+A Fractal's .csv files are exports of spreadsheets that are edited in place, and the
+late consensus penalties and the signature status of the members are applied
+retroactively by `fractal_governance.util.read_csv`. An EventLog records every
+change to the .csv files as an event instead, so that it is known what changed
+between two exports and any earlier state of the dataset can be reconstructed:
+
+- `MeetingResults` sets the weekly measurements of a meeting.
+- `LateConsensusPenalty` applies or revokes a late consensus penalty.
+- `AccountStatusChange` sets or removes the account status of a member.
+- `TeamChange` sets or removes a team.
+
+Each event is a line of the JSON Lines file `events.jsonl` in the EventLog's
+directory, numbered from 1 by its `sequence`. `EventLog.record_csv` appends the
+events that turn the last state of the log into the state of the given .csv files
+(see `diff_frames`).
+
+A checkpoint snapshots the state of the log after an event along with the derived
+aggregates of that state (see `create_aggregates`): the leaderboards, the Respect
+ledger, and the Addendum 1 weighted means and token ledger. `EventLog.replay` loads
+the last checkpoint at or before the requested event and replays only the events
+after it. If there are such events then the aggregates are calculated again from
+the checkpointed ones: the Addendum 1 weighted means, which are by far the most
+expensive aggregate, are only calculated for the meetings at or after the earliest
+meeting that the events changed, and for every meeting of the members whose account
+status or team changed (see `get_weighted_means_before`). A checkpoint is written
+by `EventLog.checkpoint`, and by `EventLog.append` once `checkpoint_interval` events
+were appended since the last checkpoint.
+"""
+
+import datetime
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import attrs
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.result_cache
+import fractal_governance.util
+from fractal_governance.addendum_1.dataset import Addendum1Dataset
+from fractal_governance.addendum_1.weighted_means import WeightedMeans
+from fractal_governance.constants import (
+    GROUP_COLUMN_NAME,
+    HIVE_ACCOUNT_NAME_COLUMN_NAME,
+    INDEX_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEMBER_NAME_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    SIGNATURE_ON_FILE_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+    TOKENS_INDIVIDUAL,
+    TOKENS_TEAM,
+)
+
+EVENT_LOG_FILE_NAME = "events.jsonl"
+
+CHECKPOINTS_DIRECTORY_NAME = "checkpoints"
+
+DEFAULT_CHECKPOINT_INTERVAL = 100
+
+# A record is a row of one of a Fractal's .csv files.
+Record = Dict[str, Any]
+
+# The columns of each of a Fractal's .csv files, which are the columns of a frame
+# without any records.
+WEEKLY_MEASUREMENTS_COLUMN_NAMES = (
+    INDEX_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+)
+ACCOUNT_STATUS_COLUMN_NAMES = (
+    INDEX_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEMBER_NAME_COLUMN_NAME,
+    HIVE_ACCOUNT_NAME_COLUMN_NAME,
+    SIGNATURE_ON_FILE_COLUMN_NAME,
+)
+LATE_CONSENSUS_COLUMN_NAMES = (
+    INDEX_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+)
+TEAMS_COLUMN_NAMES = (INDEX_COLUMN_NAME, TEAM_ID_COLUMN_NAME, TEAM_NAME_COLUMN_NAME)
+
+_FRAME_NAMES = (
+    "df_weekly_measurements",
+    "df_account_status",
+    "df_late_consensus",
+    "df_teams",
+)
+_SEQUENCE_KEY = "sequence"
+_OFFSET_KEY = "offset"
+
+
+@attrs.frozen
+class MeetingResults:
+    """Set the weekly measurements of the meeting `meeting_id` to `records`, or
+    remove the meeting if there are no records"""
+
+    meeting_id: int
+    records: Tuple[Record, ...] = attrs.field(converter=tuple)
+
+
+@attrs.frozen
+class LateConsensusPenalty:
+    """Apply the late consensus penalty `record` to a member for a meeting, or revoke
+    it if `record` is None"""
+
+    member_id: str
+    meeting_id: int
+    record: Optional[Record]
+
+
+@attrs.frozen
+class AccountStatusChange:
+    """Set the account status of a member to `record`, or remove it if `record` is
+    None"""
+
+    member_id: str
+    record: Optional[Record]
+
+
+@attrs.frozen
+class TeamChange:
+    """Set a team to `record`, or remove it if `record` is None"""
+
+    team_id: int
+    record: Optional[Record]
+
+
+Event = Union[MeetingResults, LateConsensusPenalty, AccountStatusChange, TeamChange]
+
+_EVENT_CLASS_BY_NAME = {
+    event_class.__name__: event_class
+    for event_class in [
+        MeetingResults,
+        LateConsensusPenalty,
+        AccountStatusChange,
+        TeamChange,
+    ]
+}
+
+
+@attrs.frozen
+class LoggedEvent:
+    """An event of an EventLog with its sequence number and the time it was
+    recorded"""
+
+    sequence: int
+    recorded_at: datetime.datetime
+    event: Event
+
+    def to_json(self) -> str:
+        """Return the line of the event log for this event"""
+        return json.dumps(
+            {
+                "sequence": self.sequence,
+                "recorded_at": self.recorded_at.isoformat(),
+                "type": type(self.event).__name__,
+                **attrs.asdict(self.event),
+            }
+        )
+
+    @classmethod
+    def from_json(cls, line: str) -> "LoggedEvent":
+        """Return the LoggedEvent of the given line of the event log"""
+        fields = json.loads(line)
+        sequence = fields.pop("sequence")
+        recorded_at = datetime.datetime.fromisoformat(fields.pop("recorded_at"))
+        event_class = _EVENT_CLASS_BY_NAME[fields.pop("type")]
+        return cls(
+            sequence=sequence, recorded_at=recorded_at, event=event_class(**fields)
+        )
+
+
+def _to_records(df: pd.DataFrame) -> List[Record]:
+    """Internal helper method that returns the rows of the given DataFrame as records
+    that can be represented in JSON"""
+    return [
+        {name: None if pd.isna(value) else value for name, value in record.items()}
+        for record in df.to_dict("records")
+    ]
+
+
+def _to_frame(records: Iterable[Record], column_names: Tuple[str, ...]) -> pd.DataFrame:
+    """Internal helper method that is the inverse of `_to_records`"""
+    records = list(records)
+    if not records:
+        return pd.DataFrame(columns=list(column_names))
+    df = pd.DataFrame.from_records(records)
+    # A column without any values is read from a .csv file as a column of floats.
+    for column_name in df:
+        if df[column_name].isna().all():
+            df[column_name] = df[column_name].astype(float)
+    return df
+
+
+def _sorted_by_index(records: Iterable[Record]) -> List[Record]:
+    return sorted(records, key=lambda record: record.get(INDEX_COLUMN_NAME, 0))
+
+
+@attrs.define
+class _Records:
+    """The records of a Fractal's .csv files keyed by the entities that the events
+    change"""
+
+    records_by_meeting_id: Dict[int, Tuple[Record, ...]] = attrs.Factory(dict)
+    account_status_by_member_id: Dict[str, Record] = attrs.Factory(dict)
+    late_consensus_by_key: Dict[Tuple[str, int], Record] = attrs.Factory(dict)
+    team_by_team_id: Dict[int, Record] = attrs.Factory(dict)
+
+    @classmethod
+    def from_frames(
+        cls, frames: fractal_governance.util.FractalDatasetFrames
+    ) -> "_Records":
+        records = cls()
+        records_by_meeting_id: Dict[int, List[Record]] = dict()
+        for record in _to_records(frames.df_weekly_measurements):
+            records_by_meeting_id.setdefault(record[MEETING_ID_COLUMN_NAME], []).append(
+                record
+            )
+        records.records_by_meeting_id = {
+            meeting_id: tuple(meeting_records)
+            for meeting_id, meeting_records in records_by_meeting_id.items()
+        }
+        for record in _to_records(frames.df_account_status):
+            records.account_status_by_member_id[record[MEMBER_ID_COLUMN_NAME]] = record
+        for record in _to_records(frames.df_late_consensus):
+            key = (record[MEMBER_ID_COLUMN_NAME], record[MEETING_ID_COLUMN_NAME])
+            records.late_consensus_by_key[key] = record
+        for record in _to_records(frames.df_teams):
+            records.team_by_team_id[record[TEAM_ID_COLUMN_NAME]] = record
+        return records
+
+    def to_frames(self) -> fractal_governance.util.FractalDatasetFrames:
+        # The weekly measurements are in the order of their meetings, as they are
+        # read by `fractal_governance.util.read_weekly_measurements`.
+        return fractal_governance.util.FractalDatasetFrames(
+            df_weekly_measurements=_to_frame(
+                (
+                    record
+                    for meeting_id in sorted(self.records_by_meeting_id)
+                    for record in self.records_by_meeting_id[meeting_id]
+                ),
+                WEEKLY_MEASUREMENTS_COLUMN_NAMES,
+            ),
+            df_account_status=_to_frame(
+                _sorted_by_index(self.account_status_by_member_id.values()),
+                ACCOUNT_STATUS_COLUMN_NAMES,
+            ),
+            df_late_consensus=_to_frame(
+                _sorted_by_index(self.late_consensus_by_key.values()),
+                LATE_CONSENSUS_COLUMN_NAMES,
+            ),
+            df_teams=_to_frame(
+                _sorted_by_index(self.team_by_team_id.values()), TEAMS_COLUMN_NAMES
+            ),
+        )
+
+    def apply(self, event: Event) -> None:
+        if isinstance(event, MeetingResults):
+            _set(self.records_by_meeting_id, event.meeting_id, event.records or None)
+        elif isinstance(event, LateConsensusPenalty):
+            _set(
+                self.late_consensus_by_key,
+                (event.member_id, event.meeting_id),
+                event.record,
+            )
+        elif isinstance(event, AccountStatusChange):
+            _set(self.account_status_by_member_id, event.member_id, event.record)
+        elif isinstance(event, TeamChange):
+            _set(self.team_by_team_id, event.team_id, event.record)
+        else:
+            raise TypeError(f"unknown event {event!r}")
+
+
+def _set(values: Dict[Any, Any], key: Any, value: Any) -> None:
+    if value is None:
+        values.pop(key, None)
+    else:
+        values[key] = value
+
+
+def _diff(
+    old_values: Dict[Any, Any], new_values: Dict[Any, Any]
+) -> Iterator[Tuple[Any, Any]]:
+    """Internal helper method that yields the key and new value of each value that
+    was added or changed, followed by the key and None of each value that was
+    removed"""
+    for key, value in new_values.items():
+        if old_values.get(key) != value:
+            yield key, value
+    for key in old_values:
+        if key not in new_values:
+            yield key, None
+
+
+def diff_frames(
+    old_frames: fractal_governance.util.FractalDatasetFrames,
+    new_frames: fractal_governance.util.FractalDatasetFrames,
+) -> List[Event]:
+    """Return the events that turn the given old frames of a Fractal's .csv files
+    into the new ones"""
+    old_records = _Records.from_frames(old_frames)
+    new_records = _Records.from_frames(new_frames)
+    events: List[Event] = []
+    for team_id, record in _diff(
+        old_records.team_by_team_id, new_records.team_by_team_id
+    ):
+        events.append(TeamChange(team_id=team_id, record=record))
+    for member_id, record in _diff(
+        old_records.account_status_by_member_id,
+        new_records.account_status_by_member_id,
+    ):
+        events.append(AccountStatusChange(member_id=member_id, record=record))
+    for meeting_id, records in _diff(
+        old_records.records_by_meeting_id, new_records.records_by_meeting_id
+    ):
+        events.append(MeetingResults(meeting_id=meeting_id, records=records or ()))
+    for (member_id, meeting_id), record in _diff(
+        old_records.late_consensus_by_key, new_records.late_consensus_by_key
+    ):
+        events.append(
+            LateConsensusPenalty(
+                member_id=member_id, meeting_id=meeting_id, record=record
+            )
+        )
+    return events
+
+
+def get_weighted_means_before(
+    df_weighted_means: pd.DataFrame, events: Iterable[Event]
+) -> pd.DataFrame:
+    """Return the rows of the given Addendum 1 weighted means, without their token
+    columns, that the given later events did not change
+
+    A member's weighted means at a meeting only depend on the levels of its earlier
+    meetings, on its account status and on its teams. Late consensus penalties only
+    change Respect, so they change no weighted means."""
+    first_changed_meeting_id = math.inf
+    changed_member_ids = set()
+    changed_team_ids = set()
+    for event in events:
+        if isinstance(event, MeetingResults):
+            first_changed_meeting_id = min(first_changed_meeting_id, event.meeting_id)
+        elif isinstance(event, AccountStatusChange):
+            changed_member_ids.add(event.member_id)
+        elif isinstance(event, TeamChange):
+            changed_team_ids.add(event.team_id)
+    changed_member_ids.update(
+        df_weighted_means.loc[
+            df_weighted_means[TEAM_ID_COLUMN_NAME].isin(changed_team_ids),
+            MEMBER_ID_COLUMN_NAME,
+        ]
+    )
+    return df_weighted_means.loc[
+        (df_weighted_means[MEETING_ID_COLUMN_NAME] < first_changed_meeting_id)
+        & ~df_weighted_means[MEMBER_ID_COLUMN_NAME].isin(changed_member_ids)
+    ].drop(columns=[TOKENS_INDIVIDUAL, TOKENS_TEAM])
+
+
+def create_aggregates(
+    dataset: fractal_governance.dataset.Dataset,
+    *,
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = None,
+    df_weighted_means_before: Optional[pd.DataFrame] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Return the derived aggregates of the given Dataset that a checkpoint
+    snapshots, keyed by name
+
+    If `df_weighted_means_before` is given then only the weighted means that are not
+    in it are calculated (see `get_weighted_means_before`)."""
+    addendum_1_dataset = Addendum1Dataset(
+        dataset,
+        weighted_means=WeightedMeans(
+            dataset, result_cache=result_cache, df_before=df_weighted_means_before
+        ),
+        result_cache=result_cache,
+    )
+    return {
+        "df_member_leader_board": dataset.df_member_leader_board,
+        "df_member_summary_stats_by_member_id": (
+            dataset.df_member_summary_stats_by_member_id
+        ),
+        "df_team_leader_board": dataset.df_team_leader_board,
+        "df_respect": dataset.tables.df_respect,
+        "df_weighted_means": addendum_1_dataset.df_weighted_means,
+        "df_token_distribution_per_meeting": (
+            addendum_1_dataset.df_token_distribution_per_meeting
+        ),
+        "df_token_supply": addendum_1_dataset.df_token_supply,
+    }
+
+
+@attrs.frozen
+class EventLogState:
+    """The state of an EventLog after the event `sequence`
+
+    `frames` are the frames of the Fractal's .csv files, `df` is the DataFrame that
+    `fractal_governance.util.read_csv` would return for them, and `aggregates` are
+    their derived aggregates (see `create_aggregates`)."""
+
+    sequence: int
+
+    frames: fractal_governance.util.FractalDatasetFrames = attrs.field(repr=False)
+
+    df: pd.DataFrame = attrs.field(repr=False)
+
+    aggregates: Dict[str, pd.DataFrame] = attrs.field(repr=False)
+
+    is_from_checkpoint: bool = attrs.field(default=False)
+
+
+@attrs.frozen
+class _Position:
+    """The sequence of the last event read from an event log and the byte offset of
+    the event after it"""
+
+    sequence: int = 0
+    offset: int = 0
+
+
+@attrs.frozen
+class EventLog:
+    """An append-only log of the events that change a Fractal's dataset, stored in
+    `directory`
+
+    The DataFrame and aggregates of the log's states are calculated with the given
+    `fractal_calendar` and `fractal_rules`. If `result_cache` is given then it is
+    used for the Addendum 1 aggregates (see `create_aggregates`). Only one process
+    may append to an EventLog at a time."""
+
+    directory: Path = attrs.field(converter=Path)
+
+    fractal_calendar: fractal_governance.util.FractalCalendar = attrs.field(
+        factory=fractal_governance.util.FractalCalendar, kw_only=True
+    )
+
+    fractal_rules: fractal_governance.util.FractalRules = attrs.field(
+        factory=fractal_governance.util.FractalRules, kw_only=True
+    )
+
+    checkpoint_interval: int = attrs.field(
+        default=DEFAULT_CHECKPOINT_INTERVAL, kw_only=True
+    )
+
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    @property
+    def path(self) -> Path:
+        """The path of the event log's JSON Lines file"""
+        return self.directory / EVENT_LOG_FILE_NAME
+
+    def _get_checkpoint_path(self, sequence: int) -> Path:
+        return self.directory / CHECKPOINTS_DIRECTORY_NAME / f"{sequence:012d}"
+
+    def get_checkpoint_sequences(self) -> List[int]:
+        """Return the sequences of the events after which a checkpoint was written"""
+        directory = self.directory / CHECKPOINTS_DIRECTORY_NAME
+        if not directory.is_dir():
+            return []
+        return sorted(
+            int(path.name) for path in directory.iterdir() if path.name.isdigit()
+        )
+
+    def _read_events(
+        self, position: _Position, stop: Optional[int] = None
+    ) -> Iterator[Tuple[LoggedEvent, _Position]]:
+        """Internal helper method that yields the events after the given position up
+        to and including the event `stop`, each with the position after it
+
+        An incomplete last line, e.g. of an append that was interrupted, is
+        ignored."""
+        if not self.path.is_file():
+            return
+        with open(self.path, "rb") as file:
+            file.seek(position.offset)
+            sequence = position.sequence
+            for line in file:
+                if stop is not None and sequence >= stop:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                logged_event = LoggedEvent.from_json(line.decode())
+                sequence += 1
+                if logged_event.sequence != sequence:
+                    raise ValueError(
+                        f"event {logged_event.sequence} of {self.path} is out of "
+                        f"sequence, expected {sequence}"
+                    )
+                yield logged_event, _Position(sequence, file.tell())
+
+    def read_events(
+        self, start: int = 1, stop: Optional[int] = None
+    ) -> Iterator[LoggedEvent]:
+        """Yield the events from the event `start` up to and including the event
+        `stop`"""
+        for logged_event, _ in self._read_events(_Position(), stop):
+            if logged_event.sequence >= start:
+                yield logged_event
+
+    def _restore(
+        self, sequence: Optional[int] = None
+    ) -> Tuple[_Records, _Position, Optional[Dict[str, pd.DataFrame]], List[Event]]:
+        """Internal helper method that returns the records of the state after the
+        event `sequence`, or after the last event if it is None, along with the
+        aggregates of the last checkpoint before it, if any, and the events replayed
+        after that checkpoint"""
+        checkpoint_sequences = [
+            checkpoint_sequence
+            for checkpoint_sequence in self.get_checkpoint_sequences()
+            if sequence is None or checkpoint_sequence <= sequence
+        ]
+        records = _Records()
+        position = _Position()
+        aggregates: Optional[Dict[str, pd.DataFrame]] = None
+        if checkpoint_sequences:
+            result = fractal_governance.result_cache.read_result(
+                self._get_checkpoint_path(checkpoint_sequences[-1])
+            )
+            records = _Records.from_frames(
+                fractal_governance.util.FractalDatasetFrames(
+                    **{name: result.pop(name) for name in _FRAME_NAMES}
+                )
+            )
+            position = _Position(result.pop(_SEQUENCE_KEY), result.pop(_OFFSET_KEY))
+            aggregates = result
+        events = []
+        for logged_event, position in self._read_events(position, sequence):
+            records.apply(logged_event.event)
+            events.append(logged_event.event)
+        if sequence is not None and position.sequence < sequence:
+            raise ValueError(
+                f"sequence={sequence} is after the last event {position.sequence}"
+            )
+        return records, position, aggregates, events
+
+    def get_sequence(self) -> int:
+        """Return the sequence of the last event"""
+        _, position, _, _ = self._restore()
+        return position.sequence
+
+    def _create_state(
+        self,
+        records: _Records,
+        position: _Position,
+        aggregates: Optional[Dict[str, pd.DataFrame]],
+        events: List[Event],
+    ) -> EventLogState:
+        frames = records.to_frames()
+        df = frames.create_dataframe(
+            fractal_calendar=self.fractal_calendar, fractal_rules=self.fractal_rules
+        )
+        is_from_checkpoint = aggregates is not None and not events
+        if not is_from_checkpoint:
+            aggregates = create_aggregates(
+                fractal_governance.dataset.Dataset(df=df),
+                result_cache=self.result_cache,
+                df_weighted_means_before=None
+                if aggregates is None
+                else get_weighted_means_before(aggregates["df_weighted_means"], events),
+            )
+        return EventLogState(
+            sequence=position.sequence,
+            frames=frames,
+            df=df,
+            aggregates=aggregates,  # type: ignore
+            is_from_checkpoint=is_from_checkpoint,
+        )
+
+    def replay(self, sequence: Optional[int] = None) -> EventLogState:
+        """Return the state after the event `sequence`, or after the last event if it
+        is None
+
+        The state is restored from the last checkpoint at or before the event, and
+        only the events after the checkpoint are replayed."""
+        return self._create_state(*self._restore(sequence))
+
+    def checkpoint(self, sequence: Optional[int] = None) -> EventLogState:
+        """Write a checkpoint of the state after the event `sequence`, or after the
+        last event if it is None, and return that state"""
+        records, position, aggregates, events = self._restore(sequence)
+        state = self._create_state(records, position, aggregates, events)
+        path = self._get_checkpoint_path(position.sequence)
+        if not path.exists():
+            fractal_governance.result_cache.write_result(
+                path,
+                {
+                    **{name: getattr(state.frames, name) for name in _FRAME_NAMES},
+                    **state.aggregates,
+                    _SEQUENCE_KEY: position.sequence,
+                    _OFFSET_KEY: position.offset,
+                },
+            )
+        return state
+
+    def append(self, events: Iterable[Event]) -> List[LoggedEvent]:
+        """Append the given events to the log and return them with their sequence
+        numbers
+
+        A checkpoint is written once `checkpoint_interval` events were appended
+        since the last checkpoint."""
+        _, position, _, _ = self._restore()
+        recorded_at = datetime.datetime.now(datetime.timezone.utc)
+        logged_events = [
+            LoggedEvent(
+                sequence=position.sequence + i, recorded_at=recorded_at, event=event
+            )
+            for i, event in enumerate(events, start=1)
+        ]
+        if not logged_events:
+            return logged_events
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as file:
+            # Drop an incomplete last line, e.g. of an append that was interrupted.
+            file.truncate(position.offset)
+            file.write(
+                "".join(
+                    f"{logged_event.to_json()}\n" for logged_event in logged_events
+                ).encode()
+            )
+            file.flush()
+            os.fsync(file.fileno())
+        checkpoint_sequences = self.get_checkpoint_sequences()
+        last_checkpoint_sequence = (
+            checkpoint_sequences[-1] if checkpoint_sequences else 0
+        )
+        if (
+            logged_events[-1].sequence - last_checkpoint_sequence
+            >= self.checkpoint_interval
+        ):
+            self.checkpoint()
+        return logged_events
+
+    def record_csv(
+        self,
+        fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    ) -> List[LoggedEvent]:
+        """Append the events that turn the last state of the log into the state of
+        the given Fractal's .csv files, and return them"""
+        records, _, _, _ = self._restore()
+        events = diff_frames(
+            records.to_frames(),
+            fractal_governance.util.FractalDatasetFrames.from_csv(
+                fractal_dataset_csv_paths
+            ),
+        )
+        return self.append(events)
@@ -0,0 +1,317 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A federation of Fractals with cross-fractal leaderboards and meeting summaries
+
+Each Fractal of a Federation has its own .csv files, FractalCalendar and
+FractalRules. The Dataset of each Fractal is calculated on a process pool and reduced
+to its FractalAggregates, which are small and mergeable: member totals, team totals
+and per-meeting Level statistics. The cross-fractal leaderboards and meeting
+summaries are merged from the FractalAggregates alone, without concatenating the raw
+rows of the Fractals, so a Fractal can be added to a Federation by merging its
+FractalAggregates with the ones already calculated.
+"""
+
+import concurrent.futures
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import attrs
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.progress
+import fractal_governance.read_only
+import fractal_governance.util
+from fractal_governance.constants import (
+    ACCUMULATED_RESPECT_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    FRACTAL_COUNT_COLUMN_NAME,
+    FRACTAL_NAME_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    MEAN_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEMBER_NAME_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    STANDARD_DEVIATION_COLUMN_NAME,
+)
+
+
+@attrs.frozen
+class Fractal:
+    """A Fractal of a Federation, identified by its unique `name`"""
+
+    name: str
+
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = (
+        attrs.field(factory=fractal_governance.util.FractalDatasetCSVPaths)
+    )
+
+    fractal_calendar: fractal_governance.util.FractalCalendar = attrs.field(
+        factory=fractal_governance.util.FractalCalendar
+    )
+
+    fractal_rules: fractal_governance.util.FractalRules = attrs.field(
+        factory=fractal_governance.util.FractalRules
+    )
+
+    def create_dataset(self) -> fractal_governance.dataset.Dataset:
+        """Return the Dataset of this Fractal"""
+        return fractal_governance.dataset.Dataset.from_csv(
+            self.fractal_dataset_csv_paths,
+            fractal_calendar=self.fractal_calendar,
+            fractal_rules=self.fractal_rules,
+        )
+
+
+@attrs.frozen
+class FractalAggregates:
+    """The mergeable aggregates of one Fractal's Dataset
+
+    - `df_members` is indexed by `MemberID` and has each member's accumulated Respect,
+      attendance count and name.
+    - `df_teams` is the Fractal's team leaderboard indexed by `TeamName`.
+    - `df_meetings` is indexed by `MeetingDate` and has each meeting's attendance
+      count, the mean and standard deviation of its Levels, and its Respect.
+    """
+
+    fractal_name: str
+
+    df_members: pd.DataFrame = attrs.field(repr=False)
+
+    df_teams: pd.DataFrame = attrs.field(repr=False)
+
+    df_meetings: pd.DataFrame = attrs.field(repr=False)
+
+    @classmethod
+    def from_dataset(
+        cls, fractal_name: str, dataset: fractal_governance.dataset.Dataset
+    ) -> "FractalAggregates":
+        """Return the FractalAggregates of the given Fractal's Dataset"""
+        df_members = dataset.df_member_summary_stats_by_member_id[
+            [
+                ACCUMULATED_RESPECT_COLUMN_NAME,
+                ATTENDANCE_COUNT_COLUMN_NAME,
+            ]
+        ].join(dataset.tables.df_members[[MEMBER_NAME_COLUMN_NAME]])
+        df_meetings = dataset.tables.df_attendance.groupby(
+            MEETING_DATE_COLUMN_NAME
+        ).agg(
+            AttendanceCount=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="count"),
+            Mean=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="mean"),
+            StandardDeviation=pd.NamedAgg(column=LEVEL_COLUMN_NAME, aggfunc="std"),
+            Respect=pd.NamedAgg(column=RESPECT_COLUMN_NAME, aggfunc="sum"),
+        )
+        # The aggregates are sent between processes, so they are plain DataFrames.
+        return cls(
+            fractal_name=fractal_name,
+            df_members=pd.DataFrame(df_members),
+            df_teams=pd.DataFrame(dataset.df_team_leader_board),
+            df_meetings=pd.DataFrame(df_meetings),
+        )
+
+
+def _create_fractal_aggregates(fractal: Fractal) -> FractalAggregates:
+    return FractalAggregates.from_dataset(fractal.name, fractal.create_dataset())
+
+
+def _concat(
+    fractal_aggregates: Sequence[FractalAggregates], frame_name: str
+) -> pd.DataFrame:
+    """Internal helper method that concatenates the named frame of each of the given
+    FractalAggregates, indexed by the fractal name and then by the frame's index"""
+    return pd.concat(
+        [getattr(aggregates, frame_name) for aggregates in fractal_aggregates],
+        keys=[aggregates.fractal_name for aggregates in fractal_aggregates],
+        names=[FRACTAL_NAME_COLUMN_NAME],
+    )
+
+
+def merge_member_leader_boards(
+    fractal_aggregates: Sequence[FractalAggregates],
+) -> pd.DataFrame:
+    """Return the cross-fractal member leaderboard, sorted by Respect and then by
+    attendance, of the given FractalAggregates
+
+    A member's Respect and attendance are summed over the Fractals they are a member
+    of, and `FractalCount` is the number of those Fractals."""
+    df = (
+        _concat(fractal_aggregates, "df_members")
+        .groupby(MEMBER_ID_COLUMN_NAME)
+        .agg(
+            Name=pd.NamedAgg(column=MEMBER_NAME_COLUMN_NAME, aggfunc="first"),
+            AccumulatedRespect=pd.NamedAgg(
+                column=ACCUMULATED_RESPECT_COLUMN_NAME, aggfunc="sum"
+            ),
+            AttendanceCount=pd.NamedAgg(
+                column=ATTENDANCE_COUNT_COLUMN_NAME, aggfunc="sum"
+            ),
+            FractalCount=pd.NamedAgg(
+                column=ATTENDANCE_COUNT_COLUMN_NAME, aggfunc="size"
+            ),
+        )
+        .sort_values(
+            by=[
+                ACCUMULATED_RESPECT_COLUMN_NAME,
+                ATTENDANCE_COUNT_COLUMN_NAME,
+                MEMBER_ID_COLUMN_NAME,
+            ],
+            ascending=[False, False, True],
+        )
+        .reset_index()
+    )
+    df.index += 1
+    return df
+
+
+def merge_team_leader_boards(
+    fractal_aggregates: Sequence[FractalAggregates],
+) -> pd.DataFrame:
+    """Return the cross-fractal team leaderboard, indexed by fractal name and team
+    name and sorted by Respect, of the given FractalAggregates"""
+    return _concat(fractal_aggregates, "df_teams").sort_values(
+        by=ACCUMULATED_RESPECT_COLUMN_NAME, ascending=False, kind="mergesort"
+    )
+
+
+def _merge_meeting_summaries(df: pd.DataFrame) -> pd.Series:
+    statistics = fractal_governance.dataset.combined_statistics(
+        df[df[ATTENDANCE_COUNT_COLUMN_NAME] > 0]
+    )
+    return pd.Series(
+        {
+            FRACTAL_COUNT_COLUMN_NAME: len(df),
+            ATTENDANCE_COUNT_COLUMN_NAME: df[ATTENDANCE_COUNT_COLUMN_NAME].sum(),
+            MEAN_COLUMN_NAME: statistics[MEAN_COLUMN_NAME],
+            STANDARD_DEVIATION_COLUMN_NAME: statistics[STANDARD_DEVIATION_COLUMN_NAME],
+            RESPECT_COLUMN_NAME: df[RESPECT_COLUMN_NAME].sum(),
+        }
+    )
+
+
+def merge_meeting_summaries(
+    fractal_aggregates: Sequence[FractalAggregates],
+) -> pd.DataFrame:
+    """Return the summary of the meetings held on each date by any of the Fractals of
+    the given FractalAggregates
+
+    `FractalCount` is the number of Fractals that met on the date, and the mean and
+    standard deviation of the Levels are combined from those of each meeting (see
+    `fractal_governance.dataset.combined_statistics`)."""
+    df = (
+        _concat(fractal_aggregates, "df_meetings")
+        .groupby(MEETING_DATE_COLUMN_NAME)
+        .apply(_merge_meeting_summaries)
+    )
+    return df.astype(
+        {FRACTAL_COUNT_COLUMN_NAME: int, ATTENDANCE_COUNT_COLUMN_NAME: int}
+    )
+
+
+def _to_fractals(fractals: Iterable[Fractal]) -> Tuple[Fractal, ...]:
+    return tuple(fractals)
+
+
+def _validate_fractals(
+    instance: "Federation", attribute: attrs.Attribute, fractals: Tuple[Fractal, ...]
+) -> None:
+    names = [fractal.name for fractal in fractals]
+    if not names:
+        raise ValueError("a Federation must have at least one Fractal")
+    if len(names) != len(set(names)):
+        raise ValueError(f"fractal names must be unique: {names}")
+
+
+@attrs.frozen
+class Federation:
+    """A federation of Fractals with merged cross-fractal leaderboards and meeting
+    summaries
+
+    The only required argument to the constructor is `fractals`. The Dataset of each
+    Fractal is calculated on a pool of at most `max_workers` processes. If `progress`
+    is given then the calculation reports its progress through it and raises
+    `fractal_governance.progress.CancelledError` if it is cancelled. Every DataFrame
+    is read-only."""
+
+    fractals: Tuple[Fractal, ...] = attrs.field(
+        converter=_to_fractals, validator=_validate_fractals
+    )
+
+    max_workers: Optional[int] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    progress: Optional[fractal_governance.progress.ProgressToken] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    fractal_aggregates_by_name: Dict[str, FractalAggregates] = attrs.field(
+        init=False, repr=False
+    )
+
+    df_member_leader_board: pd.DataFrame = attrs.field(init=False, repr=False)
+
+    df_team_leader_board: pd.DataFrame = attrs.field(init=False, repr=False)
+
+    df_meeting_summary: pd.DataFrame = attrs.field(init=False, repr=False)
+
+    def get_fractal(self, name: str) -> Fractal:
+        """Return the Fractal with the given name"""
+        for fractal in self.fractals:
+            if fractal.name == name:
+                return fractal
+        raise KeyError(name)
+
+    def _create_fractal_aggregates(self) -> List[FractalAggregates]:
+        fractal_aggregates: List[FractalAggregates] = []
+        fractal_governance.progress.report(
+            self.progress, "federation", 0, len(self.fractals)
+        )
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers
+        ) as executor:
+            futures = [
+                executor.submit(_create_fractal_aggregates, fractal)
+                for fractal in self.fractals
+            ]
+            try:
+                for future in futures:
+                    fractal_aggregates.append(future.result())
+                    fractal_governance.progress.report(
+                        self.progress,
+                        "federation",
+                        len(fractal_aggregates),
+                        len(self.fractals),
+                    )
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        return fractal_aggregates
+
+    def __attrs_post_init__(self) -> None:
+        fractal_aggregates = self._create_fractal_aggregates()
+        object.__setattr__(
+            self,
+            "fractal_aggregates_by_name",
+            {aggregates.fractal_name: aggregates for aggregates in fractal_aggregates},
+        )
+        object.__setattr__(
+            self,
+            "df_member_leader_board",
+            fractal_governance.read_only.freeze(
+                merge_member_leader_boards(fractal_aggregates)
+            ),
+        )
+        object.__setattr__(
+            self,
+            "df_team_leader_board",
+            fractal_governance.read_only.freeze(
+                merge_team_leader_boards(fractal_aggregates)
+            ),
+        )
+        object.__setattr__(
+            self,
+            "df_meeting_summary",
+            fractal_governance.read_only.freeze(
+                merge_meeting_summaries(fractal_aggregates)
+            ),
+        )
@@ -0,0 +1,322 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A cube of the consensus groups of fractal governance meetings
+
+Consensus is reached in groups, and a meeting with more than one round has a set of
+groups for each round. The frames of this module are keyed by the
+(MeetingID, Group, Round) of each group, in that order:
+
+- The group ranks frame has one row per member per group per round, with the
+  member's Level (NaN for a member who advanced to the next round), the member's
+  team and whether it was their first meeting. The group members frame adds the
+  Respect earned for that Level.
+- The group cube has one row per group per round with its size, the Respect earned
+  by its members, its team mix, its share of new members and the dispersion of the
+  Levels it measured.
+- The level histogram has one row per group per round and one column per Level.
+
+The cube and the histogram are each aggregated from the group members frame in a
+single groupby, and the rollups aggregate them further to meetings, members and
+teams. A `fractal_governance.dataset.Dataset` creates these frames once as its
+`df_group_ranks`, `df_group_members`, `df_group_cube` and `df_group_level_histogram`
+derived frames, so that the frames that only depend on the group ranks are not
+created again when only the Respect changes.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .constants import (
+    ADVANCED_MEMBER_COUNT_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
+    GROUP_COUNT_COLUMN_NAME,
+    GROUP_SIZE_COLUMN_NAME,
+    IS_NEW_MEMBER_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    LEVEL_RANGE_COLUMN_NAME,
+    LEVEL_STANDARD_DEVIATION_COLUMN_NAME,
+    MEAN_LEVEL_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    NEW_MEMBER_COUNT_COLUMN_NAME,
+    NEW_MEMBER_SHARE_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    TEAM_COUNT_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_MEMBER_COUNT_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+)
+from .tables import Tables
+
+# The key of each group of a meeting.
+GROUP_KEY_COLUMN_NAMES = [MEETING_ID_COLUMN_NAME, GROUP_COLUMN_NAME, ROUND_COLUMN_NAME]
+
+GROUP_RANKS_COLUMN_NAMES = GROUP_KEY_COLUMN_NAMES + [
+    MEMBER_ID_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+    IS_NEW_MEMBER_COLUMN_NAME,
+]
+
+GROUP_MEMBERS_COLUMN_NAMES = GROUP_KEY_COLUMN_NAMES + [
+    MEMBER_ID_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+    IS_NEW_MEMBER_COLUMN_NAME,
+]
+
+_LEVEL_COUNT_COLUMN_NAME = "_LevelCount"
+_MIN_LEVEL_COLUMN_NAME = "_MinLevel"
+_MAX_LEVEL_COLUMN_NAME = "_MaxLevel"
+
+
+def create_group_ranks(tables: Tables) -> pd.DataFrame:
+    """Return the group ranks frame of the given Tables, sorted by the
+    (MeetingID, Group, Round) of each group
+
+    A member's Level for a meeting is recorded in the group of the final round they
+    participated in."""
+    df_attendance = tables.df_attendance
+    first_meeting_id = df_attendance.groupby(MEMBER_ID_COLUMN_NAME)[
+        MEETING_ID_COLUMN_NAME
+    ].transform("min")
+    df_member_meetings = pd.DataFrame(
+        {
+            MEETING_ID_COLUMN_NAME: df_attendance[MEETING_ID_COLUMN_NAME],
+            MEMBER_ID_COLUMN_NAME: df_attendance[MEMBER_ID_COLUMN_NAME],
+            MEETING_DATE_COLUMN_NAME: df_attendance[MEETING_DATE_COLUMN_NAME],
+            TEAM_ID_COLUMN_NAME: df_attendance[TEAM_ID_COLUMN_NAME],
+            TEAM_NAME_COLUMN_NAME: df_attendance[TEAM_NAME_COLUMN_NAME],
+            IS_NEW_MEMBER_COLUMN_NAME: (
+                df_attendance[MEETING_ID_COLUMN_NAME] == first_meeting_id
+            ),
+        }
+    )
+    df = pd.DataFrame(tables.df_round_results).merge(
+        df_member_meetings,
+        how="left",
+        on=[MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME],
+    )
+    df[IS_NEW_MEMBER_COLUMN_NAME] = df[IS_NEW_MEMBER_COLUMN_NAME].fillna(False)
+    return df[GROUP_RANKS_COLUMN_NAMES].sort_values(
+        by=GROUP_KEY_COLUMN_NAMES, kind="mergesort", ignore_index=True
+    )
+
+
+def create_group_members(
+    tables: Tables, df_group_ranks: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
+    """Return the group members frame of the given Tables, sorted by the
+    (MeetingID, Group, Round) of each group
+
+    A member's Level and Respect for a meeting are recorded in the group of the
+    final round they participated in, and the Respect of their other groups is
+    zero. If `df_group_ranks` is given then it is the group ranks frame of the
+    Tables, which is created otherwise."""
+    if df_group_ranks is None:
+        df_group_ranks = create_group_ranks(tables)
+    df_attendance = tables.df_attendance
+    respect = pd.Series(
+        df_attendance[RESPECT_COLUMN_NAME].to_numpy(),
+        index=pd.MultiIndex.from_frame(
+            df_attendance[[MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]]
+        ),
+    )
+    # A shallow copy, so that inserting the Respect leaves `df_group_ranks` alone.
+    df = df_group_ranks.copy(deep=False)
+    df.insert(
+        df.columns.get_loc(LEVEL_COLUMN_NAME) + 1,
+        RESPECT_COLUMN_NAME,
+        np.where(
+            df[LEVEL_COLUMN_NAME].notna(),
+            respect.reindex(
+                pd.MultiIndex.from_frame(
+                    df[[MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]]
+                )
+            ).to_numpy(),
+            0,
+        ),
+    )
+    return df
+
+
+def create_group_cube(df_group_members: pd.DataFrame) -> pd.DataFrame:
+    """Return the group cube of the given group members frame, indexed by the
+    (MeetingID, Group, Round) of each group
+
+    The Levels of the members who advanced to the next round are not part of the
+    Level statistics of a group, whose LevelStandardDeviation is NaN if it measured
+    a single Level."""
+    df = df_group_members.groupby(GROUP_KEY_COLUMN_NAMES, sort=True).agg(
+        **{
+            MEETING_DATE_COLUMN_NAME: (MEETING_DATE_COLUMN_NAME, "first"),
+            GROUP_SIZE_COLUMN_NAME: (MEMBER_ID_COLUMN_NAME, "size"),
+            _LEVEL_COUNT_COLUMN_NAME: (LEVEL_COLUMN_NAME, "count"),
+            RESPECT_COLUMN_NAME: (RESPECT_COLUMN_NAME, "sum"),
+            TEAM_COUNT_COLUMN_NAME: (TEAM_ID_COLUMN_NAME, "nunique"),
+            TEAM_MEMBER_COUNT_COLUMN_NAME: (TEAM_ID_COLUMN_NAME, "count"),
+            NEW_MEMBER_COUNT_COLUMN_NAME: (IS_NEW_MEMBER_COLUMN_NAME, "sum"),
+            MEAN_LEVEL_COLUMN_NAME: (LEVEL_COLUMN_NAME, "mean"),
+            LEVEL_STANDARD_DEVIATION_COLUMN_NAME: (LEVEL_COLUMN_NAME, "std"),
+            _MIN_LEVEL_COLUMN_NAME: (LEVEL_COLUMN_NAME, "min"),
+            _MAX_LEVEL_COLUMN_NAME: (LEVEL_COLUMN_NAME, "max"),
+        }
+    )
+    df.insert(
+        2,
+        ADVANCED_MEMBER_COUNT_COLUMN_NAME,
+        df[GROUP_SIZE_COLUMN_NAME] - df.pop(_LEVEL_COUNT_COLUMN_NAME),
+    )
+    df[NEW_MEMBER_COUNT_COLUMN_NAME] = df[NEW_MEMBER_COUNT_COLUMN_NAME].astype(int)
+    df.insert(
+        df.columns.get_loc(NEW_MEMBER_COUNT_COLUMN_NAME) + 1,
+        NEW_MEMBER_SHARE_COLUMN_NAME,
+        df[NEW_MEMBER_COUNT_COLUMN_NAME] / df[GROUP_SIZE_COLUMN_NAME],
+    )
+    df[LEVEL_RANGE_COLUMN_NAME] = df.pop(_MAX_LEVEL_COLUMN_NAME) - df.pop(
+        _MIN_LEVEL_COLUMN_NAME
+    )
+    return df
+
+
+def create_group_level_histogram(df_group_members: pd.DataFrame) -> pd.DataFrame:
+    """Return the number of members of each group measured at each Level, indexed by
+    the (MeetingID, Group, Round) of each group with one column per Level"""
+    df = df_group_members[df_group_members[LEVEL_COLUMN_NAME].notna()]
+    df_histogram = (
+        df.groupby(GROUP_KEY_COLUMN_NAMES + [LEVEL_COLUMN_NAME], sort=True)
+        .size()
+        .unstack(LEVEL_COLUMN_NAME, fill_value=0)
+    )
+    df_histogram.columns = df_histogram.columns.astype(int)
+    # Groups whose members all advanced to the next round measured no Levels.
+    group_index = pd.MultiIndex.from_frame(
+        df_group_members[GROUP_KEY_COLUMN_NAMES].drop_duplicates()
+    )
+    return df_histogram.reindex(group_index, fill_value=0)
+
+
+def get_group_sizes(
+    df_group_members: pd.DataFrame, df_group_cube: pd.DataFrame
+) -> np.ndarray:
+    """Return the size of the group of each row of the given group members frame
+
+    Both frames are sorted by their group keys, so each group's size is repeated
+    once for each of its members."""
+    group_sizes = df_group_cube[GROUP_SIZE_COLUMN_NAME].to_numpy()
+    return np.repeat(group_sizes, group_sizes)
+
+
+def rollup_to_meetings(df_group_cube: pd.DataFrame) -> pd.DataFrame:
+    """Return the groups of each meeting, indexed by MeetingID
+
+    GroupCount is the number of groups of every round, GroupSize and
+    LevelStandardDeviation are the means of the meeting's groups, AttendanceCount
+    and Respect count each attendee once in the group of the final round they
+    participated in, and NewMemberCount counts the new members of the first
+    round."""
+    df = df_group_cube.reset_index()
+    # Every attendee is in a group of the first round, whose new members are the
+    # meeting's new members.
+    is_first_round = df[ROUND_COLUMN_NAME] == df.groupby(MEETING_ID_COLUMN_NAME)[
+        ROUND_COLUMN_NAME
+    ].transform("min")
+    df = df.assign(
+        **{
+            ATTENDANCE_COUNT_COLUMN_NAME: df[GROUP_SIZE_COLUMN_NAME]
+            - df[ADVANCED_MEMBER_COUNT_COLUMN_NAME],
+            NEW_MEMBER_COUNT_COLUMN_NAME: df[NEW_MEMBER_COUNT_COLUMN_NAME].where(
+                is_first_round, 0
+            ),
+        }
+    )
+    return df.groupby(MEETING_ID_COLUMN_NAME, sort=True).agg(
+        **{
+            MEETING_DATE_COLUMN_NAME: (MEETING_DATE_COLUMN_NAME, "first"),
+            GROUP_COUNT_COLUMN_NAME: (GROUP_SIZE_COLUMN_NAME, "size"),
+            GROUP_SIZE_COLUMN_NAME: (GROUP_SIZE_COLUMN_NAME, "mean"),
+            ATTENDANCE_COUNT_COLUMN_NAME: (ATTENDANCE_COUNT_COLUMN_NAME, "sum"),
+            RESPECT_COLUMN_NAME: (RESPECT_COLUMN_NAME, "sum"),
+            NEW_MEMBER_COUNT_COLUMN_NAME: (NEW_MEMBER_COUNT_COLUMN_NAME, "sum"),
+            LEVEL_STANDARD_DEVIATION_COLUMN_NAME: (
+                LEVEL_STANDARD_DEVIATION_COLUMN_NAME,
+                "mean",
+            ),
+        }
+    )
+
+
+def rollup_to_members(
+    df_group_members: pd.DataFrame, df_group_cube: pd.DataFrame
+) -> pd.DataFrame:
+    """Return the groups of each member, indexed by MemberID
+
+    GroupCount is the number of groups the member was in, AdvancedMemberCount the
+    number of rounds they advanced from, AttendanceCount the number of meetings
+    they were measured in and GroupSize the mean size of their groups."""
+    df = pd.DataFrame(
+        {
+            MEMBER_ID_COLUMN_NAME: df_group_members[MEMBER_ID_COLUMN_NAME],
+            GROUP_SIZE_COLUMN_NAME: get_group_sizes(df_group_members, df_group_cube),
+            ATTENDANCE_COUNT_COLUMN_NAME: df_group_members[LEVEL_COLUMN_NAME].notna(),
+            RESPECT_COLUMN_NAME: df_group_members[RESPECT_COLUMN_NAME],
+        }
+    )
+    df_members = df.groupby(MEMBER_ID_COLUMN_NAME, sort=True).agg(
+        **{
+            GROUP_COUNT_COLUMN_NAME: (GROUP_SIZE_COLUMN_NAME, "size"),
+            ATTENDANCE_COUNT_COLUMN_NAME: (ATTENDANCE_COUNT_COLUMN_NAME, "sum"),
+            RESPECT_COLUMN_NAME: (RESPECT_COLUMN_NAME, "sum"),
+            GROUP_SIZE_COLUMN_NAME: (GROUP_SIZE_COLUMN_NAME, "mean"),
+        }
+    )
+    df_members.insert(
+        1,
+        ADVANCED_MEMBER_COUNT_COLUMN_NAME,
+        df_members[GROUP_COUNT_COLUMN_NAME] - df_members[ATTENDANCE_COUNT_COLUMN_NAME],
+    )
+    return df_members
+
+
+def rollup_to_teams(df_group_members: pd.DataFrame) -> pd.DataFrame:
+    """Return the groups of each team's members, indexed by TeamID
+
+    GroupCount is the number of groups with at least one of the team's members,
+    TeamMemberCount the number of the team's members in every group and
+    AttendanceCount the number of times one of them was measured."""
+    df = df_group_members[df_group_members[TEAM_ID_COLUMN_NAME].notna()]
+    group_counts = (
+        df[[TEAM_ID_COLUMN_NAME] + GROUP_KEY_COLUMN_NAMES]
+        .drop_duplicates()
+        .groupby(TEAM_ID_COLUMN_NAME, sort=True)
+        .size()
+    )
+    df_teams = (
+        df.assign(**{ATTENDANCE_COUNT_COLUMN_NAME: df[LEVEL_COLUMN_NAME].notna()})
+        .groupby(TEAM_ID_COLUMN_NAME, sort=True)
+        .agg(
+            **{
+                TEAM_NAME_COLUMN_NAME: (TEAM_NAME_COLUMN_NAME, "first"),
+                TEAM_MEMBER_COUNT_COLUMN_NAME: (MEMBER_ID_COLUMN_NAME, "size"),
+                ATTENDANCE_COUNT_COLUMN_NAME: (ATTENDANCE_COUNT_COLUMN_NAME, "sum"),
+                RESPECT_COLUMN_NAME: (RESPECT_COLUMN_NAME, "sum"),
+            }
+        )
+    )
+    df_teams.insert(1, GROUP_COUNT_COLUMN_NAME, group_counts)
+    return df_teams
+
+
+def get_ranked_group_members(df_group_members: pd.DataFrame) -> pd.DataFrame:
+    """Return the rows of the given group members frame whose members were measured
+    at a Level, i.e. one row per member per meeting"""
+    return df_group_members[df_group_members[LEVEL_COLUMN_NAME].notna()]
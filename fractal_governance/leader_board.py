@@ -0,0 +1,241 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Paginated leaderboards for the dashboards
+
+A LeaderBoard calculates the colour gradient of its columns once for all of its rows,
+vectorized, and caches its row order for every sort key it is sorted by. Each
+dashboard page then only styles, or converts to Arrow, the rows it shows, so that the
+time to render a page does not grow with the number of members.
+"""
+
+import math
+import threading
+import warnings
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Sequence, Tuple
+
+import attrs
+import numpy as np
+import pandas as pd
+
+import fractal_governance.read_only
+
+if TYPE_CHECKING:
+    import matplotlib.colors
+    import pyarrow
+    from pandas.io.formats.style import Styler
+
+DEFAULT_PAGE_SIZE = 10
+
+# The relative luminance below which text is drawn in a light colour, the same as
+# `pandas.io.formats.style.Styler.background_gradient`.
+TEXT_COLOR_THRESHOLD = 0.408
+
+DARK_BACKGROUND_TEXT_COLOR = "#f1f1f1"
+
+LIGHT_BACKGROUND_TEXT_COLOR = "#000000"
+
+# The column names and sort orders (True for ascending) of the columns to sort by.
+SortKey = Tuple[Tuple[str, bool], ...]
+
+
+def _to_column_names(column_names: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(column_names)
+
+
+def get_gradient_colors(
+    df: pd.DataFrame, cmap: "matplotlib.colors.Colormap"
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Return the hex background colour of every cell of the given DataFrame in the
+    colour gradient of its column, and the text colour that contrasts with it
+
+    The colours are the same as those of `Styler.background_gradient`, but are
+    calculated for every cell at once."""
+    values = df.to_numpy(dtype=float, na_value=np.nan)
+    if values.size == 0:
+        return df.astype(str), df.astype(str)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # A column whose values are all NaN has no colour gradient.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        vmin = np.nanmin(values, axis=0)
+        vmax = np.nanmax(values, axis=0)
+        normalized_values = (values - vmin) / (vmax - vmin)
+    # A column whose values are all the same maps to the start of the gradient, the
+    # same as `matplotlib.colors.Normalize`.
+    normalized_values[:, vmin == vmax] = 0.0
+    normalized_values[np.isnan(values)] = np.nan
+    rgbs = cmap(normalized_values)[..., :3]
+
+    rgb_bytes = np.round(rgbs * 255).astype(np.int64)
+    rgb_values = (
+        (rgb_bytes[..., 0] << 16) | (rgb_bytes[..., 1] << 8) | rgb_bytes[..., 2]
+    )
+    background_colors = np.char.mod("#%06x", rgb_values)
+
+    # The relative luminance of the background colour as defined by the W3C.
+    linear_rgbs = np.where(
+        rgbs <= 0.04045, rgbs / 12.92, ((rgbs + 0.055) / 1.055) ** 2.4
+    )
+    luminance = linear_rgbs @ np.array([0.2126, 0.7152, 0.0722])
+    text_colors = np.where(
+        luminance < TEXT_COLOR_THRESHOLD,
+        DARK_BACKGROUND_TEXT_COLOR,
+        LIGHT_BACKGROUND_TEXT_COLOR,
+    )
+    return (
+        pd.DataFrame(background_colors, index=df.index, columns=df.columns),
+        pd.DataFrame(text_colors, index=df.index, columns=df.columns),
+    )
+
+
+@attrs.frozen
+class LeaderBoard:
+    """A leaderboard whose pages are sorted and styled on demand
+
+    `gradient_column_names` are the columns shaded by `cmap` relative to all of the
+    rows, whose background and text colours are `df_background_colors` and
+    `df_text_colors`. `formatter` formats the cells of a styled page and
+    `column_formats` are the printf-style formats of the columns of a page converted
+    to Arrow, in the shape of a Streamlit column config. If `sort_by_absolute_value`
+    is True, the numeric columns are sorted by their absolute value."""
+
+    df: pd.DataFrame = attrs.field(
+        converter=fractal_governance.read_only.freeze, repr=False
+    )
+
+    gradient_column_names: Tuple[str, ...] = attrs.field(converter=_to_column_names)
+
+    cmap: "matplotlib.colors.Colormap" = attrs.field(kw_only=True, repr=False)
+
+    formatter: Optional[Callable[[Any], Any]] = attrs.field(
+        default=None, kw_only=True, repr=False
+    )
+
+    column_formats: Dict[str, str] = attrs.field(factory=dict, kw_only=True, repr=False)
+
+    sort_by_absolute_value: bool = attrs.field(default=False, kw_only=True)
+
+    df_background_colors: pd.DataFrame = attrs.field(init=False, repr=False)
+
+    df_text_colors: pd.DataFrame = attrs.field(init=False, repr=False)
+
+    _order_by_sort_key: Dict[SortKey, np.ndarray] = attrs.field(
+        factory=dict, init=False, repr=False, eq=False
+    )
+
+    _lock: threading.Lock = attrs.field(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def get_order(self, sort_key: SortKey = ()) -> np.ndarray:
+        """Return the positions of the rows sorted by the given SortKey
+
+        The rows keep their order for an empty SortKey. The order of each SortKey is
+        only calculated once."""
+        with self._lock:
+            order = self._order_by_sort_key.get(sort_key)
+        if order is None:
+            if sort_key:
+                column_names = [column_name for column_name, _ in sort_key]
+                df = self.df[column_names]
+                if self.sort_by_absolute_value:
+                    df = df.apply(
+                        lambda series: series.abs()
+                        if pd.api.types.is_numeric_dtype(series)
+                        else series
+                    )
+                df = df.reset_index(drop=True).sort_values(
+                    by=column_names,
+                    ascending=[ascending for _, ascending in sort_key],
+                    kind="mergesort",
+                )
+                order = df.index.to_numpy()
+            else:
+                order = np.arange(len(self.df))
+            order.setflags(write=False)
+            with self._lock:
+                order = self._order_by_sort_key.setdefault(sort_key, order)
+        return order
+
+    def get_page_count(self, page_size: int = DEFAULT_PAGE_SIZE) -> int:
+        """Return the number of pages of the given size, which is at least one"""
+        return max(1, math.ceil(len(self.df) / page_size))
+
+    def _get_page_positions(
+        self, page_number: int, page_size: int, sort_key: SortKey
+    ) -> np.ndarray:
+        if not 1 <= page_number <= self.get_page_count(page_size):
+            raise ValueError(
+                f"page_number={page_number} must be between 1 and {self.get_page_count(page_size)}"  # noqa: E501
+            )
+        start = (page_number - 1) * page_size
+        return self.get_order(sort_key)[start : start + page_size]  # noqa: E203
+
+    def get_page(
+        self,
+        page_number: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        sort_key: SortKey = (),
+    ) -> pd.DataFrame:
+        """Return the rows of the given page, numbered from 1, of the leaderboard
+        sorted by the given SortKey"""
+        return self.df.iloc[self._get_page_positions(page_number, page_size, sort_key)]
+
+    def style(
+        self,
+        page_number: Optional[int] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        sort_key: SortKey = (),
+    ) -> "Styler":
+        """Return the styled rows of the given page, or of every row if
+        `page_number` is None, of the leaderboard sorted by the given SortKey"""
+        if page_number is None:
+            positions = self.get_order(sort_key)
+        else:
+            positions = self._get_page_positions(page_number, page_size, sort_key)
+        df = pd.DataFrame(self.df.iloc[positions])
+        df_gradient_css = (
+            "background-color: "
+            + self.df_background_colors.iloc[positions]
+            + ";color: "
+            + self.df_text_colors.iloc[positions]
+            + ";"
+        )
+        styler = df.style
+        if self.formatter is not None:
+            styler = styler.format(self.formatter)
+        return styler.apply(
+            lambda _: df_gradient_css,
+            axis=None,
+            subset=list(self.gradient_column_names),
+        )
+
+    def to_arrow(
+        self,
+        page_number: int = 1,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        sort_key: SortKey = (),
+    ) -> "pyarrow.Table":
+        """Return the rows of the given page of the leaderboard sorted by the given
+        SortKey as an Arrow table, to be formatted by `column_formats`
+
+        pyarrow is imported on first use."""
+        import pyarrow
+
+        return pyarrow.Table.from_pandas(
+            self.get_page(page_number, page_size, sort_key), preserve_index=True
+        )
+
+    def __attrs_post_init__(self) -> None:
+        background_colors, text_colors = get_gradient_colors(
+            self.df[list(self.gradient_column_names)], self.cmap
+        )
+        object.__setattr__(
+            self,
+            "df_background_colors",
+            fractal_governance.read_only.freeze(background_colors),
+        )
+        object.__setattr__(
+            self, "df_text_colors", fractal_governance.read_only.freeze(text_colors)
+        )
@@ -0,0 +1,104 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A thread-safe LRU cache that creates each value at most once
+
+The shared resources, the cached results, the rendered plots and the parsed weekly
+measurements shards are all kept in an LRUCache. When several threads ask for the
+same missing key at the same time, only one of them creates the value and the others
+wait for it.
+"""
+
+import collections
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+import attrs
+
+T = TypeVar("T")
+
+
+@attrs.define
+class LRUCache:
+    """A thread-safe LRU cache
+
+    At most `max_entries` values are kept. A value is created at most once for each
+    key, even if several threads ask for it at the same time. `hit_count` counts the
+    values that were found in the cache or loaded, and `miss_count` counts the values
+    that had to be created."""
+
+    max_entries: int
+
+    hit_count: int = attrs.field(default=0, init=False)
+
+    miss_count: int = attrs.field(default=0, init=False)
+
+    _entries: "collections.OrderedDict[str, Any]" = attrs.field(
+        factory=collections.OrderedDict, init=False, repr=False
+    )
+
+    _lock: threading.Lock = attrs.field(factory=threading.Lock, init=False, repr=False)
+
+    _lock_by_key: Dict[str, threading.Lock] = attrs.field(
+        factory=dict, init=False, repr=False
+    )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove every value from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            if key not in self._entries:
+                return False, None
+            self._entries.move_to_end(key)
+            self.hit_count += 1
+            return True, self._entries[key]
+
+    def _put(self, key: str, value: Any, *, is_hit: bool) -> None:
+        with self._lock:
+            if is_hit:
+                self.hit_count += 1
+            else:
+                self.miss_count += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_create(
+        self,
+        key: str,
+        create: Callable[[], T],
+        *,
+        load: Optional[Callable[[], Optional[T]]] = None,
+    ) -> T:
+        """Return the value for the given key, calling `create` to create it if it is
+        not in the cache
+
+        If `load` is given then it is called first, and the value it returns, unless
+        it is None, is cached instead of calling `create`. If `create` raises then
+        nothing is cached and the exception propagates to the caller."""
+        is_found, value = self._get(key)
+        if is_found:
+            return value  # type: ignore
+
+        with self._lock:
+            key_lock = self._lock_by_key.setdefault(key, threading.Lock())
+        with key_lock:
+            try:
+                # Another thread may have created the value while this one waited.
+                is_found, value = self._get(key)
+                if is_found:
+                    return value  # type: ignore
+                value = load() if load is not None else None
+                is_hit = value is not None
+                if value is None:
+                    value = create()
+                self._put(key, value, is_hit=is_hit)
+            finally:
+                with self._lock:
+                    self._lock_by_key.pop(key, None)
+        return value  # type: ignore
@@ -1,10 +1,13 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
-"""Math functions for fractal governance data analysis"""
+"""Math functions for fractal governance data analysis
+
+`uncertainties` is only imported when a function is given `uncertainties` values.
+"""
+import math
+import numbers
+
 import numpy as np
 import pandas as pd
-import uncertainties
-import uncertainties.umath
-import uncertainties.unumpy
 
 GOLDEN_RATIO = (np.sqrt(5) + 1) / 2
 
@@ -21,11 +24,16 @@ def fibonacci(
     term of this formula."""
     value = np.power(golden_ratio, n)
     if include_second_term:
-        _cos = (
-            uncertainties.unumpy.cos
-            if isinstance(n, pd.Series)
-            else uncertainties.umath.cos
-        )
+        if isinstance(n, pd.Series):
+            import uncertainties.unumpy
+
+            _cos = uncertainties.unumpy.cos
+        elif isinstance(n, numbers.Real):
+            _cos = math.cos
+        else:
+            import uncertainties.umath
+
+            _cos = uncertainties.umath.cos
         value -= _cos(n * np.pi) * np.power(golden_ratio, -n)
     return value / np.sqrt(5)  # type: ignore
 
@@ -2,10 +2,15 @@
 """Measurement uncertainties for fractal governance data analysis"""
 
 from enum import Enum, auto
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 
 import attrs
 import fractal_governance.dataset
+import fractal_governance.group_cube
+import fractal_governance.memory
+import fractal_governance.progress
+import fractal_governance.read_only
+import fractal_governance.result_cache
 import fractal_governance.util
 import numpy as np
 import pandas as pd
@@ -33,10 +38,25 @@ class UncertaintyType(Enum):
 
 @attrs.frozen
 class Dataset:
-    """A wrapper around fractal governance measurement uncertainty data"""
+    """A wrapper around fractal governance measurement uncertainty data
+
+    If `progress` is given then the calculation reports its progress through it and
+    raises `fractal_governance.progress.CancelledError` if it is cancelled, with the
+    measurement uncertainties of the members finished so far as the partial result.
+    If `result_cache` is given then the measurement uncertainties are only
+    calculated if they are not in the cache (see `fractal_governance.result_cache`).
+    """
 
     dataset: fractal_governance.dataset.Dataset = attrs.field(repr=False)
 
+    progress: Optional[fractal_governance.progress.ProgressToken] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
     df_with_self_measurements: pd.DataFrame = attrs.field(
         repr=False, default=None, init=False
     )
@@ -104,6 +124,7 @@ class Dataset:
         ]
         df = df[column_names]
 
+        df = fractal_governance.read_only.freeze(df)
         if include_self_measurement:
             object.__setattr__(self, "_df_member_leader_board_true", df)
         else:
@@ -124,20 +145,53 @@ class Dataset:
             )
         )
 
-    def __attrs_post_init__(self) -> None:
-        df = self.dataset.df
-        df_with_self_measurements = create_measurement_uncertainty_dataframe(
-            df=df, include_self_measurements=True
+    def memory_report(
+        self, *, trace_construction: bool = False
+    ) -> fractal_governance.memory.MemoryReport:
+        """Return the memory used by the measurement uncertainty frames and by the
+        Dataset they were calculated from (see
+        `fractal_governance.memory.get_memory_report`)"""
+        return fractal_governance.memory.get_memory_report(
+            self, trace_construction=trace_construction
         )
-        df_without_self_measurements = create_measurement_uncertainty_dataframe(
-            df=df, include_self_measurements=False
+
+    def __attrs_post_init__(self) -> None:
+        result = fractal_governance.result_cache.get_or_compute(
+            self.result_cache,
+            lambda: fractal_governance.result_cache.make_result_key(
+                "measurement_uncertainty.Dataset", self.dataset
+            ),
+            self._create_frames,
         )
 
-        object.__setattr__(self, "df_with_self_measurements", df_with_self_measurements)
         object.__setattr__(
-            self, "df_without_self_measurements", df_without_self_measurements
+            self,
+            "df_with_self_measurements",
+            fractal_governance.read_only.freeze(result["df_with_self_measurements"]),
+        )
+        object.__setattr__(
+            self,
+            "df_without_self_measurements",
+            fractal_governance.read_only.freeze(result["df_without_self_measurements"]),
         )
 
+    def _create_frames(self) -> Dict[str, pd.DataFrame]:
+        # The members measured at a Level in each group, from the Dataset's group cube
+        # (see `fractal_governance.group_cube`).
+        df = fractal_governance.group_cube.get_ranked_group_members(
+            self.dataset.df_group_members
+        )
+        df_with_self_measurements = create_measurement_uncertainty_dataframe(
+            df=df, include_self_measurements=True, progress=self.progress
+        )
+        df_without_self_measurements = create_measurement_uncertainty_dataframe(
+            df=df, include_self_measurements=False, progress=self.progress
+        )
+        return {
+            "df_with_self_measurements": df_with_self_measurements,
+            "df_without_self_measurements": df_without_self_measurements,
+        }
+
 
 @attrs.frozen(kw_only=True)
 class Measurement:
@@ -176,11 +230,14 @@ class Contributor:
 
 def _create_contributor_by_member_id(
     df: pd.DataFrame,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
 ) -> Dict[str, Contributor]:
     contributor_by_member_id: Dict[str, Contributor] = dict()
-    for ((meeting_id, group), df) in df[df[LEVEL_COLUMN_NAME].notna()].groupby(
-        [MEETING_ID_COLUMN_NAME, GROUP_COLUMN_NAME]
-    ):
+    groupby = df.groupby([MEETING_ID_COLUMN_NAME, GROUP_COLUMN_NAME])
+    for group_index, ((meeting_id, group), df) in enumerate(groupby):
+        fractal_governance.progress.report(
+            progress, "measurements", group_index, groupby.ngroups
+        )
         for member_id1 in df[MEMBER_ID_COLUMN_NAME]:
             if member_id1 not in contributor_by_member_id:
                 contributor_by_member_id[member_id1] = Contributor(member_id=member_id1)
@@ -203,11 +260,22 @@ def _create_contributor_by_member_id(
 
 
 def _create_measurement_uncertainty_by_member_id(
-    df: pd.DataFrame, include_self_measurements: bool = False
+    df: pd.DataFrame,
+    include_self_measurements: bool = False,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
 ) -> Dict[str, uncertainties.ufloat]:
     measurement_uncertainty_by_member_id: Dict[str, uncertainties.ufloat] = dict()
-    contributor_by_member_id = _create_contributor_by_member_id(df)
+    contributor_by_member_id = _create_contributor_by_member_id(df, progress)
     for member_id1, contributor1 in contributor_by_member_id.items():
+        fractal_governance.progress.report(
+            progress,
+            "measurement uncertainties",
+            len(measurement_uncertainty_by_member_id),
+            len(contributor_by_member_id),
+            lambda: _create_measurement_uncertainty_dataframe(
+                measurement_uncertainty_by_member_id
+            ),
+        )
         statistics_by_member_id1 = contributor1.statistics_by_member_id
         measurement_uncertainties: List[uncertainties.ufloat] = list()
         for member_id2 in statistics_by_member_id1.keys():
@@ -232,10 +300,27 @@ def create_measurement_uncertainty_dataframe(
     *,
     df: pd.DataFrame,
     include_self_measurements: bool = False,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
 ) -> pd.DataFrame:
+    """Return a DataFrame of the measurement uncertainty of every unique member for
+    the given attendance table (see `fractal_governance.tables.Tables`), or for the
+    members measured at a Level in each group of a group cube (see
+    `fractal_governance.group_cube.get_ranked_group_members`)
+
+    If `progress` is cancelled then `fractal_governance.progress.CancelledError` is
+    raised with the DataFrame of the members finished so far as the partial result.
+    """
     measurement_uncertainty_by_member_id = _create_measurement_uncertainty_by_member_id(
-        df, include_self_measurements=include_self_measurements
+        df, include_self_measurements=include_self_measurements, progress=progress
+    )
+    return _create_measurement_uncertainty_dataframe(
+        measurement_uncertainty_by_member_id
     )
+
+
+def _create_measurement_uncertainty_dataframe(
+    measurement_uncertainty_by_member_id: Dict[str, uncertainties.ufloat]
+) -> pd.DataFrame:
     member_ids: List[str] = list()
     uncertainties: List[float] = list()
     for (
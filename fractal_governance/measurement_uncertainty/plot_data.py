@@ -0,0 +1,235 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""The data of the plots of fractal governance data measurement uncertainties
+
+Every plot of `fractal_governance.measurement_uncertainty.plots.Plots` is split into a
+plot data function in this module and its matplotlib and Altair renderers, in the same
+way as `fractal_governance.plot_data`. Every tidy DataFrame has a Series column
+labeling whether the measurements include self measurements.
+"""
+
+from enum import Enum, auto
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import uncertainties
+import uncertainties.unumpy
+from fractal_governance.constants import (
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    BIN_END_COLUMN_NAME,
+    BIN_START_COLUMN_NAME,
+    ERROR_COLUMN_NAME,
+    FIT_COLUMN_NAME,
+    MEAN_COLUMN_NAME,
+    SERIES_COLUMN_NAME,
+    VALUE_COLUMN_NAME,
+    X_COLUMN_NAME,
+    X_ERROR_COLUMN_NAME,
+)
+from fractal_governance.measurement_uncertainty.dataset import (
+    MEASUREMENT_UNCERTAINTY_COLUMN_NAME,
+    Dataset,
+    UncertaintyType,
+)
+from fractal_governance.plot_data import PlotData
+
+# The number of bins of the measurement uncertainty distribution.
+DISTRIBUTION_BIN_COUNT = 30
+
+
+class CorrelationType(Enum):
+    MeanLevel = auto()
+    AttendanceCount = auto()
+
+
+def get_series_name(include_self_measurement: bool) -> str:
+    """Return the Series label of the measurements with or without self
+    measurements"""
+    return f"Include Self Measurement: {include_self_measurement}"
+
+
+def _get_measurement_uncertainties(
+    measurement_uncertainty_dataset: Dataset,
+) -> Tuple[Tuple[str, pd.DataFrame], ...]:
+    """Internal helper method that returns the Series label and DataFrame of the
+    measurement uncertainties without and then with self measurements"""
+    return (
+        (
+            get_series_name(False),
+            measurement_uncertainty_dataset.df_without_self_measurements,
+        ),
+        (
+            get_series_name(True),
+            measurement_uncertainty_dataset.df_with_self_measurements,
+        ),
+    )
+
+
+def _get_uncertainty_function_and_name(
+    uncertainty_type: UncertaintyType,
+) -> Tuple[Callable[[Any], np.ndarray], str]:
+    """Internal helper method that returns the `uncertainties.unumpy` function that
+    extracts the given UncertaintyType along with its name"""
+    if uncertainty_type == UncertaintyType.NominalValue:
+        return uncertainties.unumpy.nominal_values, "Accuracy"
+    elif uncertainty_type == UncertaintyType.StdDev:
+        return uncertainties.unumpy.std_devs, "Precision"
+    else:
+        raise RuntimeError(f"LOGIC ERROR: Unknown enum {uncertainty_type}")
+
+
+def _create_series_frame(dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Internal helper method that concatenates the DataFrame of each Series label
+    into one tidy DataFrame with a categorical Series column"""
+    df = pd.concat(
+        [df.assign(**{SERIES_COLUMN_NAME: series}) for series, df in dfs.items()],
+        ignore_index=True,
+    )
+    df[SERIES_COLUMN_NAME] = pd.Categorical(
+        df[SERIES_COLUMN_NAME], categories=list(dfs)
+    )
+    return df[[SERIES_COLUMN_NAME] + [c for c in df if c != SERIES_COLUMN_NAME]]
+
+
+def get_measurement_uncertainty(
+    measurement_uncertainty_dataset: Dataset,
+) -> PlotData:
+    """Return the measurement uncertainty for every unique member"""
+    dfs = {
+        series: pd.DataFrame(
+            {
+                X_COLUMN_NAME: np.arange(len(df)),
+                VALUE_COLUMN_NAME: uncertainties.unumpy.nominal_values(
+                    df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]
+                ),
+                ERROR_COLUMN_NAME: uncertainties.unumpy.std_devs(
+                    df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]
+                ),
+            }
+        )
+        for series, df in _get_measurement_uncertainties(
+            measurement_uncertainty_dataset
+        )
+    }
+    return PlotData(
+        df=_create_series_frame(dfs),
+        title="Member Level Measurement Uncertainty vs Unique Member",
+        x_label="Unique Member",
+        y_label="Member Level Measurement Uncertainty",
+    )
+
+
+def get_measurement_uncertainty_distribution(
+    measurement_uncertainty_dataset: Dataset, uncertainty_type: UncertaintyType
+) -> PlotData:
+    """Return the normalized histogram of the measurement uncertainty of the given
+    UncertaintyType, with the bin edges of the first series, and its best fit to a
+    normal distribution
+
+    The Fit column is the normal distribution evaluated at X. The annotations are the
+    mean, std, dof and chi2_per_dof of the fit of each Series label."""
+    import scipy.stats
+
+    unumpy_func, uncertainty_name = _get_uncertainty_function_and_name(uncertainty_type)
+    dfs = {}
+    annotations = {}
+    # Every series shares the bin edges of the first series so that their
+    # histograms overlay.
+    bins: Any = DISTRIBUTION_BIN_COUNT
+    for series, df in _get_measurement_uncertainties(measurement_uncertainty_dataset):
+        data = unumpy_func(df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME])
+        n, bins = np.histogram(data, bins=bins, density=True)
+
+        mean, std = scipy.stats.norm.fit(data)
+        bin_centers = bins[:-1] + (bins[:-1] - bins[1:]) / 2
+        expected = scipy.stats.norm.pdf(bin_centers, mean, std)
+        residuals = n - expected
+        chi2 = np.sum(residuals**2 / expected)
+        dof = len(n) - 1
+
+        dfs[series] = pd.DataFrame(
+            {
+                BIN_START_COLUMN_NAME: bins[:-1],
+                BIN_END_COLUMN_NAME: bins[1:],
+                VALUE_COLUMN_NAME: n,
+                X_COLUMN_NAME: bin_centers,
+                FIT_COLUMN_NAME: expected,
+            }
+        )
+        annotations[series] = {
+            "mean": mean,
+            "std": std,
+            "dof": dof,
+            "chi2_per_dof": chi2 / dof,
+        }
+
+    x_label = f"{uncertainty_name} of Level Measurement"
+    return PlotData(
+        df=_create_series_frame(dfs),
+        title=f"Distribution of {x_label}",
+        x_label=x_label,
+        y_label="Counts",
+        annotations=annotations,
+    )
+
+
+def get_measurement_uncertainty_correlation(
+    measurement_uncertainty_dataset: Dataset,
+    uncertainty_type: UncertaintyType,
+    correlation_type: CorrelationType,
+) -> PlotData:
+    """Return the mean measurement uncertainty of the given UncertaintyType in unit
+    bins of the given CorrelationType
+
+    The bins are (0.5, 1.5], (1.5, 2.5], etc. and the empty bins are omitted. The
+    annotations are the correlation coefficient of each Series label."""
+    unumpy_func, uncertainty_name = _get_uncertainty_function_and_name(uncertainty_type)
+    if correlation_type == CorrelationType.MeanLevel:
+        column_name = MEAN_COLUMN_NAME
+        x_label = "Mean Level"
+    elif correlation_type == CorrelationType.AttendanceCount:
+        column_name = ATTENDANCE_COUNT_COLUMN_NAME
+        x_label = "Attendance Count"
+    else:
+        raise RuntimeError(f"LOGIC ERROR: Unknown enum {correlation_type}")
+
+    dataset = measurement_uncertainty_dataset.dataset
+    dfs = {}
+    annotations = {}
+    for series, df in _get_measurement_uncertainties(measurement_uncertainty_dataset):
+        df = dataset.df_member_summary_stats_by_member_id.join(df)
+        x = df[column_name]
+        y = pd.Series(unumpy_func(df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]), x.index)
+
+        # The unit bin of each value, i.e. the right edge of its bin rounded down,
+        # with the values outside of the first bin dropped by the groupby.
+        bins = np.ceil(x - 0.5).where(x > 0.5)
+        x_by_bin = x.groupby(bins, sort=True)
+        y_by_bin = y.groupby(bins, sort=True)
+        dfs[series] = pd.DataFrame(
+            {
+                X_COLUMN_NAME: x_by_bin.mean(),
+                X_ERROR_COLUMN_NAME: x_by_bin.std(),
+                VALUE_COLUMN_NAME: y_by_bin.mean(),
+                ERROR_COLUMN_NAME: y_by_bin.std(ddof=0),
+            }
+        ).reset_index(drop=True)
+        annotations[series] = np.corrcoef(x, y)[0, 1]
+
+    y_label = f"{uncertainty_name} of Level Measurement"
+    return PlotData(
+        df=_create_series_frame(dfs),
+        title=f"{y_label} vs {x_label}",
+        x_label=x_label,
+        y_label=y_label,
+        annotations=annotations,
+    )
+
+
+# The plot data function of each plot of
+# `fractal_governance.measurement_uncertainty.plots.Plots`.
+PLOT_DATA_FUNCTION_BY_PLOT_NAME: Dict[str, Callable[..., PlotData]] = {
+    "measurement_uncertainty": get_measurement_uncertainty,
+    "measurement_uncertainty_distribution": get_measurement_uncertainty_distribution,
+    "measurement_uncertainty_correlation": get_measurement_uncertainty_correlation,
+}
@@ -1,127 +1,203 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
 """Plots for fractal governance data measurement uncertainties"""
 
-from enum import Enum, auto
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Tuple
 
 import attrs
 import fractal_governance.dataset
+import fractal_governance.plots
+import fractal_governance.render_cache
 import fractal_governance.util
-import matplotlib.figure
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-import scipy.stats
-import uncertainties
-from fractal_governance.constants import ATTENDANCE_COUNT_COLUMN_NAME, MEAN_COLUMN_NAME
+from fractal_governance.constants import (
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    ERROR_COLUMN_NAME,
+    FIT_COLUMN_NAME,
+    MEAN_COLUMN_NAME,
+    SERIES_COLUMN_NAME,
+    VALUE_COLUMN_NAME,
+    X_COLUMN_NAME,
+    X_ERROR_COLUMN_NAME,
+)
 from fractal_governance.measurement_uncertainty.dataset import (
-    MEASUREMENT_UNCERTAINTY_COLUMN_NAME,
     Dataset,
     UncertaintyType,
 )
-from fractal_governance.plots import DEFAULT_FIGSIZE
-
+from fractal_governance.measurement_uncertainty.plot_data import (
+    PLOT_DATA_FUNCTION_BY_PLOT_NAME,
+    CorrelationType,
+)
+from fractal_governance.plot_data import PlotData
+from fractal_governance.plots import (
+    DEFAULT_FIGSIZE,
+    create_figure,
+    draw_histogram,
+    get_colors,
+)
 
-class CorrelationType(Enum):
-    MeanLevel = auto()
-    AttendanceCount = auto()
+if TYPE_CHECKING:
+    import fractal_governance.charts
+    import matplotlib.figure
+from fractal_governance.render_cache import PlotInput
+
+
+# The measurement uncertainty Dataset attributes read by each plot, whose
+# fingerprints are part of the plot's render cache key.
+PLOT_INPUTS_BY_PLOT_NAME: Dict[str, Tuple[PlotInput, ...]] = {
+    "measurement_uncertainty": (
+        PlotInput("df_with_self_measurements"),
+        PlotInput("df_without_self_measurements"),
+    ),
+    "measurement_uncertainty_distribution": (
+        PlotInput("df_with_self_measurements"),
+        PlotInput("df_without_self_measurements"),
+    ),
+    "measurement_uncertainty_correlation": (
+        PlotInput("df_with_self_measurements"),
+        PlotInput("df_without_self_measurements"),
+        PlotInput(
+            "dataset.df_member_summary_stats_by_member_id",
+            [ATTENDANCE_COUNT_COLUMN_NAME, MEAN_COLUMN_NAME],
+        ),
+    ),
+}
 
 
 @attrs.frozen
 class Plots:
-    """A wrapper around e fractal governance measurement uncertainty data"""
+    """A wrapper around e fractal governance measurement uncertainty data
+
+    `measurement_uncertainty_dataset` is calculated from `dataset` unless it is
+    given."""
 
     dataset: fractal_governance.dataset.Dataset = attrs.field(repr=False)
 
     measurement_uncertainty_dataset: Dataset = attrs.field(
-        repr=False, default=None, init=False
+        repr=False, default=None, kw_only=True
+    )
+
+    figsize: Tuple[float, float] = attrs.field(default=DEFAULT_FIGSIZE, kw_only=True)
+
+    render_cache: fractal_governance.render_cache.RenderCache = attrs.field(
+        default=fractal_governance.render_cache.DEFAULT_RENDER_CACHE,
+        kw_only=True,
+        repr=False,
+        eq=False,
+    )
+
+    _plot_data_by_key: Dict[Tuple[Any, ...], PlotData] = attrs.field(
+        factory=dict, init=False, repr=False, eq=False
     )
 
+    _plot_data_lock: threading.Lock = attrs.field(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
+
+    def render(
+        self,
+        plot_name: str,
+        *args: Any,
+        format: str = "png",
+        dpi: float = fractal_governance.render_cache.DEFAULT_DPI,
+    ) -> bytes:
+        """Return the named plot, called with `args` if it is a method, rendered in
+        the given format
+
+        The rendered plot is cached, and is only rendered again when one of the
+        DataFrames it reads changes."""
+        if plot_name not in PLOT_INPUTS_BY_PLOT_NAME:
+            raise ValueError(f"Unknown plot_name {plot_name}")
+        return fractal_governance.plots.render_plot(
+            self,
+            plot_name,
+            args,
+            [
+                plot_input.fingerprint(self.measurement_uncertainty_dataset)
+                for plot_input in PLOT_INPUTS_BY_PLOT_NAME[plot_name]
+            ],
+            format=format,
+            dpi=dpi,
+        )
+
+    def plot_data(self, plot_name: str, *args: Any) -> PlotData:
+        """Return the tidy data of the named plot called with `args`
+
+        The plot data is cached, since the Dataset is read-only."""
+        if plot_name not in PLOT_DATA_FUNCTION_BY_PLOT_NAME:
+            raise ValueError(f"Unknown plot_name {plot_name}")
+        key = (plot_name, args)
+        with self._plot_data_lock:
+            plot_data = self._plot_data_by_key.get(key)
+        if plot_data is None:
+            plot_data = PLOT_DATA_FUNCTION_BY_PLOT_NAME[plot_name](
+                self.measurement_uncertainty_dataset, *args
+            )
+            with self._plot_data_lock:
+                plot_data = self._plot_data_by_key.setdefault(key, plot_data)
+        return plot_data
+
+    def chart(self, plot_name: str, *args: Any) -> "fractal_governance.charts.Chart":
+        """Return the named plot called with `args` as an Altair chart, whose
+        Vega-Lite specification is drawn by the browser"""
+        import fractal_governance.charts
+
+        return fractal_governance.charts.create_chart(
+            plot_name, self.plot_data(plot_name, *args)
+        )
+
     @property
-    def measurement_uncertainty(self) -> matplotlib.figure.Figure:
+    def measurement_uncertainty(self) -> "matplotlib.figure.Figure":
         """Return a plot of the measurement uncertainty for every unique member"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
+        fig, ax = create_figure(self.figsize)
         alpha = 0.5
 
-        for include_self_measurement in (False, True):
-            if include_self_measurement:
-                df = self.measurement_uncertainty_dataset.df_with_self_measurements
-            else:
-                df = self.measurement_uncertainty_dataset.df_without_self_measurements
-            color = next(ax._get_lines.prop_cycler)["color"]
+        plot_data = self.plot_data("measurement_uncertainty")
+        colors = get_colors()
+        for series, df in plot_data.df.groupby(SERIES_COLUMN_NAME, observed=True):
+            color = next(colors)
             ax.errorbar(
-                x=np.arange(len(df)),
-                y=uncertainties.unumpy.nominal_values(
-                    df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]
-                ),
-                yerr=uncertainties.unumpy.std_devs(
-                    df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]
-                ),
+                x=df[X_COLUMN_NAME].to_numpy(),
+                y=df[VALUE_COLUMN_NAME].to_numpy(),
+                yerr=df[ERROR_COLUMN_NAME].to_numpy(),
                 fmt="o",
                 alpha=alpha,
                 color=color,
-                label=f"Include Self Measurement: {include_self_measurement}",
+                label=series,
             )
 
         ax.legend(loc="upper left")
-        ax.set_title("Member Level Measurement Uncertainty vs Unique Member")
-        ax.set_ylabel("Member Level Measurement Uncertainty")
-        ax.set_xlabel("Unique Member")
+        ax.set_title(plot_data.title)
+        ax.set_ylabel(plot_data.y_label)
+        ax.set_xlabel(plot_data.x_label)
 
         return fig
 
     def measurement_uncertainty_distribution(
         self, uncertainty_type: UncertaintyType
-    ) -> matplotlib.figure.Figure:
+    ) -> "matplotlib.figure.Figure":
         """Return a plot of the measurement uncertainty distribution for the given
         UncertaintyType"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
+        fig, ax = create_figure(self.figsize)
 
         alpha = 0.5
-        bins = 30
-
-        for include_self_measurement in (False, True):
-            if include_self_measurement:
-                df = self.measurement_uncertainty_dataset.df_with_self_measurements
-            else:
-                df = self.measurement_uncertainty_dataset.df_without_self_measurements
-
-            if uncertainty_type == UncertaintyType.NominalValue:
-                data = uncertainties.unumpy.nominal_values(
-                    df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]
-                )
-                uncertainty_name = "Accuracy"
-            elif uncertainty_type == UncertaintyType.StdDev:
-                data = uncertainties.unumpy.std_devs(
-                    df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]
-                )
-                uncertainty_name = "Precision"
-            else:
-                raise RuntimeError(f"LOGIC ERROR: Unknown enum {uncertainty_type}")
-            color = next(ax._get_lines.prop_cycler)["color"]
-            n, bins, patches = ax.hist(
-                x=data,
-                bins=bins,
-                density=True,
-                alpha=alpha,
-                color=color,
-            )
 
-            mean, std = scipy.stats.norm.fit(data)
-            bin_centers = bins[:-1] + (bins[:-1] - bins[1:]) / 2  # type: ignore
-            expected = scipy.stats.norm.pdf(bin_centers, mean, std)
-            residuals = n - expected
-            chi2 = np.sum(residuals**2 / expected)
-            dof = len(n) - 1
-            chi2_per_dof = chi2 / dof
-
-            label = f"Include Self Measurement: {include_self_measurement}"
-            label += f", $(\\mu, \\sigma) = ({mean:.2f}, {std:.2f})$"
-            label += f", $\\chi^2({dof}) = {chi2_per_dof:.2f}$"
+        plot_data = self.plot_data(
+            "measurement_uncertainty_distribution", uncertainty_type
+        )
+        colors = get_colors()
+        for series, df in plot_data.df.groupby(SERIES_COLUMN_NAME, observed=True):
+            color = next(colors)
+            n, bins, patches = draw_histogram(ax, df, alpha=alpha, color=color)
+
+            fit = plot_data.annotations[series]
+            label = series
+            label += f", $(\\mu, \\sigma) = ({fit['mean']:.2f}, {fit['std']:.2f})$"
+            label += f", $\\chi^2({fit['dof']}) = {fit['chi2_per_dof']:.2f}$"
             patches.set_label(label)
 
             ax.plot(
-                bin_centers,
-                scipy.stats.norm.pdf(bin_centers, mean, std),
+                df[X_COLUMN_NAME].to_numpy(),
+                df[FIT_COLUMN_NAME].to_numpy(),
                 alpha=alpha,
                 color=color,
             )
@@ -151,88 +227,35 @@ class Plots:
             arrowprops=dict(arrowstyle="->"),
         )
 
-        xlabel = f"{uncertainty_name} of Level Measurement"
         ax.legend(loc="upper right")
-        ax.set_title(f"Distribution of {xlabel}")
-        ax.set_xlabel(xlabel)
-        ax.set_ylabel("Counts")
+        ax.set_title(plot_data.title)
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
 
         return fig
 
     def measurement_uncertainty_correlation(
         self, uncertainty_type: UncertaintyType, correlation_type: CorrelationType
-    ) -> matplotlib.figure.Figure:
+    ) -> "matplotlib.figure.Figure":
         """Return a plot of the measurement uncertainty vs mean_level for the given
         UncertaintyType and CorrelationType"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
+        fig, ax = create_figure(self.figsize)
         alpha = 0.5
 
-        if uncertainty_type == UncertaintyType.NominalValue:
-            unumpy_func = uncertainties.unumpy.nominal_values
-            uncertainty_name = "Accuracy"
-        elif uncertainty_type == UncertaintyType.StdDev:
-            unumpy_func = uncertainties.unumpy.std_devs
-            uncertainty_name = "Precision"
-        else:
-            raise RuntimeError(f"LOGIC ERROR: Unknown enum {uncertainty_type}")
-
-        if correlation_type == CorrelationType.MeanLevel:
-            column_name = MEAN_COLUMN_NAME
-            xlabel = "Mean Level"
-        elif correlation_type == CorrelationType.AttendanceCount:
-            column_name = ATTENDANCE_COUNT_COLUMN_NAME
-            xlabel = "Attendance Count"
-        else:
-            raise RuntimeError(f"LOGIC ERROR: Unknown enum {correlation_type}")
-
-        for include_self_measurement in (False, True):
-            if include_self_measurement:
-                df = self.measurement_uncertainty_dataset.df_with_self_measurements
-            else:
-                df = self.measurement_uncertainty_dataset.df_without_self_measurements
-
-            dataset = self.measurement_uncertainty_dataset.dataset
-            df = dataset.df_member_summary_stats_by_member_id.join(df)
-
-            x = list()
-            xerr = list()
-            y = list()
-            yerr = list()
-            cut_start = 0.5
-            cut_stop = df[column_name].max() + 1
-            cut_step = 1
-            cut_range = np.arange(start=cut_start, stop=cut_stop, step=cut_step)
-            for interval, dfx in df.groupby(
-                pd.cut(
-                    df[column_name],
-                    cut_range,
-                )
-            ):
-                x_mean = dfx[column_name].mean()
-                x_std_dev = dfx[column_name].std()
-                data = unumpy_func(dfx[MEASUREMENT_UNCERTAINTY_COLUMN_NAME])
-                if data.size == 0:
-                    continue
-                y_mean = np.mean(data)
-                y_std_dev = np.std(data)
-                x.append(x_mean)
-                xerr.append(x_std_dev)
-                y.append(y_mean)
-                yerr.append(y_std_dev)
-
-            color = next(ax._get_lines.prop_cycler)["color"]
-            corrcoef = np.corrcoef(
-                df[column_name],
-                unumpy_func(df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME]),
-            )
-            correlation_coefficient = corrcoef[0, 1]
+        plot_data = self.plot_data(
+            "measurement_uncertainty_correlation", uncertainty_type, correlation_type
+        )
+        colors = get_colors()
+        for series, df in plot_data.df.groupby(SERIES_COLUMN_NAME, observed=True):
+            color = next(colors)
+            correlation_coefficient = plot_data.annotations[series]
             label = f"Correlation Coefficient: {correlation_coefficient:.2f}"
-            label += f", Include Self Measurement: {include_self_measurement}"
+            label += f", {series}"
             ax.errorbar(
-                x=x,
-                xerr=xerr,
-                y=y,
-                yerr=yerr,
+                x=df[X_COLUMN_NAME].to_list(),
+                xerr=df[X_ERROR_COLUMN_NAME].to_list(),
+                y=df[VALUE_COLUMN_NAME].to_list(),
+                yerr=df[ERROR_COLUMN_NAME].to_list(),
                 fmt="o",
                 alpha=alpha,
                 color=color,
@@ -240,10 +263,9 @@ class Plots:
             )
 
         ax.legend(loc="upper right")
-        ylabel = f"{uncertainty_name} of Level Measurement"
-        ax.set_title(f"{ylabel} vs {xlabel}")
-        ax.set_ylabel(ylabel)
-        ax.set_xlabel(xlabel)
+        ax.set_title(plot_data.title)
+        ax.set_ylabel(plot_data.y_label)
+        ax.set_xlabel(plot_data.x_label)
 
         return fig
 
@@ -260,8 +282,8 @@ class Plots:
         )
 
     def __attrs_post_init__(self) -> None:
-        pass
-        measurement_uncertainty_dataset = Dataset(dataset=self.dataset)
-        object.__setattr__(
-            self, "measurement_uncertainty_dataset", measurement_uncertainty_dataset
-        )
+        if self.measurement_uncertainty_dataset is None:
+            measurement_uncertainty_dataset = Dataset(dataset=self.dataset)
+            object.__setattr__(
+                self, "measurement_uncertainty_dataset", measurement_uncertainty_dataset
+            )
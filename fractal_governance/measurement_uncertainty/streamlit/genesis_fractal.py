@@ -4,20 +4,15 @@
 import sys
 from pathlib import Path
 
-import numpy as np
-import pandas as pd
-import seaborn as sns
-
 import streamlit as st
 
 sys.path.append(str(Path(__file__).resolve().parents[3]))
-import fractal_governance.dataset  # noqa: E402
-import fractal_governance.measurement_uncertainty.dataset  # noqa: E402
-import fractal_governance.measurement_uncertainty.plots  # noqa: E402
-from fractal_governance.constants import (  # noqa: E402
-    ACCUMULATED_RESPECT_COLUMN_NAME,
-    ATTENDANCE_COUNT_COLUMN_NAME,
-    MEMBER_ID_COLUMN_NAME,
+import fractal_governance.refresher  # noqa: E402
+import fractal_governance.resources  # noqa: E402
+from fractal_governance.dashboard import (  # noqa: E402
+    PAGE_SIZES,
+    create_measurement_uncertainty_leader_board,
+    get_measurement_uncertainty_sort_key,
 )
 from fractal_governance.measurement_uncertainty.dataset import (  # noqa: E402
     ACCURACY_COLUMN_NAME,
@@ -32,31 +27,25 @@ PAGE_TITLE = "Genesis Uncertainty Observatory"
 st.set_page_config(page_title=PAGE_TITLE, page_icon="✅", layout="wide")
 
 
-@st.experimental_memo
-def _get_dataset() -> fractal_governance.measurement_uncertainty.dataset.Dataset:
-    """Return the Genesis Fractal Measurement Uncertainty Dataset"""
-    return fractal_governance.dataset.Dataset.from_csv()
-
-
-@st.experimental_memo
-def get_dataset() -> fractal_governance.measurement_uncertainty.dataset.Dataset:
-    """Return the Genesis Fractal Measurement Uncertainty Dataset"""
-    return fractal_governance.measurement_uncertainty.dataset.Dataset(
-        dataset=_get_dataset()
-    )
-
-
-@st.experimental_memo
-def get_plots() -> fractal_governance.measurement_uncertainty.plots.Plots:
-    """Return the Genesis Fractal Measurement Uncertainty Plots"""
-    return fractal_governance.measurement_uncertainty.plots.Plots(
-        dataset=_get_dataset()
+# The datasets and plots are built and kept up to date on a background thread, and
+# every script run reads the last good snapshot of them. Only the very first visitor
+# after the server starts waits for the first snapshot to be built. If it cannot be
+# built its error is shown instead, until a later rebuild at the next poll succeeds.
+REFRESHER = fractal_governance.refresher.get_default_refresher()
+try:
+    with st.spinner("Loading the Genesis Fractal Dataset..."):
+        SNAPSHOT = REFRESHER.wait_for_snapshot(
+            timeout=fractal_governance.refresher.DEFAULT_WAIT_TIMEOUT
+        )
+except Exception as error:
+    st.error(
+        "The Genesis Fractal Dataset could not be loaded: "
+        f"{REFRESHER.last_error or error}"
     )
-
-
-_DATASET = _get_dataset()
-DATASET = get_dataset()
-PLOTS = get_plots()
+    st.stop()
+_DATASET = SNAPSHOT.dataset
+DATASET = SNAPSHOT.measurement_uncertainty_dataset
+PLOTS = SNAPSHOT.measurement_uncertainty_plots
 LAST_MEETING_DATE = _DATASET.last_meeting_date.strftime("%b %d, %Y")
 
 st.title(PAGE_TITLE)
@@ -75,8 +64,6 @@ This accompanying article motivates the creation of this dashboard:
 """  # noqa: E501
 )
 
-CMAP = sns.light_palette("#34A853", as_cmap=True)
-
 st.subheader("Member Leaderboard")
 """
 This member leaderboard highlights Genesis members who contribute the highest quality
@@ -87,17 +74,14 @@ are better and the order is selected in the sidebar), then by Respect (descendin
 by Attendance (descending) and finally by member ID (ascending)."""
 
 with st.sidebar:
-    if st.checkbox("Include Self Measurements", value=True):
-        df_member_leader_board = DATASET.get_member_leader_board(
-            include_self_measurement=True
-        )
-    else:
-        df_member_leader_board = DATASET.get_member_leader_board(
-            include_self_measurement=False
-        )
-
-    if not st.checkbox("Show All"):
-        df_member_leader_board = df_member_leader_board.head(10)
+    include_self_measurement = st.checkbox("Include Self Measurements", value=True)
+    # The sort order of each "Sort By" option is only calculated once.
+    member_leader_board = fractal_governance.resources.get_leader_board(
+        DATASET.get_member_leader_board(
+            include_self_measurement=include_self_measurement
+        ),
+        create_measurement_uncertainty_leader_board,
+    )
 
     sort_column = st.radio(
         "Sort By",
@@ -108,83 +92,89 @@ with st.sidebar:
         else PRECISION_COLUMN_NAME,
     )
 
-sort_columns = [ACCURACY_COLUMN_NAME, PRECISION_COLUMN_NAME]
-if sort_column == UncertaintyType.StdDev:
-    sort_columns.reverse()
-
-sort_columns += [
-    ACCUMULATED_RESPECT_COLUMN_NAME,
-    ATTENDANCE_COUNT_COLUMN_NAME,
-    MEMBER_ID_COLUMN_NAME,
-]
-
-df_member_leader_board = df_member_leader_board.sort_values(
-    by=sort_columns,
-    key=lambda series: abs(series)
-    if np.issubdtype(series.dtype, np.number)
-    else series,
-    ascending=[True, True, False, False, True],
-)
+    page_size = st.selectbox("Members per page", PAGE_SIZES)
+    page_number = st.number_input(
+        "Page",
+        min_value=1,
+        max_value=member_leader_board.get_page_count(page_size),
+        value=1,
+    )
 
-df_member_leader_board = df_member_leader_board.style.background_gradient(
-    cmap=CMAP,
-    subset=pd.IndexSlice[
-        :,
-        [
-            ACCURACY_COLUMN_NAME,
-            PRECISION_COLUMN_NAME,
-        ],
-    ],
+# Only the rows of the selected page are styled and sent to the browser.
+st.dataframe(
+    member_leader_board.style(
+        page_number,
+        page_size,
+        sort_key=get_measurement_uncertainty_sort_key(sort_column),
+    )
 )
 
-st.table(df_member_leader_board)
-
 st.subheader("Plots")
 
 column1, column2 = st.columns(2)
 
 with column1:
-    st.pyplot(PLOTS.measurement_uncertainty_distribution(UncertaintyType.NominalValue))
+    st.altair_chart(
+        PLOTS.chart(
+            "measurement_uncertainty_distribution", UncertaintyType.NominalValue
+        ),
+        use_container_width=True,
+    )
 
 with column2:
-    st.pyplot(PLOTS.measurement_uncertainty_distribution(UncertaintyType.StdDev))
+    st.altair_chart(
+        PLOTS.chart("measurement_uncertainty_distribution", UncertaintyType.StdDev),
+        use_container_width=True,
+    )
 
 
 column1, column2 = st.columns(2)
 correlation_type = CorrelationType.MeanLevel
 
 with column1:
-    st.pyplot(
-        PLOTS.measurement_uncertainty_correlation(
-            UncertaintyType.NominalValue, correlation_type
-        )
+    st.altair_chart(
+        PLOTS.chart(
+            "measurement_uncertainty_correlation",
+            UncertaintyType.NominalValue,
+            correlation_type,
+        ),
+        use_container_width=True,
     )
 
 with column2:
-    st.pyplot(
-        PLOTS.measurement_uncertainty_correlation(
-            UncertaintyType.StdDev, correlation_type
-        )
+    st.altair_chart(
+        PLOTS.chart(
+            "measurement_uncertainty_correlation",
+            UncertaintyType.StdDev,
+            correlation_type,
+        ),
+        use_container_width=True,
     )
 
 column1, column2 = st.columns(2)
 correlation_type = CorrelationType.AttendanceCount
 
 with column1:
-    st.pyplot(
-        PLOTS.measurement_uncertainty_correlation(
-            UncertaintyType.NominalValue, correlation_type
-        )
+    st.altair_chart(
+        PLOTS.chart(
+            "measurement_uncertainty_correlation",
+            UncertaintyType.NominalValue,
+            correlation_type,
+        ),
+        use_container_width=True,
     )
 
 with column2:
-    st.pyplot(
-        PLOTS.measurement_uncertainty_correlation(
-            UncertaintyType.StdDev, correlation_type
-        )
+    st.altair_chart(
+        PLOTS.chart(
+            "measurement_uncertainty_correlation",
+            UncertaintyType.StdDev,
+            correlation_type,
+        ),
+        use_container_width=True,
     )
 
-st.pyplot(PLOTS.measurement_uncertainty)
+st.altair_chart(PLOTS.chart("measurement_uncertainty"), use_container_width=True)
 
 st.header("Resources")
 
@@ -0,0 +1,310 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Memory accounting of a Dataset and of the objects derived from it
+
+`get_memory_report` walks the attributes of an attrs object, e.g. a
+`fractal_governance.dataset.Dataset`, an `Addendum1Dataset`, a `WeightedMeans` or a
+measurement uncertainty `Dataset`, and of the attrs objects it refers to, such as
+its `Tables` or the Dataset it was derived from. It reports each DataFrame, Series
+and ndarray it finds under its dotted attribute name:
+
+- `deep_bytes` is the memory used by the values, including the Python objects of
+  object-dtype columns (see `pandas.DataFrame.memory_usage`).
+- `shared_bytes` is the memory of the buffers that are also referred to by another
+  entry of the report, e.g. the read-only views of a Dataset's frames, and
+  `owned_bytes` is the rest of `deep_bytes`.
+- `object_column_names` are the columns of object dtype, and `ufloat_column_names`
+  are those that hold `uncertainties` values. The derivatives of `uncertainties`
+  values are not included in `deep_bytes`, so the memory used by those columns is
+  larger than reported.
+
+A DataFrame, Series or ndarray that more than one attribute refers to, e.g. a frame
+that a derived Dataset shares with the Dataset it was derived from, is reported
+under each of their names, and its memory is entirely shared by all but the first.
+An attrs object that more than one attribute refers to is only walked the first
+time. Attributes that are not part of an object's value (i.e. attrs `eq=False`),
+such as progress tokens, result caches and build timings, are skipped.
+
+If `trace_construction` is True then the object is constructed again with
+`attrs.evolve` while `tracemalloc` traces the allocations, and the peak memory
+allocated during its construction is reported as `construction_peak_bytes`. The
+object is constructed again without its result cache and progress token, if it has
+them, so that its values are calculated rather than copied from the cache.
+"""
+
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+
+import attrs
+import numpy as np
+import pandas as pd
+
+T = TypeVar("T")
+
+
+@attrs.frozen
+class MemoryReportEntry:
+    """The memory used by one DataFrame, Series or ndarray of an object"""
+
+    name: str
+    type_name: str
+    deep_bytes: int
+    shared_bytes: int
+    object_column_names: Tuple[str, ...] = ()
+    ufloat_column_names: Tuple[str, ...] = ()
+
+    @property
+    def owned_bytes(self) -> int:
+        """The memory used by buffers that no other entry refers to"""
+        return self.deep_bytes - self.shared_bytes
+
+
+@attrs.frozen
+class MemoryReport:
+    """The memory used by the DataFrames, Series and ndarrays of an object (see
+    `get_memory_report`)"""
+
+    type_name: str
+    entries: Tuple[MemoryReportEntry, ...]
+    shared_buffer_bytes: int
+    construction_peak_bytes: Optional[int] = None
+
+    @property
+    def deep_bytes(self) -> int:
+        """The memory used by every entry, counting each shared buffer once for
+        every entry that refers to it"""
+        return sum(entry.deep_bytes for entry in self.entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """The memory used by every entry, counting each shared buffer once"""
+        return (
+            sum(entry.owned_bytes for entry in self.entries) + self.shared_buffer_bytes
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the entries as a DataFrame indexed by name and sorted by
+        `deep_bytes`"""
+        df = pd.DataFrame(
+            [
+                {
+                    "Name": entry.name,
+                    "Type": entry.type_name,
+                    "DeepBytes": entry.deep_bytes,
+                    "SharedBytes": entry.shared_bytes,
+                    "OwnedBytes": entry.owned_bytes,
+                    "ObjectColumns": ", ".join(entry.object_column_names),
+                    "UFloatColumns": ", ".join(entry.ufloat_column_names),
+                }
+                for entry in self.entries
+            ],
+            columns=[
+                "Name",
+                "Type",
+                "DeepBytes",
+                "SharedBytes",
+                "OwnedBytes",
+                "ObjectColumns",
+                "UFloatColumns",
+            ],
+        )
+        return df.set_index("Name").sort_values(
+            by="DeepBytes", ascending=False, kind="mergesort"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as a dictionary that can be represented in JSON"""
+        return {
+            "type_name": self.type_name,
+            "deep_bytes": self.deep_bytes,
+            "total_bytes": self.total_bytes,
+            "shared_buffer_bytes": self.shared_buffer_bytes,
+            "construction_peak_bytes": self.construction_peak_bytes,
+            "entries": [
+                {
+                    **attrs.asdict(entry),
+                    "owned_bytes": entry.owned_bytes,
+                }
+                for entry in self.entries
+            ],
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Return the report as JSON, passing the keyword arguments to
+        `json.dumps`"""
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def trace_peak(factory: Callable[[], T]) -> Tuple[T, int]:
+    """Return the value of `factory()` and the peak memory in bytes that was
+    allocated while it was called, as traced by `tracemalloc`"""
+    is_tracing = tracemalloc.is_tracing()
+    if not is_tracing:
+        tracemalloc.start()
+    try:
+        current_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        value = factory()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        if not is_tracing:
+            tracemalloc.stop()
+    return value, max(peak_bytes - current_bytes, 0)
+
+
+def _get_root(array: np.ndarray) -> np.ndarray:
+    while isinstance(array.base, np.ndarray):
+        array = array.base
+    return array
+
+
+def _get_arrays(obj: Any) -> Iterator[np.ndarray]:
+    """Internal helper method that yields the ndarrays that hold the values of the
+    given DataFrame, Series or ndarray without copying them"""
+    if isinstance(obj, np.ndarray):
+        yield obj
+        return
+    if isinstance(obj, pd.Series):
+        obj = obj.to_frame()
+    for _, series in obj.items():
+        values = series.to_numpy(copy=False)
+        if isinstance(values, np.ndarray):
+            yield values
+    if not isinstance(obj.index, (pd.RangeIndex, pd.MultiIndex)):
+        values = obj.index.to_numpy(copy=False)
+        if isinstance(values, np.ndarray):
+            yield values
+
+
+def _get_buffer_bytes(obj: Any, arrays: List[np.ndarray]) -> Dict[int, int]:
+    """Internal helper method that returns the bytes of the given object's values
+    keyed by the address of the buffer that holds them
+
+    The arrays are appended to `arrays`, which keeps the ones that are copies alive
+    so that their addresses are not reused for the values of another object."""
+    buffer_bytes: Dict[int, int] = dict()
+    for array in _get_arrays(obj):
+        arrays.append(array)
+        address = _get_root(array).__array_interface__["data"][0]
+        buffer_bytes[address] = buffer_bytes.get(address, 0) + array.nbytes
+    return buffer_bytes
+
+
+def _is_ufloat(value: Any) -> bool:
+    return type(value).__module__.startswith("uncertainties")
+
+
+def _get_object_column_names(df: pd.DataFrame) -> Tuple[List[str], List[str]]:
+    object_column_names = [
+        column_name for column_name in df if df[column_name].dtype == object
+    ]
+    ufloat_column_names = [
+        column_name
+        for column_name in object_column_names
+        if df[column_name].dropna().map(_is_ufloat).any()
+    ]
+    return [str(column_name) for column_name in object_column_names], [
+        str(column_name) for column_name in ufloat_column_names
+    ]
+
+
+def _get_deep_bytes(obj: Any) -> int:
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(index=True, deep=True))
+    return int(obj.nbytes)
+
+
+def _walk(obj: Any, name: str, seen_ids: Set[int]) -> Iterator[Tuple[str, Any]]:
+    """Internal helper method that yields the dotted name and value of each
+    DataFrame, Series and ndarray that the given object refers to"""
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)):
+        yield name, obj
+    elif id(obj) in seen_ids:
+        return
+    elif attrs.has(type(obj)):
+        seen_ids.add(id(obj))
+        for field in attrs.fields(type(obj)):
+            if field.eq:
+                yield from _walk(
+                    getattr(obj, field.name),
+                    f"{name}.{field.name}" if name else field.name,
+                    seen_ids,
+                )
+    elif isinstance(obj, dict):
+        seen_ids.add(id(obj))
+        for key, value in obj.items():
+            yield from _walk(value, f"{name}[{key!r}]", seen_ids)
+
+
+# The fields that are cleared when an object is constructed again for
+# `trace_construction`.
+_CONSTRUCTION_FIELD_NAMES_TO_CLEAR = {"progress", "result_cache"}
+
+
+def get_memory_report(obj: Any, *, trace_construction: bool = False) -> MemoryReport:
+    """Return the MemoryReport of the given attrs object"""
+    construction_peak_bytes = None
+    if trace_construction:
+        changes = {
+            field.name: None
+            for field in attrs.fields(type(obj))
+            if field.init and field.name in _CONSTRUCTION_FIELD_NAMES_TO_CLEAR
+        }
+        _, construction_peak_bytes = trace_peak(lambda: attrs.evolve(obj, **changes))
+
+    values_by_name = dict(_walk(obj, "", set()))
+    first_name_by_id: Dict[int, str] = dict()
+    for name, value in values_by_name.items():
+        first_name_by_id.setdefault(id(value), name)
+    arrays: List[np.ndarray] = []
+    buffer_bytes_by_name = {
+        name: _get_buffer_bytes(value, arrays) for name, value in values_by_name.items()
+    }
+    name_count_by_address: Dict[int, int] = dict()
+    max_bytes_by_address: Dict[int, int] = dict()
+    for buffer_bytes in buffer_bytes_by_name.values():
+        for address, nbytes in buffer_bytes.items():
+            name_count_by_address[address] = name_count_by_address.get(address, 0) + 1
+            max_bytes_by_address[address] = max(
+                max_bytes_by_address.get(address, 0), nbytes
+            )
+
+    entries = []
+    for name, value in values_by_name.items():
+        deep_bytes = _get_deep_bytes(value)
+        if first_name_by_id[id(value)] != name:
+            shared_bytes = deep_bytes
+        else:
+            shared_bytes = sum(
+                nbytes
+                for address, nbytes in buffer_bytes_by_name[name].items()
+                if name_count_by_address[address] > 1
+            )
+        object_column_names: List[str] = []
+        ufloat_column_names: List[str] = []
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            object_column_names, ufloat_column_names = _get_object_column_names(
+                pd.DataFrame(value)
+            )
+        entries.append(
+            MemoryReportEntry(
+                name=name,
+                type_name=type(value).__name__,
+                deep_bytes=deep_bytes,
+                shared_bytes=min(shared_bytes, deep_bytes),
+                object_column_names=tuple(object_column_names),
+                ufloat_column_names=tuple(ufloat_column_names),
+            )
+        )
+    return MemoryReport(
+        type_name=type(obj).__name__,
+        entries=tuple(entries),
+        shared_buffer_bytes=sum(
+            nbytes
+            for address, nbytes in max_bytes_by_address.items()
+            if name_count_by_address[address] > 1
+        ),
+        construction_peak_bytes=construction_peak_bytes,
+    )
@@ -0,0 +1,605 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A performance regression harness for the stages of the fractal governance pipeline
+
+`run` creates the fixed synthetic datasets of `SYNTHETIC_DATASET_SPECS` (see
+`create_synthetic_frames`) and measures each stage of the pipeline on them: creating
+the DataFrame from the frames of the .csv files, the `Tables` and each derived frame
+of a `fractal_governance.dataset.Dataset`, the Addendum 1 `WeightedMeans` and
+`Addendum1Dataset`, the measurement uncertainty `Dataset` and the
+`fractal_governance.co_attendance.CoAttendanceGraph`. The time of a stage is the
+median of `repeat` runs, or of as many runs as fit in `MAX_MEASURE_SECONDS`, with
+the garbage collector disabled the same as `timeit`, and its peak memory is traced
+by `tracemalloc` in another run (see `fractal_governance.memory.trace_peak`).
+
+`compare` compares the PerfResults of `run` to the baseline PerfResults committed in
+`DEFAULT_BASELINES_PATH` and returns a PerfReport of every stage whose time or peak
+memory grew by more than its `Tolerances`. The current times are first divided by
+the median ratio of the current to the baseline times of every stage, the speed
+ratio of the machine they were measured on, so that a baseline recorded on one
+machine can be compared to results measured on another. A slowdown of every stage
+at once is therefore indistinguishable from a slower machine. `compare` also checks
+the empirical complexity of each stage: from the smallest to the largest synthetic
+dataset, the time of a stage must grow by less than `Tolerances.max_growth` each
+time the number of meetings doubles, e.g. a stage that is linear in the number of
+meetings doubles while a quadratic one quadruples. Times shorter than a stage's
+`Tolerances.floor_seconds` are raised to it before they are compared, so that the
+jitter of the fastest stages is not reported as a regression.
+
+    fractal_governance perf
+    fractal_governance perf --update-baselines
+"""
+
+import gc
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import attrs
+import numpy as np
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.dataset
+import fractal_governance.memory
+import fractal_governance.read_only
+import fractal_governance.tables
+import fractal_governance.util
+from fractal_governance.addendum_1.dataset import Addendum1Dataset
+from fractal_governance.addendum_1.weighted_means import WeightedMeans
+from fractal_governance.co_attendance import CoAttendanceGraph
+from fractal_governance.constants import (
+    GROUP_COLUMN_NAME,
+    HIVE_ACCOUNT_NAME_COLUMN_NAME,
+    INDEX_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEMBER_NAME_COLUMN_NAME,
+    PROJECT_DIR,
+    ROUND_COLUMN_NAME,
+    SIGNATURE_ON_FILE_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+)
+
+DEFAULT_BASELINES_PATH = PROJECT_DIR / "data/perf_baselines.json"
+
+PERF_RESULTS_VERSION = 2
+
+# The number of runs of each stage whose median time is measured.
+DEFAULT_REPEAT = 5
+
+# The time in seconds after which a stage is not run again, so that the slowest
+# stages are only run once.
+MAX_MEASURE_SECONDS = 5.0
+
+# The largest group of a meeting, whose members are ranked from Level 6 down.
+MAX_GROUP_SIZE = 6
+
+
+@attrs.frozen
+class SyntheticDatasetSpec:
+    """The parameters of a synthetic dataset (see `create_synthetic_frames`)"""
+
+    name: str
+    meeting_count: int
+    member_count: int = 100
+    team_count: int = 10
+    seed: int = 0
+
+    def create_frames(self) -> fractal_governance.util.FractalDatasetFrames:
+        """Return the frames of this synthetic dataset"""
+        return create_synthetic_frames(
+            self.meeting_count,
+            member_count=self.member_count,
+            team_count=self.team_count,
+            seed=self.seed,
+        )
+
+
+# The synthetic datasets measured by `run`. Each one has twice the meetings of the
+# one before it so that `compare` can check the empirical complexity of each stage.
+# They are large enough that the time of a stage that is quadratic in the number of
+# meetings is dominated by its quadratic term.
+SYNTHETIC_DATASET_SPECS: Tuple[SyntheticDatasetSpec, ...] = (
+    SyntheticDatasetSpec(name="meetings_100", meeting_count=100, member_count=300),
+    SyntheticDatasetSpec(name="meetings_200", meeting_count=200, member_count=300),
+    SyntheticDatasetSpec(name="meetings_400", meeting_count=400, member_count=300),
+)
+
+
+def create_synthetic_frames(
+    meeting_count: int,
+    *,
+    member_count: int = 100,
+    team_count: int = 10,
+    seed: int = 0,
+) -> fractal_governance.util.FractalDatasetFrames:
+    """Return the frames of a reproducible synthetic Fractal dataset
+
+    Members join over time, so that every meeting has both new and returning
+    members, and attend about half of the meetings after joining. Each meeting's
+    attendees are ranked in randomly assigned groups of at most six, about 40% of
+    the members represent a team, about 90% of them have a signature on file and
+    about 1% of the measurements are penalized for a late consensus."""
+    rng = np.random.default_rng(seed)
+    member_ids = np.array([f"member{i:05d}" for i in range(member_count)])
+    first_meeting_ids = np.sort(rng.integers(1, meeting_count + 1, size=member_count))
+    first_meeting_ids[: min(member_count, 2 * MAX_GROUP_SIZE)] = 1
+    team_ids = np.where(
+        rng.random(member_count) < 0.4,
+        rng.integers(1, team_count + 1, size=member_count),
+        np.nan,
+    )
+
+    records: List[Dict[str, Any]] = []
+    for meeting_id in range(1, meeting_count + 1):
+        (is_eligible,) = np.nonzero(first_meeting_ids <= meeting_id)
+        is_attending = (first_meeting_ids[is_eligible] == meeting_id) | (
+            rng.random(len(is_eligible)) < 0.5
+        )
+        attendees = rng.permutation(is_eligible[is_attending])
+        group_count = -(-len(attendees) // MAX_GROUP_SIZE)
+        for group, group_attendees in enumerate(
+            np.array_split(attendees, group_count), start=1
+        ):
+            levels = rng.permutation(
+                np.arange(MAX_GROUP_SIZE, MAX_GROUP_SIZE - len(group_attendees), -1)
+            )
+            for member, level in zip(group_attendees, levels):
+                records.append(
+                    {
+                        MEMBER_ID_COLUMN_NAME: member_ids[member],
+                        MEETING_ID_COLUMN_NAME: meeting_id,
+                        GROUP_COLUMN_NAME: group,
+                        ROUND_COLUMN_NAME: 1,
+                        LEVEL_COLUMN_NAME: float(level),
+                        TEAM_ID_COLUMN_NAME: team_ids[member],
+                    }
+                )
+    df_weekly_measurements = pd.DataFrame(records)
+    df_weekly_measurements.insert(
+        0, INDEX_COLUMN_NAME, np.arange(1, len(df_weekly_measurements) + 1)
+    )
+
+    df_account_status = pd.DataFrame(
+        {
+            INDEX_COLUMN_NAME: np.arange(1, member_count + 1),
+            MEMBER_ID_COLUMN_NAME: member_ids,
+            MEMBER_NAME_COLUMN_NAME: [f"Member {i}" for i in range(member_count)],
+            HIVE_ACCOUNT_NAME_COLUMN_NAME: rng.random(member_count) < 0.9,
+            SIGNATURE_ON_FILE_COLUMN_NAME: rng.random(member_count) < 0.9,
+        }
+    )
+
+    df_late_consensus = (
+        df_weekly_measurements[rng.random(len(df_weekly_measurements)) < 0.01][
+            [MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME]
+        ]
+        .drop_duplicates()
+        .reset_index(drop=True)
+    )
+    df_late_consensus.insert(
+        0, INDEX_COLUMN_NAME, np.arange(1, len(df_late_consensus) + 1)
+    )
+
+    df_teams = pd.DataFrame(
+        {
+            INDEX_COLUMN_NAME: np.arange(1, team_count + 1),
+            TEAM_ID_COLUMN_NAME: np.arange(1, team_count + 1),
+            TEAM_NAME_COLUMN_NAME: [f"Team {i}" for i in range(1, team_count + 1)],
+        }
+    )
+    return fractal_governance.util.FractalDatasetFrames(
+        df_weekly_measurements=df_weekly_measurements,
+        df_account_status=df_account_status,
+        df_late_consensus=df_late_consensus,
+        df_teams=df_teams,
+    )
+
+
+@attrs.frozen
+class Tolerances:
+    """The growth of a stage that `compare` reports as a regression
+
+    `max_time_ratio` and `max_peak_bytes_ratio` are the largest ratios of a stage's
+    time and peak memory to its baseline, and `max_growth` is the largest growth of
+    a stage's time each time the number of meetings of a synthetic dataset doubles.
+    Times shorter than `floor_seconds` are compared as if they took `floor_seconds`,
+    which is the jitter of a stage's time."""
+
+    max_time_ratio: float = 1.5
+    max_peak_bytes_ratio: float = 1.5
+    max_growth: float = 2.4
+    floor_seconds: float = 0.03
+
+
+@attrs.frozen
+class StageMeasurement:
+    """The time in seconds and the peak memory in bytes of a stage"""
+
+    seconds: float
+    peak_bytes: int
+
+
+@attrs.frozen
+class PerfResults:
+    """The StageMeasurements of every stage on each synthetic dataset"""
+
+    meeting_count_by_dataset_name: Dict[str, int]
+    measurements_by_dataset_name: Dict[str, Dict[str, StageMeasurement]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return these results as a dictionary that can be represented in JSON"""
+        return {
+            "version": PERF_RESULTS_VERSION,
+            "datasets": {
+                dataset_name: {
+                    "meeting_count": self.meeting_count_by_dataset_name[dataset_name],
+                    "stages": {
+                        stage_name: attrs.asdict(stage_measurement)
+                        for stage_name, stage_measurement in measurements.items()
+                    },
+                }
+                for dataset_name, measurements in (
+                    self.measurements_by_dataset_name.items()
+                )
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, value: Mapping[str, Any]) -> "PerfResults":
+        """Return the PerfResults of a dictionary returned by `to_dict`"""
+        if value.get("version") != PERF_RESULTS_VERSION:
+            raise ValueError(
+                f"version={value.get('version')} must be {PERF_RESULTS_VERSION}"
+            )
+        return cls(
+            meeting_count_by_dataset_name={
+                dataset_name: dataset["meeting_count"]
+                for dataset_name, dataset in value["datasets"].items()
+            },
+            measurements_by_dataset_name={
+                dataset_name: {
+                    stage_name: StageMeasurement(**stage_measurement)
+                    for stage_name, stage_measurement in dataset["stages"].items()
+                }
+                for dataset_name, dataset in value["datasets"].items()
+            },
+        )
+
+    @classmethod
+    def read(cls, path: os.PathLike = DEFAULT_BASELINES_PATH) -> "PerfResults":
+        """Return the PerfResults of the given JSON file"""
+        with open(path) as file:
+            return cls.from_dict(json.load(file))
+
+    def write(self, path: os.PathLike = DEFAULT_BASELINES_PATH) -> None:
+        """Write these results to the given JSON file"""
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+def _measure(
+    function: Callable[[], Any], *, repeat: int, trace: bool = False
+) -> Tuple[float, int]:
+    """Internal helper method that returns the median time of `repeat` calls of
+    `function`, or of as many as fit in MAX_MEASURE_SECONDS, and, if `trace` is
+    True, the peak memory of another call"""
+    seconds: List[float] = []
+    while len(seconds) < repeat and sum(seconds) < MAX_MEASURE_SECONDS:
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            function()
+            seconds.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    peak_bytes = 0
+    if trace:
+        _, peak_bytes = fractal_governance.memory.trace_peak(function)
+    return float(np.median(seconds)), peak_bytes
+
+
+def measure_stages(
+    frames: fractal_governance.util.FractalDatasetFrames,
+    *,
+    repeat: int = DEFAULT_REPEAT,
+) -> Dict[str, StageMeasurement]:
+    """Return the StageMeasurement of each stage of the pipeline on the given frames
+
+    Each stage is measured separately, on the results of the stages before it, and
+    every derived frame of the Dataset is its own stage."""
+    measurements: Dict[str, StageMeasurement] = dict()
+
+    def measure(stage_name: str, function: Callable[[], Any]) -> None:
+        seconds, peak_bytes = _measure(function, repeat=repeat, trace=True)
+        measurements[stage_name] = StageMeasurement(
+            seconds=seconds, peak_bytes=peak_bytes
+        )
+
+    measure("create_dataframe", frames.create_dataframe)
+    df = fractal_governance.read_only.freeze(frames.create_dataframe())
+    measure("tables", lambda: fractal_governance.tables.Tables.from_dataframe(df))
+    dataset = fractal_governance.dataset.Dataset(df=df, max_workers=1)
+    for derived_frame in fractal_governance.dataset.DERIVED_FRAMES:
+        measure(derived_frame.name, lambda: derived_frame.create(dataset))
+    measure("weighted_means", lambda: WeightedMeans(dataset=dataset))
+    weighted_means = WeightedMeans(dataset=dataset)
+    measure(
+        "addendum_1",
+        lambda: Addendum1Dataset(dataset=dataset, weighted_means=weighted_means),
+    )
+    measure(
+        "measurement_uncertainty",
+        lambda: fractal_governance.measurement_uncertainty.dataset.Dataset(
+            dataset=dataset
+        ),
+    )
+    measure(
+        "co_attendance",
+        lambda: CoAttendanceGraph.from_group_members(dataset.df_group_members),
+    )
+    return measurements
+
+
+def run(
+    synthetic_dataset_specs: Sequence[SyntheticDatasetSpec] = SYNTHETIC_DATASET_SPECS,
+    *,
+    repeat: int = DEFAULT_REPEAT,
+) -> PerfResults:
+    """Return the PerfResults of every stage on each of the given synthetic
+    datasets"""
+    return PerfResults(
+        meeting_count_by_dataset_name={
+            spec.name: spec.meeting_count for spec in synthetic_dataset_specs
+        },
+        measurements_by_dataset_name={
+            spec.name: measure_stages(spec.create_frames(), repeat=repeat)
+            for spec in synthetic_dataset_specs
+        },
+    )
+
+
+@attrs.frozen
+class PerfCheck:
+    """A comparison of one metric of a stage to its limit
+
+    `metric` is "time" or "peak_bytes", which compare a stage to its `baseline`, or
+    "growth", which compares a stage's time on the largest dataset to its
+    `baseline` time on the smallest one, and whose `ratio` is the growth per
+    doubling of the meetings. `ratio` is None if the baseline has no such stage."""
+
+    dataset_name: str
+    stage_name: str
+    metric: str
+    baseline: Optional[float]
+    current: float
+    ratio: Optional[float]
+    max_ratio: float
+
+    @property
+    def is_regression(self) -> bool:
+        return self.ratio is not None and self.ratio > self.max_ratio
+
+
+@attrs.frozen
+class PerfReport:
+    """The PerfChecks of `compare` and the speed ratio of the machine the current
+    results were measured on to the one the baseline was recorded on"""
+
+    checks: Tuple[PerfCheck, ...]
+    speed_ratio: float = 1.0
+
+    @property
+    def regressions(self) -> Tuple[PerfCheck, ...]:
+        return tuple(check for check in self.checks if check.is_regression)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the checks as a DataFrame with an IsRegression column"""
+        return pd.DataFrame(
+            [
+                {
+                    "Dataset": check.dataset_name,
+                    "Stage": check.stage_name,
+                    "Metric": check.metric,
+                    "Baseline": check.baseline,
+                    "Current": check.current,
+                    "Ratio": check.ratio,
+                    "MaxRatio": check.max_ratio,
+                    "IsRegression": check.is_regression,
+                }
+                for check in self.checks
+            ],
+            columns=[
+                "Dataset",
+                "Stage",
+                "Metric",
+                "Baseline",
+                "Current",
+                "Ratio",
+                "MaxRatio",
+                "IsRegression",
+            ],
+        )
+
+    def to_text(self) -> str:
+        """Return the checks as a diff of the baseline and current values of each
+        stage, where each regression is marked with a "!" and the stages that were
+        not compared with a "?"."""
+        lines = [f"speed ratio {self.speed_ratio:.2f}x to the baseline machine"]
+        for check in self.checks:
+            marker = "!" if check.is_regression else "?" if check.ratio is None else " "
+            ratio = "" if check.ratio is None else f"{check.ratio:6.2f}x"
+            if check.is_regression:
+                ratio += f" > {check.max_ratio:.2f}x"
+            lines.append(
+                f"{marker} {check.dataset_name}/{check.stage_name:<50} "
+                f"{check.metric:<10} {_format_value(check.metric, check.baseline):>10}"
+                f" -> {_format_value(check.metric, check.current):>10} {ratio}".rstrip()
+            )
+        regression_count = len(self.regressions)
+        lines.append(
+            f"{regression_count} regression{'' if regression_count == 1 else 's'} in "
+            f"{len(self.checks)} checks"
+        )
+        return "\n".join(lines)
+
+
+def _format_value(metric: str, value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if metric == "peak_bytes":
+        return f"{value / 2**20:.2f} MiB"
+    return f"{value * 1000:.1f} ms"
+
+
+def compare(
+    baseline: PerfResults,
+    current: PerfResults,
+    tolerances: Tolerances = Tolerances(),
+    *,
+    tolerances_by_stage_name: Optional[Mapping[str, Tolerances]] = None,
+) -> PerfReport:
+    """Return the PerfReport of the current results compared to the baseline, and of
+    the growth of each stage's time from the smallest to the largest synthetic
+    dataset of the current results
+
+    `tolerances_by_stage_name` overrides `tolerances` for the given stages."""
+    tolerances_by_stage_name = tolerances_by_stage_name or dict()
+    speed_ratio = _get_speed_ratio(
+        baseline, current, tolerances, tolerances_by_stage_name
+    )
+    checks = []
+    for dataset_name, measurements in current.measurements_by_dataset_name.items():
+        baseline_measurements = baseline.measurements_by_dataset_name.get(
+            dataset_name, dict()
+        )
+        for stage_name, measurement in measurements.items():
+            stage_tolerances = tolerances_by_stage_name.get(stage_name, tolerances)
+            baseline_measurement = baseline_measurements.get(stage_name)
+            baseline_seconds = baseline_peak_bytes = None
+            time_ratio = peak_bytes_ratio = None
+            if baseline_measurement is not None:
+                baseline_seconds = baseline_measurement.seconds
+                baseline_peak_bytes = baseline_measurement.peak_bytes
+                time_ratio = _get_ratio(
+                    measurement.seconds / speed_ratio,
+                    baseline_measurement.seconds,
+                    stage_tolerances.floor_seconds,
+                )
+                if baseline_measurement.peak_bytes > 0:
+                    peak_bytes_ratio = (
+                        measurement.peak_bytes / baseline_measurement.peak_bytes
+                    )
+            checks.append(
+                PerfCheck(
+                    dataset_name=dataset_name,
+                    stage_name=stage_name,
+                    metric="time",
+                    baseline=baseline_seconds,
+                    current=measurement.seconds,
+                    ratio=time_ratio,
+                    max_ratio=stage_tolerances.max_time_ratio,
+                )
+            )
+            checks.append(
+                PerfCheck(
+                    dataset_name=dataset_name,
+                    stage_name=stage_name,
+                    metric="peak_bytes",
+                    baseline=baseline_peak_bytes,
+                    current=measurement.peak_bytes,
+                    ratio=peak_bytes_ratio,
+                    max_ratio=stage_tolerances.max_peak_bytes_ratio,
+                )
+            )
+    checks.extend(_get_growth_checks(current, tolerances, tolerances_by_stage_name))
+    return PerfReport(checks=tuple(checks), speed_ratio=speed_ratio)
+
+
+def _get_speed_ratio(
+    baseline: PerfResults,
+    current: PerfResults,
+    tolerances: Tolerances = Tolerances(),
+    tolerances_by_stage_name: Optional[Mapping[str, Tolerances]] = None,
+) -> float:
+    """Internal helper method that returns the median ratio of the current to the
+    baseline time of every stage on every synthetic dataset that took at least its
+    `Tolerances.floor_seconds`, or 1.0 if there is none"""
+    tolerances_by_stage_name = tolerances_by_stage_name or dict()
+    ratios = []
+    for dataset_name, measurements in current.measurements_by_dataset_name.items():
+        baseline_measurements = baseline.measurements_by_dataset_name.get(
+            dataset_name, dict()
+        )
+        for stage_name, measurement in measurements.items():
+            baseline_measurement = baseline_measurements.get(stage_name)
+            floor_seconds = tolerances_by_stage_name.get(
+                stage_name, tolerances
+            ).floor_seconds
+            if (
+                baseline_measurement is not None
+                and min(baseline_measurement.seconds, measurement.seconds)
+                >= floor_seconds
+            ):
+                ratios.append(measurement.seconds / baseline_measurement.seconds)
+    return float(np.median(ratios)) if ratios else 1.0
+
+
+def _get_ratio(seconds: float, baseline_seconds: float, floor_seconds: float) -> float:
+    return max(seconds, floor_seconds) / max(baseline_seconds, floor_seconds)
+
+
+def _get_growth_checks(
+    current: PerfResults,
+    tolerances: Tolerances,
+    tolerances_by_stage_name: Mapping[str, Tolerances],
+) -> List[PerfCheck]:
+    """Internal helper method that returns the growth PerfChecks of the largest
+    dataset of the current results relative to the smallest one, if they differ"""
+    meeting_count_by_dataset_name = current.meeting_count_by_dataset_name
+    if not meeting_count_by_dataset_name:
+        return []
+    smallest_dataset_name = min(
+        meeting_count_by_dataset_name, key=meeting_count_by_dataset_name.__getitem__
+    )
+    largest_dataset_name = max(
+        meeting_count_by_dataset_name, key=meeting_count_by_dataset_name.__getitem__
+    )
+    # The number of times the meetings double from the smallest to the largest
+    # dataset.
+    doubling_count = math.log2(
+        meeting_count_by_dataset_name[largest_dataset_name]
+        / meeting_count_by_dataset_name[smallest_dataset_name]
+    )
+    if doubling_count == 0:
+        return []
+    smallest_measurements = current.measurements_by_dataset_name[smallest_dataset_name]
+    checks = []
+    for stage_name, measurement in current.measurements_by_dataset_name[
+        largest_dataset_name
+    ].items():
+        smallest_measurement = smallest_measurements.get(stage_name)
+        if smallest_measurement is None:
+            continue
+        stage_tolerances = tolerances_by_stage_name.get(stage_name, tolerances)
+        ratio = _get_ratio(
+            measurement.seconds,
+            smallest_measurement.seconds,
+            stage_tolerances.floor_seconds,
+        )
+        checks.append(
+            PerfCheck(
+                dataset_name=largest_dataset_name,
+                stage_name=stage_name,
+                metric="growth",
+                baseline=smallest_measurement.seconds,
+                current=measurement.seconds,
+                ratio=ratio ** (1 / doubling_count),
+                max_ratio=stage_tolerances.max_growth,
+            )
+        )
+    return checks
@@ -0,0 +1,435 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""The data of the plots of fractal governance data analysis
+
+Every plot of `fractal_governance.plots.Plots` is split into a plot data function in
+this module, which prepares a tidy (long-form) DataFrame from a Dataset, and a
+renderer that only draws it: the matplotlib renderers in `fractal_governance.plots`
+and the Altair (Vega-Lite) renderers in `fractal_governance.charts`.
+
+The tidy DataFrames have one row per bar or point. The time-series plots have the
+columns Period (the start of the time period), PeriodLabel and Value, along with
+Series for the plots with more than one series.
+"""
+
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+
+import attrs
+import numpy as np
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.read_only
+
+from .constants import (
+    ACCUMULATED_RESPECT_COLUMN_NAME,
+    ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
+    ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    BIN_END_COLUMN_NAME,
+    BIN_START_COLUMN_NAME,
+    ERROR_COLUMN_NAME,
+    GROUP_SIZE_COLUMN_NAME,
+    KENDALL_TAU_COLUMN_NAME,
+    MEAN_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    NEW_MEMBER_COUNT_COLUMN_NAME,
+    PERIOD_COLUMN_NAME,
+    PERIOD_LABEL_COLUMN_NAME,
+    RETURNING_MEMBER_COUNT_COLUMN_NAME,
+    SERIES_COLUMN_NAME,
+    STANDARD_DEVIATION_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+    VALUE_COLUMN_NAME,
+    X_COLUMN_NAME,
+)
+from .rollups import Granularity, format_period, get_rollup
+
+NEW_MEMBERS_SERIES_NAME = "New Members"
+
+RETURNING_MEMBERS_SERIES_NAME = "Returning Members"
+
+
+@attrs.frozen(kw_only=True)
+class PlotData:
+    """The tidy DataFrame of a plot along with its titles
+
+    `granularity` is the Granularity of a time-series plot and `annotations` are the
+    scalar results shown on a plot (e.g. the parameters of a fit)."""
+
+    df: pd.DataFrame = attrs.field(converter=fractal_governance.read_only.freeze)
+    title: str
+    x_label: str
+    y_label: str
+    granularity: Optional[Granularity] = None
+    annotations: Mapping[str, Any] = attrs.field(factory=dict)
+
+
+def create_period_frame(
+    values: Union[pd.Series, pd.DataFrame], granularity: Granularity
+) -> pd.DataFrame:
+    """Return the tidy DataFrame for the given Series, or DataFrame with one column
+    per series, indexed by the start of each time period
+
+    The Series column is categorical with the categories in column order."""
+    if isinstance(values, pd.Series):
+        df = values.rename(VALUE_COLUMN_NAME).rename_axis(PERIOD_COLUMN_NAME)
+        df = df.reset_index()
+    else:
+        df = values.rename_axis(PERIOD_COLUMN_NAME).melt(
+            var_name=SERIES_COLUMN_NAME,
+            value_name=VALUE_COLUMN_NAME,
+            ignore_index=False,
+        )
+        df = df.reset_index()
+        df[SERIES_COLUMN_NAME] = pd.Categorical(
+            df[SERIES_COLUMN_NAME], categories=list(values.columns)
+        )
+    return insert_period_labels(df, granularity)
+
+
+def insert_period_labels(df: pd.DataFrame, granularity: Granularity) -> pd.DataFrame:
+    """Insert the PeriodLabel column after the Period column of the given DataFrame
+    and return it"""
+    df.insert(
+        df.columns.get_loc(PERIOD_COLUMN_NAME) + 1,
+        PERIOD_LABEL_COLUMN_NAME,
+        [format_period(period, granularity) for period in df[PERIOD_COLUMN_NAME]],
+    )
+    return df
+
+
+def get_period_axis_label(granularity: Granularity) -> str:
+    """Return the label of the time axis for the given Granularity"""
+    return "Meeting Date" if granularity == Granularity.Week else granularity.name
+
+
+def _get_member_attendance(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> pd.DataFrame:
+    """Internal helper method that returns the new and returning member attendance
+    in each time period of the given Granularity"""
+    if granularity == Granularity.Week:
+        return dataset.df_member_attendance_new_and_returning_by_meeting.set_index(
+            MEETING_DATE_COLUMN_NAME
+        )
+    return get_rollup(
+        dataset.df_member_attendance_new_and_returning_by_period, granularity
+    )
+
+
+def _get_member_respect(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> pd.DataFrame:
+    """Internal helper method that returns the member Respect earned in each time
+    period of the given Granularity"""
+    if granularity == Granularity.Week:
+        return dataset.df_member_respect_new_and_returning_by_meeting.set_index(
+            MEETING_DATE_COLUMN_NAME
+        )
+    return get_rollup(
+        dataset.df_member_respect_new_and_returning_by_period, granularity
+    )
+
+
+def _get_team_respect(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> pd.DataFrame:
+    """Internal helper method that returns the Respect earned by each team in each
+    time period of the given Granularity, whose start is in the Period column"""
+    if granularity == Granularity.Week:
+        df = dataset.df_team_respect_by_meeting_date.rename(
+            columns={MEETING_DATE_COLUMN_NAME: PERIOD_COLUMN_NAME}
+        )
+    else:
+        df = get_rollup(dataset.df_team_respect_by_period, granularity).reset_index()
+    return df[
+        [PERIOD_COLUMN_NAME, TEAM_NAME_COLUMN_NAME, ACCUMULATED_RESPECT_COLUMN_NAME]
+    ]
+
+
+def get_attendance_vs_time(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the attendance in each time period"""
+    if granularity == Granularity.Week:
+        attendance = dataset.tables.df_attendance.groupby(
+            MEETING_DATE_COLUMN_NAME
+        ).size()
+        y_label = "Attendees"
+    else:
+        df = _get_member_attendance(dataset, granularity)
+        attendance = (
+            df[NEW_MEMBER_COUNT_COLUMN_NAME] + df[RETURNING_MEMBER_COUNT_COLUMN_NAME]
+        )
+        y_label = "Attendees per Meeting"
+    return PlotData(
+        df=create_period_frame(attendance, granularity),
+        title="Attendance vs Time",
+        x_label=get_period_axis_label(granularity),
+        y_label=y_label,
+        granularity=granularity,
+    )
+
+
+def get_attendance_vs_time_stacked(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the returning and new member attendance in each time period"""
+    df = _get_member_attendance(dataset, granularity)
+    df = df[[RETURNING_MEMBER_COUNT_COLUMN_NAME, NEW_MEMBER_COUNT_COLUMN_NAME]].rename(
+        columns={
+            RETURNING_MEMBER_COUNT_COLUMN_NAME: RETURNING_MEMBERS_SERIES_NAME,
+            NEW_MEMBER_COUNT_COLUMN_NAME: NEW_MEMBERS_SERIES_NAME,
+        }
+    )
+    return PlotData(
+        df=create_period_frame(df, granularity),
+        title="Attendance vs Time",
+        x_label=get_period_axis_label(granularity),
+        y_label="Attendees"
+        if granularity == Granularity.Week
+        else "Attendees per Meeting",
+        granularity=granularity,
+    )
+
+
+def get_attendance_consistency_histogram(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the histogram of the number of meetings attended by each member with
+    one bin per meeting"""
+    counts, bin_edges = np.histogram(
+        dataset.df_member_leader_board[ATTENDANCE_COUNT_COLUMN_NAME].dropna().values,
+        bins=dataset.total_meetings,
+    )
+    return PlotData(
+        df=pd.DataFrame(
+            {
+                BIN_START_COLUMN_NAME: bin_edges[:-1],
+                BIN_END_COLUMN_NAME: bin_edges[1:],
+                VALUE_COLUMN_NAME: counts,
+            }
+        ),
+        title="Consistency of Attendance",
+        x_label="Total Meetings Attended by a Unique Member",
+        y_label="Counts",
+    )
+
+
+def get_accumulated_member_respect_vs_time(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the accumulated member Respect at the end of each time period"""
+    df = _get_member_respect(dataset, granularity)
+    return PlotData(
+        df=create_period_frame(
+            df[ACCUMULATED_RESPECT_COLUMN_NAME].cumsum(), granularity
+        ),
+        title="Accumulated Member Respect vs Time",
+        x_label=get_period_axis_label(granularity),
+        y_label="Accumulated Respect",
+        granularity=granularity,
+    )
+
+
+def get_accumulated_member_respect_vs_time_stacked(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the accumulated Respect of returning and new members at the end of each
+    time period"""
+    df = _get_member_respect(dataset, granularity)
+    df = (
+        df[
+            [
+                ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
+                ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
+            ]
+        ]
+        .cumsum()
+        .rename(
+            columns={
+                ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME: RETURNING_MEMBERS_SERIES_NAME,  # noqa: E501
+                ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME: NEW_MEMBERS_SERIES_NAME,
+            }
+        )
+    )
+    return PlotData(
+        df=create_period_frame(df, granularity),
+        title="Accumulated Member Respect vs Time",
+        x_label=get_period_axis_label(granularity),
+        y_label="Accumulated Member Respect",
+        granularity=granularity,
+    )
+
+
+def get_accumulated_team_respect_vs_time(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the accumulated Respect of each team at the end of each time period in
+    which it earned Respect"""
+    df = _get_team_respect(dataset, granularity)
+    df = pd.DataFrame(
+        {
+            PERIOD_COLUMN_NAME: df[PERIOD_COLUMN_NAME],
+            SERIES_COLUMN_NAME: pd.Categorical(df[TEAM_NAME_COLUMN_NAME]),
+            VALUE_COLUMN_NAME: df.groupby(TEAM_NAME_COLUMN_NAME)[
+                ACCUMULATED_RESPECT_COLUMN_NAME
+            ].cumsum(),
+        }
+    )
+    insert_period_labels(df, granularity)
+    return PlotData(
+        df=df,
+        title="Accumulated Team Respect vs Time",
+        x_label=get_period_axis_label(granularity),
+        y_label="Accumulated Team Respect",
+        granularity=granularity,
+    )
+
+
+def get_accumulated_team_respect_vs_time_stacked(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the Respect earned by each team in each time period with the teams
+    ordered by the team leaderboard"""
+    df = _get_team_respect(dataset, granularity)
+    df = pd.DataFrame(
+        {
+            PERIOD_COLUMN_NAME: df[PERIOD_COLUMN_NAME],
+            SERIES_COLUMN_NAME: pd.Categorical(
+                df[TEAM_NAME_COLUMN_NAME],
+                categories=list(dataset.df_team_leader_board.index),
+            ),
+            VALUE_COLUMN_NAME: df[ACCUMULATED_RESPECT_COLUMN_NAME],
+        }
+    )
+    insert_period_labels(df, granularity)
+    return PlotData(
+        df=df,
+        title="Accumulated Team Respect vs Time",
+        x_label=get_period_axis_label(granularity),
+        y_label="Accumulated Team Respect",
+        granularity=granularity,
+    )
+
+
+def get_team_representation_vs_time(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the team representation in each time period"""
+    if granularity == Granularity.Week:
+        team_representation = dataset.df_team_representation_by_date
+    else:
+        team_representation = get_rollup(
+            dataset.df_team_representation_by_period, granularity
+        )
+    return PlotData(
+        df=create_period_frame(team_representation, granularity),
+        title="Team Representation vs Time",
+        x_label=get_period_axis_label(granularity),
+        y_label="Team Representation",
+        granularity=granularity,
+    )
+
+
+def get_group_size_histogram(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the histogram of the size of every group of every round of every
+    meeting with one bin per size (see `fractal_governance.group_cube`)"""
+    group_size_counts = (
+        dataset.df_group_cube[GROUP_SIZE_COLUMN_NAME].value_counts().sort_index()
+    )
+    return PlotData(
+        df=pd.DataFrame(
+            {
+                BIN_START_COLUMN_NAME: group_size_counts.index - 0.5,
+                BIN_END_COLUMN_NAME: group_size_counts.index + 0.5,
+                VALUE_COLUMN_NAME: group_size_counts.to_numpy(),
+            }
+        ),
+        title="Consensus Group Sizes",
+        x_label="Members per Group",
+        y_label="Groups",
+    )
+
+
+def get_ranking_stability_histogram(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the histogram of the Kendall tau between the Levels of every group's
+    members and their Levels at the previous meeting each of them attended (see
+    `fractal_governance.ranking_stability`)
+
+    The annotations are the mean of the Kendall taus and the number of groups with
+    a Kendall tau."""
+    kendall_taus = dataset.df_ranking_stability[KENDALL_TAU_COLUMN_NAME].dropna()
+    counts, bin_edges = np.histogram(kendall_taus, bins=10, range=(-1, 1))
+    return PlotData(
+        df=pd.DataFrame(
+            {
+                BIN_START_COLUMN_NAME: bin_edges[:-1],
+                BIN_END_COLUMN_NAME: bin_edges[1:],
+                VALUE_COLUMN_NAME: counts,
+            }
+        ),
+        title="Ranking Stability Between Meetings",
+        x_label="Kendall Tau",
+        y_label="Groups",
+        annotations={
+            "mean": kendall_taus.mean(),
+            "group_count": len(kendall_taus),
+        },
+    )
+
+
+def get_attendance_count_vs_level(
+    dataset: fractal_governance.dataset.Dataset, granularity: Granularity
+) -> PlotData:
+    """Return the mean Level for each attendance count and its linear regression
+
+    The annotations are the slope, intercept and their standard errors."""
+    import scipy.stats
+
+    df = dataset.df_member_level_by_attendance_count
+    # Perform a linear regression on this data to demonstrate how meeting attendance
+    # affects a member's standing as perceived by their fractal.
+    result = scipy.stats.linregress(
+        df[ATTENDANCE_COUNT_COLUMN_NAME], df[MEAN_COLUMN_NAME]
+    )
+    return PlotData(
+        df=pd.DataFrame(
+            {
+                X_COLUMN_NAME: df[ATTENDANCE_COUNT_COLUMN_NAME],
+                VALUE_COLUMN_NAME: df[MEAN_COLUMN_NAME],
+                ERROR_COLUMN_NAME: df[STANDARD_DEVIATION_COLUMN_NAME],
+            }
+        ),
+        title="Attendance Count vs Level",
+        x_label="Attendance Count",
+        y_label="Mean Level",
+        annotations={
+            "slope": result.slope,
+            "slope_stderr": result.stderr,
+            "intercept": result.intercept,
+            "intercept_stderr": result.intercept_stderr,
+        },
+    )
+
+
+# The plot data function of each plot of `fractal_governance.plots.Plots`.
+PLOT_DATA_FUNCTION_BY_PLOT_NAME: Dict[
+    str, Callable[[fractal_governance.dataset.Dataset, Granularity], PlotData]
+] = {
+    "attendance_vs_time": get_attendance_vs_time,
+    "attendance_vs_time_stacked": get_attendance_vs_time_stacked,
+    "attendance_consistency_histogram": get_attendance_consistency_histogram,
+    "accumulated_member_respect_vs_time": get_accumulated_member_respect_vs_time,
+    "accumulated_member_respect_vs_time_stacked": get_accumulated_member_respect_vs_time_stacked,  # noqa: E501
+    "accumulated_team_respect_vs_time": get_accumulated_team_respect_vs_time,
+    "accumulated_team_respect_vs_time_stacked": get_accumulated_team_respect_vs_time_stacked,  # noqa: E501
+    "team_representation_vs_time": get_team_representation_vs_time,
+    "attendance_count_vs_level": get_attendance_count_vs_level,
+    "group_size_histogram": get_group_size_histogram,
+    "ranking_stability_histogram": get_ranking_stability_histogram,
+}
@@ -1,14 +1,17 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
 """Plots for fractal governance data analysis"""
 
+import itertools
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple
+
 import attrs
-import matplotlib.figure
-import matplotlib.pyplot as plt
-import matplotlib.ticker
+import numpy as np
 import pandas as pd
-import scipy.stats
 
 import fractal_governance.dataset
+import fractal_governance.render_cache
+import fractal_governance.rollups
 import fractal_governance.util
 
 from .constants import (
@@ -16,228 +19,473 @@ from .constants import (
     ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
     ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
     ATTENDANCE_COUNT_COLUMN_NAME,
-    LEVEL_COLUMN_NAME,
-    MEAN_COLUMN_NAME,
+    BIN_END_COLUMN_NAME,
+    BIN_START_COLUMN_NAME,
+    ERROR_COLUMN_NAME,
+    GROUP_SIZE_COLUMN_NAME,
+    KENDALL_TAU_COLUMN_NAME,
     MEETING_DATE_COLUMN_NAME,
     NEW_MEMBER_COUNT_COLUMN_NAME,
+    PERIOD_COLUMN_NAME,
+    PERIOD_LABEL_COLUMN_NAME,
     RETURNING_MEMBER_COUNT_COLUMN_NAME,
-    STANDARD_DEVIATION_COLUMN_NAME,
-    TEAM_NAME_COLUMN_NAME,
+    SERIES_COLUMN_NAME,
+    VALUE_COLUMN_NAME,
+    X_COLUMN_NAME,
 )
 
+if TYPE_CHECKING:
+    import matplotlib.axes
+    import matplotlib.figure
+
+    import fractal_governance.charts
+from .plot_data import PLOT_DATA_FUNCTION_BY_PLOT_NAME, PlotData
+from .render_cache import PlotInput
+from .rollups import DEFAULT_MAX_BAR_COUNT, Granularity
+
 DEFAULT_FIGSIZE = (10, 6)
 
+# The Dataset attributes read by each plot, whose fingerprints are part of the plot's
+# render cache key.
+PLOT_INPUTS_BY_PLOT_NAME: Dict[
+    str, Tuple[fractal_governance.render_cache.PlotInput, ...]
+] = {
+    "attendance_vs_time": (
+        PlotInput("tables.df_attendance", [MEETING_DATE_COLUMN_NAME]),
+    ),
+    "attendance_vs_time_stacked": (
+        PlotInput(
+            "df_member_attendance_new_and_returning_by_meeting",
+            [
+                MEETING_DATE_COLUMN_NAME,
+                NEW_MEMBER_COUNT_COLUMN_NAME,
+                RETURNING_MEMBER_COUNT_COLUMN_NAME,
+            ],
+        ),
+    ),
+    "attendance_consistency_histogram": (
+        PlotInput("df_member_leader_board", [ATTENDANCE_COUNT_COLUMN_NAME]),
+        PlotInput("tables.df_meetings"),
+    ),
+    "accumulated_member_respect_vs_time": (
+        PlotInput(
+            "df_member_respect_new_and_returning_by_meeting",
+            [MEETING_DATE_COLUMN_NAME, ACCUMULATED_RESPECT_COLUMN_NAME],
+        ),
+    ),
+    "accumulated_member_respect_vs_time_stacked": (
+        PlotInput(
+            "df_member_respect_new_and_returning_by_meeting",
+            [
+                MEETING_DATE_COLUMN_NAME,
+                ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
+                ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
+            ],
+        ),
+    ),
+    "accumulated_team_respect_vs_time": (PlotInput("df_team_respect_by_meeting_date"),),
+    "accumulated_team_respect_vs_time_stacked": (
+        PlotInput("df_team_respect_by_meeting_date"),
+        PlotInput("df_team_leader_board"),
+    ),
+    "team_representation_vs_time": (PlotInput("df_team_representation_by_date"),),
+    "attendance_count_vs_level": (PlotInput("df_member_level_by_attendance_count"),),
+    "group_size_histogram": (PlotInput("df_group_cube", [GROUP_SIZE_COLUMN_NAME]),),
+    "ranking_stability_histogram": (
+        PlotInput("df_ranking_stability", [KENDALL_TAU_COLUMN_NAME]),
+    ),
+}
+
+# The rollups read by each time-series plot in place of its weekly inputs when its
+# Granularity is not Granularity.Week.
+ROLLUP_PLOT_INPUTS_BY_PLOT_NAME: Dict[
+    str, Tuple[fractal_governance.render_cache.PlotInput, ...]
+] = {
+    "attendance_vs_time": (
+        PlotInput("df_member_attendance_new_and_returning_by_period"),
+    ),
+    "attendance_vs_time_stacked": (
+        PlotInput("df_member_attendance_new_and_returning_by_period"),
+    ),
+    "accumulated_member_respect_vs_time": (
+        PlotInput(
+            "df_member_respect_new_and_returning_by_period",
+            [ACCUMULATED_RESPECT_COLUMN_NAME],
+        ),
+    ),
+    "accumulated_member_respect_vs_time_stacked": (
+        PlotInput(
+            "df_member_respect_new_and_returning_by_period",
+            [
+                ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
+                ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
+            ],
+        ),
+    ),
+    "accumulated_team_respect_vs_time": (PlotInput("df_team_respect_by_period"),),
+    "accumulated_team_respect_vs_time_stacked": (
+        PlotInput("df_team_respect_by_period"),
+        PlotInput("df_team_leader_board"),
+    ),
+    "team_representation_vs_time": (PlotInput("df_team_representation_by_period"),),
+}
+
+# The width of each team's bar in `Plots.accumulated_team_respect_vs_time`.
+_TEAM_BAR_WIDTH_BY_GRANULARITY = {
+    Granularity.Week: pd.Timedelta(1, unit="d"),
+    Granularity.Month: pd.Timedelta(4, unit="d"),
+    Granularity.Quarter: pd.Timedelta(13, unit="d"),
+    Granularity.Year: pd.Timedelta(52, unit="d"),
+}
+
+
+def create_figure(
+    figsize: Tuple[float, float]
+) -> Tuple["matplotlib.figure.Figure", "matplotlib.axes.Axes"]:
+    """Return a new Figure with a single Axes
+
+    The Figure is not managed by pyplot, so it is released as soon as it is no longer
+    referenced and several Figures can be rendered concurrently."""
+    import matplotlib.figure
+
+    fig = matplotlib.figure.Figure(figsize=figsize)
+    return fig, fig.subplots()
+
+
+def get_colors() -> Iterator[str]:
+    """Return an endless iterator over the colors of the default property cycle"""
+    import matplotlib
+
+    return itertools.cycle(matplotlib.rcParams["axes.prop_cycle"].by_key()["color"])
+
+
+def set_period_labels(ax: "matplotlib.axes.Axes", period_labels: Iterable[str]) -> None:
+    """Label the bars of the given bar plot with their time periods"""
+    import matplotlib.ticker
+
+    ax.xaxis.set_major_formatter(matplotlib.ticker.FixedFormatter(list(period_labels)))
+
+
+def get_period_labels(df: pd.DataFrame) -> List[str]:
+    """Return the label of each time period of the given tidy DataFrame in time
+    order"""
+    return (
+        df.drop_duplicates(PERIOD_COLUMN_NAME)
+        .sort_values(PERIOD_COLUMN_NAME)[PERIOD_LABEL_COLUMN_NAME]
+        .to_list()
+    )
+
+
+def pivot_series(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the given tidy DataFrame with one column per series indexed by the
+    start of each time period"""
+    return df.pivot(
+        index=PERIOD_COLUMN_NAME, columns=SERIES_COLUMN_NAME, values=VALUE_COLUMN_NAME
+    )
+
+
+def draw_histogram(ax: "matplotlib.axes.Axes", df: pd.DataFrame, **kwargs: Any) -> Any:
+    """Draw the given tidy histogram, whose bins are already counted, and return the
+    result of `Axes.hist`"""
+    bin_starts = df[BIN_START_COLUMN_NAME].to_numpy()
+    bin_edges = np.append(bin_starts, df[BIN_END_COLUMN_NAME].iloc[-1])
+    return ax.hist(
+        bin_starts, bins=bin_edges, weights=df[VALUE_COLUMN_NAME].to_numpy(), **kwargs
+    )
+
 
 @attrs.frozen
 class Plots:
-    """A wrapper around fractal governance plots"""
+    """A wrapper around fractal governance plots
+
+    Every plot is available both as a matplotlib Figure and, through `render`, as
+    PNG or SVG bytes cached in `render_cache`.
+
+    The time-series plots draw one bar per `granularity` time period, rolled up from
+    the weekly meetings (see `fractal_governance.rollups`). Granularity.Auto draws at
+    most `max_bar_count` bars."""
 
     dataset: fractal_governance.dataset.Dataset
 
+    figsize: Tuple[float, float] = attrs.field(default=DEFAULT_FIGSIZE, kw_only=True)
+
+    granularity: Granularity = attrs.field(default=Granularity.Week, kw_only=True)
+
+    max_bar_count: int = attrs.field(default=DEFAULT_MAX_BAR_COUNT, kw_only=True)
+
+    render_cache: fractal_governance.render_cache.RenderCache = attrs.field(
+        default=fractal_governance.render_cache.DEFAULT_RENDER_CACHE,
+        kw_only=True,
+        repr=False,
+        eq=False,
+    )
+
+    _plot_data_by_key: Dict[Tuple[Any, ...], PlotData] = attrs.field(
+        factory=dict, init=False, repr=False, eq=False
+    )
+
+    _plot_data_lock: threading.Lock = attrs.field(
+        factory=threading.Lock, init=False, repr=False, eq=False
+    )
+
+    def render(
+        self,
+        plot_name: str,
+        *args: Any,
+        format: str = "png",
+        dpi: float = fractal_governance.render_cache.DEFAULT_DPI,
+    ) -> bytes:
+        """Return the named plot rendered in the given format
+
+        The rendered plot is cached, and is only rendered again when one of the
+        DataFrames it reads changes."""
+        if plot_name not in PLOT_INPUTS_BY_PLOT_NAME:
+            raise ValueError(f"Unknown plot_name {plot_name}")
+        plot_inputs = PLOT_INPUTS_BY_PLOT_NAME[plot_name]
+        options: Tuple[Any, ...] = ()
+        if plot_name in ROLLUP_PLOT_INPUTS_BY_PLOT_NAME:
+            granularity = self.resolved_granularity
+            options = (granularity.name,)
+            if granularity != Granularity.Week:
+                plot_inputs = ROLLUP_PLOT_INPUTS_BY_PLOT_NAME[plot_name]
+        return render_plot(
+            self,
+            plot_name,
+            args,
+            [plot_input.fingerprint(self.dataset) for plot_input in plot_inputs],
+            format=format,
+            dpi=dpi,
+            options=options,
+        )
+
+    @property
+    def resolved_granularity(self) -> Granularity:
+        """Return the Granularity of the time-series plots, resolving
+        Granularity.Auto for this Dataset"""
+        return fractal_governance.rollups.resolve_granularity(
+            self.granularity,
+            self.dataset.df_member_attendance_new_and_returning_by_period,
+            meeting_count=self.dataset.total_meetings,
+            max_bar_count=self.max_bar_count,
+        )
+
+    def plot_data(self, plot_name: str, *args: Any) -> PlotData:
+        """Return the tidy data of the named plot
+
+        The plot data is cached, since the Dataset is read-only."""
+        if plot_name not in PLOT_DATA_FUNCTION_BY_PLOT_NAME:
+            raise ValueError(f"Unknown plot_name {plot_name}")
+        key = (plot_name, args, self.resolved_granularity)
+        with self._plot_data_lock:
+            plot_data = self._plot_data_by_key.get(key)
+        if plot_data is None:
+            plot_data = PLOT_DATA_FUNCTION_BY_PLOT_NAME[plot_name](
+                self.dataset, self.resolved_granularity, *args
+            )
+            with self._plot_data_lock:
+                plot_data = self._plot_data_by_key.setdefault(key, plot_data)
+        return plot_data
+
+    def chart(self, plot_name: str, *args: Any) -> "fractal_governance.charts.Chart":
+        """Return the named plot as an Altair chart, whose Vega-Lite specification
+        is drawn by the browser"""
+        import fractal_governance.charts
+
+        return fractal_governance.charts.create_chart(
+            plot_name, self.plot_data(plot_name, *args)
+        )
+
     @property
-    def attendance_vs_time(self) -> matplotlib.figure.Figure:
+    def attendance_vs_time(self) -> "matplotlib.figure.Figure":
         """Return a plot of attendance vs time"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df
-        # The (MEETING_DATE_COLUMN_NAME, MEMBER_ID_COLUMN_NAME) tuple is generate after
-        # the addition of multiple rounds, which is the reason for the `notna` on
-        # LEVEL_COLUMN_NAME.
-        df = df[df[LEVEL_COLUMN_NAME].notna()]
-        group_by = df.groupby(MEETING_DATE_COLUMN_NAME).size()
-        group_by.plot.bar(xlabel="Meeting Date", ylabel="Attendees")
-        xaxis_labels = [
-            meeting_date.strftime("%b %d %Y") for meeting_date in group_by.index
-        ]
-        ax.xaxis.set_major_formatter(matplotlib.ticker.FixedFormatter(xaxis_labels))
-        ax.set_title("Attendance vs Time")
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("attendance_vs_time")
+        df = plot_data.df
+        df.set_index(PERIOD_COLUMN_NAME)[VALUE_COLUMN_NAME].plot.bar(
+            ax=ax, xlabel=plot_data.x_label, ylabel=plot_data.y_label
+        )
+        set_period_labels(ax, df[PERIOD_LABEL_COLUMN_NAME])
+        ax.set_title(plot_data.title)
         ylim = ax.get_ylim()
         ylim = tuple(left * right for left, right in zip((1, 1.3), ylim))
         ax.set_ylim(ylim)
-        plt.gcf().autofmt_xdate()
+        fig.autofmt_xdate()
         return fig
 
     @property
-    def attendance_vs_time_stacked(self) -> matplotlib.figure.Figure:
+    def attendance_vs_time_stacked(self) -> "matplotlib.figure.Figure":
         """Return a stacked plot of attendance vs time"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_member_attendance_new_and_returning_by_meeting
-        df = df.set_index(MEETING_DATE_COLUMN_NAME)
-        df = df[[NEW_MEMBER_COUNT_COLUMN_NAME, RETURNING_MEMBER_COUNT_COLUMN_NAME]]
-        df = df[df.columns[::-1]]
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("attendance_vs_time_stacked")
+        df = pivot_series(plot_data.df)
         df.plot.bar(ax=ax, stacked=True)
-        ax.set_xlabel("Meeting Date")
-        ax.set_ylabel("Attendees")
-        ax.set_title("Attendance vs Time")
-        xaxis_labels = [meeting_date.strftime("%b %d %Y") for meeting_date in df.index]
-        ax.xaxis.set_major_formatter(matplotlib.ticker.FixedFormatter(xaxis_labels))
-        ax.legend(["Returning Members", "New Members"])
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
+        ax.set_title(plot_data.title)
+        set_period_labels(ax, get_period_labels(plot_data.df))
+        ax.legend(list(df.columns))
         ylim = ax.get_ylim()
         ylim = tuple(left * right for left, right in zip((1, 1.3), ylim))
         ax.set_ylim(ylim)
-        plt.gcf().autofmt_xdate()
+        fig.autofmt_xdate()
         return fig
 
     @property
-    def attendance_consistency_histogram(self) -> matplotlib.figure.Figure:
+    def attendance_consistency_histogram(self) -> "matplotlib.figure.Figure":
         """Return a plot of attendance histogram"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_member_leader_board
-        df[ATTENDANCE_COUNT_COLUMN_NAME].hist(bins=self.dataset.total_meetings)
-        ax.set_title("Consistency of Attendance")
-        ax.set_xlabel("Total Meetings Attended by a Unique Member")
-        ax.set_ylabel("Counts")
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("attendance_consistency_histogram")
+        draw_histogram(ax, plot_data.df)
+        ax.grid(True)
+        ax.set_title(plot_data.title)
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
         return fig
 
     @property
-    def accumulated_member_respect_vs_time(self) -> matplotlib.figure.Figure:
+    def accumulated_member_respect_vs_time(self) -> "matplotlib.figure.Figure":
         """Return a plot of the accumulated member Respect vs time"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_member_respect_new_and_returning_by_meeting.set_index(
-            MEETING_DATE_COLUMN_NAME
-        )
-        accumulated_respect = df[ACCUMULATED_RESPECT_COLUMN_NAME].cumsum()
-        accumulated_respect.plot.bar(
-            xlabel="Meeting Date", ylabel="Accumulated Respect"
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("accumulated_member_respect_vs_time")
+        df = plot_data.df
+        df.set_index(PERIOD_COLUMN_NAME)[VALUE_COLUMN_NAME].plot.bar(
+            ax=ax, xlabel=plot_data.x_label, ylabel=plot_data.y_label
         )
-        xaxis_labels = [
-            meeting_date.strftime("%b %d %Y")
-            for meeting_date in accumulated_respect.index
-        ]
-        ax.xaxis.set_major_formatter(matplotlib.ticker.FixedFormatter(xaxis_labels))
-        ax.set_title("Accumulated Member Respect vs Time")
-        plt.gcf().autofmt_xdate()
+        set_period_labels(ax, df[PERIOD_LABEL_COLUMN_NAME])
+        ax.set_title(plot_data.title)
+        fig.autofmt_xdate()
         return fig
 
     @property
-    def accumulated_member_respect_vs_time_stacked(self) -> matplotlib.figure.Figure:
+    def accumulated_member_respect_vs_time_stacked(self) -> "matplotlib.figure.Figure":
         """Return a stacked plot of accumulated member Respect vs time"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_member_respect_new_and_returning_by_meeting
-        df = df.set_index(MEETING_DATE_COLUMN_NAME)
-        df = df[
-            [
-                ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME,
-                ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME,
-            ]
-        ]
-        df[ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME] = df[
-            ACCUMULATED_RESPECT_RETURNING_MEMBER_COLUMN_NAME
-        ].cumsum()
-        df[ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME] = df[
-            ACCUMULATED_RESPECT_NEW_MEMBER_COLUMN_NAME
-        ].cumsum()
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("accumulated_member_respect_vs_time_stacked")
+        df = pivot_series(plot_data.df)
         df.plot.bar(ax=ax, stacked=True)
-        ax.set_xlabel("Meeting Date")
-        ax.set_ylabel("Accumulated Member Respect")
-        xaxis_labels = [meeting_date.strftime("%b %d %Y") for meeting_date in df.index]
-        ax.xaxis.set_major_formatter(matplotlib.ticker.FixedFormatter(xaxis_labels))
-        ax.set_title("Accumulated Member Respect vs Time")
-        ax.legend(["Returning Members", "New Members"])
-        plt.gcf().autofmt_xdate()
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
+        set_period_labels(ax, get_period_labels(plot_data.df))
+        ax.set_title(plot_data.title)
+        ax.legend(list(df.columns))
+        fig.autofmt_xdate()
         return fig
 
     @property
-    def accumulated_team_respect_vs_time(self) -> matplotlib.figure.Figure:
+    def accumulated_team_respect_vs_time(self) -> "matplotlib.figure.Figure":
         """Return a plot of the accumulated team Respect vs time"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_team_respect_by_meeting_date
-        x_axis_offset = pd.Timedelta(-0.3, unit="d")
-        x_axis_width = pd.Timedelta(1, unit="d")
-        for team_name, dfx in df.groupby(TEAM_NAME_COLUMN_NAME):
-            color = next(ax._get_lines.prop_cycler)["color"]
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("accumulated_team_respect_vs_time")
+        x_axis_width = _TEAM_BAR_WIDTH_BY_GRANULARITY[self.resolved_granularity]
+        x_axis_offset = -0.3 * x_axis_width
+        colors = get_colors()
+        for team_name, dfx in plot_data.df.groupby(SERIES_COLUMN_NAME, observed=True):
+            color = next(colors)
             ax.bar(
-                dfx[MEETING_DATE_COLUMN_NAME] + x_axis_offset,
-                dfx[ACCUMULATED_RESPECT_COLUMN_NAME].cumsum(),
+                dfx[PERIOD_COLUMN_NAME] + x_axis_offset,
+                dfx[VALUE_COLUMN_NAME],
                 color=color,
                 width=x_axis_width,
                 label=team_name,
             )
             x_axis_offset += x_axis_width
         ax.legend()
-        ax.set_title("Accumulated Team Respect vs Time")
-        ax.set_xlabel("Meeting Date")
-        ax.set_ylabel("Accumulated Team Respect")
-        plt.gcf().autofmt_xdate()
+        ax.set_title(plot_data.title)
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
+        fig.autofmt_xdate()
         return fig
 
     @property
-    def accumulated_team_respect_vs_time_stacked(self) -> matplotlib.figure.Figure:
+    def accumulated_team_respect_vs_time_stacked(self) -> "matplotlib.figure.Figure":
         """Return a stacked plot of the accumulated team Respect vs time"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_team_respect_by_meeting_date.set_index(
-            MEETING_DATE_COLUMN_NAME
-        )
-        df = df.pivot(columns=TEAM_NAME_COLUMN_NAME)
-        df = df[
-            pd.MultiIndex.from_product(
-                [
-                    [ACCUMULATED_RESPECT_COLUMN_NAME],
-                    self.dataset.df_team_leader_board.index,
-                ]
-            )
-        ]
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("accumulated_team_respect_vs_time_stacked")
+        df = pivot_series(plot_data.df)
         df.plot.bar(ax=ax, stacked=True)
-        ax.set_xlabel("Meeting Date")
-        ax.set_ylabel("Accumulated Team Respect")
-        ax.set_title("Accumulated Team Respect vs Time")
-        xaxis_labels = [meeting_date.strftime("%b %d %Y") for meeting_date in df.index]
-        ax.xaxis.set_major_formatter(matplotlib.ticker.FixedFormatter(xaxis_labels))
-        ax.legend(self.dataset.df_team_leader_board.index, loc="upper left")
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
+        ax.set_title(plot_data.title)
+        set_period_labels(ax, get_period_labels(plot_data.df))
+        ax.legend(list(df.columns), loc="upper left")
         ylim = ax.get_ylim()
         ylim = tuple(left * right for left, right in zip((1, 1.3), ylim))
         ax.set_ylim(ylim)
-        plt.gcf().autofmt_xdate()
+        fig.autofmt_xdate()
         return fig
 
     @property
-    def team_representation_vs_time(self) -> matplotlib.figure.Figure:
+    def team_representation_vs_time(self) -> "matplotlib.figure.Figure":
         """Return a plot of the team representation vs time"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_team_representation_by_date
-        df.plot.bar(xlabel="Meeting Date", ylabel="Team Representation")
-        xaxis_labels = [meeting_date.strftime("%b %d %Y") for meeting_date in df.index]
-        ax.xaxis.set_major_formatter(matplotlib.ticker.FixedFormatter(xaxis_labels))
-        ax.set_title("Team Representation vs Time")
-        plt.gcf().autofmt_xdate()
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("team_representation_vs_time")
+        df = plot_data.df
+        df.set_index(PERIOD_COLUMN_NAME)[VALUE_COLUMN_NAME].plot.bar(
+            ax=ax, xlabel=plot_data.x_label, ylabel=plot_data.y_label
+        )
+        set_period_labels(ax, df[PERIOD_LABEL_COLUMN_NAME])
+        ax.set_title(plot_data.title)
+        fig.autofmt_xdate()
         return fig
 
     @property
-    def attendance_count_vs_level(self) -> matplotlib.figure.Figure:
+    def attendance_count_vs_level(self) -> "matplotlib.figure.Figure":
         """Plot the attendance count vs level"""
-        fig, ax = plt.subplots(figsize=DEFAULT_FIGSIZE)
-        df = self.dataset.df_member_level_by_attendance_count
-        x = df[ATTENDANCE_COUNT_COLUMN_NAME]
-        y = df[MEAN_COLUMN_NAME]
-        yerr = df[STANDARD_DEVIATION_COLUMN_NAME]
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("attendance_count_vs_level")
+        df = plot_data.df
         ax.errorbar(
-            x=x,
-            y=y,
-            yerr=yerr,
+            x=df[X_COLUMN_NAME],
+            y=df[VALUE_COLUMN_NAME],
+            yerr=df[ERROR_COLUMN_NAME],
             fmt="o",
         )
-        ax.set_title("Attendance Count vs Level")
-        ax.set_xlabel("Attendance Count")
-        ax.set_ylabel("Mean Level")
+        ax.set_title(plot_data.title)
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
 
         ax.set(ylim=(0, 8))
 
-        # Perform a linear regression on this data and overlay it on the
-        # plot to demonstrate how meeting attendance affects a member's
-        # standing as perceived by their fractal.
-        result = scipy.stats.linregress(x, y)
-
-        x = x.to_list()
+        # Overlay the linear regression on the plot to demonstrate how meeting
+        # attendance affects a member's standing as perceived by their fractal.
+        annotations = plot_data.annotations
+        x = df[X_COLUMN_NAME].to_list()
         x.insert(0, x[0] - 1)
         x.append(x[-1] + 1)
         x = pd.Series(x)
 
-        ax.plot(x, result.slope * x + result.intercept, "r")
+        ax.plot(x, annotations["slope"] * x + annotations["intercept"], "r")
 
-        result_as_text = f"y = $x*{result.slope:.2f}_{{\pm{result.stderr:.2f}}} + {result.intercept:.2f}_{{\pm{result.intercept_stderr:.2f}}}$"  # noqa: E501, W605
+        result_as_text = f"y = $x*{annotations['slope']:.2f}_{{\\pm{annotations['slope_stderr']:.2f}}} + {annotations['intercept']:.2f}_{{\\pm{annotations['intercept_stderr']:.2f}}}$"  # noqa: E501
         ax.text(3, 6.8, result_as_text, fontsize=15)
 
         return fig
 
+    @property
+    def group_size_histogram(self) -> "matplotlib.figure.Figure":
+        """Return a plot of the histogram of consensus group sizes"""
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("group_size_histogram")
+        draw_histogram(ax, plot_data.df)
+        ax.grid(True)
+        ax.set_title(plot_data.title)
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
+        return fig
+
+    @property
+    def ranking_stability_histogram(self) -> "matplotlib.figure.Figure":
+        """Return a plot of the histogram of the Kendall tau between the Levels of
+        every group's members and their Levels at their previous meetings"""
+        fig, ax = create_figure(self.figsize)
+        plot_data = self.plot_data("ranking_stability_histogram")
+        draw_histogram(ax, plot_data.df)
+        ax.grid(True)
+        ax.set_title(plot_data.title)
+        ax.set_xlabel(plot_data.x_label)
+        ax.set_ylabel(plot_data.y_label)
+        return fig
+
     @classmethod
     def from_dataset(cls, dataset: fractal_governance.dataset.Dataset) -> "Plots":
         """Return a Plots object for the given Dataset"""
@@ -251,3 +499,42 @@ class Plots:
         """Return a Plots object for the given Fractal's .csv file paths"""
         dataset = fractal_governance.dataset.Dataset.from_csv(fractal_dataset_csv_paths)
         return cls(dataset=dataset)
+
+
+def render_plot(
+    plots: Any,
+    plot_name: str,
+    args: Tuple[Any, ...],
+    input_fingerprints: List[str],
+    *,
+    format: str,
+    dpi: float,
+    options: Tuple[Any, ...] = (),
+) -> bytes:
+    """Return the plot of the given Plots object rendered through its render cache
+
+    The plot is the property named `plot_name`, or the method named `plot_name`
+    called with `args`, and the cache key includes the given fingerprints of the
+    DataFrames the plot reads and the given options of the Plots object that affect
+    the plot."""
+    plots_type = type(plots)
+    key = fractal_governance.render_cache.make_key(
+        f"{plots_type.__module__}.{plots_type.__qualname__}.{plot_name}",
+        args,
+        tuple(plots.figsize),
+        format,
+        dpi,
+        tuple(input_fingerprints),
+        options,
+    )
+
+    def create() -> bytes:
+        if isinstance(getattr(plots_type, plot_name), property):
+            fig = getattr(plots, plot_name)
+        else:
+            fig = getattr(plots, plot_name)(*args)
+        return fractal_governance.render_cache.render_figure(
+            fig, format=format, dpi=dpi
+        )
+
+    return plots.render_cache.get_or_render(key, create)
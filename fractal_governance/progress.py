@@ -0,0 +1,104 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Progress reporting and cooperative cancellation for long computations
+
+A `ProgressToken` is passed to a long computation (e.g. `WeightedMeans`,
+`Addendum1Dataset` or the measurement uncertainty `Dataset`), which reports its
+progress through the token at every step of its loops. Any thread may cancel the
+token, and the computation raises `CancelledError` at its next step.
+"""
+
+import concurrent.futures
+import threading
+from typing import Any, Callable, Optional
+
+import attrs
+
+
+class CancelledError(concurrent.futures.CancelledError):
+    """Raised by a computation whose `ProgressToken` was cancelled
+
+    `stage` is the name of the stage that was running and `partial_result` is the
+    result computed so far, or None if the computation has no meaningful partial
+    result."""
+
+    def __init__(self, stage: str, partial_result: Any = None) -> None:
+        super().__init__(f"cancelled during stage {stage!r}")
+        self.stage = stage
+        self.partial_result = partial_result
+
+
+@attrs.frozen(kw_only=True)
+class Progress:
+    """The progress of one stage of a computation"""
+
+    stage: str
+    completed: int
+    total: int
+
+    @property
+    def percent(self) -> float:
+        """Return the percent complete of the stage"""
+        if self.total <= 0:
+            return 100.0
+        return 100.0 * self.completed / self.total
+
+
+@attrs.define
+class ProgressToken:
+    """A token through which a computation reports its progress and is cancelled
+
+    `callback`, if given, is called with a `Progress` for every step reported by the
+    computation, on the thread running the computation."""
+
+    callback: Optional[Callable[[Progress], None]] = attrs.field(
+        default=None, repr=False
+    )
+
+    _cancelled: threading.Event = attrs.field(
+        factory=threading.Event, init=False, repr=False
+    )
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Request that the computation stop at its next step"""
+        self._cancelled.set()
+
+    def check(
+        self, stage: str, partial_result: Optional[Callable[[], Any]] = None
+    ) -> None:
+        """Raise CancelledError if this token was cancelled
+
+        `partial_result` is only called when the token was cancelled, so building
+        the partial result costs nothing otherwise."""
+        if self._cancelled.is_set():
+            raise CancelledError(
+                stage, partial_result() if partial_result is not None else None
+            )
+
+    def report(
+        self,
+        stage: str,
+        completed: int,
+        total: int,
+        partial_result: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """Report that `completed` of `total` steps of `stage` are done, then raise
+        CancelledError if this token was cancelled"""
+        if self.callback is not None:
+            self.callback(Progress(stage=stage, completed=completed, total=total))
+        self.check(stage, partial_result)
+
+
+def report(
+    progress: Optional[ProgressToken],
+    stage: str,
+    completed: int,
+    total: int,
+    partial_result: Optional[Callable[[], Any]] = None,
+) -> None:
+    """Call `ProgressToken.report` if `progress` is not None"""
+    if progress is not None:
+        progress.report(stage, completed, total, partial_result)
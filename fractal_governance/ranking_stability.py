@@ -0,0 +1,374 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""The stability of the consensus rankings of fractal governance meetings
+
+A group's consensus ranks its members by Level. This module measures how well those
+rankings agree with each other for the same members, for every group of every round
+of every meeting at once:
+
+- The ranking stability frame has one row per group that measured a Level, keyed by
+  its (MeetingID, Group, Round), with the Kendall tau-b and Spearman rho between its
+  members' Levels and their Levels at the previous meeting each of them attended,
+  and Kendall's W of its members' Levels over the last few meetings they attended.
+- The round stability frame has one row per group of a second or later round with
+  the same correlations between its members' Levels and their Levels in the
+  previous round of the meeting. The Genesis fractal records no Level for a member
+  who advanced to the next round, so its correlations are NaN.
+- The member rank volatility frame has one row per member, keyed by MemberID, with
+  the standard deviation and mean change of the member's NormalizedRank, which is
+  their rank among every attendee of a meeting scaled to [0, 1].
+
+The correlations are computed from the within-group pairs of members in a handful
+of numpy array operations rather than a Python loop per group. A
+`fractal_governance.dataset.Dataset` creates the ranking stability and member rank
+volatility frames once as its `df_ranking_stability` and `df_member_rank_volatility`
+derived frames.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .constants import (
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    KENDALL_TAU_COLUMN_NAME,
+    KENDALLS_W_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    MEAN_RANK_CHANGE_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    NORMALIZED_RANK_COLUMN_NAME,
+    PAIRED_MEMBER_COUNT_COLUMN_NAME,
+    RANK_VOLATILITY_COLUMN_NAME,
+    RATED_MEMBER_COUNT_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    SPEARMAN_RHO_COLUMN_NAME,
+)
+from .group_cube import GROUP_KEY_COLUMN_NAMES, get_ranked_group_members
+
+# The number of meetings, including the current one, over which Kendall's W
+# measures the agreement of a group's rankings.
+DEFAULT_CONCORDANCE_WINDOW = 3
+
+_PREVIOUS_LEVEL_COLUMN_NAME = "_PreviousLevel"
+
+
+def _get_previous_level_column_name(lag: int) -> str:
+    """Internal helper method that returns the name of the column of the Levels of
+    the meeting `lag` meetings before the current one"""
+    return f"{_PREVIOUS_LEVEL_COLUMN_NAME}{lag}"
+
+
+def get_group_pairs(group_codes: np.ndarray) -> np.ndarray:
+    """Return the row numbers (i, j) with i < j of every pair of rows in the same
+    group, one pair per column
+
+    The rows are sorted by their group codes, so a row at position k of a group of
+    size n pairs with the n - 1 - k rows after it."""
+    row_count = len(group_codes)
+    is_group_start = np.ones(row_count, dtype=bool)
+    is_group_start[1:] = group_codes[1:] != group_codes[:-1]
+    group_starts = np.flatnonzero(is_group_start)
+    group_sizes = np.diff(np.append(group_starts, row_count))
+    positions = np.arange(row_count) - np.repeat(group_starts, group_sizes)
+    pair_counts = np.repeat(group_sizes, group_sizes) - 1 - positions
+    i = np.repeat(np.arange(row_count), pair_counts)
+    offsets = np.arange(len(i)) - np.repeat(
+        np.cumsum(pair_counts) - pair_counts, pair_counts
+    )
+    return np.vstack((i, i + 1 + offsets))
+
+
+def _get_group_ranks(group_codes: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Internal helper method that returns the rank of each value within its group,
+    with tied values sharing their average rank"""
+    return pd.Series(values).groupby(group_codes).rank(method="average").to_numpy()
+
+
+def get_rank_correlations(
+    group_codes: np.ndarray, x: np.ndarray, y: np.ndarray, group_count: int
+) -> pd.DataFrame:
+    """Return the PairedMemberCount, Kendall tau-b and Spearman rho between x and y
+    of each group, indexed by group code
+
+    The rows are sorted by their group codes, which are in [0, group_count), and
+    neither x nor y is NaN. A correlation is NaN for a group with fewer than two
+    rows or whose x or y are all tied."""
+    paired_member_counts = np.bincount(group_codes, minlength=group_count)
+
+    # Kendall's tau-b counts the concordant and discordant pairs of each group,
+    # discounted by the pairs tied in x or y.
+    i, j = get_group_pairs(group_codes)
+    pair_group_codes = group_codes[i]
+    x_signs = np.sign(x[j] - x[i])
+    y_signs = np.sign(y[j] - y[i])
+    pair_counts = np.bincount(pair_group_codes, minlength=group_count)
+    concordance = np.bincount(
+        pair_group_codes, weights=x_signs * y_signs, minlength=group_count
+    )
+    x_untied_pair_counts = pair_counts - np.bincount(
+        pair_group_codes, weights=x_signs == 0, minlength=group_count
+    )
+    y_untied_pair_counts = pair_counts - np.bincount(
+        pair_group_codes, weights=y_signs == 0, minlength=group_count
+    )
+    kendall_denominator = np.sqrt(x_untied_pair_counts * y_untied_pair_counts)
+
+    # Spearman's rho is the Pearson correlation of the ranks within each group.
+    x_ranks = _get_group_ranks(group_codes, x)
+    y_ranks = _get_group_ranks(group_codes, y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_means = (
+            np.bincount(group_codes, weights=x_ranks, minlength=group_count)
+            / paired_member_counts
+        )
+        y_means = (
+            np.bincount(group_codes, weights=y_ranks, minlength=group_count)
+            / paired_member_counts
+        )
+    x_deviations = x_ranks - x_means[group_codes]
+    y_deviations = y_ranks - y_means[group_codes]
+    covariances = np.bincount(
+        group_codes, weights=x_deviations * y_deviations, minlength=group_count
+    )
+    spearman_denominator = np.sqrt(
+        np.bincount(group_codes, weights=x_deviations**2, minlength=group_count)
+        * np.bincount(group_codes, weights=y_deviations**2, minlength=group_count)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame(
+            {
+                PAIRED_MEMBER_COUNT_COLUMN_NAME: paired_member_counts,
+                KENDALL_TAU_COLUMN_NAME: np.where(
+                    kendall_denominator > 0,
+                    concordance / kendall_denominator,
+                    np.nan,
+                ),
+                SPEARMAN_RHO_COLUMN_NAME: np.where(
+                    spearman_denominator > 0,
+                    covariances / spearman_denominator,
+                    np.nan,
+                ),
+            }
+        )
+
+
+def get_kendalls_w(
+    group_codes: np.ndarray, ratings: np.ndarray, group_count: int
+) -> pd.DataFrame:
+    """Return the RatedMemberCount and Kendall's W of each group, indexed by group
+    code
+
+    `ratings` has one row per member and one column per ranking of the members,
+    i.e. per rater, and is sorted by group code like `get_rank_correlations`. W is
+    corrected for ties, and is NaN for a group with fewer than two members or
+    whose rankings are all ties."""
+    rater_count = ratings.shape[1]
+    rated_member_counts = np.bincount(group_codes, minlength=group_count)
+    rank_sums = np.zeros(len(group_codes))
+    tie_corrections = np.zeros(group_count)
+    for rater in range(rater_count):
+        rank_sums += _get_group_ranks(group_codes, ratings[:, rater])
+        tie_sizes = (
+            pd.DataFrame({"code": group_codes, "rating": ratings[:, rater]})
+            .groupby(["code", "rating"], sort=False)
+            .size()
+        )
+        tie_corrections += np.bincount(
+            tie_sizes.index.get_level_values("code"),
+            weights=tie_sizes.to_numpy() ** 3 - tie_sizes.to_numpy(),
+            minlength=group_count,
+        )
+    mean_rank_sums = rater_count * (rated_member_counts + 1) / 2
+    squared_deviations = np.bincount(
+        group_codes,
+        weights=(rank_sums - mean_rank_sums[group_codes]) ** 2,
+        minlength=group_count,
+    )
+    denominator = (
+        rater_count**2 * (rated_member_counts**3 - rated_member_counts)
+        - rater_count * tie_corrections
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pd.DataFrame(
+            {
+                RATED_MEMBER_COUNT_COLUMN_NAME: rated_member_counts,
+                KENDALLS_W_COLUMN_NAME: np.where(
+                    denominator > 0, 12 * squared_deviations / denominator, np.nan
+                ),
+            }
+        )
+
+
+def _get_group_codes(df: pd.DataFrame) -> np.ndarray:
+    """Internal helper method that returns the group code of each row of the given
+    frame, which is sorted by its group keys"""
+    return df.groupby(GROUP_KEY_COLUMN_NAMES, sort=True).ngroup().to_numpy()
+
+
+def _get_group_index(df: pd.DataFrame) -> pd.MultiIndex:
+    """Internal helper method that returns the group keys of the given frame, which
+    is sorted by its group keys, in group code order"""
+    return pd.MultiIndex.from_frame(df[GROUP_KEY_COLUMN_NAMES].drop_duplicates())
+
+
+def create_ranking_stability(
+    df_group_members: pd.DataFrame, *, window: int = DEFAULT_CONCORDANCE_WINDOW
+) -> pd.DataFrame:
+    """Return the ranking stability of each group of the given group members frame
+    that measured a Level, indexed by the (MeetingID, Group, Round) of each group
+
+    PairedMemberCount is the number of the group's members who attended a previous
+    meeting. RatedMemberCount is the number who attended at least `window` - 1
+    previous meetings, whose Levels at the current and their last `window` - 1
+    meetings are the `window` rankings of Kendall's W."""
+    if window < 2:
+        raise ValueError(f"window must be at least 2 but is {window}")
+    df = get_ranked_group_members(df_group_members)[
+        GROUP_KEY_COLUMN_NAMES
+        + [MEMBER_ID_COLUMN_NAME, MEETING_DATE_COLUMN_NAME, LEVEL_COLUMN_NAME]
+    ]
+    previous_level_column_names = [
+        _get_previous_level_column_name(lag) for lag in range(1, window)
+    ]
+    # Each member's previous Levels are shifted along their meetings in time order,
+    # and the rows are then restored to the group key order of the group members.
+    df_history = df.sort_values(
+        by=[MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME], kind="mergesort"
+    )
+    levels_by_member = df_history.groupby(MEMBER_ID_COLUMN_NAME, sort=False)[
+        LEVEL_COLUMN_NAME
+    ]
+    df = df.assign(
+        **{
+            column_name: levels_by_member.shift(lag)
+            for lag, column_name in enumerate(previous_level_column_names, start=1)
+        }
+    )
+
+    group_codes = _get_group_codes(df)
+    group_index = _get_group_index(df)
+    group_count = len(group_index)
+
+    is_paired = df[previous_level_column_names[0]].notna().to_numpy()
+    df_correlations = get_rank_correlations(
+        group_codes[is_paired],
+        df.loc[is_paired, LEVEL_COLUMN_NAME].to_numpy(),
+        df.loc[is_paired, previous_level_column_names[0]].to_numpy(),
+        group_count,
+    )
+    is_rated = df[previous_level_column_names].notna().all(axis=1).to_numpy()
+    df_concordance = get_kendalls_w(
+        group_codes[is_rated],
+        df.loc[is_rated, [LEVEL_COLUMN_NAME] + previous_level_column_names].to_numpy(),
+        group_count,
+    )
+
+    df_stability = pd.concat([df_correlations, df_concordance], axis=1)
+    df_stability.index = group_index
+    df_stability.insert(
+        0,
+        MEETING_DATE_COLUMN_NAME,
+        df.groupby(GROUP_KEY_COLUMN_NAMES, sort=True)[MEETING_DATE_COLUMN_NAME]
+        .first()
+        .to_numpy(),
+    )
+    return df_stability
+
+
+def create_round_stability(df_group_members: pd.DataFrame) -> pd.DataFrame:
+    """Return the ranking stability of each group of a second or later round of the
+    given group members frame, indexed by the (MeetingID, Group, Round) of each
+    group
+
+    PairedMemberCount is the number of the group's members measured at a Level in
+    both this round and the previous round of the meeting."""
+    member_key_column_names = [
+        MEETING_ID_COLUMN_NAME,
+        MEMBER_ID_COLUMN_NAME,
+        ROUND_COLUMN_NAME,
+    ]
+    df_previous_round = df_group_members[
+        member_key_column_names + [LEVEL_COLUMN_NAME]
+    ].rename(columns={LEVEL_COLUMN_NAME: _PREVIOUS_LEVEL_COLUMN_NAME})
+    df_previous_round[ROUND_COLUMN_NAME] = df_previous_round[ROUND_COLUMN_NAME] + 1
+
+    is_later_round = df_group_members[ROUND_COLUMN_NAME] > df_group_members.groupby(
+        MEETING_ID_COLUMN_NAME
+    )[ROUND_COLUMN_NAME].transform("min")
+    # A left merge keeps the group key order of the group members.
+    df = df_group_members.loc[
+        is_later_round,
+        GROUP_KEY_COLUMN_NAMES
+        + [MEMBER_ID_COLUMN_NAME, MEETING_DATE_COLUMN_NAME, LEVEL_COLUMN_NAME],
+    ].merge(df_previous_round, how="left", on=member_key_column_names)
+
+    group_codes = _get_group_codes(df)
+    group_index = _get_group_index(df)
+    is_paired = (
+        df[[LEVEL_COLUMN_NAME, _PREVIOUS_LEVEL_COLUMN_NAME]]
+        .notna()
+        .all(axis=1)
+        .to_numpy()
+    )
+    df_stability = get_rank_correlations(
+        group_codes[is_paired],
+        df.loc[is_paired, LEVEL_COLUMN_NAME].to_numpy(),
+        df.loc[is_paired, _PREVIOUS_LEVEL_COLUMN_NAME].to_numpy(),
+        len(group_index),
+    )
+    df_stability.index = group_index
+    df_stability.insert(
+        0,
+        MEETING_DATE_COLUMN_NAME,
+        df.groupby(GROUP_KEY_COLUMN_NAMES, sort=True)[MEETING_DATE_COLUMN_NAME]
+        .first()
+        .to_numpy(),
+    )
+    return df_stability
+
+
+def get_normalized_ranks(df_group_members: pd.DataFrame) -> pd.Series:
+    """Return the NormalizedRank of each member measured at a Level in the given
+    group members frame, indexed like the frame
+
+    A member's NormalizedRank is their rank among the meeting's attendees by Level,
+    with ties sharing their average rank, scaled so the lowest rank is 0 and the
+    highest is 1. It is NaN for a meeting with a single attendee."""
+    df = get_ranked_group_members(df_group_members)
+    levels_by_meeting = df.groupby(MEETING_ID_COLUMN_NAME)[LEVEL_COLUMN_NAME]
+    attendance_counts = levels_by_meeting.transform("size")
+    return (
+        (levels_by_meeting.rank(method="average") - 1)
+        .div((attendance_counts - 1).where(attendance_counts > 1))
+        .rename(NORMALIZED_RANK_COLUMN_NAME)
+    )
+
+
+def create_member_rank_volatility(df_group_members: pd.DataFrame) -> pd.DataFrame:
+    """Return the rank volatility of each member of the given group members frame,
+    indexed by MemberID
+
+    NormalizedRank is the mean of the member's NormalizedRanks, RankVolatility
+    their standard deviation and MeanRankChange the mean absolute change between
+    consecutive meetings the member attended. The latter two are NaN for a member
+    who attended a single meeting."""
+    df = get_ranked_group_members(df_group_members)[
+        [MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME]
+    ].assign(**{NORMALIZED_RANK_COLUMN_NAME: get_normalized_ranks(df_group_members)})
+    df = df.sort_values(
+        by=[MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME], kind="mergesort"
+    )
+    df[MEAN_RANK_CHANGE_COLUMN_NAME] = (
+        df.groupby(MEMBER_ID_COLUMN_NAME, sort=False)[NORMALIZED_RANK_COLUMN_NAME]
+        .diff()
+        .abs()
+    )
+    return df.groupby(MEMBER_ID_COLUMN_NAME, sort=True).agg(
+        **{
+            ATTENDANCE_COUNT_COLUMN_NAME: (NORMALIZED_RANK_COLUMN_NAME, "size"),
+            NORMALIZED_RANK_COLUMN_NAME: (NORMALIZED_RANK_COLUMN_NAME, "mean"),
+            RANK_VOLATILITY_COLUMN_NAME: (NORMALIZED_RANK_COLUMN_NAME, "std"),
+            MEAN_RANK_CHANGE_COLUMN_NAME: (MEAN_RANK_CHANGE_COLUMN_NAME, "mean"),
+        }
+    )
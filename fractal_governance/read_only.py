@@ -0,0 +1,175 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Read-only pandas objects for fractal governance data analysis
+
+The DataFrames computed by `Dataset`, `WeightedMeans` and `Addendum1Dataset` are
+cached and shared between callers (e.g. across Streamlit reruns and sessions), so they
+are exposed as read-only objects that fail loudly when mutated instead of requiring
+every caller to make a defensive copy.
+
+Freezing shares memory with the frozen object through non-writeable NumPy views, so
+the frozen object itself stays writeable. A DataFrame whose columns are not yet
+consolidated into one block per dtype is consolidated first, which copies its data.
+Every operation that returns a new object (e.g. `copy`, `set_index`, `sort_values`,
+`assign` or a boolean filter) returns an ordinary, writeable pandas object.
+"""
+
+from typing import Any, Union
+
+import numpy as np
+import pandas as pd
+
+
+class ReadOnlyError(TypeError):
+    """Raised when attempting to mutate a read-only DataFrame or Series"""
+
+
+def _raise_read_only_error(obj: Any) -> None:
+    raise ReadOnlyError(
+        f"this {type(obj).__name__} is read-only; call `.copy()` to get a writeable "
+        "copy"
+    )
+
+
+class _ReadOnlyIndexer:
+    """A wrapper around a pandas indexer (e.g. `loc` and `iloc`) that only supports
+    getting values"""
+
+    def __init__(self, indexer: Any, obj: Any) -> None:
+        self._indexer = indexer
+        self._obj = obj
+
+    def __getattr__(self, name: str) -> Any:
+        # pandas uses the private methods of an object's indexers internally.
+        return getattr(self._indexer, name)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._indexer[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        _raise_read_only_error(self._obj)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "_ReadOnlyIndexer":
+        return _ReadOnlyIndexer(self._indexer(*args, **kwargs), self._obj)
+
+
+class _ReadOnlyMixin:
+    """The mutating methods shared by ReadOnlyDataFrame and ReadOnlySeries"""
+
+    _READ_ONLY_ATTRIBUTE_NAMES = frozenset(["index", "columns", "name"])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        _raise_read_only_error(self)
+
+    def __delitem__(self, key: Any) -> None:
+        _raise_read_only_error(self)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get("_is_read_only", False) and (
+            name in self._READ_ONLY_ATTRIBUTE_NAMES
+            or (name == "_mgr" and value is not getattr(self, "_mgr", value))
+        ):
+            _raise_read_only_error(self)
+        super().__setattr__(name, value)  # type: ignore
+
+    def __reduce__(self) -> Any:
+        # Pickle as an ordinary pandas object that is frozen again when unpickled.
+        return freeze, (self._constructor(self),)  # type: ignore
+
+    def _update_inplace(self, *args: Any, **kwargs: Any) -> None:
+        # pandas calls this for every `inplace=True` operation.
+        _raise_read_only_error(self)
+
+    def _maybe_cache_changed(self, *args: Any, **kwargs: Any) -> None:
+        # pandas calls this when a cached column Series is mutated.
+        _raise_read_only_error(self)
+
+    @property
+    def loc(self) -> _ReadOnlyIndexer:
+        return _ReadOnlyIndexer(super().loc, self)  # type: ignore
+
+    @property
+    def iloc(self) -> _ReadOnlyIndexer:
+        return _ReadOnlyIndexer(super().iloc, self)  # type: ignore
+
+    @property
+    def at(self) -> _ReadOnlyIndexer:
+        return _ReadOnlyIndexer(super().at, self)  # type: ignore
+
+    @property
+    def iat(self) -> _ReadOnlyIndexer:
+        return _ReadOnlyIndexer(super().iat, self)  # type: ignore
+
+
+class ReadOnlyDataFrame(_ReadOnlyMixin, pd.DataFrame):  # type: ignore
+    """A DataFrame that raises ReadOnlyError when mutated"""
+
+    @property
+    def _constructor(self) -> type:
+        return pd.DataFrame
+
+    def insert(self, *args: Any, **kwargs: Any) -> None:
+        _raise_read_only_error(self)
+
+    def pop(self, *args: Any, **kwargs: Any) -> None:
+        _raise_read_only_error(self)
+
+
+class ReadOnlySeries(_ReadOnlyMixin, pd.Series):  # type: ignore
+    """A Series that raises ReadOnlyError when mutated"""
+
+    @property
+    def _constructor(self) -> type:
+        return pd.Series
+
+    @property
+    def _constructor_expanddim(self) -> type:
+        return pd.DataFrame
+
+    def pop(self, *args: Any, **kwargs: Any) -> None:
+        _raise_read_only_error(self)
+
+
+def _get_read_only_view(values: Any) -> Any:
+    # Extension arrays such as DatetimeArray store their data in `_ndarray`.
+    ndarray = getattr(values, "_ndarray", values)
+    if not isinstance(ndarray, np.ndarray):
+        return values
+    # Marking a view as non-writeable leaves the flags of the array it views alone.
+    read_only_ndarray = ndarray.view()
+    read_only_ndarray.flags.writeable = False
+    if ndarray is values:
+        return read_only_ndarray
+    return values._from_backing_data(read_only_ndarray)
+
+
+def _set_blocks_read_only(obj: Union[pd.DataFrame, pd.Series]) -> None:
+    # The blocks of a shallow copy are new objects that share their values with the
+    # original, so replacing their values does not affect the original.
+    for block in obj._mgr.blocks:
+        block.values = _get_read_only_view(block.values)
+
+
+def freeze(
+    obj: Union[pd.DataFrame, pd.Series]
+) -> Union[ReadOnlyDataFrame, ReadOnlySeries]:
+    """Return a read-only view of the given DataFrame or Series
+
+    The view shares memory with `obj` through non-writeable NumPy views, and `obj`
+    itself remains writeable, so it must not be modified after it is frozen. A
+    DataFrame that is not consolidated is copied instead (see the module docstring).
+    Freezing a read-only object returns it unchanged."""
+    if isinstance(obj, (ReadOnlyDataFrame, ReadOnlySeries)):
+        return obj
+    if isinstance(obj, pd.DataFrame):
+        # A shallow copy has its own block manager, so adding or replacing columns of
+        # `obj` does not leak into the read-only view. Consolidating up front keeps
+        # pandas from lazily consolidating the read-only view into writeable blocks.
+        read_only_obj = ReadOnlyDataFrame(obj.copy(deep=False))
+        read_only_obj._consolidate_inplace()
+    elif isinstance(obj, pd.Series):
+        read_only_obj = ReadOnlySeries(obj.copy(deep=False))
+    else:
+        raise TypeError(f"unsupported type {type(obj).__name__}")
+    _set_blocks_read_only(read_only_obj)
+    object.__setattr__(read_only_obj, "_is_read_only", True)
+    return read_only_obj
@@ -0,0 +1,269 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A background refresher of the datasets and plots of the dashboards
+
+The Refresher builds a Snapshot of every Dataset and Plots object the dashboards
+serve on a background thread, and polls the fingerprints of the .csv files for
+changes. When a file changes it builds a new Snapshot off the request path and swaps
+it in atomically once it is complete, so that visitors are always served the last
+good Snapshot and never wait for a rebuild. A failed rebuild keeps the last good
+Snapshot.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import attrs
+
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.dataset
+import fractal_governance.measurement_uncertainty.plots
+import fractal_governance.plots
+import fractal_governance.resources
+import fractal_governance.scheduler
+import fractal_governance.util
+from fractal_governance.dashboard import DashboardView
+from fractal_governance.resources import DEFAULT_RESOURCE_REGISTRY, ResourceRegistry
+from fractal_governance.rollups import Granularity
+
+DEFAULT_POLL_INTERVAL = 60.0
+
+DEFAULT_WAIT_TIMEOUT = 300.0
+
+
+@attrs.frozen(kw_only=True)
+class Snapshot:
+    """The datasets and plots built from one version of a Fractal's .csv files
+
+    `fingerprint` is the fingerprint of the .csv files and `timestamp` is the time
+    the Snapshot was built, in seconds since the epoch."""
+
+    fingerprint: str
+
+    timestamp: float
+
+    dataset_by_view: Dict[
+        DashboardView, fractal_governance.dataset.Dataset
+    ] = attrs.field(repr=False)
+
+    plots_by_view: Dict[DashboardView, fractal_governance.plots.Plots] = attrs.field(
+        repr=False
+    )
+
+    measurement_uncertainty_dataset: fractal_governance.measurement_uncertainty.dataset.Dataset = attrs.field(  # noqa: E501
+        repr=False
+    )
+
+    measurement_uncertainty_plots: fractal_governance.measurement_uncertainty.plots.Plots = attrs.field(  # noqa: E501
+        repr=False
+    )
+
+    @property
+    def dataset(self) -> fractal_governance.dataset.Dataset:
+        """Return the Dataset of the Classic DashboardView"""
+        return self.dataset_by_view[DashboardView.Classic]
+
+
+def build_snapshot(
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    granularity: Granularity = Granularity.Auto,
+    registry: ResourceRegistry = DEFAULT_RESOURCE_REGISTRY,
+) -> Snapshot:
+    """Return a new Snapshot of the given Fractal's .csv files
+
+    The independent objects are built concurrently (see
+    `fractal_governance.scheduler`)."""
+    fingerprint = fractal_governance.util.csv_paths_fingerprint(
+        fractal_dataset_csv_paths
+    )
+    nodes = [
+        fractal_governance.scheduler.Node(
+            name="dataset",
+            run=lambda: fractal_governance.resources.get_dataset(
+                fractal_dataset_csv_paths, registry=registry
+            ),
+        ),
+        fractal_governance.scheduler.Node(
+            name="measurement_uncertainty_plots",
+            run=lambda: fractal_governance.resources.get_measurement_uncertainty_plots(
+                fractal_dataset_csv_paths, registry=registry
+            ),
+            dependencies=("dataset",),
+        ),
+    ]
+
+    def create_plots_run(
+        dashboard_view: DashboardView,
+    ) -> Callable[[], fractal_governance.plots.Plots]:
+        return lambda: fractal_governance.resources.get_plots(
+            dashboard_view,
+            fractal_dataset_csv_paths,
+            granularity=granularity,
+            registry=registry,
+        )
+
+    for dashboard_view in DashboardView:
+        nodes.append(
+            fractal_governance.scheduler.Node(
+                name=dashboard_view.name,
+                run=create_plots_run(dashboard_view),
+                dependencies=("dataset",),
+            )
+        )
+    values = fractal_governance.scheduler.run(nodes).values
+
+    plots_by_view = {
+        dashboard_view: values[dashboard_view.name] for dashboard_view in DashboardView
+    }
+    measurement_uncertainty_plots = values["measurement_uncertainty_plots"]
+    return Snapshot(
+        fingerprint=fingerprint,
+        timestamp=time.time(),
+        dataset_by_view={
+            dashboard_view: plots.dataset
+            for dashboard_view, plots in plots_by_view.items()
+        },
+        plots_by_view=plots_by_view,
+        measurement_uncertainty_dataset=measurement_uncertainty_plots.measurement_uncertainty_dataset,  # noqa: E501
+        measurement_uncertainty_plots=measurement_uncertainty_plots,
+    )
+
+
+@attrs.define
+class Refresher:
+    """Keeps a Snapshot of a Fractal's .csv files up to date on a background thread
+
+    The thread started by `start` checks the fingerprints of the .csv files every
+    `poll_interval` seconds and builds a new Snapshot when they change.
+    `refresh_count` counts the Snapshots that were built, `error_count` counts the
+    rebuilds that failed and `last_error` is the exception of the last failed
+    rebuild."""
+
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = (
+        attrs.field(factory=fractal_governance.util.FractalDatasetCSVPaths)
+    )
+
+    poll_interval: float = attrs.field(default=DEFAULT_POLL_INTERVAL, kw_only=True)
+
+    granularity: Granularity = attrs.field(default=Granularity.Auto, kw_only=True)
+
+    registry: ResourceRegistry = attrs.field(
+        default=DEFAULT_RESOURCE_REGISTRY, kw_only=True, repr=False
+    )
+
+    refresh_count: int = attrs.field(default=0, init=False)
+
+    error_count: int = attrs.field(default=0, init=False)
+
+    last_error: Optional[BaseException] = attrs.field(default=None, init=False)
+
+    _snapshot: Optional[Snapshot] = attrs.field(default=None, init=False, repr=False)
+
+    _condition: threading.Condition = attrs.field(
+        factory=threading.Condition, init=False, repr=False
+    )
+
+    _stop_event: threading.Event = attrs.field(
+        factory=threading.Event, init=False, repr=False
+    )
+
+    _thread: Optional[threading.Thread] = attrs.field(
+        default=None, init=False, repr=False
+    )
+
+    @property
+    def snapshot(self) -> Optional[Snapshot]:
+        """Return the last good Snapshot, or None if none has been built yet"""
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        """Build a new Snapshot and swap it in if the .csv files changed since the
+        current Snapshot was built, and return whether it was swapped in
+
+        An exception raised while building the Snapshot is recorded in `last_error`
+        and re-raised, and the current Snapshot is kept."""
+        fingerprint = fractal_governance.util.csv_paths_fingerprint(
+            self.fractal_dataset_csv_paths
+        )
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.fingerprint == fingerprint:
+            return False
+        try:
+            snapshot = build_snapshot(
+                self.fractal_dataset_csv_paths,
+                granularity=self.granularity,
+                registry=self.registry,
+            )
+        except BaseException as error:
+            with self._condition:
+                self.error_count += 1
+                self.last_error = error
+                self._condition.notify_all()
+            raise
+        with self._condition:
+            self._snapshot = snapshot
+            self.refresh_count += 1
+            self._condition.notify_all()
+        return True
+
+    def wait_for_snapshot(self, timeout: Optional[float] = None) -> Snapshot:
+        """Return the last good Snapshot, waiting for the first one to be built if
+        necessary
+
+        Raises TimeoutError if no Snapshot is built within `timeout` seconds, and
+        re-raises `last_error` if building the first Snapshot failed."""
+        with self._condition:
+            if not self._condition.wait_for(
+                lambda: self._snapshot is not None or self.last_error is not None,
+                timeout=timeout,
+            ):
+                raise TimeoutError(f"no snapshot was built within {timeout} seconds")
+            if self._snapshot is None:
+                raise self.last_error  # type: ignore
+            return self._snapshot
+
+    def start(self) -> None:
+        """Start the background thread, which builds the first Snapshot right away
+
+        Calling `start` again while the thread is running does nothing."""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="fractal_governance.refresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread after its current rebuild, if any"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                # The error is recorded in last_error and the last good Snapshot
+                # is kept, so the rebuild is simply retried at the next poll.
+                pass
+            self._stop_event.wait(self.poll_interval)
+
+
+_default_refresher: Optional[Refresher] = None
+_default_refresher_lock = threading.Lock()
+
+
+def get_default_refresher() -> Refresher:
+    """Return the process-wide Refresher of the Genesis Fractal's .csv files, starting
+    it on first use"""
+    global _default_refresher
+    with _default_refresher_lock:
+        if _default_refresher is None:
+            _default_refresher = Refresher()
+            _default_refresher.start()
+        return _default_refresher
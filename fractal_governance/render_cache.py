@@ -0,0 +1,186 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A cache of rendered plots for fractal governance data analysis
+
+Rendered plots are cached as PNG or SVG bytes keyed by the fingerprints of the
+DataFrames each plot reads along with the plot's name, arguments, figure size and
+resolution. A plot is therefore only rendered again when one of its input DataFrames
+changes, e.g. after new meetings are appended to the dataset.
+"""
+
+import hashlib
+import io
+import operator
+import os
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+import attrs
+import pandas as pd
+
+import fractal_governance.read_only
+from fractal_governance.lru_cache import LRUCache
+
+if TYPE_CHECKING:
+    import matplotlib.figure
+
+DEFAULT_DPI = 200
+
+DEFAULT_MAX_ENTRIES = 128
+
+# The fingerprints of read-only DataFrames and Series keyed by `id` and column names.
+# Read-only objects cannot change, so their fingerprints are only calculated once.
+_fingerprint_by_key: Dict[
+    Tuple[int, Optional[Tuple[str, ...]]], Tuple[weakref.ref, str]
+] = dict()
+_fingerprint_lock = threading.Lock()
+
+
+def _to_column_names(
+    column_names: Optional[Iterable[str]],
+) -> Optional[Tuple[str, ...]]:
+    return tuple(column_names) if column_names is not None else None
+
+
+@attrs.frozen
+class PlotInput:
+    """A DataFrame read by a plot
+
+    `frame_name` is the dotted attribute path of the DataFrame (e.g.
+    `tables.df_attendance`) and `column_names`, if given, are the only columns the
+    plot reads."""
+
+    frame_name: str
+    column_names: Optional[Tuple[str, ...]] = attrs.field(
+        default=None, converter=_to_column_names
+    )
+
+    def fingerprint(self, obj: Any) -> str:
+        """Return the fingerprint of this input of the given object"""
+        return fingerprint(
+            operator.attrgetter(self.frame_name)(obj), column_names=self.column_names
+        )
+
+
+def fingerprint(
+    obj: Union[pd.DataFrame, pd.Series],
+    *,
+    column_names: Optional[Tuple[str, ...]] = None,
+) -> str:
+    """Return a hash of the contents of the given DataFrame or Series, including its
+    index and column names
+
+    If `column_names` is given then only those columns of the DataFrame are
+    hashed."""
+    is_read_only = isinstance(
+        obj,
+        (
+            fractal_governance.read_only.ReadOnlyDataFrame,
+            fractal_governance.read_only.ReadOnlySeries,
+        ),
+    )
+    key = (id(obj), column_names)
+    if is_read_only:
+        with _fingerprint_lock:
+            ref_and_fingerprint = _fingerprint_by_key.get(key)
+        if ref_and_fingerprint is not None and ref_and_fingerprint[0]() is obj:
+            return ref_and_fingerprint[1]
+
+    hashed_obj = obj if column_names is None else obj[list(column_names)]
+    hash = hashlib.sha256()
+    hash.update(repr(list(hashed_obj.index.names)).encode())
+    if isinstance(hashed_obj, pd.DataFrame):
+        hash.update(
+            repr(list(zip(hashed_obj.columns, hashed_obj.dtypes.astype(str)))).encode()
+        )
+    else:
+        hash.update(repr((hashed_obj.name, str(hashed_obj.dtype))).encode())
+    hash.update(
+        pd.util.hash_pandas_object(
+            hashed_obj, index=True, categorize=False
+        ).values.tobytes()
+    )
+    obj_fingerprint = hash.hexdigest()
+
+    if is_read_only:
+
+        def remove(_: weakref.ref) -> None:
+            with _fingerprint_lock:
+                _fingerprint_by_key.pop(key, None)
+
+        with _fingerprint_lock:
+            _fingerprint_by_key[key] = (weakref.ref(obj, remove), obj_fingerprint)
+    return obj_fingerprint
+
+
+def make_key(*parts: Any) -> str:
+    """Return a cache key for the given parts, each of which must have a stable
+    `repr`"""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def render_figure(
+    fig: "matplotlib.figure.Figure", *, format: str = "png", dpi: float = DEFAULT_DPI
+) -> bytes:
+    """Return the given figure rendered in the given format
+
+    The figure is cleared afterwards to release its artists. It should not be managed
+    by pyplot (see `fractal_governance.plots.create_figure`), otherwise pyplot keeps
+    a reference to it until it is closed."""
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=format, dpi=dpi, bbox_inches="tight")
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+@attrs.define
+class RenderCache(LRUCache):
+    """A thread-safe LRU cache of rendered plots
+
+    At most `max_entries` rendered plots are kept in memory. If `directory` is given
+    then rendered plots are also stored there so that they survive process restarts
+    and are shared between processes. Files in `directory` are never evicted.
+    `miss_count` counts the plots that had to be rendered."""
+
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+    directory: Optional[Path] = attrs.field(
+        default=None, converter=attrs.converters.optional(Path)
+    )
+
+    def get_or_render(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Return the rendered plot for the given key, calling `render` to create it
+        if it is not in the cache"""
+        path = self.directory / key if self.directory is not None else None
+
+        def load() -> Optional[bytes]:
+            if path is None or not path.exists():
+                return None
+            return path.read_bytes()
+
+        def create() -> bytes:
+            data = render()
+            if path is not None:
+                _write_bytes_atomically(path, data)
+            return data
+
+        return self.get_or_create(key, create, load=load)
+
+
+def _write_bytes_atomically(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+DEFAULT_RENDER_CACHE = RenderCache()
@@ -0,0 +1,178 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A process-wide registry of the shared, read-only objects of the dashboards
+
+Datasets and Plots are expensive to build and are read-only once built, so every
+caller in the process can share the same instance. The registry builds each object
+once, keyed by the fingerprints of the .csv files it is built from and by its
+parameters. An object is therefore built again only when one of its .csv files
+changes, and it is handed out without being copied or pickled.
+"""
+
+from typing import Callable, Optional
+
+import attrs
+import pandas as pd
+
+import fractal_governance.dashboard
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.dataset
+import fractal_governance.measurement_uncertainty.plots
+import fractal_governance.plots
+import fractal_governance.progress
+import fractal_governance.render_cache
+import fractal_governance.result_cache
+import fractal_governance.util
+from fractal_governance.dashboard import DashboardView
+from fractal_governance.leader_board import LeaderBoard
+from fractal_governance.lru_cache import LRUCache
+from fractal_governance.render_cache import make_key
+from fractal_governance.result_cache import DEFAULT_RESULT_CACHE, ResultCache
+from fractal_governance.rollups import Granularity
+from fractal_governance.util import csv_paths_fingerprint
+
+DEFAULT_MAX_ENTRIES = 32
+
+
+@attrs.define
+class ResourceRegistry(LRUCache):
+    """A thread-safe LRU registry of shared, read-only objects
+
+    At most `max_entries` objects are kept. An object is built at most once for each
+    key, even if several threads ask for it at the same time. `hit_count` counts the
+    objects that were shared and `miss_count` counts the objects that had to be
+    built."""
+
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+
+DEFAULT_RESOURCE_REGISTRY = ResourceRegistry()
+
+
+def get_dataset(
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    registry: ResourceRegistry = DEFAULT_RESOURCE_REGISTRY,
+) -> fractal_governance.dataset.Dataset:
+    """Return the shared Dataset for the given Fractal's .csv file paths"""
+    key = make_key("dataset", csv_paths_fingerprint(fractal_dataset_csv_paths))
+    return registry.get_or_create(
+        key,
+        lambda: fractal_governance.dataset.Dataset.from_csv(fractal_dataset_csv_paths),
+    )
+
+
+def get_dashboard_dataset(
+    dashboard_view: DashboardView,
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    registry: ResourceRegistry = DEFAULT_RESOURCE_REGISTRY,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
+    result_cache: ResultCache = DEFAULT_RESULT_CACHE,
+) -> fractal_governance.dataset.Dataset:
+    """Return the shared Dataset of the given DashboardView
+
+    `progress` is only used if the Dataset has to be built, in which case the
+    results of its calculations are looked up in `result_cache` first."""
+    key = make_key(
+        "dashboard_dataset",
+        csv_paths_fingerprint(fractal_dataset_csv_paths),
+        dashboard_view.name,
+    )
+    return registry.get_or_create(
+        key,
+        lambda: fractal_governance.dashboard.create_dataset(
+            dashboard_view,
+            get_dataset(fractal_dataset_csv_paths, registry=registry),
+            progress=progress,
+            result_cache=result_cache,
+        ),
+    )
+
+
+def get_plots(
+    dashboard_view: DashboardView,
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    granularity: Granularity = Granularity.Auto,
+    registry: ResourceRegistry = DEFAULT_RESOURCE_REGISTRY,
+) -> fractal_governance.plots.Plots:
+    """Return the shared Plots of the given DashboardView"""
+    key = make_key(
+        "plots",
+        csv_paths_fingerprint(fractal_dataset_csv_paths),
+        dashboard_view.name,
+        granularity.name,
+    )
+    return registry.get_or_create(
+        key,
+        lambda: fractal_governance.plots.Plots(
+            dataset=get_dashboard_dataset(
+                dashboard_view, fractal_dataset_csv_paths, registry=registry
+            ),
+            granularity=granularity,
+        ),
+    )
+
+
+def get_measurement_uncertainty_dataset(
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    registry: ResourceRegistry = DEFAULT_RESOURCE_REGISTRY,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
+    result_cache: ResultCache = DEFAULT_RESULT_CACHE,
+) -> fractal_governance.measurement_uncertainty.dataset.Dataset:
+    """Return the shared measurement uncertainty Dataset
+
+    `progress` is only used if the Dataset has to be built, in which case the
+    measurement uncertainties are looked up in `result_cache` first."""
+    key = make_key(
+        "measurement_uncertainty_dataset",
+        csv_paths_fingerprint(fractal_dataset_csv_paths),
+    )
+    return registry.get_or_create(
+        key,
+        lambda: fractal_governance.measurement_uncertainty.dataset.Dataset(
+            dataset=get_dataset(fractal_dataset_csv_paths, registry=registry),
+            progress=progress,
+            result_cache=result_cache,
+        ),
+    )
+
+
+def get_measurement_uncertainty_plots(
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    registry: ResourceRegistry = DEFAULT_RESOURCE_REGISTRY,
+) -> fractal_governance.measurement_uncertainty.plots.Plots:
+    """Return the shared measurement uncertainty Plots, which share the measurement
+    uncertainty Dataset"""
+    key = make_key(
+        "measurement_uncertainty_plots",
+        csv_paths_fingerprint(fractal_dataset_csv_paths),
+    )
+    return registry.get_or_create(
+        key,
+        lambda: fractal_governance.measurement_uncertainty.plots.Plots(
+            dataset=get_dataset(fractal_dataset_csv_paths, registry=registry),
+            measurement_uncertainty_dataset=get_measurement_uncertainty_dataset(
+                fractal_dataset_csv_paths, registry=registry
+            ),
+        ),
+    )
+
+
+def get_leader_board(
+    df: pd.DataFrame,
+    create: Callable[[pd.DataFrame], LeaderBoard],
+    *,
+    registry: ResourceRegistry = DEFAULT_RESOURCE_REGISTRY,
+) -> LeaderBoard:
+    """Return the shared LeaderBoard that `create` returns for the given leaderboard
+    DataFrame, so that its sort orders are only calculated once (see e.g.
+    `fractal_governance.dashboard.create_member_leader_board`)"""
+    key = make_key(
+        "leader_board",
+        create.__qualname__,
+        fractal_governance.render_cache.fingerprint(df),
+    )
+    return registry.get_or_create(key, lambda: create(df))
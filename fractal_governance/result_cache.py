@@ -0,0 +1,329 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A content-addressed cache of the results of expensive calculations
+
+`fractal_governance.addendum_1.WeightedMeans`, `Addendum1Constants`,
+`Addendum1Dataset` and the measurement uncertainty `Dataset` are deterministic
+functions of the Dataset they are given and of their parameters. Their results are
+cached keyed by the fingerprint of the Dataset's DataFrame along with their
+parameters, so that a result is only calculated again when the data or the
+parameters change.
+
+A ResultCache keeps the most recently used results in memory. If it is given a
+`directory` then the results are also stored there as Apache Parquet files, so that
+batch jobs, notebooks and dashboards on the same host share them and so that they
+survive process restarts. The least recently used results in `directory` are evicted
+when their total size exceeds `max_bytes`.
+
+The columns of `uncertainties` values are stored as a column of nominal values and a
+column of standard deviations. The values read back from `directory` therefore have
+the same nominal values and standard deviations, but are independent of each other.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+
+import attrs
+import numpy as np
+import pandas as pd
+import uncertainties
+
+import fractal_governance.dataset
+import fractal_governance.read_only
+import fractal_governance.render_cache
+import fractal_governance.util
+from fractal_governance.lru_cache import LRUCache
+
+if TYPE_CHECKING:
+    import pyarrow
+from fractal_governance.render_cache import make_key
+
+DEFAULT_MAX_BYTES = 512 * 2**20
+
+DEFAULT_MAX_ENTRIES = 16
+
+# The environment variable naming the directory of `DEFAULT_RESULT_CACHE`.
+RESULT_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE = "FRACTAL_GOVERNANCE_RESULT_CACHE_DIR"
+
+# The version of the calculations and of the file format of the cached results. It is
+# part of every key, so incrementing it invalidates every result in a directory.
+RESULT_CACHE_VERSION = 1
+
+# The name of the subdirectory of a cache directory that holds the cached results,
+# next to the rendered plots (see `fractal_governance.static_site`).
+RESULT_CACHE_DIRECTORY_NAME = "results"
+
+# The names and values of a result, each of which is a DataFrame, a Series or a
+# scalar that can be represented in JSON.
+Result = Dict[str, Any]
+
+_PARQUET_SUFFIX = ".parquet"
+_SCALARS_FILE_NAME = "scalars.json"
+_SERIES_METADATA_KEY = b"fractal_governance.series"
+_STD_DEV_COLUMN_NAME_SUFFIX = ".std_dev"
+_UFLOAT_COLUMNS_METADATA_KEY = b"fractal_governance.ufloat_columns"
+
+
+def make_result_key(
+    name: str, dataset: fractal_governance.dataset.Dataset, *parameters: Any
+) -> str:
+    """Return the cache key of the named calculation of the given Dataset with the
+    given parameters, each of which must have a stable `repr`"""
+    return make_key(
+        RESULT_CACHE_VERSION,
+        name,
+        fractal_governance.render_cache.fingerprint(dataset.df),
+        *parameters,
+    )
+
+
+def make_csv_result_key(
+    name: str,
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths,
+    *parameters: Any,
+) -> str:
+    """Return the cache key of the named calculation of the Dataset of the given
+    Fractal's .csv files with the given parameters
+
+    Unlike `make_result_key` it only hashes the .csv files, so a cached result is
+    found without reading them into a Dataset."""
+    return make_key(
+        RESULT_CACHE_VERSION,
+        name,
+        fractal_governance.util.csv_paths_fingerprint(fractal_dataset_csv_paths),
+        *parameters,
+    )
+
+
+def _is_ufloat_column(series: pd.Series) -> bool:
+    if series.dtype != object:
+        return False
+    values = series.dropna()
+    return (
+        len(values) > 0
+        and values.map(lambda value: isinstance(value, uncertainties.UFloat)).any()
+    )
+
+
+def _std_dev(value: Any) -> float:
+    # Plain numbers have no standard deviation, which distinguishes them from
+    # `uncertainties` values with a standard deviation of 0.
+    return value.std_dev if isinstance(value, uncertainties.UFloat) else np.nan
+
+
+def _nominal_value(value: Any) -> float:
+    return value.nominal_value if isinstance(value, uncertainties.UFloat) else value
+
+
+def _to_table(obj: Union[pd.DataFrame, pd.Series]) -> "pyarrow.Table":
+    """Internal helper method that returns the given DataFrame or Series as an Arrow
+    table, with each column of `uncertainties` values split in two"""
+    import pyarrow
+
+    is_series = isinstance(obj, pd.Series)
+    df = obj.to_frame() if is_series else pd.DataFrame(obj)
+    ufloat_column_names = [
+        column_name for column_name in df if _is_ufloat_column(df[column_name])
+    ]
+    if ufloat_column_names:
+        df = df.copy()
+    # The standard deviation of a value is much faster to calculate once those of the
+    # values it was calculated from are, and derived columns tend to be placed before
+    # the columns they are derived from, e.g. the tokens of the Addendum 1 weighted
+    # means, so the standard deviations are calculated from the last column.
+    std_devs_by_column_name = {
+        column_name: df[column_name].map(_std_dev).astype(float)
+        for column_name in reversed(ufloat_column_names)
+    }
+    for column_name in ufloat_column_names:
+        values = df[column_name]
+        df[column_name] = values.map(_nominal_value).astype(float)
+        df.insert(
+            df.columns.get_loc(column_name) + 1,
+            f"{column_name}{_STD_DEV_COLUMN_NAME_SUFFIX}",
+            std_devs_by_column_name[column_name],
+        )
+    table = pyarrow.Table.from_pandas(df, preserve_index=True)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_UFLOAT_COLUMNS_METADATA_KEY] = json.dumps(ufloat_column_names).encode()
+    metadata[_SERIES_METADATA_KEY] = json.dumps(is_series).encode()
+    return table.replace_schema_metadata(metadata)
+
+
+def _from_table(table: "pyarrow.Table") -> Union[pd.DataFrame, pd.Series]:
+    """Internal helper method that is the inverse of `_to_table`"""
+    metadata = table.schema.metadata
+    df = table.to_pandas()
+    for column_name in json.loads(metadata[_UFLOAT_COLUMNS_METADATA_KEY]):
+        std_dev_column_name = f"{column_name}{_STD_DEV_COLUMN_NAME_SUFFIX}"
+        nominal_values = df[column_name].to_numpy()
+        std_devs = df.pop(std_dev_column_name).to_numpy()
+        values = np.empty(len(df), dtype=object)
+        for i, (nominal_value, std_dev) in enumerate(zip(nominal_values, std_devs)):
+            values[i] = (
+                nominal_value
+                if np.isnan(std_dev)
+                else uncertainties.ufloat(nominal_value, std_dev)
+            )
+        df[column_name] = values
+    if json.loads(metadata[_SERIES_METADATA_KEY]):
+        return df.iloc[:, 0]
+    return df
+
+
+def _freeze(result: Result) -> Result:
+    return {
+        name: fractal_governance.read_only.freeze(value)
+        if isinstance(value, (pd.DataFrame, pd.Series))
+        else value
+        for name, value in result.items()
+    }
+
+
+def _to_scalar(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def write_result(path: Path, result: Result) -> None:
+    """Write the given result to the directory `path`, which appears atomically once
+    it is complete"""
+    import pyarrow.parquet
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(tempfile.mkdtemp(dir=path.parent, prefix=f".{path.name}."))
+    try:
+        scalars = dict()
+        for name, value in result.items():
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                pyarrow.parquet.write_table(
+                    _to_table(value), tmp_path / f"{name}{_PARQUET_SUFFIX}"
+                )
+            else:
+                scalars[name] = _to_scalar(value)
+        (tmp_path / _SCALARS_FILE_NAME).write_text(json.dumps(scalars))
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Another process stored the same result first.
+            if not path.is_dir():
+                raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def read_result(path: Path) -> Result:
+    """Return the result written to the directory `path` by `write_result`"""
+    import pyarrow.parquet
+
+    result: Result = json.loads((path / _SCALARS_FILE_NAME).read_text())
+    for file_path in path.glob(f"*{_PARQUET_SUFFIX}"):
+        result[file_path.stem] = _from_table(pyarrow.parquet.read_table(file_path))
+    return result
+
+
+def _get_size(path: Path) -> int:
+    return sum(file_path.stat().st_size for file_path in path.iterdir())
+
+
+@attrs.define
+class ResultCache(LRUCache):
+    """A thread-safe, content-addressed cache of the results of expensive
+    calculations
+
+    At most `max_entries` results are kept in memory. If `directory` is given then
+    results are also stored there, and the least recently used of them are evicted
+    when their total size exceeds `max_bytes`. `hit_count` counts the results that
+    were found in memory or in `directory` and `miss_count` counts the results that
+    had to be calculated."""
+
+    max_entries: int = DEFAULT_MAX_ENTRIES
+
+    directory: Optional[Path] = attrs.field(
+        default=None, converter=attrs.converters.optional(Path)
+    )
+
+    max_bytes: int = attrs.field(default=DEFAULT_MAX_BYTES, kw_only=True)
+
+    def _read(self, key: str) -> Optional[Result]:
+        if self.directory is None:
+            return None
+        import pyarrow
+
+        path = self.directory / key
+        try:
+            result = read_result(path)
+            # The modification time of a result's directory is the time it was last
+            # used.
+            os.utime(path)
+        except (OSError, ValueError, KeyError, pyarrow.ArrowException):
+            # The result is missing, or was evicted by another process while it was
+            # being read.
+            return None
+        return result
+
+    def _write(self, key: str, result: Result) -> None:
+        if self.directory is None:
+            return
+        write_result(self.directory / key, result)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used results from `directory` until their total
+        size is at most `max_bytes`"""
+        if self.directory is None or not self.directory.is_dir():
+            return
+        entries: List[Tuple[float, int, Path]] = []
+        for path in self.directory.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                entries.append((path.stat().st_mtime, _get_size(path), path))
+            except OSError:
+                # Another process evicted the result.
+                continue
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total_size -= size
+
+    def get_or_compute(self, key: str, compute: Callable[[], Result]) -> Result:
+        """Return the result for the given key, calling `compute` to calculate it if
+        it is neither in memory nor in `directory`
+
+        The DataFrames and Series of the returned result are read-only. If `compute`
+        raises then nothing is cached and the exception propagates to the caller."""
+
+        def load() -> Optional[Result]:
+            result = self._read(key)
+            return _freeze(result) if result is not None else None
+
+        def create() -> Result:
+            result = compute()
+            self._write(key, result)
+            return _freeze(result)
+
+        return self.get_or_create(key, create, load=load)
+
+
+def get_or_compute(
+    result_cache: Optional[ResultCache],
+    get_key: Callable[[], str],
+    compute: Callable[[], Result],
+) -> Result:
+    """Return the result of `compute` from the given ResultCache, or calculate it
+    without caching if `result_cache` is None
+
+    `get_key` is only called if `result_cache` is given."""
+    if result_cache is None:
+        return compute()
+    return result_cache.get_or_compute(get_key(), compute)
+
+
+DEFAULT_RESULT_CACHE = ResultCache(
+    directory=os.environ.get(RESULT_CACHE_DIRECTORY_ENVIRONMENT_VARIABLE) or None
+)
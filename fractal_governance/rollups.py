@@ -0,0 +1,133 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Rollups of weekly fractal governance data to months, quarters and years
+
+A plot with one bar per weekly meeting becomes slow to render and unreadable as the
+history grows. The rollups aggregate the per-meeting DataFrames of a Dataset to
+coarser time periods so that a plot's bar count stays bounded. Every rollup DataFrame
+is indexed by (Granularity, Period), where Period is the start of the time period,
+and holds the rollups for every Granularity in ROLLUP_GRANULARITIES.
+"""
+
+from enum import Enum, auto
+from typing import Dict, Iterable, List, Union
+
+import pandas as pd
+
+from .constants import (
+    GRANULARITY_COLUMN_NAME,
+    MEETING_COUNT_COLUMN_NAME,
+    PERIOD_COLUMN_NAME,
+)
+
+# The default maximum number of bars in a plot with Granularity.Auto, about one year
+# of weekly meetings.
+DEFAULT_MAX_BAR_COUNT = 52
+
+
+class Granularity(Enum):
+    """The time period of each bar in a time-series plot
+
+    Week is one bar per meeting. Auto is the finest granularity whose bar count does
+    not exceed a maximum (see `resolve_granularity`)."""
+
+    Week = auto()
+    Month = auto()
+    Quarter = auto()
+    Year = auto()
+    Auto = auto()
+
+
+# The granularities that are rolled up from the weekly data, finest first.
+ROLLUP_GRANULARITIES = (Granularity.Month, Granularity.Quarter, Granularity.Year)
+
+_FREQUENCY_BY_GRANULARITY = {
+    Granularity.Month: "M",
+    Granularity.Quarter: "Q",
+    Granularity.Year: "Y",
+}
+
+
+def format_period(period: pd.Timestamp, granularity: Granularity) -> str:
+    """Return the axis label for the time period starting at `period`"""
+    if granularity == Granularity.Week:
+        return period.strftime("%b %d %Y")
+    elif granularity == Granularity.Month:
+        return period.strftime("%b %Y")
+    elif granularity == Granularity.Quarter:
+        return f"{period.year} Q{period.quarter}"
+    elif granularity == Granularity.Year:
+        return period.strftime("%Y")
+    else:
+        raise ValueError(f"granularity {granularity} has no time period")
+
+
+def roll_up(
+    df: Union[pd.DataFrame, pd.Series],
+    aggregations: Union[str, Dict[str, str]],
+    *,
+    meeting_dates: pd.Series,
+    group_by: Iterable[str] = (),
+) -> Union[pd.DataFrame, pd.Series]:
+    """Return the rollups of the given per-meeting DataFrame or Series for every
+    Granularity in ROLLUP_GRANULARITIES
+
+    `meeting_dates` are the meeting dates of the rows of `df`, `aggregations` are
+    the aggregations of its columns (e.g. "sum" or "mean") and `group_by` are
+    additional columns to group by. A DataFrame rollup also has the number of meetings
+    in each time period."""
+    group_by = list(group_by)
+    rollups: List[Union[pd.DataFrame, pd.Series]] = []
+    for granularity in ROLLUP_GRANULARITIES:
+        period = meeting_dates.dt.to_period(
+            _FREQUENCY_BY_GRANULARITY[granularity]
+        ).dt.start_time
+        grouper = [pd.Index(period.to_numpy(), name=PERIOD_COLUMN_NAME)] + [
+            df[column_name] for column_name in group_by
+        ]
+        rollup = df.groupby(grouper, sort=True).agg(aggregations)
+        if isinstance(rollup, pd.DataFrame):
+            rollup[MEETING_COUNT_COLUMN_NAME] = (
+                meeting_dates.groupby(grouper).nunique().to_numpy()
+            )
+        rollups.append(rollup)
+    rollup = pd.concat(
+        rollups,
+        keys=[granularity.name for granularity in ROLLUP_GRANULARITIES],
+        names=[GRANULARITY_COLUMN_NAME],
+    )
+    if group_by:
+        rollup = rollup.reset_index(group_by)
+    return rollup
+
+
+def get_rollup(
+    df: Union[pd.DataFrame, pd.Series], granularity: Granularity
+) -> Union[pd.DataFrame, pd.Series]:
+    """Return the rollup of the given Granularity indexed by Period"""
+    if granularity not in ROLLUP_GRANULARITIES:
+        raise ValueError(f"granularity {granularity} is not rolled up")
+    return df.xs(granularity.name, level=GRANULARITY_COLUMN_NAME)
+
+
+def resolve_granularity(
+    granularity: Granularity,
+    df_rollup: pd.DataFrame,
+    *,
+    meeting_count: int,
+    max_bar_count: int = DEFAULT_MAX_BAR_COUNT,
+) -> Granularity:
+    """Return the given Granularity, or for Granularity.Auto the finest granularity
+    whose number of time periods does not exceed `max_bar_count`
+
+    `df_rollup` is a rollup DataFrame with one row per time period and
+    `meeting_count` is the number of weekly meetings. The coarsest granularity is
+    returned if every granularity has too many time periods."""
+    if granularity != Granularity.Auto:
+        return granularity
+    if meeting_count <= max_bar_count:
+        return Granularity.Week
+    period_counts = df_rollup.groupby(level=GRANULARITY_COLUMN_NAME).size()
+    for rollup_granularity in ROLLUP_GRANULARITIES:
+        if period_counts.get(rollup_granularity.name, 0) <= max_bar_count:
+            return rollup_granularity
+    return ROLLUP_GRANULARITIES[-1]
@@ -0,0 +1,101 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A scheduler for running a dependency graph of computations concurrently"""
+
+import concurrent.futures
+import time
+from typing import Any, Callable, Dict, Optional, Sequence, Set, Tuple
+
+import attrs
+
+
+@attrs.frozen(kw_only=True)
+class Node:
+    """A named computation in a dependency graph
+
+    `run` is called only after every node named in `dependencies` has finished."""
+
+    name: str
+    run: Callable[[], Any] = attrs.field(repr=False)
+    dependencies: Tuple[str, ...] = ()
+
+
+@attrs.frozen(kw_only=True)
+class ScheduleResult:
+    """The return value and the wall-clock run time in seconds of every node"""
+
+    values: Dict[str, Any] = attrs.field(repr=False)
+    timings: Dict[str, float]
+
+
+def _run_node(node: Node) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    value = node.run()
+    return value, time.perf_counter() - start
+
+
+def _validate(nodes: Sequence[Node]) -> None:
+    names = [node.name for node in nodes]
+    if len(names) != len(set(names)):
+        raise ValueError(f"node names must be unique: {names}")
+    for node in nodes:
+        unknown_dependencies = set(node.dependencies).difference(names)
+        if unknown_dependencies:
+            raise ValueError(
+                f"node {node.name} has unknown dependencies {sorted(unknown_dependencies)}"  # noqa: E501
+            )
+
+
+def run(
+    nodes: Sequence[Node],
+    *,
+    executor: Optional[concurrent.futures.Executor] = None,
+    max_workers: Optional[int] = None,
+) -> ScheduleResult:
+    """Run the given nodes, each one as soon as all of its dependencies have finished
+
+    Independent nodes run concurrently on the given `executor`, or on a new thread
+    pool with `max_workers` threads if no executor is given. A process pool executor
+    may be given if every node's `run` and return value can be pickled. The first
+    exception raised by a node is re-raised after the nodes already running finish,
+    and nodes that have not started yet are never run."""
+    _validate(nodes)
+    node_by_name = {node.name: node for node in nodes}
+    remaining_dependencies: Dict[str, Set[str]] = {
+        node.name: set(node.dependencies) for node in nodes
+    }
+    values: Dict[str, Any] = dict()
+    timings: Dict[str, float] = dict()
+
+    owns_executor = executor is None
+    if executor is None:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        running: Dict[concurrent.futures.Future, str] = dict()  # type: ignore
+
+        def submit_ready_nodes() -> None:
+            for name, dependencies in list(remaining_dependencies.items()):
+                if not dependencies:
+                    del remaining_dependencies[name]
+                    future = executor.submit(_run_node, node_by_name[name])  # type: ignore # noqa: E501
+                    running[future] = name
+
+        submit_ready_nodes()
+        while running:
+            done, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                name = running.pop(future)
+                values[name], timings[name] = future.result()
+                for dependencies in remaining_dependencies.values():
+                    dependencies.discard(name)
+            submit_ready_nodes()
+        if remaining_dependencies:
+            raise ValueError(
+                f"dependency cycle between nodes {sorted(remaining_dependencies)}"
+            )
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return ScheduleResult(values=values, timings=timings)
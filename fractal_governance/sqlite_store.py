@@ -0,0 +1,389 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A SQLite store of a Fractal's dataset
+
+A Dataset holds the whole history of a Fractal in memory, which every worker of an
+API server would otherwise have to load to look up a single member or meeting. A
+SQLiteStore instead keeps the normalized tables of a Fractal (see
+`fractal_governance.tables.Tables`) in a local SQLite database file, indexed by
+`MemberID`, `MeetingID`, (`MeetingID`, `Group`) and `TeamID`:
+
+- The member summary statistics, the leaderboards and the team Respect by meeting
+  date are calculated by SQLite, and return the same DataFrames as the
+  corresponding frames of a Dataset.
+- Point lookups of a member or a meeting use the indexes.
+- The rows of the attendance table are streamed in chunks by `iter_attendance`.
+
+The database is only built again when the fingerprint of the .csv files, calendar
+or rules it was built from changes, and it is replaced atomically so that readers in
+other processes always see a complete database.
+"""
+
+import contextlib
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import attrs
+import numpy as np
+import pandas as pd
+
+import fractal_governance.tables
+import fractal_governance.util
+from fractal_governance.constants import (
+    GROUP_COLUMN_NAME,
+    HIVE_ACCOUNT_NAME_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    SIGNATURE_ON_FILE_COLUMN_NAME,
+    STANDARD_DEVIATION_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+)
+from fractal_governance.render_cache import make_key
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# The version of the database schema. It is part of the fingerprint of a database,
+# so incrementing it rebuilds every database.
+SQLITE_STORE_VERSION = 1
+
+_METADATA_TABLE_NAME = "metadata"
+_FINGERPRINT_KEY = "fingerprint"
+
+# The index of each table that is stored as a column.
+_INDEX_COLUMN_NAME_BY_TABLE_NAME = {
+    "members": MEMBER_ID_COLUMN_NAME,
+    "teams": TEAM_ID_COLUMN_NAME,
+    "meetings": MEETING_ID_COLUMN_NAME,
+}
+
+_INDEXES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "attendance_member_id": ("attendance", (MEMBER_ID_COLUMN_NAME,)),
+    "attendance_meeting_id_group": (
+        "attendance",
+        (MEETING_ID_COLUMN_NAME, GROUP_COLUMN_NAME),
+    ),
+    "attendance_team_id": ("attendance", (TEAM_ID_COLUMN_NAME,)),
+    "round_results_meeting_id_group": (
+        "round_results",
+        (MEETING_ID_COLUMN_NAME, GROUP_COLUMN_NAME),
+    ),
+    "round_results_member_id": ("round_results", (MEMBER_ID_COLUMN_NAME,)),
+    "respect_member_id": ("respect", (MEMBER_ID_COLUMN_NAME,)),
+    "respect_meeting_id": ("respect", (MEETING_ID_COLUMN_NAME,)),
+}
+
+_MEMBER_SUMMARY_STATS_SQL = """
+SELECT
+    m.MemberID,
+    COUNT(a.Level) AS AttendanceCount,
+    COALESCE(SUM(a.Level), 0.0) AS AccumulatedLevel,
+    (
+        SELECT COALESCE(KAHAN_SUM(r.Respect), 0.0)
+        FROM respect AS r
+        WHERE r.MemberID = m.MemberID
+    ) AS AccumulatedRespect,
+    AVG(a.Level) AS Mean,
+    CASE WHEN COUNT(a.Level) > 1 THEN
+        (SUM(a.Level * a.Level) - SUM(a.Level) * SUM(a.Level) / COUNT(a.Level))
+        / (COUNT(a.Level) - 1)
+    END AS Variance
+FROM members AS m
+LEFT JOIN attendance AS a ON a.MemberID = m.MemberID
+GROUP BY m.MemberID
+ORDER BY m.MemberID
+"""
+
+_TEAM_RESPECT_BY_MEETING_DATE_SQL = """
+SELECT TeamName, MeetingDate, KAHAN_SUM(Respect) AS AccumulatedRespect
+FROM attendance
+WHERE TeamName IS NOT NULL
+GROUP BY TeamName, MeetingDate
+ORDER BY TeamName, MeetingDate
+"""
+
+_TEAM_LEADER_BOARD_SQL = """
+SELECT TeamName, KAHAN_SUM(Respect) AS AccumulatedRespect
+FROM attendance
+WHERE TeamName IS NOT NULL
+GROUP BY TeamName
+ORDER BY AccumulatedRespect DESC
+"""
+
+
+class _KahanSum:
+    """A SQLite aggregate function that sums its values with Kahan summation, as
+    pandas does, so that accumulated Respect and the order of the leaderboards are
+    the same as those of a Dataset"""
+
+    def __init__(self) -> None:
+        self.sum: Optional[float] = None
+        self.compensation = 0.0
+
+    def step(self, value: Optional[float]) -> None:
+        if value is None:
+            return
+        if self.sum is None:
+            self.sum = 0.0
+        y = value - self.compensation
+        t = self.sum + y
+        self.compensation = (t - self.sum) - y
+        self.sum = t
+
+    def finalize(self) -> Optional[float]:
+        return self.sum
+
+
+def _connect(path: Path, *, read_only: bool = True) -> sqlite3.Connection:
+    """Internal helper method that returns a connection to the given database file
+    with the KAHAN_SUM aggregate function"""
+    if read_only:
+        connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+    else:
+        connection = sqlite3.connect(path)
+    connection.create_aggregate("KAHAN_SUM", 1, _KahanSum)  # type: ignore
+    return connection
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def get_fingerprint(
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths,
+    fractal_calendar: fractal_governance.util.FractalCalendar,
+    fractal_rules: fractal_governance.util.FractalRules,
+) -> str:
+    """Return the fingerprint of the database built from the given Fractal's .csv
+    files, calendar and rules"""
+    return make_key(
+        SQLITE_STORE_VERSION,
+        fractal_governance.util.csv_paths_fingerprint(fractal_dataset_csv_paths),
+        fractal_calendar,
+        fractal_rules,
+    )
+
+
+def _write_database(
+    path: Path, tables: fractal_governance.tables.Tables, fingerprint: str
+) -> None:
+    """Internal helper method that writes the given Tables to the database file
+    `path`, which appears atomically once it is complete"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_descriptor, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}."
+    )
+    os.close(file_descriptor)
+    try:
+        with contextlib.closing(
+            _connect(Path(tmp_name), read_only=False)
+        ) as connection:
+            for table_name, df in [
+                ("attendance", tables.df_attendance),
+                ("round_results", tables.df_round_results),
+                ("respect", tables.df_respect),
+                ("members", tables.df_members),
+                ("teams", tables.df_teams),
+                ("meetings", tables.df_meetings),
+            ]:
+                pd.DataFrame(df).to_sql(
+                    table_name,
+                    connection,
+                    index=table_name in _INDEX_COLUMN_NAME_BY_TABLE_NAME,
+                )
+            for index_name, (
+                table_name,
+                column_names,
+            ) in _INDEXES.items():
+                connection.execute(
+                    f"CREATE INDEX {index_name} ON {table_name} "
+                    f"({', '.join(_quote(name) for name in column_names)})"
+                )
+            connection.execute(
+                f"CREATE TABLE {_METADATA_TABLE_NAME} "
+                "(key TEXT PRIMARY KEY, value TEXT)"
+            )
+            connection.execute(
+                f"INSERT INTO {_METADATA_TABLE_NAME} VALUES (?, ?)",
+                (_FINGERPRINT_KEY, fingerprint),
+            )
+            connection.commit()
+        os.replace(tmp_name, path)
+    finally:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_name)
+
+
+def _read_fingerprint(path: Path) -> Optional[str]:
+    """Internal helper method that returns the fingerprint of the given database
+    file, or None if it does not exist or is not a database"""
+    if not path.is_file():
+        return None
+    try:
+        with contextlib.closing(_connect(path)) as connection:
+            row = connection.execute(
+                f"SELECT value FROM {_METADATA_TABLE_NAME} WHERE key = ?",
+                (_FINGERPRINT_KEY,),
+            ).fetchone()
+    except sqlite3.DatabaseError:
+        return None
+    return None if row is None else row[0]
+
+
+@attrs.frozen
+class SQLiteStore:
+    """A read-only view of a Fractal's dataset stored in the SQLite database file
+    `path` (see `SQLiteStore.from_csv`)
+
+    Every query opens its own connection, so a SQLiteStore can be shared between
+    threads and sent to other processes."""
+
+    path: Path = attrs.field(converter=Path)
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: os.PathLike,
+        fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+        *,
+        fractal_calendar: fractal_governance.util.FractalCalendar = fractal_governance.util.FractalCalendar(),  # noqa: E501
+        fractal_rules: fractal_governance.util.FractalRules = fractal_governance.util.FractalRules(),  # noqa: E501
+    ) -> "SQLiteStore":
+        """Return the SQLiteStore of the given Fractal's .csv files in the database
+        file `path`, which is only built if it is missing or out of date"""
+        path = Path(path)
+        fingerprint = get_fingerprint(
+            fractal_dataset_csv_paths, fractal_calendar, fractal_rules
+        )
+        if _read_fingerprint(path) != fingerprint:
+            df = fractal_governance.util.read_csv(
+                fractal_dataset_csv_paths,
+                fractal_calendar=fractal_calendar,
+                fractal_rules=fractal_rules,
+            )
+            _write_database(
+                path,
+                fractal_governance.tables.Tables.from_dataframe(df),
+                fingerprint,
+            )
+        return cls(path)
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """The fingerprint of the .csv files, calendar and rules of the database"""
+        return _read_fingerprint(self.path)
+
+    def _connect(self) -> "contextlib.closing[sqlite3.Connection]":
+        return contextlib.closing(_connect(self.path))
+
+    def _read_sql(
+        self,
+        sql: str,
+        params: Tuple[Any, ...] = (),
+        *,
+        parse_dates: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        with self._connect() as connection:
+            return pd.read_sql_query(
+                sql, connection, params=params, parse_dates=parse_dates
+            )
+
+    def get_member_summary_stats_by_member_id(self) -> pd.DataFrame:
+        """Return the same DataFrame as
+        `Dataset.df_member_summary_stats_by_member_id`"""
+        df = self._read_sql(_MEMBER_SUMMARY_STATS_SQL).set_index(MEMBER_ID_COLUMN_NAME)
+        # SQLite has no square root function.
+        df[STANDARD_DEVIATION_COLUMN_NAME] = np.sqrt(df.pop("Variance").clip(lower=0))
+        return df
+
+    def get_member_leader_board(self) -> pd.DataFrame:
+        """Return the same DataFrame as `Dataset.df_member_leader_board`"""
+        df = self._read_sql(
+            f"""
+            SELECT s.MemberID, m.Name, s.AccumulatedRespect, s.AttendanceCount
+            FROM ({_MEMBER_SUMMARY_STATS_SQL}) AS s
+            JOIN members AS m ON m.MemberID = s.MemberID
+            ORDER BY s.AccumulatedRespect DESC, s.AttendanceCount DESC, s.MemberID
+            """
+        )
+        df.index += 1
+        return df
+
+    def get_team_respect_by_meeting_date(self) -> pd.DataFrame:
+        """Return the same DataFrame as `Dataset.df_team_respect_by_meeting_date`"""
+        return self._read_sql(
+            _TEAM_RESPECT_BY_MEETING_DATE_SQL, parse_dates=[MEETING_DATE_COLUMN_NAME]
+        )
+
+    def get_team_leader_board(self) -> pd.DataFrame:
+        """Return the same DataFrame as `Dataset.df_team_leader_board`"""
+        return self._read_sql(_TEAM_LEADER_BOARD_SQL).set_index(TEAM_NAME_COLUMN_NAME)
+
+    def get_member(self, member_id: str) -> pd.Series:
+        """Return the name, Hive account status and signature status of the given
+        member, and raise KeyError if there is no such member"""
+        df = self._read_sql(
+            "SELECT * FROM members WHERE MemberID = ?", (member_id,)
+        ).set_index(MEMBER_ID_COLUMN_NAME)
+        if df.empty:
+            raise KeyError(member_id)
+        return df.astype(
+            {HIVE_ACCOUNT_NAME_COLUMN_NAME: bool, SIGNATURE_ON_FILE_COLUMN_NAME: bool}
+        ).iloc[0]
+
+    def iter_attendance(
+        self,
+        *,
+        member_id: Optional[str] = None,
+        meeting_id: Optional[int] = None,
+        group: Optional[int] = None,
+        team_id: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        """Yield the rows of the attendance table with the given member, meeting,
+        group and team, in chunks of at most `chunk_size` rows
+
+        The rows are ordered by meeting and then by member. Only one chunk is held
+        in memory at a time."""
+        conditions = []
+        params: List[Any] = []
+        for column_name, value in [
+            (MEMBER_ID_COLUMN_NAME, member_id),
+            (MEETING_ID_COLUMN_NAME, meeting_id),
+            (GROUP_COLUMN_NAME, group),
+            (TEAM_ID_COLUMN_NAME, team_id),
+        ]:
+            if value is not None:
+                conditions.append(f"{_quote(column_name)} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connect() as connection:
+            yield from pd.read_sql_query(
+                f"SELECT * FROM attendance {where} ORDER BY MeetingID, MemberID",
+                connection,
+                params=params,
+                parse_dates=[MEETING_DATE_COLUMN_NAME],
+                chunksize=chunk_size,
+            )
+
+    def get_attendance(self, **kwargs: Any) -> pd.DataFrame:
+        """Return the rows of the attendance table selected by the keyword arguments
+        of `iter_attendance`"""
+        chunks = list(self.iter_attendance(**kwargs))
+        if not chunks:
+            return self._read_sql(
+                "SELECT * FROM attendance LIMIT 0",
+                parse_dates=[MEETING_DATE_COLUMN_NAME],
+            )
+        return pd.concat(chunks, ignore_index=True)
+
+    def get_attendance_count(self, member_id: str) -> int:
+        """Return the number of meetings the given member attended"""
+        with self._connect() as connection:
+            (count,) = connection.execute(
+                "SELECT COUNT(*) FROM attendance WHERE MemberID = ?", (member_id,)
+            ).fetchone()
+        return int(count)
@@ -0,0 +1,522 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""A static HTML export of the Genesis Fractal Dashboard and the Genesis Uncertainty
+Observatory
+
+The Streamlit dashboards compute their datasets and render their plots for every
+visitor session, even though the data only changes once per weekly meeting. `export`
+renders every plot and table of both dashboards, for every DashboardView and every
+measurement uncertainty option, into a directory of plain HTML pages and PNG images
+that can be served by any web server.
+
+The datasets are computed once in the parent process and the plots are rendered on a
+process pool, since matplotlib rendering is CPU bound.
+
+Usage: python -m fractal_governance.static_site OUTPUT_DIR
+"""
+
+import argparse
+import concurrent.futures
+import html
+import os
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import attrs
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.dataset
+import fractal_governance.measurement_uncertainty.plots
+import fractal_governance.plots
+import fractal_governance.progress
+import fractal_governance.render_cache
+import fractal_governance.result_cache
+import fractal_governance.util
+from fractal_governance.dashboard import (
+    DashboardView,
+    create_dataset,
+    get_attendance_table,
+    style_measurement_uncertainty_leader_board,
+    style_member_leader_board,
+    style_team_leader_board,
+)
+from fractal_governance.measurement_uncertainty.dataset import UncertaintyType
+from fractal_governance.measurement_uncertainty.plots import CorrelationType
+from fractal_governance.rollups import Granularity
+
+if TYPE_CHECKING:
+    from pandas.io.formats.style import Styler
+
+DASHBOARD_TITLE = "Genesis Fractal Dashboard"
+
+UNCERTAINTY_TITLE = "Genesis Uncertainty Observatory"
+
+UNCERTAINTY_PAGE_NAME = "uncertainty"
+
+IMAGES_DIRECTORY_NAME = "images"
+
+# The plots shown on each DashboardView page, in display order.
+DASHBOARD_PLOT_NAMES = (
+    "accumulated_member_respect_vs_time_stacked",
+    "attendance_vs_time_stacked",
+    "attendance_consistency_histogram",
+    "accumulated_team_respect_vs_time_stacked",
+    "team_representation_vs_time",
+    "ranking_stability_histogram",
+)
+
+# The plots and their arguments shown on the measurement uncertainty page, in display
+# order.
+UNCERTAINTY_PLOT_NAMES_AND_ARGS: Tuple[Tuple[str, Tuple[Any, ...]], ...] = (
+    ("measurement_uncertainty_distribution", (UncertaintyType.NominalValue,)),
+    ("measurement_uncertainty_distribution", (UncertaintyType.StdDev,)),
+    (
+        "measurement_uncertainty_correlation",
+        (UncertaintyType.NominalValue, CorrelationType.MeanLevel),
+    ),
+    (
+        "measurement_uncertainty_correlation",
+        (UncertaintyType.StdDev, CorrelationType.MeanLevel),
+    ),
+    (
+        "measurement_uncertainty_correlation",
+        (UncertaintyType.NominalValue, CorrelationType.AttendanceCount),
+    ),
+    (
+        "measurement_uncertainty_correlation",
+        (UncertaintyType.StdDev, CorrelationType.AttendanceCount),
+    ),
+    ("measurement_uncertainty", ()),
+)
+
+_STYLESHEET = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 1200px; }
+nav a { margin-right: 1em; }
+img { max-width: 100%; }
+table { border-collapse: collapse; margin-bottom: 1em; }
+th, td { border: 1px solid #ddd; padding: 0.25em 0.5em; text-align: right; }
+.columns { display: flex; gap: 2em; }
+.columns > div { flex: 1; min-width: 0; overflow-x: auto; }
+"""
+
+
+@attrs.frozen
+class PlotJob:
+    """A plot to render on the page named `page_name`"""
+
+    page_name: str
+    plot_name: str
+    args: Tuple[Any, ...] = ()
+
+    @property
+    def path(self) -> Path:
+        """Return the path of the rendered plot relative to the site's root"""
+        stem = "-".join(
+            [self.plot_name]
+            + [arg.name if isinstance(arg, Enum) else str(arg) for arg in self.args]
+        )
+        return Path(IMAGES_DIRECTORY_NAME, self.page_name, f"{stem}.png")
+
+
+def get_page_name(dashboard_view: DashboardView) -> str:
+    """Return the page name of the given DashboardView"""
+    return dashboard_view.name.lower()
+
+
+def get_plot_jobs() -> List[PlotJob]:
+    """Return every plot of both dashboards"""
+    plot_jobs = [
+        PlotJob(get_page_name(dashboard_view), plot_name)
+        for dashboard_view in DashboardView
+        for plot_name in DASHBOARD_PLOT_NAMES
+    ]
+    plot_jobs += [
+        PlotJob(UNCERTAINTY_PAGE_NAME, plot_name, args)
+        for plot_name, args in UNCERTAINTY_PLOT_NAMES_AND_ARGS
+    ]
+    return plot_jobs
+
+
+def create_plots_by_page_name(
+    dataset_by_page_name: Dict[str, fractal_governance.dataset.Dataset],
+    measurement_uncertainty_dataset: fractal_governance.measurement_uncertainty.dataset.Dataset,  # noqa: E501
+    render_cache: fractal_governance.render_cache.RenderCache,
+) -> Dict[str, Any]:
+    """Return the Plots of each page, keyed by the `page_name` of its PlotJobs"""
+    plots_by_page_name: Dict[str, Any] = {
+        page_name: fractal_governance.plots.Plots(
+            dataset=dataset, granularity=Granularity.Auto, render_cache=render_cache
+        )
+        for page_name, dataset in dataset_by_page_name.items()
+    }
+    plots_by_page_name[
+        UNCERTAINTY_PAGE_NAME
+    ] = fractal_governance.measurement_uncertainty.plots.Plots(
+        dataset=measurement_uncertainty_dataset.dataset,
+        measurement_uncertainty_dataset=measurement_uncertainty_dataset,
+        render_cache=render_cache,
+    )
+    return plots_by_page_name
+
+
+# The Plots of each page, created once per worker process by `_initialize_worker`.
+_plots_by_page_name: Dict[str, Any] = dict()
+
+
+def _initialize_worker(
+    dataset_by_page_name: Dict[str, fractal_governance.dataset.Dataset],
+    measurement_uncertainty_dataset: fractal_governance.measurement_uncertainty.dataset.Dataset,  # noqa: E501
+    cache_directory: Optional[os.PathLike],
+) -> None:
+    # Every plot is rendered once per export, so rendered plots are only kept on disk.
+    render_cache = fractal_governance.render_cache.RenderCache(
+        max_entries=0, directory=cache_directory
+    )
+    _plots_by_page_name.clear()
+    _plots_by_page_name.update(
+        create_plots_by_page_name(
+            dataset_by_page_name, measurement_uncertainty_dataset, render_cache
+        )
+    )
+
+
+def _render_plot(plot_job: PlotJob, output_dir: Path, dpi: float) -> Path:
+    path = output_dir / plot_job.path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(
+        _plots_by_page_name[plot_job.page_name].render(
+            plot_job.plot_name, *plot_job.args, dpi=dpi
+        )
+    )
+    return path
+
+
+def export(
+    output_dir: os.PathLike,
+    fractal_dataset_csv_paths: fractal_governance.util.FractalDatasetCSVPaths = fractal_governance.util.FractalDatasetCSVPaths(),  # noqa: E501
+    *,
+    max_workers: Optional[int] = None,
+    dpi: float = fractal_governance.render_cache.DEFAULT_DPI,
+    cache_directory: Optional[os.PathLike] = None,
+    progress: Optional[fractal_governance.progress.ProgressToken] = None,
+) -> List[Path]:
+    """Write the static site for the given Fractal's .csv file paths to `output_dir`
+    and return the paths of the files written
+
+    The plots are rendered on a pool of at most `max_workers` processes. If
+    `cache_directory` is given then rendered plots are stored there and only the
+    plots whose input data changed are rendered again by the next export, and the
+    results of the expensive calculations are stored in its "results" subdirectory
+    (see `fractal_governance.result_cache`)."""
+    output_dir = Path(output_dir)
+    result_cache = fractal_governance.result_cache.DEFAULT_RESULT_CACHE
+    if cache_directory is not None:
+        result_cache = fractal_governance.result_cache.ResultCache(
+            directory=Path(cache_directory)
+            / fractal_governance.result_cache.RESULT_CACHE_DIRECTORY_NAME
+        )
+    dataset = fractal_governance.dataset.Dataset.from_csv(fractal_dataset_csv_paths)
+    dataset_by_page_name = {
+        get_page_name(dashboard_view): create_dataset(
+            dashboard_view, dataset, progress=progress, result_cache=result_cache
+        )
+        for dashboard_view in DashboardView
+    }
+    measurement_uncertainty_dataset = (
+        fractal_governance.measurement_uncertainty.dataset.Dataset(
+            dataset=dataset, progress=progress, result_cache=result_cache
+        )
+    )
+
+    paths = [_write_page(output_dir / "index.html", _create_index_page(dataset))]
+    for dashboard_view in DashboardView:
+        page_name = get_page_name(dashboard_view)
+        paths.append(
+            _write_page(
+                output_dir / f"{page_name}.html",
+                _create_dashboard_page(dashboard_view, dataset_by_page_name[page_name]),
+            )
+        )
+    paths.append(
+        _write_page(
+            output_dir / f"{UNCERTAINTY_PAGE_NAME}.html",
+            _create_uncertainty_page(measurement_uncertainty_dataset),
+        )
+    )
+
+    plot_jobs = get_plot_jobs()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_initialize_worker,
+        initargs=(
+            dataset_by_page_name,
+            measurement_uncertainty_dataset,
+            cache_directory,
+        ),
+    ) as executor:
+        futures = [
+            executor.submit(_render_plot, plot_job, output_dir, dpi)
+            for plot_job in plot_jobs
+        ]
+        try:
+            for index, future in enumerate(concurrent.futures.as_completed(futures)):
+                paths.append(future.result())
+                fractal_governance.progress.report(
+                    progress, "static site plots", index + 1, len(futures)
+                )
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return paths
+
+
+def _write_page(path: Path, content: str) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _create_page(title: str, body: str) -> str:
+    navigation = " ".join(
+        [f'<a href="index.html">{html.escape(DASHBOARD_TITLE)}</a>']
+        + [
+            f'<a href="{get_page_name(dashboard_view)}.html">'
+            f"{html.escape(dashboard_view.name)}</a>"
+            for dashboard_view in DashboardView
+        ]
+        + [
+            f'<a href="{UNCERTAINTY_PAGE_NAME}.html">'
+            f"{html.escape(UNCERTAINTY_TITLE)}</a>"
+        ]
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>{_STYLESHEET}</style>
+</head>
+<body>
+<nav>{navigation}</nav>
+<h1>{html.escape(title)}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def _create_image(plot_job: PlotJob) -> str:
+    return (
+        f'<img src="{plot_job.path.as_posix()}" '
+        f'alt="{html.escape(plot_job.plot_name)}" loading="lazy">'
+    )
+
+
+def _create_table(styler: "Styler", table_uuid: str) -> str:
+    # A fixed uuid keeps the HTML identical between exports of the same data.
+    return styler.set_uuid(table_uuid).to_html()
+
+
+def _create_columns(*columns: str) -> str:
+    return (
+        '<div class="columns">'
+        + "".join(f"<div>{column}</div>" for column in columns)
+        + "</div>"
+    )
+
+
+def _get_last_meeting_date(dataset: fractal_governance.dataset.Dataset) -> str:
+    return html.escape(dataset.last_meeting_date.strftime("%b %d, %Y"))
+
+
+def _create_index_page(dataset: fractal_governance.dataset.Dataset) -> str:
+    links = "".join(
+        f'<li><a href="{get_page_name(dashboard_view)}.html">'
+        f"{html.escape(dashboard_view.name)}</a></li>"
+        for dashboard_view in DashboardView
+    )
+    body = f"""
+<p>Data is current up through the meeting held on
+{_get_last_meeting_date(dataset)}.</p>
+<h2>Dashboard Views</h2>
+<ul>{links}</ul>
+<h2>{html.escape(UNCERTAINTY_TITLE)}</h2>
+<p><a href="{UNCERTAINTY_PAGE_NAME}.html">Accuracy and precision of the Genesis
+Fractal's consensus algorithm</a></p>
+"""
+    return _create_page(DASHBOARD_TITLE, body)
+
+
+def get_summary_statistics(
+    dataset: fractal_governance.dataset.Dataset,
+) -> pd.DataFrame:
+    """Return the summary statistics of the given Dataset"""
+    attendance_stats = dataset.attendance_stats
+    attendance_consistency_stats = dataset.attendance_consistency_stats
+    team_representation_stats = dataset.team_representation_stats
+    descriptions_and_values = [
+        (
+            "Total Respect tokens earned from all sources",
+            f"{dataset.total_respect:,.2f}",
+        ),
+        (
+            "Total Respect tokens earned by members",
+            f"{dataset.total_member_respect:,.2f}",
+        ),
+        ("Respect tokens earned by teams", f"{dataset.total_team_respect:,.2f}"),
+        ("Total number of weekly consensus meetings", f"{dataset.total_meetings:,}"),
+        ("Total number of unique members", f"{dataset.total_unique_members:,}"),
+        (
+            "Average number of attendees per meeting",
+            f"{attendance_stats.mean:.0f} ± "
+            f"{attendance_stats.standard_deviation:.0f}",
+        ),
+        (
+            "Average number of meetings attended by a unique member",
+            f"{attendance_consistency_stats.mean:.0f} ± "
+            f"{attendance_consistency_stats.standard_deviation:.0f}",
+        ),
+        (
+            "Average team representation per meeting",
+            f"{team_representation_stats.mean:.2f} ± "
+            f"{team_representation_stats.standard_deviation:.2f}",
+        ),
+    ]
+    return pd.DataFrame(
+        descriptions_and_values, columns=["Description", "Value"]
+    ).set_index("Description")
+
+
+def _create_dashboard_page(
+    dashboard_view: DashboardView, dataset: fractal_governance.dataset.Dataset
+) -> str:
+    page_name = get_page_name(dashboard_view)
+    image_by_plot_name = {
+        plot_name: _create_image(PlotJob(page_name, plot_name))
+        for plot_name in DASHBOARD_PLOT_NAMES
+    }
+    summary_statistics = _create_columns(
+        "<h2>Summary Statistics</h2>" + get_summary_statistics(dataset).to_html(),
+        image_by_plot_name["accumulated_member_respect_vs_time_stacked"],
+    )
+    member_leader_board = _create_table(
+        style_member_leader_board(dataset.df_member_leader_board),
+        f"{page_name}_member_leader_board",
+    )
+    attendance = _create_columns(
+        _create_table(get_attendance_table(dataset).style, f"{page_name}_attendance"),
+        image_by_plot_name["attendance_vs_time_stacked"]
+        + image_by_plot_name["attendance_consistency_histogram"],
+    )
+    team_leader_board = _create_columns(
+        "<h3>Team Leaderboard</h3>"
+        + _create_table(
+            style_team_leader_board(dataset.df_team_leader_board),
+            f"{page_name}_team_leader_board",
+        ),
+        image_by_plot_name["accumulated_team_respect_vs_time_stacked"],
+    )
+    team_representation = _create_columns(
+        "<h3>Team Representation</h3><p>The average team representation is the "
+        "number of members in attendance that are members of a team divided by the "
+        "total number of members in attendance.</p>",
+        image_by_plot_name["team_representation_vs_time"],
+    )
+    ranking_stability = _create_columns(
+        "<p>The Kendall tau between the Levels of a group's members and their Levels "
+        "at the previous meeting each of them attended is 1 if the group ranked its "
+        "members in the same order as their previous meetings did and -1 if it "
+        "reversed that order.</p>",
+        image_by_plot_name["ranking_stability_histogram"],
+    )
+    body = f"""
+<p>Data is current up through the meeting held on
+{_get_last_meeting_date(dataset)}. Dashboard view:
+<strong>{html.escape(dashboard_view.name)}</strong>.</p>
+{summary_statistics}
+<h2>Member Leaderboard</h2>
+<p>The table is sorted first by Respect (descending) and then by attendance
+(descending).</p>
+{member_leader_board}
+<h2>Attendance</h2>
+{attendance}
+<h2>Team Statistics</h2>
+{team_leader_board}
+{team_representation}
+<h2>Ranking Stability</h2>
+{ranking_stability}
+"""
+    return _create_page(f"{DASHBOARD_TITLE}: {dashboard_view.name}", body)
+
+
+def _create_uncertainty_page(
+    measurement_uncertainty_dataset: fractal_governance.measurement_uncertainty.dataset.Dataset,  # noqa: E501
+) -> str:
+    leader_boards = []
+    for include_self_measurement in (True, False):
+        df = measurement_uncertainty_dataset.get_member_leader_board(
+            include_self_measurement=include_self_measurement
+        )
+        for sort_by in (UncertaintyType.StdDev, UncertaintyType.NominalValue):
+            title = (
+                f"{'Including' if include_self_measurement else 'Excluding'} self "
+                "measurements, sorted by "
+                f"{'Precision' if sort_by == UncertaintyType.StdDev else 'Accuracy'}"
+            )
+            leader_boards.append(
+                f"<h3>{html.escape(title)}</h3>"
+                + _create_table(
+                    style_measurement_uncertainty_leader_board(df, sort_by=sort_by),
+                    f"measurement_uncertainty_leader_board_"
+                    f"{str(include_self_measurement).lower()}_{sort_by.name.lower()}",
+                )
+            )
+
+    images = [
+        _create_image(PlotJob(UNCERTAINTY_PAGE_NAME, plot_name, args))
+        for plot_name, args in UNCERTAINTY_PLOT_NAMES_AND_ARGS
+    ]
+    body = f"""
+<p>Data is current up through the meeting held on
+{_get_last_meeting_date(measurement_uncertainty_dataset.dataset)}.</p>
+<p>A surveillance tool to track the <em>accuracy</em> and <em>precision</em> of the
+Genesis Fractal's consensus algorithm over time.</p>
+<h2>Plots</h2>
+{_create_columns(*images[0:2])}
+{_create_columns(*images[2:4])}
+{_create_columns(*images[4:6])}
+{images[6]}
+<h2>Member Leaderboard</h2>
+<p>The tables are sorted first by Accuracy and Precision in ascending order (smaller
+values are better), then by Respect (descending), then by Attendance (descending) and
+finally by member ID (ascending).</p>
+{_create_columns(*leader_boards[0:2])}
+{_create_columns(*leader_boards[2:4])}
+"""
+    return _create_page(UNCERTAINTY_TITLE, body)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=f"Export the {DASHBOARD_TITLE} and the {UNCERTAINTY_TITLE} as a "
+        "static HTML site"
+    )
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument(
+        "--dpi", type=float, default=fractal_governance.render_cache.DEFAULT_DPI
+    )
+    parser.add_argument("--cache-directory", type=Path, default=None)
+    args = parser.parse_args(argv)
+    export(
+        args.output_dir,
+        max_workers=args.max_workers,
+        dpi=args.dpi,
+        cache_directory=args.cache_directory,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,72 +2,44 @@
 """Streamlit app for the Genesis Fractal Dashboard"""
 
 import sys
-from enum import Enum, auto
 from pathlib import Path
-from typing import Any
-
-import pandas as pd
-import seaborn as sns
-import uncertainties
 
 import streamlit as st
 
 sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-import fractal_governance.dataset  # noqa: E402
-import fractal_governance.plots  # noqa: E402
-from fractal_governance.addendum_1.dataset import Addendum1Dataset  # noqa: E402
-from fractal_governance.constants import (  # noqa: E402
-    ACCUMULATED_RESPECT_COLUMN_NAME,
-    ATTENDANCE_COUNT_COLUMN_NAME,
-    MEETING_DATE_COLUMN_NAME,
+import fractal_governance.refresher  # noqa: E402
+import fractal_governance.resources  # noqa: E402
+from fractal_governance.dashboard import (  # noqa: E402
+    PAGE_SIZES,
+    DashboardView,
+    create_member_leader_board,
+    create_team_leader_board,
+    get_attendance_table,
 )
 
 
-class DashboardView(Enum):
-    Classic = auto()
-    Addendum1 = auto()
-    TeamFractallySpreadsheet = auto()
-
-
 PAGE_TITLE = "Genesis Fractal Dashboard"
 st.set_page_config(page_title=PAGE_TITLE, page_icon="✅", layout="wide")
 
 
-@st.experimental_memo
-def get_dataset(
-    dataset_type: int = DashboardView.Classic.value,
-) -> fractal_governance.dataset.Dataset:
-    """Return the Genesis Fractal Dataset"""
-    dataset = fractal_governance.dataset.Dataset.from_csv()
-    addendum_1_dataset = None
-    if dataset_type == DashboardView.Classic.value:
-        pass
-    elif dataset_type == DashboardView.Addendum1.value:
-        addendum_1_dataset = Addendum1Dataset(dataset=dataset)
-    elif dataset_type == DashboardView.TeamFractallySpreadsheet.value:
-        # Team fractally's spreadsheet came into alignment with this dashboard on
-        # 2022.09.02 so that now there are no differences. However, I am keeping this
-        # logic here to help highlight any future divergences.
-        addendum_1_dataset = Addendum1Dataset(dataset=dataset)
-    else:
-        raise RuntimeError(f"LOGIC ERROR: Unknown enum {dataset_type}")
-
-    if addendum_1_dataset:
-        dataset = addendum_1_dataset.dataset_with_addendum_1_respect
-
-    return dataset
-
-
-@st.experimental_memo
-def get_plots(
-    dataset_type: int = DashboardView.Classic.value,
-) -> fractal_governance.plots.Plots:
-    """Return the Genesis Fractal Plots"""
-    return fractal_governance.plots.Plots.from_dataset(get_dataset(dataset_type))
-
-
-LAST_MEETING_DATE = get_dataset().last_meeting_date.strftime("%b %d, %Y")
+# The datasets and plots are built and kept up to date on a background thread, and
+# every script run reads the last good snapshot of them. Only the very first visitor
+# after the server starts waits for the first snapshot to be built. If it cannot be
+# built its error is shown instead, until a later rebuild at the next poll succeeds.
+REFRESHER = fractal_governance.refresher.get_default_refresher()
+try:
+    with st.spinner("Loading the Genesis Fractal Dataset..."):
+        SNAPSHOT = REFRESHER.wait_for_snapshot(
+            timeout=fractal_governance.refresher.DEFAULT_WAIT_TIMEOUT
+        )
+except Exception as error:
+    st.error(
+        "The Genesis Fractal Dataset could not be loaded: "
+        f"{REFRESHER.last_error or error}"
+    )
+    st.stop()
+LAST_MEETING_DATE = SNAPSHOT.dataset.last_meeting_date.strftime("%b %d, %Y")
 
 
 st.title(PAGE_TITLE)
@@ -90,8 +62,8 @@ dataset_type = st.radio(
     format_func=lambda dataset_type: DashboardView(dataset_type).name,
 )
 
-DATASET = get_dataset(dataset_type)
-PLOTS = get_plots(dataset_type)
+DATASET = SNAPSHOT.dataset_by_view[DashboardView(dataset_type)]
+PLOTS = SNAPSHOT.plots_by_view[DashboardView(dataset_type)]
 ATTENDANCE_STATS = DATASET.attendance_stats
 ATTENDANCE_CONSISTENCY_STATS = DATASET.attendance_consistency_stats
 
@@ -135,9 +107,10 @@ with column1:
     )
 
 with column2:
-    st.pyplot(PLOTS.accumulated_member_respect_vs_time_stacked)
-
-CMAP = sns.light_palette("#34A853", as_cmap=True)
+    st.altair_chart(
+        PLOTS.chart("accumulated_member_respect_vs_time_stacked"),
+        use_container_width=True,
+    )
 
 st.subheader("Member Leaderboard")
 """
@@ -148,78 +121,55 @@ Also see the member leaderboard in the sister dashboard
 """  # noqa: E501,W605
 
 
-df_member_leader_board = DATASET.df_member_leader_board.head(10)
-if st.checkbox("Show All"):
-    df_member_leader_board = DATASET.df_member_leader_board
-
-
-def formatter(data: Any) -> Any:
-    if isinstance(data, uncertainties.UFloat):
-        return f"{data.nominal_value:,.2f}"
-    if isinstance(data, float):
-        return f"{data:,.2f}"
-    return data
-
-
-df_member_leader_board = df_member_leader_board.style.format(
-    formatter
-).background_gradient(
-    cmap=CMAP,
-    subset=pd.IndexSlice[
-        :,
-        [
-            ACCUMULATED_RESPECT_COLUMN_NAME,
-            ATTENDANCE_COUNT_COLUMN_NAME,
-        ],
-    ],
+# Only the rows of the selected page are styled and sent to the browser.
+MEMBER_LEADER_BOARD = fractal_governance.resources.get_leader_board(
+    DATASET.df_member_leader_board, create_member_leader_board
 )
+column1, column2 = st.columns(2)
+with column1:
+    page_size = st.selectbox("Members per page", PAGE_SIZES)
+with column2:
+    page_number = st.number_input(
+        "Page",
+        min_value=1,
+        max_value=MEMBER_LEADER_BOARD.get_page_count(page_size),
+        value=1,
+    )
 
-
-st.table(df_member_leader_board)
+st.dataframe(MEMBER_LEADER_BOARD.style(page_number, page_size))
 
 st.subheader("Attendance")
 
 column1, column2 = st.columns(2)
 
 with column1:
-    df_member_attendance_new_and_returning_by_meeting = (
-        DATASET.df_member_attendance_new_and_returning_by_meeting
-    )
-    df_member_attendance_new_and_returning_by_meeting.index += 1
-    df_member_attendance_new_and_returning_by_meeting[
-        MEETING_DATE_COLUMN_NAME
-    ] = df_member_attendance_new_and_returning_by_meeting[
-        MEETING_DATE_COLUMN_NAME
-    ].dt.strftime(
-        "%b %d, %Y"
-    )
-    st.table(df_member_attendance_new_and_returning_by_meeting.iloc[::-1])
+    st.table(get_attendance_table(DATASET))
 
 with column2:
     with st.container():
-        st.pyplot(PLOTS.attendance_vs_time_stacked)
-        st.pyplot(PLOTS.attendance_consistency_histogram)
+        st.altair_chart(
+            PLOTS.chart("attendance_vs_time_stacked"), use_container_width=True
+        )
+        st.altair_chart(
+            PLOTS.chart("attendance_consistency_histogram"), use_container_width=True
+        )
 
 st.header("Team Statistics")
 
 column1, column2 = st.columns(2)
 with column1:
     st.subheader("Team Leaderboard")
-    df_team_leader_board = DATASET.df_team_leader_board.style.format(
-        formatter
-    ).background_gradient(
-        cmap=CMAP,
-        subset=pd.IndexSlice[
-            :,
-            [
-                ACCUMULATED_RESPECT_COLUMN_NAME,
-            ],
-        ],
+    st.dataframe(
+        fractal_governance.resources.get_leader_board(
+            DATASET.df_team_leader_board, create_team_leader_board
+        ).style()
     )
-    st.dataframe(df_team_leader_board)
 
 with column2:
-    st.pyplot(PLOTS.accumulated_team_respect_vs_time_stacked)
+    st.altair_chart(
+        PLOTS.chart("accumulated_team_respect_vs_time_stacked"),
+        use_container_width=True,
+    )
 
 column1, column2 = st.columns(2)
 
@@ -237,7 +187,32 @@ with column1:
     )
 
 with column2:
-    st.pyplot(PLOTS.team_representation_vs_time)
+    st.altair_chart(
+        PLOTS.chart("team_representation_vs_time"), use_container_width=True
+    )
+
+st.header("Ranking Stability")
+
+column1, column2 = st.columns(2)
+
+with column1:
+    ranking_stability_plot_data = PLOTS.plot_data("ranking_stability_histogram")
+    st.markdown(
+        f"""
+    The average Kendall tau between the Levels of a group's members and their Levels
+    at the previous meeting each of them attended:
+    {ranking_stability_plot_data.annotations["mean"]:.2f} over
+    {ranking_stability_plot_data.annotations["group_count"]} groups.
+
+    A Kendall tau of 1 means a group ranked its members in the same order as their
+    previous meetings did, and -1 means it reversed that order.
+    """
+    )
+
+with column2:
+    st.altair_chart(
+        PLOTS.chart("ranking_stability_histogram"), use_container_width=True
+    )
 
 st.header("Description")
 
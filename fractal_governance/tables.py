@@ -0,0 +1,144 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Normalized tables for fractal governance data analysis
+
+The denormalized DataFrame returned by `fractal_governance.util.read_csv` has one row
+per member per round per meeting, so the (MeetingDate, MemberID) tuple is degenerate
+after the addition of multiple rounds. The tables in this module split that frame into
+fact and dimension tables so that derived computations can read the narrowest table
+they need instead of re-filtering the full frame.
+"""
+
+import attrs
+import pandas as pd
+
+from .constants import (
+    GROUP_COLUMN_NAME,
+    HIVE_ACCOUNT_NAME_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEMBER_NAME_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    SIGNATURE_ON_FILE_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+)
+from .read_only import freeze
+
+ATTENDANCE_COLUMN_NAMES = [
+    MEMBER_ID_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+]
+
+ROUND_RESULTS_COLUMN_NAMES = [
+    MEETING_ID_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+]
+
+MEMBER_COLUMN_NAMES = [
+    MEMBER_NAME_COLUMN_NAME,
+    HIVE_ACCOUNT_NAME_COLUMN_NAME,
+    SIGNATURE_ON_FILE_COLUMN_NAME,
+]
+
+
+@attrs.frozen
+class Tables:
+    """The normalized fact and dimension tables of a Fractal dataset
+
+    - `df_attendance` is the attendance fact table with one row per member per meeting
+      that records the group and Level from the member's final round.
+    - `df_round_results` has one row per member per group per round per meeting.
+    - `df_respect` is the Respect ledger with one row per member per meeting that
+      earned Respect, which may include meetings the member did not attend.
+    - `df_members`, `df_teams` and `df_meetings` are the member, team and meeting
+      dimension tables indexed by `MemberID`, `TeamID` and `MeetingID` respectively.
+
+    Every table is read-only.
+    """
+
+    df_attendance: pd.DataFrame = attrs.field(repr=False, converter=freeze)
+    df_round_results: pd.DataFrame = attrs.field(repr=False, converter=freeze)
+    df_respect: pd.DataFrame = attrs.field(repr=False, converter=freeze)
+    df_members: pd.DataFrame = attrs.field(repr=False, converter=freeze)
+    df_teams: pd.DataFrame = attrs.field(repr=False, converter=freeze)
+    df_meetings: pd.DataFrame = attrs.field(repr=False, converter=freeze)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> "Tables":
+        """Return the normalized Tables for the given denormalized DataFrame"""
+        # The (MEETING_DATE_COLUMN_NAME, MEMBER_ID_COLUMN_NAME) tuple is degenerate
+        # after the addition of multiple rounds. A member's Level for a meeting is
+        # recorded only in the final round they participated in, which is the reason
+        # for the `notna` on LEVEL_COLUMN_NAME. This is the only place it is needed.
+        is_attendance = df[LEVEL_COLUMN_NAME].notna()
+        df_attendance = df.loc[is_attendance, ATTENDANCE_COLUMN_NAMES].reset_index(
+            drop=True
+        )
+
+        df_round_results = df.loc[
+            df[GROUP_COLUMN_NAME].notna(), ROUND_RESULTS_COLUMN_NAMES
+        ].reset_index(drop=True)
+
+        df_respect = create_respect_ledger(df)
+
+        df_members = (
+            df[[MEMBER_ID_COLUMN_NAME] + MEMBER_COLUMN_NAMES]
+            .groupby(MEMBER_ID_COLUMN_NAME)
+            .first()
+        )
+
+        df_teams = (
+            df.loc[
+                df[TEAM_NAME_COLUMN_NAME].notna(),
+                [TEAM_ID_COLUMN_NAME, TEAM_NAME_COLUMN_NAME],
+            ]
+            .drop_duplicates(subset=TEAM_ID_COLUMN_NAME)
+            .set_index(TEAM_ID_COLUMN_NAME)
+            .sort_index()
+        )
+
+        df_meetings = (
+            df_attendance[[MEETING_ID_COLUMN_NAME, MEETING_DATE_COLUMN_NAME]]
+            .drop_duplicates(subset=MEETING_ID_COLUMN_NAME)
+            .set_index(MEETING_ID_COLUMN_NAME)
+            .sort_index()
+        )
+
+        return cls(
+            df_attendance=df_attendance,
+            df_round_results=df_round_results,
+            df_respect=df_respect,
+            df_members=df_members,
+            df_teams=df_teams,
+            df_meetings=df_meetings,
+        )
+
+
+def create_respect_ledger(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the Respect ledger for the given denormalized DataFrame
+
+    The ledger has one row per (MeetingID, MemberID) for which the DataFrame has a
+    non-null Respect value."""
+    df_respect = df.loc[
+        df[RESPECT_COLUMN_NAME].notna(),
+        [MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME, RESPECT_COLUMN_NAME],
+    ]
+    return (
+        df_respect.groupby([MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME], sort=True)[
+            RESPECT_COLUMN_NAME
+        ]
+        .sum()
+        .reset_index()
+    )
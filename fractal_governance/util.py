@@ -1,13 +1,25 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
 """Utility functions for fractal governance data analysis"""
 
+import collections
+import concurrent.futures
+import datetime
+import glob
+import hashlib
+import os
 import re
+import threading
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 import attrs
 import pandas as pd
 
 import fractal_governance.math
+import fractal_governance.read_only
+import fractal_governance.tables
+from fractal_governance.lru_cache import LRUCache
+from fractal_governance.render_cache import make_key
 
 from .constants import (
     DATE_OF_FIRST_GENESIS_FRACTAL_MEETING,
@@ -27,23 +39,83 @@ from .constants import (
     TEAM_ID_COLUMN_NAME,
 )
 
+# The maximum number of file fingerprints to keep in memory.
+MAX_FILE_FINGERPRINT_CACHE_ENTRIES = 1024
+
+# The modification time, size and fingerprint of the latest version of files keyed by
+# their path, so that an unchanged file is only hashed once.
+_file_fingerprint_by_path: "collections.OrderedDict[str, Tuple[int, int, str]]" = (
+    collections.OrderedDict()
+)
+_file_fingerprint_lock = threading.Lock()
+
+# The maximum number of parsed weekly measurements .csv files to keep in memory.
+MAX_SHARD_CACHE_ENTRIES = 1024
+
+# The parsed weekly measurements .csv files keyed by the fingerprints of their
+# contents, so that only new or changed files are parsed again.
+_shard_cache = LRUCache(MAX_SHARD_CACHE_ENTRIES)
+
+_GLOB_CHARACTERS = "*?["
+
+
+@attrs.frozen
+class FractalCalendar:
+    """The calendar of a Fractal that meets weekly
+
+    `cancelled_week_offsets` are the weeks, counted from the week of the first
+    meeting, in which no meeting was held. The default is the Genesis fractal's
+    calendar."""
+
+    date_of_first_meeting: datetime.datetime = attrs.field(
+        default=DATE_OF_FIRST_GENESIS_FRACTAL_MEETING
+    )
 
-def meeting_id_to_timestamp(meeting_id: int) -> pd.Timestamp:
-    """Return the meeting date for the given Genesis fractal meeting_id"""
-    if meeting_id < 1:
-        raise ValueError(f"meeting_id={meeting_id} must be >= 1")
-    week_offset = meeting_id - 1
     # April 9, 2022 was the date for the Eden on EOS elections, so the Weekly Consensus
     # meeting was cancelled to allow Genesis Fractal members to attend. This caused
     # meeting ID #7 to be pushed back to April 16, 2022.
-    if week_offset >= 7:
-        week_offset += 1
-    return DATE_OF_FIRST_GENESIS_FRACTAL_MEETING + week_offset * pd.to_timedelta("1 w")
+    cancelled_week_offsets: Tuple[int, ...] = attrs.field(
+        default=(7,), converter=lambda offsets: tuple(sorted(offsets))
+    )
+
+    def meeting_id_to_timestamp(self, meeting_id: int) -> pd.Timestamp:
+        """Return the meeting date for the given meeting_id"""
+        if meeting_id < 1:
+            raise ValueError(f"meeting_id={meeting_id} must be >= 1")
+        week_offset = meeting_id - 1
+        for cancelled_week_offset in self.cancelled_week_offsets:
+            if week_offset >= cancelled_week_offset:
+                week_offset += 1
+        return pd.Timestamp(self.date_of_first_meeting) + week_offset * pd.to_timedelta(
+            "1 w"
+        )
+
+
+@attrs.frozen
+class FractalRules:
+    """The rules of a Fractal that determine the Respect its members earn
+
+    Members without a signature on file earn no Respect from the meeting
+    `meeting_id_when_hive_signature_required` on, or from no meeting if it is None.
+    The default is the Genesis fractal's rules."""
+
+    meeting_id_when_hive_signature_required: Optional[int] = attrs.field(
+        default=MEETING_ID_WHEN_HIVE_SIGNATURE_REQUIRED
+    )
+
+
+def meeting_id_to_timestamp(meeting_id: int) -> pd.Timestamp:
+    """Return the meeting date for the given Genesis fractal meeting_id"""
+    return FractalCalendar().meeting_id_to_timestamp(meeting_id)
 
 
 @attrs.frozen
 class FractalDatasetCSVPaths:
-    """A wrapper around the paths to a Fractal dataset's .csv files"""
+    """A wrapper around the paths to a Fractal dataset's .csv files
+
+    `weekly_measurements` is either a .csv file, a directory of .csv files or a glob
+    pattern of .csv files. Each of those files is a shard of the weekly
+    measurements, e.g. the measurements of one meeting."""
 
     account_status: Path = attrs.field(default=GENESIS_ACCOUNT_STATUS_CSV_PATH)
     late_consensus: Path = attrs.field(default=GENESIS_LATE_CONSENSUS_CSV_PATH)
@@ -52,6 +124,19 @@ class FractalDatasetCSVPaths:
         default=GENESIS_WEEKLY_MEASUREMENTS_CSV_PATH
     )
 
+    def get_weekly_measurements_paths(self) -> List[Path]:
+        """Return the paths of the weekly measurements .csv files sorted by name"""
+        path = Path(self.weekly_measurements)
+        if path.is_dir():
+            paths = sorted(path.glob("*.csv"))
+        elif any(character in str(path) for character in _GLOB_CHARACTERS):
+            paths = sorted(Path(match) for match in glob.glob(str(path)))
+        else:
+            return [path]
+        if not paths:
+            raise FileNotFoundError(f"No weekly measurements .csv files in {path}")
+        return paths
+
     @classmethod
     def relative_to(cls, PROJECT_DIR: Path) -> "FractalDatasetCSVPaths":
         account_status = GENESIS_ACCOUNT_STATUS_CSV_PATH.relative_to(PROJECT_DIR)
@@ -68,89 +153,203 @@ class FractalDatasetCSVPaths:
         )
 
 
-def read_csv(
-    fractal_dataset_csv_paths: FractalDatasetCSVPaths = FractalDatasetCSVPaths(),
-) -> pd.DataFrame:
-    """Return a pandas DataFrame for the given file path to the Genesis .csv dataset"""
+def file_fingerprint(path: Path) -> str:
+    """Return a hash of the contents of the given file"""
+    path = Path(path).resolve()
+    stat = os.stat(path)
+    path_key = str(path)
+    with _file_fingerprint_lock:
+        entry = _file_fingerprint_by_path.get(path_key)
+        if entry is not None:
+            _file_fingerprint_by_path.move_to_end(path_key)
+    if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+        return entry[2]
+    fingerprint = hashlib.sha256(path.read_bytes()).hexdigest()
+    with _file_fingerprint_lock:
+        # Replace the fingerprint of the previous version of the file, if any.
+        _file_fingerprint_by_path[path_key] = (
+            stat.st_mtime_ns,
+            stat.st_size,
+            fingerprint,
+        )
+        _file_fingerprint_by_path.move_to_end(path_key)
+        while len(_file_fingerprint_by_path) > MAX_FILE_FINGERPRINT_CACHE_ENTRIES:
+            _file_fingerprint_by_path.popitem(last=False)
+    return fingerprint
 
-    account_status_file_path = fractal_dataset_csv_paths.account_status
-    late_consensus_file_path = fractal_dataset_csv_paths.late_consensus
-    teams_file_path = fractal_dataset_csv_paths.teams
-    weekly_measurements_file_path = fractal_dataset_csv_paths.weekly_measurements
 
-    df = pd.read_csv(weekly_measurements_file_path)
-    df = df.set_index(MEMBER_ID_COLUMN_NAME)
+def csv_paths_fingerprint(fractal_dataset_csv_paths: FractalDatasetCSVPaths) -> str:
+    """Return a hash of the contents of the given Fractal's .csv files"""
+    paths = [
+        fractal_dataset_csv_paths.account_status,
+        fractal_dataset_csv_paths.late_consensus,
+        fractal_dataset_csv_paths.teams,
+    ] + fractal_dataset_csv_paths.get_weekly_measurements_paths()
+    return make_key(*(file_fingerprint(path) for path in paths))
 
-    # Add a column for each meeting's date.
-    df[MEETING_DATE_COLUMN_NAME] = df[MEETING_ID_COLUMN_NAME].apply(
-        meeting_id_to_timestamp
-    )
 
-    # Add a column for the amount of Respect that corresponds to the Level in each row.
-    df[RESPECT_COLUMN_NAME] = df[LEVEL_COLUMN_NAME].apply(
-        fractal_governance.math.respect
+def _read_shard(path: Path) -> pd.DataFrame:
+    """Internal helper method that returns the read-only DataFrame of the given weekly
+    measurements .csv file, which is only parsed if it is new or changed"""
+    return _shard_cache.get_or_create(
+        file_fingerprint(path),
+        lambda: fractal_governance.read_only.freeze(pd.read_csv(path)),
     )
 
-    df_account_status = (
-        pd.read_csv(account_status_file_path)
-        .drop([INDEX_COLUMN_NAME], axis=1)
-        .set_index(MEMBER_ID_COLUMN_NAME)
+
+def read_weekly_measurements(
+    fractal_dataset_csv_paths: FractalDatasetCSVPaths = FractalDatasetCSVPaths(),
+    *,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Return the weekly measurements of the given Fractal's .csv files
+
+    The weekly measurements .csv files are parsed concurrently on a pool of at most
+    `max_workers` threads, and are concatenated in the order of their meeting IDs."""
+    paths = fractal_dataset_csv_paths.get_weekly_measurements_paths()
+    if len(paths) == 1:
+        return _read_shard(paths[0]).copy()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        shards = list(executor.map(_read_shard, paths))
+    return pd.concat(shards, ignore_index=True).sort_values(
+        by=MEETING_ID_COLUMN_NAME, kind="mergesort", ignore_index=True
     )
-    df = df.join(df_account_status)
-    df[[HIVE_ACCOUNT_NAME_COLUMN_NAME, SIGNATURE_ON_FILE_COLUMN_NAME]] = df[
-        [HIVE_ACCOUNT_NAME_COLUMN_NAME, SIGNATURE_ON_FILE_COLUMN_NAME]
-    ].fillna(False)
-
-    # Per email from Gregory Wexler on July 6, 2022 with the subject
-    # "Re: Differences between spreadsheet and dashboard":
-    #
-    # We should have zero'ed out the (NS) No-signature people early on.
-    #
-    # Since we published numbers, I didn't think it was right to 'pull it back'. That
-    # said, given our statements in the meeting that you need to sign to participate
-    # and earn respect, I started zeroing out (NS) members from that point forward.
-    #
-    # So the rules are:
-    # 1. as of last meeting date, (NS) means you're going to get ZERO respect going
-    #    forward.
-    # 2. prior to that meeting, we're going to keep that respect in place.
-    #
-    # NOTE: The "last meeting date" that Gregory was referring to was 6/25/2022, which
-    # was meeting_id 17.
-    df.loc[
-        ~df[SIGNATURE_ON_FILE_COLUMN_NAME]
-        & (df[MEETING_ID_COLUMN_NAME] >= MEETING_ID_WHEN_HIVE_SIGNATURE_REQUIRED),
-        [RESPECT_COLUMN_NAME],
-    ] = 0
-
-    df_teams = (
-        pd.read_csv(teams_file_path)
-        .drop([INDEX_COLUMN_NAME], axis=1)
-        .set_index(TEAM_ID_COLUMN_NAME)
+
+
+@attrs.frozen
+class FractalDatasetFrames:
+    """The DataFrames of a Fractal dataset's .csv files as they are read, before the
+    Respect of each meeting and the penalties are applied to them (see
+    `create_dataframe`)"""
+
+    df_weekly_measurements: pd.DataFrame = attrs.field(repr=False)
+    df_account_status: pd.DataFrame = attrs.field(repr=False)
+    df_late_consensus: pd.DataFrame = attrs.field(repr=False)
+    df_teams: pd.DataFrame = attrs.field(repr=False)
+
+    @classmethod
+    def from_csv(
+        cls,
+        fractal_dataset_csv_paths: FractalDatasetCSVPaths = FractalDatasetCSVPaths(),
+        *,
+        max_workers: Optional[int] = None,
+    ) -> "FractalDatasetFrames":
+        """Return the FractalDatasetFrames of the given Fractal's .csv files, whose
+        weekly measurements are read with `read_weekly_measurements`"""
+        return cls(
+            df_weekly_measurements=read_weekly_measurements(
+                fractal_dataset_csv_paths, max_workers=max_workers
+            ),
+            df_account_status=pd.read_csv(fractal_dataset_csv_paths.account_status),
+            df_late_consensus=pd.read_csv(fractal_dataset_csv_paths.late_consensus),
+            df_teams=pd.read_csv(fractal_dataset_csv_paths.teams),
+        )
+
+    def create_dataframe(
+        self,
+        *,
+        fractal_calendar: FractalCalendar = FractalCalendar(),
+        fractal_rules: FractalRules = FractalRules(),
+    ) -> pd.DataFrame:
+        """Return the DataFrame of these frames with the meeting dates and the
+        Respect of the given FractalCalendar and FractalRules (see `read_csv`)"""
+        df = self.df_weekly_measurements.set_index(MEMBER_ID_COLUMN_NAME)
+
+        # Add a column for each meeting's date.
+        df[MEETING_DATE_COLUMN_NAME] = df[MEETING_ID_COLUMN_NAME].apply(
+            fractal_calendar.meeting_id_to_timestamp
+        )
+
+        # Add a column for the amount of Respect that corresponds to the Level in each
+        # row.
+        df[RESPECT_COLUMN_NAME] = df[LEVEL_COLUMN_NAME].apply(
+            fractal_governance.math.respect
+        )
+
+        df_account_status = self.df_account_status.drop(
+            [INDEX_COLUMN_NAME], axis=1
+        ).set_index(MEMBER_ID_COLUMN_NAME)
+        df = df.join(df_account_status)
+        df[[HIVE_ACCOUNT_NAME_COLUMN_NAME, SIGNATURE_ON_FILE_COLUMN_NAME]] = df[
+            [HIVE_ACCOUNT_NAME_COLUMN_NAME, SIGNATURE_ON_FILE_COLUMN_NAME]
+        ].fillna(False)
+
+        # Per email from Gregory Wexler on July 6, 2022 with the subject
+        # "Re: Differences between spreadsheet and dashboard":
+        #
+        # We should have zero'ed out the (NS) No-signature people early on.
+        #
+        # Since we published numbers, I didn't think it was right to 'pull it back'.
+        # That said, given our statements in the meeting that you need to sign to
+        # participate and earn respect, I started zeroing out (NS) members from that
+        # point forward.
+        #
+        # So the rules are:
+        # 1. as of last meeting date, (NS) means you're going to get ZERO respect going
+        #    forward.
+        # 2. prior to that meeting, we're going to keep that respect in place.
+        #
+        # NOTE: The "last meeting date" that Gregory was referring to was 6/25/2022,
+        # which was meeting_id 17.
+        if fractal_rules.meeting_id_when_hive_signature_required is not None:
+            df.loc[
+                ~df[SIGNATURE_ON_FILE_COLUMN_NAME]
+                & (
+                    df[MEETING_ID_COLUMN_NAME]
+                    >= fractal_rules.meeting_id_when_hive_signature_required
+                ),
+                [RESPECT_COLUMN_NAME],
+            ] = 0
+
+        df_teams = self.df_teams.drop([INDEX_COLUMN_NAME], axis=1).set_index(
+            TEAM_ID_COLUMN_NAME
+        )
+        df = df.join(df_teams, on=TEAM_ID_COLUMN_NAME)
+
+        df = df.reset_index()
+
+        # Per email from Gregory Wexler on July 25, 2022 with the subject
+        # "Re: Differences between spreadsheet and dashboard":
+        #
+        # From memory (and if you hover over the cell you might find the comment),
+        # they registered their Consensus logs in to the HIVE.BLOG for beyond the 1
+        # hour time limit allowed, hence they were awarded zero respect for their
+        # tartiness. They have up to 1 hour after the meeting conclusion with which to
+        # post their HIVE.BLOG consensus ranks.  They entered beyond that window.
+        key_column_names = [MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME]
+        is_late_consensus = pd.MultiIndex.from_frame(df[key_column_names]).isin(
+            pd.MultiIndex.from_frame(self.df_late_consensus[key_column_names])
+        )
+        df.loc[is_late_consensus, [RESPECT_COLUMN_NAME]] = 0
+
+        return df
+
+
+def read_csv(
+    fractal_dataset_csv_paths: FractalDatasetCSVPaths = FractalDatasetCSVPaths(),
+    *,
+    fractal_calendar: FractalCalendar = FractalCalendar(),
+    fractal_rules: FractalRules = FractalRules(),
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """Return a pandas DataFrame for the given file path to the Genesis .csv dataset
+
+    The meeting dates and the Respect of another Fractal's .csv dataset are
+    calculated with its own FractalCalendar and FractalRules. The weekly
+    measurements are read with `read_weekly_measurements`."""
+    return FractalDatasetFrames.from_csv(
+        fractal_dataset_csv_paths, max_workers=max_workers
+    ).create_dataframe(fractal_calendar=fractal_calendar, fractal_rules=fractal_rules)
+
+
+def read_tables(
+    fractal_dataset_csv_paths: FractalDatasetCSVPaths = FractalDatasetCSVPaths(),
+) -> fractal_governance.tables.Tables:
+    """Return the normalized Tables for the given file path to the Genesis .csv
+    dataset"""
+    return fractal_governance.tables.Tables.from_dataframe(
+        read_csv(fractal_dataset_csv_paths)
     )
-    df = df.join(df_teams, on=TEAM_ID_COLUMN_NAME)
-
-    df = df.reset_index()
-
-    # Per email from Gregory Wexler on July 25, 2022 with the subject
-    # "Re: Differences between spreadsheet and dashboard":
-    #
-    # From memory (and if you hover over the cell you might find the comment), they
-    # registered their Consensus logs in to the HIVE.BLOG for beyond the 1 hour time
-    # limit allowed, hence they were awarded zero respect for their tartiness. They
-    # have up to 1 hour after the meeting conclusion with which to post their HIVE.BLOG
-    # consensus ranks.  They entered beyond that window.
-    df_late_consensus = pd.read_csv(late_consensus_file_path)
-    for member_id, meeting_id in df_late_consensus[
-        [MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME]
-    ].values:
-        df.loc[
-            (df[MEMBER_ID_COLUMN_NAME] == member_id)
-            & (df[MEETING_ID_COLUMN_NAME] == meeting_id),
-            [RESPECT_COLUMN_NAME],
-        ] = 0
-
-    return df
 
 
 # From https://github.com/jupyter/nbconvert/issues/946#issuecomment-1055635749
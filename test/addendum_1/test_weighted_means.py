@@ -5,13 +5,18 @@ import unittest
 
 import attrs
 import fractal_governance.dataset
+import fractal_governance.progress
 import fractal_governance.util
 import pandas as pd
 from fractal_governance.addendum_1.weighted_means import (
     WeightedMeanParameters,
     WeightedMeans,
 )
-from fractal_governance.constants import MEMBER_ID_COLUMN_NAME, PROJECT_DIR
+from fractal_governance.constants import (
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    PROJECT_DIR,
+)
 
 TEST_DATA_CSV_FILE_PATH = (
     PROJECT_DIR / "data/test/addendum_1/Stats_post-Aug_6_Dist_Portions.csv"
@@ -27,6 +32,38 @@ class WeightedMeanRespect:
 class TestWeightedMeans(unittest.TestCase):
     """Test fixture for the fractal_governance.addendum_1.weighted_means module"""
 
+    def test_cancel(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        member_count = dataset.total_unique_members
+        cancel_after_member_count = member_count // 2
+
+        def callback(progress: fractal_governance.progress.Progress) -> None:
+            self.assertEqual(progress.total, member_count)
+            if progress.completed == cancel_after_member_count:
+                progress_token.cancel()
+
+        progress_token = fractal_governance.progress.ProgressToken(callback)
+        with self.assertRaises(fractal_governance.progress.CancelledError) as context:
+            WeightedMeans(dataset=dataset, progress=progress_token)
+        self.assertEqual(context.exception.stage, "weighted mean levels")
+
+        # The partial result has the weighted mean levels of the finished members.
+        df_partial = context.exception.partial_result
+        self.assertEqual(
+            df_partial[MEMBER_ID_COLUMN_NAME].nunique(), cancel_after_member_count
+        )
+        df = WeightedMeans(dataset=dataset).df
+        df = df[df[MEMBER_ID_COLUMN_NAME].isin(df_partial[MEMBER_ID_COLUMN_NAME])]
+        self.assertEqual(
+            sorted(zip(df[MEMBER_ID_COLUMN_NAME], df[MEETING_ID_COLUMN_NAME])),
+            sorted(
+                zip(
+                    df_partial[MEMBER_ID_COLUMN_NAME],
+                    df_partial[MEETING_ID_COLUMN_NAME],
+                )
+            ),
+        )
+
     def test_with_default_values(self) -> None:
         dataset = fractal_governance.dataset.Dataset.from_csv()
         weighted_means = WeightedMeans(dataset=dataset)
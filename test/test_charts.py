@@ -0,0 +1,58 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.charts module"""
+
+import json
+import unittest
+
+import fractal_governance.charts
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.plots
+import fractal_governance.plots
+from fractal_governance.measurement_uncertainty.dataset import UncertaintyType
+from fractal_governance.measurement_uncertainty.plot_data import CorrelationType
+from fractal_governance.rollups import Granularity
+
+
+class TestCharts(unittest.TestCase):
+    """Test fixture for the fractal_governance.charts module"""
+
+    def test_charts(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        for granularity in (Granularity.Week, Granularity.Month):
+            plots = fractal_governance.plots.Plots(
+                dataset=dataset, granularity=granularity
+            )
+            for plot_name in fractal_governance.plots.PLOT_INPUTS_BY_PLOT_NAME:
+                spec = plots.chart(plot_name).to_dict()
+                self.assertIn("$schema", spec)
+                self.assertEqual(spec["title"], plots.plot_data(plot_name).title)
+                json.dumps(spec)
+
+        plots = fractal_governance.measurement_uncertainty.plots.Plots(dataset=dataset)
+        charts = [plots.chart("measurement_uncertainty")]
+        for uncertainty_type in UncertaintyType:
+            charts.append(
+                plots.chart("measurement_uncertainty_distribution", uncertainty_type)
+            )
+            for correlation_type in CorrelationType:
+                charts.append(
+                    plots.chart(
+                        "measurement_uncertainty_correlation",
+                        uncertainty_type,
+                        correlation_type,
+                    )
+                )
+        for chart in charts:
+            self.assertIn("layer", chart.to_dict())
+
+    def test_unknown_plot_name(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        plots = fractal_governance.plots.Plots(dataset=dataset)
+        with self.assertRaises(ValueError):
+            fractal_governance.charts.create_chart(
+                "unknown", plots.plot_data("attendance_vs_time")
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.cli module"""
+
+import contextlib
+import datetime
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.util
+from fractal_governance.cli import (
+    DASHBOARD_VIEW_NAMES,
+    export_figures,
+    get_csv_paths,
+    get_leader_board,
+    main,
+)
+from fractal_governance.constants import (
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    TOKEN_SUPPLY_COLUMN_NAME,
+)
+from fractal_governance.dashboard import DashboardView
+from fractal_governance.result_cache import RESULT_CACHE_DIRECTORY_NAME, ResultCache
+from fractal_governance.static_site import get_plot_jobs
+
+
+class TestCLI(unittest.TestCase):
+    """Test fixture for the fractal_governance.cli module"""
+
+    def test_dashboard_view_names(self) -> None:
+        self.assertEqual(
+            DASHBOARD_VIEW_NAMES,
+            tuple(dashboard_view.name.lower() for dashboard_view in DashboardView),
+        )
+
+    def test_get_csv_paths(self) -> None:
+        csv_paths = fractal_governance.util.FractalDatasetCSVPaths()
+        self.assertEqual(get_csv_paths(), csv_paths)
+        self.assertEqual(get_csv_paths(csv_paths.weekly_measurements.parent), csv_paths)
+
+    def test_get_leader_board(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        with tempfile.TemporaryDirectory() as directory:
+            df = get_leader_board(
+                "classic", result_cache=ResultCache(directory=directory)
+            )
+            pd.testing.assert_frame_equal(
+                df,
+                dataset.df_member_leader_board,
+                check_frame_type=False,
+                check_names=False,
+            )
+
+            # The leaderboard is read from disk without reading the .csv files.
+            result_cache = ResultCache(directory=directory)
+            pd.testing.assert_frame_equal(
+                get_leader_board("classic", result_cache=result_cache), df
+            )
+            self.assertEqual(result_cache.hit_count, 1)
+            self.assertEqual(result_cache.miss_count, 0)
+
+    def test_get_leader_board_as_of(self) -> None:
+        as_of = datetime.date(2022, 3, 12)
+        df = get_leader_board("classic", as_of=as_of, result_cache=ResultCache())
+        # Only the first three meetings were held on or before March 12, 2022.
+        self.assertEqual(df[ATTENDANCE_COUNT_COLUMN_NAME].max(), 3)
+
+        with self.assertRaises(ValueError):
+            get_leader_board(
+                "classic", as_of=datetime.date(2021, 1, 1), result_cache=ResultCache()
+            )
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit):
+                main(["leaderboard", "--as-of", "2021-01-01"])
+        self.assertIn("No meeting was held on or before 2021-01-01", stderr.getvalue())
+
+    def test_main(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache_directory = Path(directory, "cache")
+            for output_format in ["csv", "json", "parquet"]:
+                path = Path(directory, f"token_supply.{output_format}")
+                main(
+                    [
+                        "--cache-directory",
+                        str(cache_directory),
+                        "token-supply",
+                        "--meetings",
+                        "3",
+                        "--format",
+                        output_format,
+                        "--output",
+                        str(path),
+                    ]
+                )
+                if output_format == "csv":
+                    df = pd.read_csv(path, index_col=MEETING_ID_COLUMN_NAME)
+                elif output_format == "json":
+                    df = pd.DataFrame(json.loads(path.read_text())).set_index(
+                        MEETING_ID_COLUMN_NAME
+                    )
+                else:
+                    df = pd.read_parquet(path)
+                self.assertEqual(df.index.tolist(), [1, 2, 3])
+                self.assertTrue((df[TOKEN_SUPPLY_COLUMN_NAME] > 0).all())
+            self.assertEqual(
+                len(list(Path(cache_directory, RESULT_CACHE_DIRECTORY_NAME).iterdir())),
+                1,
+            )
+
+            path = Path(directory, "weighted_means.csv")
+            main(["weighted-means", "--column", "respect", "--output", str(path)])
+            df = pd.read_csv(path, index_col=MEMBER_ID_COLUMN_NAME)
+            self.assertFalse(df.empty)
+
+    def test_export_figures(self) -> None:
+        with tempfile.TemporaryDirectory() as output_dir:
+            paths = export_figures(Path(output_dir), format="svg", dpi=20)
+            self.assertEqual(len(set(paths)), len(get_plot_jobs()))
+            self.assertTrue(
+                all(path.suffix == ".svg" and path.stat().st_size > 0 for path in paths)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.co_attendance module"""
+
+import unittest
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import fractal_governance.dataset
+from fractal_governance.co_attendance import CoAttendanceGraph
+from fractal_governance.constants import (
+    COMPONENT_COLUMN_NAME,
+    DEGREE_CENTRALITY_COLUMN_NAME,
+    DEGREE_COLUMN_NAME,
+    EIGENVECTOR_CENTRALITY_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
+    GROUP_COUNT_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID1_COLUMN_NAME,
+    MEMBER_ID2_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    PAIRING_COUNT_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    WEIGHTED_DEGREE_COLUMN_NAME,
+)
+from fractal_governance.group_cube import GROUP_KEY_COLUMN_NAMES, rollup_to_members
+
+
+def create_group_members(groups: List[Tuple[int, int, List[str]]]) -> pd.DataFrame:
+    """Return a group members frame of the given (MeetingID, Group, MemberIDs) of
+    each group of the first round"""
+    return pd.DataFrame(
+        [
+            {
+                MEETING_ID_COLUMN_NAME: meeting_id,
+                GROUP_COLUMN_NAME: group,
+                ROUND_COLUMN_NAME: 1,
+                MEMBER_ID_COLUMN_NAME: member_id,
+            }
+            for meeting_id, group, member_ids in groups
+            for member_id in member_ids
+        ]
+    )
+
+
+class TestCoAttendance(unittest.TestCase):
+    """Test fixture for the fractal_governance.co_attendance module"""
+
+    dataset: fractal_governance.dataset.Dataset
+    graph: CoAttendanceGraph
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+        cls.graph = CoAttendanceGraph.from_group_members(cls.dataset.df_group_members)
+
+    def test_matrix(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        graph = self.graph
+        self.assertEqual(graph.member_count, self.dataset.total_unique_members)
+        self.assertEqual(
+            graph.meeting_ids, set(df_group_members[MEETING_ID_COLUMN_NAME])
+        )
+
+        # The sparse matrix is the product of the dense incidence matrix.
+        df_incidence = pd.crosstab(
+            df_group_members[MEMBER_ID_COLUMN_NAME],
+            [df_group_members[column_name] for column_name in GROUP_KEY_COLUMN_NAMES],
+        ).reindex(graph.member_ids)
+        incidence = df_incidence.to_numpy()
+        np.testing.assert_array_equal(graph.matrix.toarray(), incidence @ incidence.T)
+
+    def test_add_meetings(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        meeting_ids = df_group_members[MEETING_ID_COLUMN_NAME]
+        graph = (
+            CoAttendanceGraph.from_group_members(df_group_members[meeting_ids <= 10])
+            .add_meetings(df_group_members[meeting_ids <= 20])
+            .add_meetings(df_group_members)
+        )
+        self.assertEqual(graph.meeting_ids, self.graph.meeting_ids)
+        self.assertIs(graph.add_meetings(df_group_members), graph)
+        pd.testing.assert_frame_equal(
+            graph.get_member_statistics().drop(columns=COMPONENT_COLUMN_NAME),
+            self.graph.get_member_statistics().drop(columns=COMPONENT_COLUMN_NAME),
+        )
+        pd.testing.assert_frame_equal(
+            graph.get_pairs(min_pairing_count=1),
+            self.graph.get_pairs(min_pairing_count=1),
+        )
+
+    def test_member_statistics(self) -> None:
+        df_statistics = self.graph.get_member_statistics()
+        self.assertTrue(df_statistics.index.is_monotonic_increasing)
+        df_members = rollup_to_members(
+            self.dataset.df_group_members, self.dataset.df_group_cube
+        )
+        pd.testing.assert_series_equal(
+            df_statistics[GROUP_COUNT_COLUMN_NAME],
+            df_members[GROUP_COUNT_COLUMN_NAME],
+            check_dtype=False,
+        )
+        self.assertTrue(
+            (
+                df_statistics[DEGREE_COLUMN_NAME]
+                <= df_statistics[WEIGHTED_DEGREE_COLUMN_NAME]
+            ).all()
+        )
+        self.assertTrue(
+            df_statistics[DEGREE_CENTRALITY_COLUMN_NAME].between(0, 1).all()
+        )
+        self.assertEqual(df_statistics[EIGENVECTOR_CENTRALITY_COLUMN_NAME].max(), 1)
+
+        # The centralities are the eigenvector of the largest eigenvalue of the
+        # adjacency matrix.
+        adjacency_matrix = self.graph.get_adjacency_matrix().toarray()
+        centralities = self.graph.get_eigenvector_centralities()
+        np.testing.assert_allclose(
+            adjacency_matrix @ centralities,
+            np.linalg.eigvalsh(adjacency_matrix).max() * centralities,
+            atol=1e-6,
+        )
+
+    def test_components(self) -> None:
+        graph = CoAttendanceGraph.from_group_members(
+            create_group_members(
+                [
+                    (1, 1, ["a", "b", "c"]),
+                    (1, 2, ["d", "e"]),
+                    (1, 3, ["f"]),
+                    (2, 1, ["a", "b"]),
+                    (2, 2, ["c", "g"]),
+                ]
+            )
+        )
+        df_statistics = graph.get_member_statistics()
+        components = df_statistics[COMPONENT_COLUMN_NAME]
+        self.assertEqual(len(set(components[["a", "b", "c", "g"]])), 1)
+        self.assertEqual(components["d"], components["e"])
+        self.assertEqual(components.nunique(), 3)
+        self.assertEqual(graph.get_component_sizes().to_list(), [4, 2, 1])
+        self.assertEqual(
+            df_statistics.loc[["a", "c", "f"], DEGREE_COLUMN_NAME].to_list(), [2, 3, 0]
+        )
+        self.assertEqual(
+            df_statistics.loc[["a", "c", "f"], WEIGHTED_DEGREE_COLUMN_NAME].to_list(),
+            [3, 3, 0],
+        )
+        self.assertEqual(df_statistics.loc["c", DEGREE_CENTRALITY_COLUMN_NAME], 0.5)
+
+    def test_pairs(self) -> None:
+        graph = self.graph
+        pairing_counts = graph.get_pairing_counts()
+        self.assertEqual(
+            (pairing_counts * pairing_counts.index).sum(),
+            graph.get_member_statistics()[WEIGHTED_DEGREE_COLUMN_NAME].sum() / 2,
+        )
+        df_pairs = graph.get_pairs()
+        self.assertEqual(len(df_pairs), pairing_counts[pairing_counts.index >= 2].sum())
+        self.assertTrue(
+            (df_pairs[MEMBER_ID1_COLUMN_NAME] < df_pairs[MEMBER_ID2_COLUMN_NAME]).all()
+        )
+        self.assertTrue(
+            df_pairs[PAIRING_COUNT_COLUMN_NAME].is_monotonic_decreasing,
+        )
+        self.assertEqual(
+            df_pairs[PAIRING_COUNT_COLUMN_NAME].iloc[0], pairing_counts.index.max()
+        )
+        pd.testing.assert_frame_equal(
+            graph.get_pairs(max_pair_count=3), df_pairs.head(3)
+        )
+
+        # The pairing count of the most repeated pair is the number of groups both
+        # members sat in.
+        member_id1, member_id2 = df_pairs.iloc[0][
+            [MEMBER_ID1_COLUMN_NAME, MEMBER_ID2_COLUMN_NAME]
+        ]
+        df_group_members = self.dataset.df_group_members.copy()
+        groups1 = set(
+            map(
+                tuple,
+                df_group_members.loc[
+                    df_group_members[MEMBER_ID_COLUMN_NAME] == member_id1,
+                    GROUP_KEY_COLUMN_NAMES,
+                ].to_numpy(),
+            )
+        )
+        groups2 = set(
+            map(
+                tuple,
+                df_group_members.loc[
+                    df_group_members[MEMBER_ID_COLUMN_NAME] == member_id2,
+                    GROUP_KEY_COLUMN_NAMES,
+                ].to_numpy(),
+            )
+        )
+        self.assertEqual(
+            df_pairs[PAIRING_COUNT_COLUMN_NAME].iloc[0], len(groups1 & groups2)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
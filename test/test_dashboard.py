@@ -0,0 +1,69 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.dashboard module"""
+
+import unittest
+
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.dataset
+from fractal_governance.constants import MEETING_DATE_COLUMN_NAME
+from fractal_governance.dashboard import (
+    DashboardView,
+    create_dataset,
+    get_attendance_table,
+    style_measurement_uncertainty_leader_board,
+    style_member_leader_board,
+)
+from fractal_governance.measurement_uncertainty.dataset import (
+    ACCURACY_COLUMN_NAME,
+    PRECISION_COLUMN_NAME,
+    UncertaintyType,
+)
+
+DATASET = fractal_governance.dataset.Dataset.from_csv()
+
+
+class TestDashboard(unittest.TestCase):
+    """Test fixture for the fractal_governance.dashboard module"""
+
+    def test_create_dataset(self) -> None:
+        self.assertIs(create_dataset(DashboardView.Classic, DATASET), DATASET)
+        for dashboard_view in (
+            DashboardView.Addendum1,
+            DashboardView.TeamFractallySpreadsheet,
+        ):
+            dataset = create_dataset(dashboard_view, DATASET)
+            self.assertIsNot(dataset, DATASET)
+            self.assertEqual(dataset.total_meetings, DATASET.total_meetings)
+
+    def test_get_attendance_table(self) -> None:
+        df = get_attendance_table(DATASET)
+        self.assertEqual(len(df), DATASET.total_meetings)
+        # The most recent meeting is first and meetings are numbered from 1.
+        self.assertEqual(df.index[0], DATASET.total_meetings)
+        self.assertEqual(df.index[-1], 1)
+        self.assertEqual(
+            df[MEETING_DATE_COLUMN_NAME].iloc[0],
+            DATASET.last_meeting_date.strftime("%b %d, %Y"),
+        )
+
+    def test_style_member_leader_board(self) -> None:
+        html = style_member_leader_board(DATASET.df_member_leader_board).to_html()
+        self.assertIn("background-color", html)
+
+    def test_style_measurement_uncertainty_leader_board(self) -> None:
+        df = fractal_governance.measurement_uncertainty.dataset.Dataset(
+            dataset=DATASET
+        ).get_member_leader_board(include_self_measurement=True)
+        for sort_by, column_name in (
+            (UncertaintyType.StdDev, PRECISION_COLUMN_NAME),
+            (UncertaintyType.NominalValue, ACCURACY_COLUMN_NAME),
+        ):
+            df_sorted = style_measurement_uncertainty_leader_board(
+                df, sort_by=sort_by
+            ).data
+            self.assertEqual(len(df_sorted), len(df))
+            self.assertTrue(abs(df_sorted[column_name]).is_monotonic_increasing)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,9 +2,19 @@
 """Unit test for the fractal_governance.dataset module"""
 
 import unittest
+import warnings
 
+import attrs
 import fractal_governance.dataset
+import fractal_governance.tables
 import fractal_governance.util
+import pandas as pd
+from fractal_governance.constants import (
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+)
+from fractal_governance.read_only import ReadOnlyError
 
 
 class TestDataset(unittest.TestCase):
@@ -38,6 +48,80 @@ class TestDataset(unittest.TestCase):
         self.assertGreater(dataset.team_representation_stats.mean, 0)
         self.assertGreater(dataset.team_representation_stats.standard_deviation, 0)
         self.assertIsNotNone(dataset.get_returning_member_dataframe_for_meeting_id(1))
+        self.assertEqual(
+            set(dataset.build_timings),
+            {"tables"}
+            | {
+                derived_frame.name
+                for derived_frame in fractal_governance.dataset.DERIVED_FRAMES
+            },
+        )
+
+    def test_max_workers(self) -> None:
+        df = fractal_governance.util.read_csv()
+        dataset1 = fractal_governance.dataset.Dataset(df, max_workers=1)
+        dataset4 = fractal_governance.dataset.Dataset(df, max_workers=4)
+        for derived_frame in fractal_governance.dataset.DERIVED_FRAMES:
+            pd.testing.assert_frame_equal(
+                pd.DataFrame(getattr(dataset1, derived_frame.name)),
+                pd.DataFrame(getattr(dataset4, derived_frame.name)),
+            )
+
+    def test_derive(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        respect = dataset.tables.df_respect.set_index(
+            [MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]
+        )[RESPECT_COLUMN_NAME]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", FutureWarning)
+            derived_dataset = dataset.derive(respect=2 * respect)
+        self.assertAlmostEqual(
+            derived_dataset.total_member_respect, 2 * dataset.total_member_respect
+        )
+        self.assertAlmostEqual(
+            derived_dataset.total_team_respect, 2 * dataset.total_team_respect
+        )
+        self.assertAlmostEqual(
+            derived_dataset.df[RESPECT_COLUMN_NAME].sum(),
+            2 * dataset.df[RESPECT_COLUMN_NAME].sum(),
+        )
+        for derived_frame in fractal_governance.dataset.DERIVED_FRAMES:
+            is_shared = getattr(derived_dataset, derived_frame.name) is getattr(
+                dataset, derived_frame.name
+            )
+            self.assertEqual(
+                is_shared,
+                derived_frame.name
+                in (
+                    "df_member_attendance_new_and_returning_by_meeting",
+                    "df_team_representation_by_date",
+                    "df_member_attendance_new_and_returning_by_period",
+                    "df_team_representation_by_period",
+                    "df_group_ranks",
+                    "df_group_level_histogram",
+                    "df_ranking_stability",
+                    "df_member_rank_volatility",
+                ),
+                derived_frame.name,
+            )
+        self.assertIs(derived_dataset.tables.df_members, dataset.tables.df_members)
+
+        # The tables of a shared Dataset cannot be modified in place.
+        for tables in [dataset.tables, derived_dataset.tables]:
+            for field in attrs.fields(fractal_governance.tables.Tables):
+                df = getattr(tables, field.name)
+                with self.assertRaises(ReadOnlyError):
+                    df.iloc[0, 0] = df.iloc[-1, 0]
+                with self.assertRaises(ValueError):
+                    df[df.columns[-1]].values[0] = df[df.columns[-1]].values[-1]
+
+        with self.assertRaises(ValueError):
+            dataset.derive(
+                respect=pd.Series(
+                    [1.0],
+                    index=pd.MultiIndex.from_tuples([(1, "no such member")]),
+                )
+            )
 
 
 if __name__ == "__main__":
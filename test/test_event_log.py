@@ -0,0 +1,257 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.event_log module"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import attrs
+import pandas as pd
+import uncertainties
+
+import fractal_governance.dataset
+import fractal_governance.result_cache
+import fractal_governance.util
+from fractal_governance.addendum_1.weighted_means import WeightedMeans
+from fractal_governance.constants import (
+    INDEX_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    SIGNATURE_ON_FILE_COLUMN_NAME,
+    TOKENS_INDIVIDUAL,
+    TOKENS_TEAM,
+)
+from fractal_governance.event_log import (
+    EVENT_LOG_FILE_NAME,
+    AccountStatusChange,
+    EventLog,
+    LateConsensusPenalty,
+    LoggedEvent,
+    MeetingResults,
+    diff_frames,
+)
+
+
+def get_nominal_values_and_std_devs(df: pd.DataFrame) -> pd.DataFrame:
+    """Return the given DataFrame with each `uncertainties` value replaced by its
+    nominal value, followed by the standard deviations of those values"""
+    return pd.concat(
+        [df.applymap(uncertainties.nominal_value), df.applymap(uncertainties.std_dev)],
+        axis=1,
+    ).reset_index(drop=True)
+
+
+class TestEventLog(unittest.TestCase):
+    """Test fixture for the fractal_governance.event_log module"""
+
+    dataset: fractal_governance.dataset.Dataset
+    frames: fractal_governance.util.FractalDatasetFrames
+    result_cache: fractal_governance.result_cache.ResultCache
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+        cls.frames = fractal_governance.util.FractalDatasetFrames.from_csv()
+        # The event logs of every test share the aggregates of the same states.
+        cls.result_cache = fractal_governance.result_cache.ResultCache()
+
+    def setUp(self) -> None:
+        self.directory = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.directory)
+
+    def create_csv_paths(
+        self, frames: fractal_governance.util.FractalDatasetFrames
+    ) -> fractal_governance.util.FractalDatasetCSVPaths:
+        """Return the paths of .csv files with the given frames"""
+        csv_paths = fractal_governance.util.FractalDatasetCSVPaths(
+            account_status=self.directory / "account_status.csv",
+            late_consensus=self.directory / "late_consensus.csv",
+            teams=self.directory / "teams.csv",
+            weekly_measurements=self.directory / "weekly_measurements.csv",
+        )
+        frames.df_account_status.to_csv(csv_paths.account_status, index=False)
+        frames.df_late_consensus.to_csv(csv_paths.late_consensus, index=False)
+        frames.df_teams.to_csv(csv_paths.teams, index=False)
+        frames.df_weekly_measurements.to_csv(csv_paths.weekly_measurements, index=False)
+        return csv_paths
+
+    def test_record_csv(self) -> None:
+        event_log = EventLog(self.directory / "log", result_cache=self.result_cache)
+        logged_events = event_log.record_csv()
+        self.assertEqual(
+            [logged_event.sequence for logged_event in logged_events],
+            list(range(1, len(logged_events) + 1)),
+        )
+        self.assertEqual(list(event_log.read_events()), logged_events)
+        self.assertEqual(
+            sum(
+                isinstance(logged_event.event, MeetingResults)
+                for logged_event in logged_events
+            ),
+            len(self.dataset.tables.df_meetings),
+        )
+
+        # The first record writes a checkpoint, and nothing changed since.
+        self.assertEqual(event_log.get_checkpoint_sequences(), [len(logged_events)])
+        self.assertEqual(event_log.record_csv(), [])
+
+        state = event_log.replay()
+        self.assertTrue(state.is_from_checkpoint)
+        pd.testing.assert_frame_equal(state.df, fractal_governance.util.read_csv())
+        for name in ["df_member_leader_board", "df_team_leader_board"]:
+            pd.testing.assert_frame_equal(
+                state.aggregates[name], pd.DataFrame(getattr(self.dataset, name))
+            )
+        pd.testing.assert_frame_equal(
+            state.aggregates["df_respect"],
+            pd.DataFrame(self.dataset.tables.df_respect),
+        )
+
+    def test_replay_history(self) -> None:
+        event_log = EventLog(
+            self.directory / "log",
+            checkpoint_interval=10**6,
+            result_cache=self.result_cache,
+        )
+        first_sequence = len(event_log.record_csv())
+
+        # Retroactively record the signature of a member without one, and penalize
+        # the member for a late consensus.
+        df_account_status = self.frames.df_account_status.copy()
+        member_id = df_account_status.loc[
+            ~df_account_status[SIGNATURE_ON_FILE_COLUMN_NAME], MEMBER_ID_COLUMN_NAME
+        ].iloc[0]
+        df_account_status.loc[
+            df_account_status[MEMBER_ID_COLUMN_NAME] == member_id,
+            SIGNATURE_ON_FILE_COLUMN_NAME,
+        ] = True
+        meeting_id = self.frames.df_weekly_measurements.loc[
+            self.frames.df_weekly_measurements[MEMBER_ID_COLUMN_NAME] == member_id,
+            MEETING_ID_COLUMN_NAME,
+        ].max()
+        df_late_consensus = pd.concat(
+            [
+                self.frames.df_late_consensus,
+                pd.DataFrame(
+                    {
+                        INDEX_COLUMN_NAME: [len(self.frames.df_late_consensus) + 1],
+                        MEMBER_ID_COLUMN_NAME: [member_id],
+                        MEETING_ID_COLUMN_NAME: [meeting_id],
+                    }
+                ),
+            ],
+            ignore_index=True,
+        )
+        frames = attrs.evolve(
+            self.frames,
+            df_account_status=df_account_status,
+            df_late_consensus=df_late_consensus,
+        )
+        csv_paths = self.create_csv_paths(frames)
+        logged_events = event_log.record_csv(csv_paths)
+        self.assertEqual(
+            [logged_event.event for logged_event in logged_events],
+            diff_frames(self.frames, frames),
+        )
+        self.assertEqual(
+            [type(logged_event.event) for logged_event in logged_events],
+            [AccountStatusChange, LateConsensusPenalty],
+        )
+
+        # Every earlier state can be reconstructed.
+        state = event_log.replay()
+        self.assertFalse(state.is_from_checkpoint)
+        pd.testing.assert_frame_equal(
+            state.df, fractal_governance.util.read_csv(csv_paths)
+        )
+        pd.testing.assert_frame_equal(
+            event_log.replay(first_sequence).df, fractal_governance.util.read_csv()
+        )
+        with self.assertRaises(ValueError):
+            event_log.replay(first_sequence + len(logged_events) + 1)
+
+        df = state.df.set_index([MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME])
+        self.assertEqual(df.loc[(member_id, meeting_id), RESPECT_COLUMN_NAME].sum(), 0)
+
+        # Revoking the penalty is another event.
+        csv_paths = self.create_csv_paths(
+            attrs.evolve(frames, df_late_consensus=self.frames.df_late_consensus)
+        )
+        (logged_event,) = event_log.record_csv(csv_paths)
+        self.assertEqual(
+            logged_event.event,
+            LateConsensusPenalty(
+                member_id=member_id, meeting_id=meeting_id, record=None
+            ),
+        )
+
+    def test_checkpoint(self) -> None:
+        event_log = EventLog(
+            self.directory / "log",
+            checkpoint_interval=10**6,
+            result_cache=self.result_cache,
+        )
+        first_sequence = len(event_log.record_csv())
+        self.assertEqual(event_log.get_checkpoint_sequences(), [])
+        event_log.checkpoint()
+        self.assertEqual(event_log.get_checkpoint_sequences(), [first_sequence])
+        self.assertTrue(event_log.replay(first_sequence).is_from_checkpoint)
+
+        # The results of a new meeting are replayed on top of the checkpoint.
+        df_weekly_measurements = self.frames.df_weekly_measurements
+        meeting_id = df_weekly_measurements[MEETING_ID_COLUMN_NAME].max()
+        df_new_meeting = df_weekly_measurements[
+            df_weekly_measurements[MEETING_ID_COLUMN_NAME] == meeting_id
+        ].copy()
+        df_new_meeting[MEETING_ID_COLUMN_NAME] = meeting_id + 1
+        df_new_meeting[INDEX_COLUMN_NAME] += len(df_weekly_measurements)
+        csv_paths = self.create_csv_paths(
+            attrs.evolve(
+                self.frames,
+                df_weekly_measurements=pd.concat(
+                    [df_weekly_measurements, df_new_meeting], ignore_index=True
+                ),
+            )
+        )
+        (logged_event,) = event_log.record_csv(csv_paths)
+        self.assertIsInstance(logged_event.event, MeetingResults)
+        state = event_log.replay()
+        self.assertFalse(state.is_from_checkpoint)
+        df = fractal_governance.util.read_csv(csv_paths)
+        pd.testing.assert_frame_equal(state.df, df)
+
+        # Only the weighted means of the new meeting were calculated, and they agree
+        # with the weighted means calculated from scratch.
+        dataset = fractal_governance.dataset.Dataset(df=df)
+        pd.testing.assert_frame_equal(
+            state.aggregates["df_member_leader_board"],
+            pd.DataFrame(dataset.df_member_leader_board),
+        )
+        pd.testing.assert_frame_equal(
+            get_nominal_values_and_std_devs(
+                state.aggregates["df_weighted_means"].drop(
+                    columns=[TOKENS_INDIVIDUAL, TOKENS_TEAM]
+                )
+            ),
+            get_nominal_values_and_std_devs(WeightedMeans(dataset).df),
+        )
+
+    def test_incomplete_event_is_ignored(self) -> None:
+        event_log = EventLog(self.directory / "log", checkpoint_interval=10**6)
+        event = MeetingResults(meeting_id=1, records=())
+        event_log.append([event])
+        with open(self.directory / "log" / EVENT_LOG_FILE_NAME, "a") as file:
+            file.write('{"sequence": 2')
+        self.assertEqual(event_log.get_sequence(), 1)
+        (logged_event,) = event_log.append([event])
+        self.assertEqual(logged_event.sequence, 2)
+        self.assertEqual(LoggedEvent.from_json(logged_event.to_json()), logged_event)
+        self.assertEqual(len(list(event_log.read_events())), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
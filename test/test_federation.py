@@ -0,0 +1,138 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.federation module"""
+
+import datetime
+import unittest
+
+import attrs
+import numpy as np
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.progress
+from fractal_governance.constants import (
+    ACCUMULATED_RESPECT_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    FRACTAL_COUNT_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    MEAN_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEMBER_NAME_COLUMN_NAME,
+    STANDARD_DEVIATION_COLUMN_NAME,
+)
+from fractal_governance.federation import (
+    Federation,
+    Fractal,
+    FractalAggregates,
+    merge_meeting_summaries,
+)
+from fractal_governance.util import FractalCalendar
+
+
+class TestFederation(unittest.TestCase):
+    """Test fixture for the fractal_governance.federation module"""
+
+    dataset: fractal_governance.dataset.Dataset
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+
+    def test_fractal_names_must_be_unique(self) -> None:
+        with self.assertRaises(ValueError):
+            Federation([Fractal("genesis"), Fractal("genesis")])
+        with self.assertRaises(ValueError):
+            Federation([])
+
+    def test_single_fractal(self) -> None:
+        stages = set()
+        progress = fractal_governance.progress.ProgressToken(
+            lambda progress: stages.add(progress.stage)
+        )
+        federation = Federation([Fractal("genesis")], max_workers=1, progress=progress)
+        self.assertIn("federation", stages)
+        self.assertEqual(federation.get_fractal("genesis"), Fractal("genesis"))
+
+        column_names = [
+            MEMBER_ID_COLUMN_NAME,
+            MEMBER_NAME_COLUMN_NAME,
+            ACCUMULATED_RESPECT_COLUMN_NAME,
+            ATTENDANCE_COUNT_COLUMN_NAME,
+        ]
+        pd.testing.assert_frame_equal(
+            federation.df_member_leader_board[column_names],
+            self.dataset.df_member_leader_board[column_names],
+            check_frame_type=False,
+        )
+        self.assertTrue(
+            (federation.df_member_leader_board[FRACTAL_COUNT_COLUMN_NAME] == 1).all()
+        )
+        self.assertEqual(
+            federation.df_team_leader_board[ACCUMULATED_RESPECT_COLUMN_NAME].tolist(),
+            self.dataset.df_team_leader_board[ACCUMULATED_RESPECT_COLUMN_NAME].tolist(),
+        )
+
+    def test_merged_aggregates(self) -> None:
+        # A copy of the Genesis fractal that met one week later.
+        calendar = FractalCalendar(date_of_first_meeting=datetime.datetime(2022, 3, 5))
+        federation = Federation(
+            [Fractal("genesis"), Fractal("copy", fractal_calendar=calendar)],
+            max_workers=2,
+        )
+        df = federation.df_member_leader_board.set_index(MEMBER_ID_COLUMN_NAME)
+        df_genesis = self.dataset.df_member_leader_board.set_index(
+            MEMBER_ID_COLUMN_NAME
+        )
+        np.testing.assert_allclose(
+            df[ACCUMULATED_RESPECT_COLUMN_NAME],
+            2 * df_genesis[ACCUMULATED_RESPECT_COLUMN_NAME].reindex(df.index),
+        )
+        self.assertTrue((df[FRACTAL_COUNT_COLUMN_NAME] == 2).all())
+        self.assertEqual(
+            len(federation.df_team_leader_board),
+            2 * len(self.dataset.df_team_leader_board),
+        )
+
+        # The merged meeting summary is the same as the one calculated from the rows
+        # of both fractals.
+        df_attendance = self.dataset.tables.df_attendance
+        df_copy = df_attendance.assign(
+            **{
+                MEETING_DATE_COLUMN_NAME: df_attendance[MEETING_DATE_COLUMN_NAME]
+                + pd.Timedelta(weeks=1)
+            }
+        )
+        df_expected = (
+            pd.concat([df_attendance, df_copy])
+            .groupby(MEETING_DATE_COLUMN_NAME)[LEVEL_COLUMN_NAME]
+            .agg(["count", "mean", "std"])
+        )
+        df_summary = federation.df_meeting_summary
+        self.assertEqual(df_summary.index.tolist(), df_expected.index.tolist())
+        np.testing.assert_array_equal(
+            df_summary[ATTENDANCE_COUNT_COLUMN_NAME], df_expected["count"]
+        )
+        np.testing.assert_allclose(df_summary[MEAN_COLUMN_NAME], df_expected["mean"])
+        # The first and last dates have a single meeting each.
+        self.assertEqual(df_summary[FRACTAL_COUNT_COLUMN_NAME].iloc[0], 1)
+        self.assertEqual(df_summary[FRACTAL_COUNT_COLUMN_NAME].iloc[-1], 1)
+        np.testing.assert_allclose(
+            df_summary[STANDARD_DEVIATION_COLUMN_NAME].iloc[[0, -1]],
+            df_expected["std"].iloc[[0, -1]],
+        )
+
+    def test_merge_is_incremental(self) -> None:
+        aggregates = FractalAggregates.from_dataset("genesis", self.dataset)
+        df = merge_meeting_summaries(
+            [aggregates, attrs.evolve(aggregates, fractal_name="copy")]
+        )
+        self.assertTrue((df[FRACTAL_COUNT_COLUMN_NAME] == 2).all())
+        np.testing.assert_array_equal(
+            df[ATTENDANCE_COUNT_COLUMN_NAME],
+            2 * aggregates.df_meetings[ATTENDANCE_COUNT_COLUMN_NAME],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,19 +5,69 @@ import unittest
 from typing import List, Type
 
 # import test_addendum_1
+import test_charts
+import test_cli
+import test_co_attendance
+import test_dashboard
 import test_dataset
+import test_event_log
+import test_federation
+import test_group_cube
+import test_imports
+import test_leader_board
+import test_lru_cache
 import test_math
+import test_memory
+import test_perf
+import test_plot_data
 import test_plots
+import test_progress
+import test_ranking_stability
+import test_read_only
+import test_refresher
+import test_render_cache
+import test_resources
+import test_result_cache
+import test_rollups
+import test_scheduler
+import test_sqlite_store
+import test_static_site
 import test_statistics
+import test_tables
 import test_util
 
 if __name__ == "__main__":
     test_cases_to_run: List[Type[unittest.TestCase]] = []
     # test_cases_to_run.append(test_addendum_1.TestWeightedMeans)
+    test_cases_to_run.append(test_charts.TestCharts)
+    test_cases_to_run.append(test_cli.TestCLI)
+    test_cases_to_run.append(test_co_attendance.TestCoAttendance)
+    test_cases_to_run.append(test_dashboard.TestDashboard)
     test_cases_to_run.append(test_dataset.TestDataset)
+    test_cases_to_run.append(test_event_log.TestEventLog)
+    test_cases_to_run.append(test_federation.TestFederation)
+    test_cases_to_run.append(test_group_cube.TestGroupCube)
+    test_cases_to_run.append(test_imports.TestImports)
+    test_cases_to_run.append(test_leader_board.TestLeaderBoard)
+    test_cases_to_run.append(test_lru_cache.TestLRUCache)
     test_cases_to_run.append(test_math.TestMath)
+    test_cases_to_run.append(test_memory.TestMemory)
+    test_cases_to_run.append(test_perf.TestPerf)
+    test_cases_to_run.append(test_plot_data.TestPlotData)
     test_cases_to_run.append(test_plots.TestPlots)
+    test_cases_to_run.append(test_progress.TestProgress)
+    test_cases_to_run.append(test_ranking_stability.TestRankingStability)
+    test_cases_to_run.append(test_read_only.TestReadOnly)
+    test_cases_to_run.append(test_refresher.TestRefresher)
+    test_cases_to_run.append(test_render_cache.TestRenderCache)
+    test_cases_to_run.append(test_resources.TestResources)
+    test_cases_to_run.append(test_result_cache.TestResultCache)
+    test_cases_to_run.append(test_rollups.TestRollups)
+    test_cases_to_run.append(test_scheduler.TestScheduler)
+    test_cases_to_run.append(test_sqlite_store.TestSQLiteStore)
+    test_cases_to_run.append(test_static_site.TestStaticSite)
     test_cases_to_run.append(test_statistics.TestStatistics)
+    test_cases_to_run.append(test_tables.TestTables)
     test_cases_to_run.append(test_util.TestUtil)
 
     test_loader = unittest.TestLoader()
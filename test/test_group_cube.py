@@ -0,0 +1,231 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.group_cube module"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import fractal_governance.dataset
+from fractal_governance.constants import (
+    ADVANCED_MEMBER_COUNT_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
+    GROUP_COUNT_COLUMN_NAME,
+    GROUP_SIZE_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    LEVEL_RANGE_COLUMN_NAME,
+    LEVEL_STANDARD_DEVIATION_COLUMN_NAME,
+    MEAN_LEVEL_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    NEW_MEMBER_COUNT_COLUMN_NAME,
+    NEW_MEMBER_SHARE_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    TEAM_COUNT_COLUMN_NAME,
+    TEAM_ID_COLUMN_NAME,
+    TEAM_MEMBER_COUNT_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+)
+from fractal_governance.group_cube import (
+    GROUP_KEY_COLUMN_NAMES,
+    create_group_members,
+    get_group_sizes,
+    get_ranked_group_members,
+    rollup_to_meetings,
+    rollup_to_members,
+    rollup_to_teams,
+)
+
+
+class TestGroupCube(unittest.TestCase):
+    """Test fixture for the fractal_governance.group_cube module"""
+
+    dataset: fractal_governance.dataset.Dataset
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+
+    def test_group_members(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        self.assertEqual(
+            len(df_group_members), len(self.dataset.tables.df_round_results)
+        )
+        self.assertTrue(
+            df_group_members.equals(
+                df_group_members.sort_values(
+                    by=GROUP_KEY_COLUMN_NAMES, kind="mergesort"
+                )
+            )
+        )
+
+        # Every attendee is measured once per meeting, in the final round they
+        # participated in, which is the attendance table.
+        column_names = [
+            MEETING_ID_COLUMN_NAME,
+            MEMBER_ID_COLUMN_NAME,
+            GROUP_COLUMN_NAME,
+            LEVEL_COLUMN_NAME,
+            RESPECT_COLUMN_NAME,
+        ]
+        pd.testing.assert_frame_equal(
+            get_ranked_group_members(df_group_members)[column_names]
+            .sort_values(by=column_names[:2])
+            .reset_index(drop=True),
+            pd.DataFrame(self.dataset.tables.df_attendance)[column_names]
+            .sort_values(by=column_names[:2])
+            .reset_index(drop=True),
+        )
+        self.assertEqual(
+            df_group_members.loc[
+                df_group_members[LEVEL_COLUMN_NAME].isna(), RESPECT_COLUMN_NAME
+            ]
+            .abs()
+            .sum(),
+            0,
+        )
+
+        # The group ranks are the group members without their Respect.
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(self.dataset.df_group_ranks),
+            pd.DataFrame(df_group_members).drop(columns=RESPECT_COLUMN_NAME),
+        )
+        pd.testing.assert_frame_equal(
+            create_group_members(self.dataset.tables),
+            pd.DataFrame(df_group_members),
+        )
+
+    def test_group_cube(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        df_group_cube = self.dataset.df_group_cube
+        self.assertEqual(df_group_cube.index.names, GROUP_KEY_COLUMN_NAMES)
+        self.assertEqual(
+            df_group_cube[GROUP_SIZE_COLUMN_NAME].sum(), len(df_group_members)
+        )
+        self.assertEqual(
+            df_group_cube[ADVANCED_MEMBER_COUNT_COLUMN_NAME].sum(),
+            df_group_members[LEVEL_COLUMN_NAME].isna().sum(),
+        )
+        self.assertEqual(
+            df_group_cube[RESPECT_COLUMN_NAME].sum(), self.dataset.total_member_respect
+        )
+        self.assertTrue(
+            (
+                df_group_cube[TEAM_COUNT_COLUMN_NAME]
+                <= df_group_cube[TEAM_MEMBER_COUNT_COLUMN_NAME]
+            ).all()
+        )
+        self.assertTrue(df_group_cube[NEW_MEMBER_SHARE_COLUMN_NAME].between(0, 1).all())
+
+        # A second round measures the members who advanced from the first round.
+        df_second_round = df_group_cube.xs(2, level=ROUND_COLUMN_NAME)
+        self.assertGreater(len(df_second_round), 0)
+        self.assertEqual(
+            df_second_round[GROUP_SIZE_COLUMN_NAME].sum(),
+            df_group_cube.xs(1, level=ROUND_COLUMN_NAME)[
+                ADVANCED_MEMBER_COUNT_COLUMN_NAME
+            ].sum(),
+        )
+
+        key = df_group_cube.index[-1]
+        df_group = df_group_members.set_index(GROUP_KEY_COLUMN_NAMES).loc[key]
+        levels = df_group[LEVEL_COLUMN_NAME].dropna()
+        self.assertAlmostEqual(
+            df_group_cube.loc[key, MEAN_LEVEL_COLUMN_NAME], levels.mean()
+        )
+        self.assertAlmostEqual(
+            df_group_cube.loc[key, LEVEL_STANDARD_DEVIATION_COLUMN_NAME], levels.std()
+        )
+        self.assertEqual(
+            df_group_cube.loc[key, LEVEL_RANGE_COLUMN_NAME], levels.max() - levels.min()
+        )
+
+    def test_group_level_histogram(self) -> None:
+        df_group_cube = self.dataset.df_group_cube
+        df_histogram = self.dataset.df_group_level_histogram
+        self.assertTrue(df_histogram.index.equals(df_group_cube.index))
+        np.testing.assert_array_equal(
+            df_histogram.sum(axis=1).to_numpy(),
+            (
+                df_group_cube[GROUP_SIZE_COLUMN_NAME]
+                - df_group_cube[ADVANCED_MEMBER_COUNT_COLUMN_NAME]
+            ).to_numpy(),
+        )
+        levels = pd.Series(df_histogram.columns, index=df_histogram.columns)
+        np.testing.assert_allclose(
+            (df_histogram * levels).sum(axis=1) / df_histogram.sum(axis=1),
+            df_group_cube[MEAN_LEVEL_COLUMN_NAME],
+        )
+
+    def test_rollup_to_meetings(self) -> None:
+        df_meetings = rollup_to_meetings(self.dataset.df_group_cube)
+        df_attendance = self.dataset.tables.df_attendance
+        self.assertEqual(
+            df_meetings[GROUP_COUNT_COLUMN_NAME].sum(), len(self.dataset.df_group_cube)
+        )
+        pd.testing.assert_series_equal(
+            df_meetings[ATTENDANCE_COUNT_COLUMN_NAME],
+            df_attendance.groupby(MEETING_ID_COLUMN_NAME).size(),
+            check_names=False,
+        )
+        pd.testing.assert_series_equal(
+            df_meetings[RESPECT_COLUMN_NAME],
+            df_attendance.groupby(MEETING_ID_COLUMN_NAME)[RESPECT_COLUMN_NAME].sum(),
+        )
+        pd.testing.assert_series_equal(
+            df_meetings[NEW_MEMBER_COUNT_COLUMN_NAME],
+            self.dataset.df_member_attendance_new_and_returning_by_meeting.set_index(
+                MEETING_ID_COLUMN_NAME
+            )[NEW_MEMBER_COUNT_COLUMN_NAME],
+        )
+
+    def test_rollup_to_members(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        df_members = rollup_to_members(df_group_members, self.dataset.df_group_cube)
+        df_member_leader_board = self.dataset.df_member_leader_board.set_index(
+            MEMBER_ID_COLUMN_NAME
+        )
+        pd.testing.assert_series_equal(
+            df_members[ATTENDANCE_COUNT_COLUMN_NAME],
+            df_member_leader_board[ATTENDANCE_COUNT_COLUMN_NAME]
+            .reindex(df_members.index)
+            .astype(int),
+        )
+        self.assertEqual(
+            df_members[GROUP_COUNT_COLUMN_NAME].sum(), len(df_group_members)
+        )
+
+        group_sizes = get_group_sizes(df_group_members, self.dataset.df_group_cube)
+        np.testing.assert_array_equal(
+            group_sizes,
+            df_group_members.groupby(GROUP_KEY_COLUMN_NAMES)[MEMBER_ID_COLUMN_NAME]
+            .transform("size")
+            .to_numpy(),
+        )
+
+    def test_rollup_to_teams(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        df_teams = rollup_to_teams(df_group_members)
+        self.assertEqual(
+            list(df_teams[TEAM_NAME_COLUMN_NAME]),
+            list(self.dataset.tables.df_teams[TEAM_NAME_COLUMN_NAME]),
+        )
+        self.assertEqual(
+            df_teams[TEAM_MEMBER_COUNT_COLUMN_NAME].sum(),
+            self.dataset.df_group_cube[TEAM_MEMBER_COUNT_COLUMN_NAME].sum(),
+        )
+        self.assertEqual(
+            df_teams[GROUP_COUNT_COLUMN_NAME].sum(),
+            self.dataset.df_group_cube[TEAM_COUNT_COLUMN_NAME].sum(),
+        )
+        df_attendance = self.dataset.tables.df_attendance
+        self.assertEqual(
+            df_teams[ATTENDANCE_COUNT_COLUMN_NAME].sum(),
+            df_attendance[TEAM_ID_COLUMN_NAME].notna().sum(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the imports and import time of the fractal_governance package"""
+
+import os
+import subprocess
+import sys
+import unittest
+from typing import List, Set, Tuple
+
+# The dependencies that are only imported when a plot is drawn or a measurement
+# uncertainty is calculated.
+PLOTTING_MODULE_NAMES = {"altair", "matplotlib", "scipy", "seaborn"}
+UNCERTAINTY_MODULE_NAMES = {"uncertainties"}
+
+# The plotting, Arrow and Streamlit stacks, which the command line tool, the Dataset
+# and the shared resources do not import beyond what pandas itself imports.
+HEAVY_MODULE_NAMES = {"altair", "matplotlib", "pyarrow", "streamlit"}
+
+# The number of times each module is imported, of which the fastest is compared.
+IMPORT_TIME_REPEAT = 3
+
+# The time in seconds that importing a module may add to importing pandas, about twice
+# the measured times (0.15, 0.15 and 0.2 seconds).
+IMPORT_TIME_BUDGET_BY_MODULE_NAME = {
+    "fractal_governance.cli": 0.3,
+    "fractal_governance.dataset": 0.3,
+    "fractal_governance.resources": 0.5,
+}
+
+
+def import_module(module_name: str) -> Tuple[float, Set[str]]:
+    """Return the time in seconds it takes to import the given module in a new Python
+    process, and the names of the top-level packages that it imported"""
+    import_time, module_names = import_module_names(module_name)
+    return import_time, {module_name.split(".")[0] for module_name in module_names}
+
+
+def import_module_names(module_name: str) -> Tuple[float, Set[str]]:
+    """Return the time in seconds it takes to import the given module in a new Python
+    process, and the names of all of the modules that it imported"""
+    import_time, module_names = run_python(
+        [
+            "import sys, time",
+            "start = time.perf_counter()",
+            f"import {module_name}",
+            "print(time.perf_counter() - start)",
+            "print(' '.join(sys.modules))",
+        ]
+    ).splitlines()
+    return float(import_time), set(module_names.split())
+
+
+def run_module_names(module_name: str, *args: str) -> Set[str]:
+    """Return the names of all of the modules imported by running the given module as
+    a script with the given arguments in a new Python process"""
+    output = run_python(
+        [
+            "import runpy, sys",
+            f"sys.argv = [{module_name!r}, *{list(args)!r}]",
+            "try: runpy.run_module(sys.argv[0], run_name='__main__')",
+            "except SystemExit: pass",
+            "print(' '.join(sys.modules))",
+        ]
+    )
+    return set(output.splitlines()[-1].split())
+
+
+def run_python(lines: List[str]) -> str:
+    """Return the standard output of running the given lines of Python code in a new
+    Python process"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", "\n".join(lines)],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    return result.stdout
+
+
+def get_heavy_module_names(module_names: Set[str]) -> Set[str]:
+    """Return the names of the given modules that belong to HEAVY_MODULE_NAMES"""
+    return {
+        module_name
+        for module_name in module_names
+        if module_name.split(".")[0] in HEAVY_MODULE_NAMES
+    }
+
+
+class TestImports(unittest.TestCase):
+    """Test fixture for the import time of the fractal_governance package"""
+
+    def test_constants(self) -> None:
+        _, module_names = import_module("fractal_governance.constants")
+        self.assertNotIn("pandas", module_names)
+
+    def test_dataset(self) -> None:
+        for module_name in [
+            "fractal_governance.dataset",
+            "fractal_governance.rollups",
+            "fractal_governance.tables",
+            "fractal_governance.util",
+        ]:
+            _, module_names = import_module(module_name)
+            self.assertFalse(
+                module_names & (PLOTTING_MODULE_NAMES | UNCERTAINTY_MODULE_NAMES),
+                module_name,
+            )
+
+    def test_dashboards(self) -> None:
+        for module_name in [
+            "fractal_governance.dashboard",
+            "fractal_governance.measurement_uncertainty.plots",
+            "fractal_governance.plots",
+            "fractal_governance.refresher",
+            "fractal_governance.resources",
+            "fractal_governance.static_site",
+        ]:
+            _, module_names = import_module(module_name)
+            self.assertFalse(module_names & PLOTTING_MODULE_NAMES, module_name)
+
+    def test_cli(self) -> None:
+        _, module_names = import_module("fractal_governance.cli")
+        self.assertFalse(module_names & PLOTTING_MODULE_NAMES)
+
+    def test_heavy_modules(self) -> None:
+        # pandas imports pyarrow itself if it is installed, so only the modules
+        # imported beyond those of pandas count.
+        _, pandas_module_names = import_module_names("pandas")
+        for module_name in IMPORT_TIME_BUDGET_BY_MODULE_NAME:
+            _, module_names = import_module_names(module_name)
+            self.assertFalse(
+                get_heavy_module_names(module_names - pandas_module_names),
+                module_name,
+            )
+
+    def test_cli_help(self) -> None:
+        _, pandas_module_names = import_module_names("pandas")
+        module_names = run_module_names("fractal_governance.cli", "--help")
+        self.assertIn("fractal_governance.constants", module_names)
+        self.assertFalse(get_heavy_module_names(module_names - pandas_module_names))
+
+    def test_import_time(self) -> None:
+        def get_import_time(module_name: str) -> float:
+            return min(import_module(module_name)[0] for _ in range(IMPORT_TIME_REPEAT))
+
+        pandas_import_time = get_import_time("pandas")
+        for module_name, budget in IMPORT_TIME_BUDGET_BY_MODULE_NAME.items():
+            import_time = get_import_time(module_name)
+            self.assertLess(import_time, pandas_import_time + budget, module_name)
+
+
+if __name__ == "__main__":
+    unittest.main()
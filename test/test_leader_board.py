@@ -0,0 +1,130 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.leader_board module"""
+
+import unittest
+
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.dataset
+import numpy as np
+import pandas as pd
+from fractal_governance.constants import (
+    ACCUMULATED_RESPECT_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+)
+from fractal_governance.dashboard import (
+    CMAP,
+    create_measurement_uncertainty_leader_board,
+    create_member_leader_board,
+    get_measurement_uncertainty_sort_key,
+)
+from fractal_governance.leader_board import LeaderBoard, get_gradient_colors
+from fractal_governance.measurement_uncertainty.dataset import UncertaintyType
+from fractal_governance.resources import ResourceRegistry, get_leader_board
+
+
+class TestLeaderBoard(unittest.TestCase):
+    """Test fixture for the fractal_governance.leader_board module"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+
+    def test_gradient_colors(self) -> None:
+        df = pd.DataFrame(
+            {"a": [1.0, 2.0, np.nan, 4.0], "b": [3, 3, 3, 3], "c": [-1, 0, 5, 2]}
+        )
+        background_colors, text_colors = get_gradient_colors(df, CMAP)
+        styler = df.style.background_gradient(cmap=CMAP)
+        styler._compute()
+        for (row, column), css in styler.ctx.items():
+            self.assertEqual(
+                css,
+                [
+                    ("background-color", background_colors.iat[row, column]),
+                    ("color", text_colors.iat[row, column]),
+                ],
+            )
+
+    def test_style(self) -> None:
+        df = self.dataset.df_member_leader_board
+        leader_board = create_member_leader_board(df)
+        column_names = [ACCUMULATED_RESPECT_COLUMN_NAME, ATTENDANCE_COUNT_COLUMN_NAME]
+        expected_styler = df.style.background_gradient(
+            cmap=CMAP, subset=pd.IndexSlice[:, column_names]
+        )
+        expected_styler._compute()
+        styler = leader_board.style(2, 25)
+        styler._compute()
+        # The colours of a page are relative to every row.
+        for (row, column), css in styler.ctx.items():
+            self.assertEqual(css, expected_styler.ctx[(25 + row, column)])
+        self.assertEqual(len(styler.data), 25)
+
+    def test_pages(self) -> None:
+        df = pd.DataFrame({"a": np.arange(23)}, index=np.arange(23) + 1)
+        leader_board = LeaderBoard(df, ["a"], cmap=CMAP)
+        self.assertEqual(len(leader_board), 23)
+        self.assertEqual(leader_board.get_page_count(10), 3)
+        self.assertEqual(leader_board.get_page(3, 10)["a"].to_list(), [20, 21, 22])
+        self.assertEqual(
+            leader_board.get_page(1, 5, sort_key=(("a", False),))["a"].to_list(),
+            [22, 21, 20, 19, 18],
+        )
+        for page_number in (0, 4):
+            with self.assertRaises(ValueError):
+                leader_board.get_page(page_number, 10)
+        self.assertEqual(
+            LeaderBoard(df.iloc[:0], ["a"], cmap=CMAP).get_page(1).shape, (0, 1)
+        )
+
+    def test_to_arrow(self) -> None:
+        df = self.dataset.df_member_leader_board
+        leader_board = create_member_leader_board(df)
+        sort_key = ((ATTENDANCE_COUNT_COLUMN_NAME, False),)
+        table = leader_board.to_arrow(2, 10, sort_key)
+        self.assertEqual(table.num_rows, 10)
+        pd.testing.assert_frame_equal(
+            table.to_pandas(), leader_board.get_page(2, 10, sort_key)
+        )
+        self.assertTrue(set(leader_board.column_formats).issubset(table.column_names))
+
+    def test_measurement_uncertainty_sort(self) -> None:
+        measurement_uncertainty_dataset = (
+            fractal_governance.measurement_uncertainty.dataset.Dataset(
+                dataset=self.dataset
+            )
+        )
+        df = measurement_uncertainty_dataset.get_member_leader_board(
+            include_self_measurement=True
+        )
+        leader_board = create_measurement_uncertainty_leader_board(df)
+        for uncertainty_type in UncertaintyType:
+            sort_key = get_measurement_uncertainty_sort_key(uncertainty_type)
+            expected_df = df.sort_values(
+                by=[column_name for column_name, _ in sort_key],
+                key=lambda series: abs(series)
+                if np.issubdtype(series.dtype, np.number)
+                else series,
+                ascending=[ascending for _, ascending in sort_key],
+            )
+            order = leader_board.get_order(sort_key)
+            self.assertEqual(list(df.index[order]), list(expected_df.index))
+            # The order of each sort key is only calculated once.
+            self.assertIs(leader_board.get_order(sort_key), order)
+
+    def test_get_leader_board(self) -> None:
+        registry = ResourceRegistry()
+        df = self.dataset.df_member_leader_board
+        leader_board = get_leader_board(
+            df, create_member_leader_board, registry=registry
+        )
+        self.assertIs(
+            get_leader_board(df, create_member_leader_board, registry=registry),
+            leader_board,
+        )
+        self.assertEqual(registry.miss_count, 1)
+        self.assertEqual(registry.hit_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.lru_cache module"""
+
+import concurrent.futures
+import threading
+import unittest
+
+from fractal_governance.lru_cache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test fixture for the fractal_governance.lru_cache module"""
+
+    def test_get_or_create(self) -> None:
+        cache = LRUCache(max_entries=2)
+        self.assertEqual(cache.get_or_create("a", lambda: "a"), "a")
+        self.assertEqual(cache.get_or_create("a", self.fail), "a")
+        self.assertEqual(cache.get_or_create("b", lambda: "b"), "b")
+        self.assertEqual(cache.get_or_create("c", lambda: "c"), "c")
+        self.assertEqual(len(cache), 2)
+        # "a" was the least recently used entry.
+        self.assertEqual(cache.get_or_create("a", lambda: "A"), "A")
+        self.assertEqual(cache.hit_count, 1)
+        self.assertEqual(cache.miss_count, 4)
+
+        def fail() -> str:
+            raise RuntimeError("fail")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_create("d", fail)
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_load(self) -> None:
+        cache = LRUCache(max_entries=2)
+        self.assertEqual(cache.get_or_create("a", self.fail, load=lambda: "a"), "a")
+        self.assertEqual(cache.get_or_create("b", lambda: "b", load=lambda: None), "b")
+        self.assertEqual(cache.hit_count, 1)
+        self.assertEqual(cache.miss_count, 1)
+
+    def test_get_or_create_concurrently(self) -> None:
+        cache = LRUCache(max_entries=2)
+        created = threading.Event()
+        create_count = 0
+
+        def create() -> object:
+            nonlocal create_count
+            create_count += 1
+            created.wait(timeout=1)
+            return object()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(cache.get_or_create, "key", create) for _ in range(4)
+            ]
+            created.set()
+            values = [future.result() for future in futures]
+        self.assertEqual(create_count, 1)
+        self.assertTrue(all(value is values[0] for value in values))
+        self.assertEqual(cache.miss_count, 1)
+        self.assertEqual(cache.hit_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.memory module"""
+
+import json
+import unittest
+from typing import Dict, Optional
+
+import attrs
+import numpy as np
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.read_only
+import fractal_governance.result_cache
+from fractal_governance.addendum_1.weighted_means import WeightedMeans
+from fractal_governance.constants import (
+    MEMBER_ID_COLUMN_NAME,
+    WEIGHTED_MEAN_LEVEL_COLUMN_NAME,
+)
+from fractal_governance.memory import get_memory_report, trace_peak
+
+
+@attrs.frozen
+class Frames:
+    """Frames that share buffers with each other"""
+
+    df: pd.DataFrame = attrs.field(repr=False)
+    df_view: pd.DataFrame = attrs.field(repr=False)
+    df_same: pd.DataFrame = attrs.field(repr=False)
+    df_copy: pd.DataFrame = attrs.field(repr=False)
+    df_by_name: Dict[str, pd.DataFrame] = attrs.field(repr=False, eq=False)
+
+
+@attrs.frozen
+class Cached:
+    """An array that is calculated through a ResultCache"""
+
+    result_cache: Optional[fractal_governance.result_cache.ResultCache] = attrs.field(
+        default=None, kw_only=True, repr=False, eq=False
+    )
+
+    array: np.ndarray = attrs.field(default=None, init=False, repr=False)
+
+    def __attrs_post_init__(self) -> None:
+        result = fractal_governance.result_cache.get_or_compute(
+            self.result_cache,
+            lambda: "array",
+            lambda: {"array": np.ones(2**20)},
+        )
+        object.__setattr__(self, "array", result["array"])
+
+
+class TestMemory(unittest.TestCase):
+    """Test fixture for the fractal_governance.memory module"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+
+    def test_dataset(self) -> None:
+        memory_report = self.dataset.memory_report()
+        entry_by_name = {entry.name: entry for entry in memory_report.entries}
+        self.assertIn("tables.df_attendance", entry_by_name)
+        self.assertIn("df_member_leader_board", entry_by_name)
+        self.assertEqual(
+            entry_by_name["df"].deep_bytes,
+            self.dataset.df.memory_usage(index=True, deep=True).sum(),
+        )
+        self.assertIn(MEMBER_ID_COLUMN_NAME, entry_by_name["df"].object_column_names)
+        self.assertEqual(entry_by_name["df"].ufloat_column_names, ())
+        self.assertLessEqual(memory_report.total_bytes, memory_report.deep_bytes)
+        self.assertIsNone(memory_report.construction_peak_bytes)
+
+        report = json.loads(memory_report.to_json())
+        self.assertEqual(report["total_bytes"], memory_report.total_bytes)
+        self.assertEqual(len(report["entries"]), len(memory_report.entries))
+        self.assertEqual(
+            memory_report.to_dataframe().index.tolist()[0],
+            max(memory_report.entries, key=lambda entry: entry.deep_bytes).name,
+        )
+
+    def test_trace_construction(self) -> None:
+        memory_report = self.dataset.memory_report(trace_construction=True)
+        self.assertGreater(memory_report.construction_peak_bytes, 0)
+
+        # The object is constructed again without its result cache.
+        result_cache = fractal_governance.result_cache.ResultCache()
+        cached = Cached(result_cache=result_cache)
+        memory_report = get_memory_report(cached, trace_construction=True)
+        self.assertGreaterEqual(memory_report.construction_peak_bytes, 8 * 2**20)
+        self.assertEqual((result_cache.hit_count, result_cache.miss_count), (0, 1))
+
+        value, peak_bytes = trace_peak(lambda: np.ones(2**20).sum())
+        self.assertEqual(value, 2**20)
+        self.assertGreaterEqual(peak_bytes, 8 * 2**20)
+
+    def test_shared_and_owned(self) -> None:
+        df = pd.DataFrame({"a": np.arange(1000.0), "b": np.arange(1000)})
+        frames = Frames(
+            df=df,
+            df_view=fractal_governance.read_only.freeze(df),
+            df_same=df,
+            df_copy=df.copy(),
+            df_by_name={"ignored": df.copy()},
+        )
+        memory_report = get_memory_report(frames)
+        entry_by_name = {entry.name: entry for entry in memory_report.entries}
+        self.assertEqual(list(entry_by_name), ["df", "df_view", "df_same", "df_copy"])
+        nbytes = df["a"].nbytes + df["b"].nbytes
+        self.assertEqual(entry_by_name["df"].shared_bytes, nbytes)
+        self.assertEqual(entry_by_name["df_view"].shared_bytes, nbytes)
+        self.assertEqual(entry_by_name["df_same"].owned_bytes, 0)
+        self.assertEqual(entry_by_name["df_copy"].shared_bytes, 0)
+        self.assertEqual(memory_report.shared_buffer_bytes, nbytes)
+        self.assertEqual(
+            memory_report.total_bytes,
+            entry_by_name["df"].deep_bytes
+            + entry_by_name["df_view"].owned_bytes
+            + entry_by_name["df_copy"].deep_bytes,
+        )
+
+    def test_ufloat_columns(self) -> None:
+        memory_report = WeightedMeans(dataset=self.dataset).memory_report()
+        (entry,) = [entry for entry in memory_report.entries if entry.name == "df"]
+        self.assertIn(WEIGHTED_MEAN_LEVEL_COLUMN_NAME, entry.ufloat_column_names)
+        self.assertTrue(
+            set(entry.ufloat_column_names) <= set(entry.object_column_names)
+        )
+        self.assertTrue(
+            any(entry.name.startswith("dataset.") for entry in memory_report.entries)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.perf module"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.util
+from fractal_governance.constants import (
+    LEVEL_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    NEW_MEMBER_COUNT_COLUMN_NAME,
+    RETURNING_MEMBER_COUNT_COLUMN_NAME,
+)
+from fractal_governance.perf import (
+    SYNTHETIC_DATASET_SPECS,
+    PerfResults,
+    StageMeasurement,
+    SyntheticDatasetSpec,
+    Tolerances,
+    compare,
+    create_synthetic_frames,
+    run,
+)
+
+STAGE_NAMES = [
+    "create_dataframe",
+    "tables",
+    *[
+        derived_frame.name
+        for derived_frame in fractal_governance.dataset.DERIVED_FRAMES
+    ],
+    "weighted_means",
+    "addendum_1",
+    "measurement_uncertainty",
+    "co_attendance",
+]
+
+
+def create_perf_results(
+    seconds_by_dataset_name: dict, peak_bytes: int = 1000, speed_ratio: float = 1.0
+) -> PerfResults:
+    """Return PerfResults of a stage named "stage" with the given times and peak
+    memory, and of two other stages that take `speed_ratio` seconds, on datasets
+    named by their meeting counts"""
+    return PerfResults(
+        meeting_count_by_dataset_name={
+            dataset_name: int(dataset_name) for dataset_name in seconds_by_dataset_name
+        },
+        measurements_by_dataset_name={
+            dataset_name: {
+                "stage": StageMeasurement(seconds=seconds, peak_bytes=peak_bytes),
+                **{
+                    f"other_stage_{i}": StageMeasurement(
+                        seconds=speed_ratio, peak_bytes=1000
+                    )
+                    for i in range(2)
+                },
+            }
+            for dataset_name, seconds in seconds_by_dataset_name.items()
+        },
+    )
+
+
+class TestPerf(unittest.TestCase):
+    """Test fixture for the fractal_governance.perf module"""
+
+    def test_create_synthetic_frames(self) -> None:
+        frames = create_synthetic_frames(10, member_count=40)
+        df_genesis = fractal_governance.util.FractalDatasetFrames.from_csv()
+        for name in [
+            "df_weekly_measurements",
+            "df_account_status",
+            "df_late_consensus",
+            "df_teams",
+        ]:
+            self.assertEqual(
+                getattr(frames, name).columns.tolist(),
+                getattr(df_genesis, name).columns.tolist(),
+            )
+        pd.testing.assert_frame_equal(
+            frames.df_weekly_measurements,
+            create_synthetic_frames(10, member_count=40).df_weekly_measurements,
+        )
+
+        df = frames.df_weekly_measurements
+        self.assertEqual(df[MEETING_ID_COLUMN_NAME].nunique(), 10)
+        self.assertTrue(df[LEVEL_COLUMN_NAME].between(1, 6).all())
+        self.assertFalse(
+            df.duplicated([MEMBER_ID_COLUMN_NAME, MEETING_ID_COLUMN_NAME]).any()
+        )
+
+        dataset = fractal_governance.dataset.Dataset(df=frames.create_dataframe())
+        self.assertEqual(dataset.total_meetings, 10)
+        df_attendance = dataset.df_member_attendance_new_and_returning_by_meeting
+        self.assertGreater(
+            df_attendance[NEW_MEMBER_COUNT_COLUMN_NAME].iloc[1:].sum(), 0
+        )
+        self.assertGreater(df_attendance[RETURNING_MEMBER_COUNT_COLUMN_NAME].sum(), 0)
+
+    def test_run(self) -> None:
+        perf_results = run(
+            [
+                SyntheticDatasetSpec(name="small", meeting_count=26, member_count=15),
+                SyntheticDatasetSpec(name="large", meeting_count=52, member_count=15),
+            ],
+            repeat=1,
+        )
+        self.assertEqual(
+            list(perf_results.measurements_by_dataset_name["small"]), STAGE_NAMES
+        )
+        self.assertGreater(
+            perf_results.measurements_by_dataset_name["large"][
+                "weighted_means"
+            ].peak_bytes,
+            0,
+        )
+        self.assertEqual(PerfResults.from_dict(perf_results.to_dict()), perf_results)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "baselines.json"
+            perf_results.write(path)
+            self.assertEqual(PerfResults.read(path), perf_results)
+
+        perf_report = compare(
+            perf_results, perf_results, Tolerances(max_growth=float("inf"))
+        )
+        self.assertEqual(perf_report.regressions, ())
+        self.assertEqual(
+            {check.metric for check in perf_report.checks},
+            {"time", "peak_bytes", "growth"},
+        )
+        self.assertEqual(
+            {
+                check.dataset_name
+                for check in perf_report.checks
+                if check.metric == "growth"
+            },
+            {"large"},
+        )
+
+    def test_baselines(self) -> None:
+        perf_results = PerfResults.read()
+        self.assertEqual(
+            list(perf_results.measurements_by_dataset_name),
+            [spec.name for spec in SYNTHETIC_DATASET_SPECS],
+        )
+        for measurements in perf_results.measurements_by_dataset_name.values():
+            self.assertEqual(list(measurements), STAGE_NAMES)
+
+    def test_compare(self) -> None:
+        baseline = create_perf_results({"10": 0.1, "20": 0.2})
+
+        # The same times on a machine that is twice as slow are not regressions.
+        perf_report = compare(
+            baseline, create_perf_results({"10": 0.2, "20": 0.4}, speed_ratio=2.0)
+        )
+        self.assertEqual(perf_report.regressions, ())
+        self.assertEqual(perf_report.speed_ratio, 2.0)
+
+        # The time of the larger dataset grew, and it grew quadratically.
+        perf_report = compare(
+            baseline, create_perf_results({"10": 0.1, "20": 0.4}, peak_bytes=2000)
+        )
+        self.assertEqual(
+            [(check.dataset_name, check.metric) for check in perf_report.regressions],
+            [
+                ("10", "peak_bytes"),
+                ("20", "time"),
+                ("20", "peak_bytes"),
+                ("20", "growth"),
+            ],
+        )
+        text = perf_report.to_text()
+        self.assertIn("! 20/stage", text)
+        self.assertIn("4.00x > 2.40x", text)
+        self.assertTrue(text.startswith("speed ratio 1.00x"))
+        self.assertTrue(text.endswith("4 regressions in 15 checks"))
+        self.assertEqual(perf_report.to_dataframe()["IsRegression"].sum(), 4)
+
+        # A stage's tolerances can be overridden.
+        perf_report = compare(
+            baseline,
+            create_perf_results({"10": 0.1, "20": 0.4}),
+            tolerances_by_stage_name={
+                "stage": Tolerances(max_time_ratio=3.0, max_growth=5.0)
+            },
+        )
+        self.assertEqual(perf_report.regressions, ())
+
+        # The times of stages that are faster than their floor are compared as if
+        # they took their floor, and the growth is that of each doubling from the
+        # smallest to the largest dataset.
+        perf_report = compare(
+            create_perf_results({"10": 0.001, "20": 0.002, "40": 0.004}),
+            create_perf_results({"10": 0.002, "20": 0.008, "40": 0.3}),
+        )
+        self.assertEqual(
+            [(check.dataset_name, check.metric) for check in perf_report.regressions],
+            [("40", "time"), ("40", "growth")],
+        )
+        self.assertNotIn("?", perf_report.to_text())
+        self.assertAlmostEqual(perf_report.regressions[-1].ratio, 10**0.5)
+
+        # The peak memory of a stage varies by up to about 30% between runs.
+        perf_report = compare(
+            baseline, create_perf_results({"10": 0.1, "20": 0.2}, peak_bytes=1300)
+        )
+        self.assertEqual(perf_report.regressions, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
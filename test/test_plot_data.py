@@ -0,0 +1,176 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.plot_data module"""
+
+import unittest
+
+import fractal_governance.dataset
+import fractal_governance.measurement_uncertainty.plots
+import fractal_governance.plot_data
+import fractal_governance.plots
+import numpy as np
+import pandas as pd
+import uncertainties.unumpy
+from fractal_governance.constants import (
+    BIN_START_COLUMN_NAME,
+    ERROR_COLUMN_NAME,
+    KENDALL_TAU_COLUMN_NAME,
+    MEAN_COLUMN_NAME,
+    PERIOD_COLUMN_NAME,
+    PERIOD_LABEL_COLUMN_NAME,
+    SERIES_COLUMN_NAME,
+    VALUE_COLUMN_NAME,
+    X_COLUMN_NAME,
+    X_ERROR_COLUMN_NAME,
+)
+from fractal_governance.measurement_uncertainty.dataset import (
+    MEASUREMENT_UNCERTAINTY_COLUMN_NAME,
+    UncertaintyType,
+)
+from fractal_governance.measurement_uncertainty.plot_data import (
+    CorrelationType,
+    get_series_name,
+)
+from fractal_governance.rollups import Granularity
+
+
+class TestPlotData(unittest.TestCase):
+    """Test fixture for the fractal_governance.plot_data module"""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+
+    def test_plot_data(self) -> None:
+        for granularity in (Granularity.Week, Granularity.Month, Granularity.Year):
+            plots = fractal_governance.plots.Plots(
+                dataset=self.dataset, granularity=granularity
+            )
+            for (
+                plot_name
+            ) in fractal_governance.plot_data.PLOT_DATA_FUNCTION_BY_PLOT_NAME:
+                plot_data = plots.plot_data(plot_name)
+                self.assertGreater(len(plot_data.df), 0)
+                self.assertIn(VALUE_COLUMN_NAME, plot_data.df)
+                # The plot data is cached.
+                self.assertIs(plots.plot_data(plot_name), plot_data)
+                if (
+                    plot_name
+                    not in fractal_governance.plots.ROLLUP_PLOT_INPUTS_BY_PLOT_NAME
+                ):
+                    continue
+                self.assertEqual(plot_data.granularity, granularity)
+                self.assertIn(PERIOD_LABEL_COLUMN_NAME, plot_data.df)
+        with self.assertRaises(ValueError):
+            plots.plot_data("unknown")
+
+    def test_stacked_plot_data(self) -> None:
+        plots = fractal_governance.plots.Plots(
+            dataset=self.dataset, granularity=Granularity.Quarter
+        )
+        df = plots.plot_data("attendance_vs_time").df
+        df_stacked = plots.plot_data("attendance_vs_time_stacked").df
+        self.assertEqual(
+            list(df_stacked[SERIES_COLUMN_NAME].cat.categories),
+            [
+                fractal_governance.plot_data.RETURNING_MEMBERS_SERIES_NAME,
+                fractal_governance.plot_data.NEW_MEMBERS_SERIES_NAME,
+            ],
+        )
+        attendance = df_stacked.groupby(PERIOD_COLUMN_NAME)[VALUE_COLUMN_NAME].sum()
+        self.assertTrue(
+            np.allclose(attendance, df.set_index(PERIOD_COLUMN_NAME)[VALUE_COLUMN_NAME])
+        )
+        self.assertEqual(
+            fractal_governance.plots.get_period_labels(df_stacked),
+            df[PERIOD_LABEL_COLUMN_NAME].to_list(),
+        )
+
+    def test_histogram_plot_data(self) -> None:
+        plots = fractal_governance.plots.Plots(dataset=self.dataset)
+        df = plots.plot_data("attendance_consistency_histogram").df
+        self.assertEqual(len(df), self.dataset.total_meetings)
+        self.assertEqual(df[VALUE_COLUMN_NAME].sum(), self.dataset.total_unique_members)
+
+        df = plots.plot_data("group_size_histogram").df
+        self.assertEqual(df[VALUE_COLUMN_NAME].sum(), len(self.dataset.df_group_cube))
+
+        plot_data = plots.plot_data("ranking_stability_histogram")
+        self.assertEqual(
+            plot_data.df[VALUE_COLUMN_NAME].sum(), plot_data.annotations["group_count"]
+        )
+        self.assertEqual(
+            plot_data.annotations["group_count"],
+            self.dataset.df_ranking_stability[KENDALL_TAU_COLUMN_NAME].count(),
+        )
+
+    def test_measurement_uncertainty_distribution(self) -> None:
+        plots = fractal_governance.measurement_uncertainty.plots.Plots(
+            dataset=self.dataset
+        )
+        plot_data = plots.plot_data(
+            "measurement_uncertainty_distribution", UncertaintyType.StdDev
+        )
+        bin_starts = [
+            df[BIN_START_COLUMN_NAME].to_list()
+            for _, df in plot_data.df.groupby(SERIES_COLUMN_NAME, observed=True)
+        ]
+        # Both series share the same bins.
+        self.assertEqual(len(bin_starts), 2)
+        self.assertEqual(bin_starts[0], bin_starts[1])
+        self.assertEqual(
+            set(plot_data.annotations), {get_series_name(False), get_series_name(True)}
+        )
+
+    def test_measurement_uncertainty_correlation(self) -> None:
+        plots = fractal_governance.measurement_uncertainty.plots.Plots(
+            dataset=self.dataset
+        )
+        plot_data = plots.plot_data(
+            "measurement_uncertainty_correlation",
+            UncertaintyType.NominalValue,
+            CorrelationType.MeanLevel,
+        )
+        # The unit bins equal those of pd.cut.
+        df = self.dataset.df_member_summary_stats_by_member_id.join(
+            plots.measurement_uncertainty_dataset.df_with_self_measurements
+        )
+        y = uncertainties.unumpy.nominal_values(df[MEASUREMENT_UNCERTAINTY_COLUMN_NAME])
+        cut = pd.cut(
+            df[MEAN_COLUMN_NAME],
+            np.arange(start=0.5, stop=df[MEAN_COLUMN_NAME].max() + 1, step=1),
+        )
+        rows = []
+        for interval, dfx in df.groupby(cut):
+            if len(dfx) == 0:
+                continue
+            yx = y[df.index.get_indexer(dfx.index)]
+            rows.append(
+                [
+                    dfx[MEAN_COLUMN_NAME].mean(),
+                    dfx[MEAN_COLUMN_NAME].std(),
+                    np.mean(yx),
+                    np.std(yx),
+                ]
+            )
+        df_plot = plot_data.df[
+            plot_data.df[SERIES_COLUMN_NAME] == get_series_name(True)
+        ]
+        np.testing.assert_allclose(
+            df_plot[
+                [
+                    X_COLUMN_NAME,
+                    X_ERROR_COLUMN_NAME,
+                    VALUE_COLUMN_NAME,
+                    ERROR_COLUMN_NAME,
+                ]
+            ].to_numpy(),
+            np.array(rows),
+        )
+        self.assertAlmostEqual(
+            plot_data.annotations[get_series_name(True)],
+            np.corrcoef(df[MEAN_COLUMN_NAME], y)[0, 1],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,21 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
 """Unit test for the fractal_governance.plots module"""
 
+import concurrent.futures
 import unittest
 
 import fractal_governance.dataset
 import fractal_governance.plots
+import fractal_governance.render_cache
 import fractal_governance.util
+import matplotlib.pyplot as plt
+from fractal_governance.constants import (
+    MEETING_DATE_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+)
+from fractal_governance.rollups import Granularity
 
 
 class TestPlots(unittest.TestCase):
@@ -21,6 +31,100 @@ class TestPlots(unittest.TestCase):
         self.assertIsNotNone(plots.accumulated_team_respect_vs_time)
         self.assertIsNotNone(plots.attendance_count_vs_level)
 
+    def test_render_concurrently(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        plots = fractal_governance.plots.Plots(
+            dataset=dataset,
+            figsize=(4, 3),
+            render_cache=fractal_governance.render_cache.RenderCache(),
+        )
+        plot_names = list(fractal_governance.plots.PLOT_INPUTS_BY_PLOT_NAME)
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            rendered_plots = list(
+                executor.map(
+                    lambda plot_name: plots.render(plot_name, dpi=50), plot_names
+                )
+            )
+        self.assertEqual(len(rendered_plots), len(plot_names))
+        self.assertEqual(plots.render_cache.miss_count, len(plot_names))
+        # No figure is managed by pyplot, so none is left open.
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_render(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        render_cache = fractal_governance.render_cache.RenderCache()
+        plots = fractal_governance.plots.Plots(
+            dataset=dataset, figsize=(4, 3), render_cache=render_cache
+        )
+        plot_names = ["attendance_vs_time", "accumulated_member_respect_vs_time"]
+        for plot_name in plot_names:
+            self.assertTrue(plots.render(plot_name, dpi=50).startswith(b"\x89PNG"))
+        self.assertTrue(plots.render(plot_names[0], format="svg").startswith(b"<?xml"))
+        self.assertEqual(render_cache.miss_count, 3)
+        for plot_name in plot_names:
+            plots.render(plot_name, dpi=50)
+        self.assertEqual(render_cache.hit_count, 2)
+        with self.assertRaises(ValueError):
+            plots.render("dataset")
+
+        # Only the plots whose input DataFrames changed are rendered again.
+        df_respect = dataset.tables.df_respect
+        respect = df_respect.set_index([MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME])[
+            RESPECT_COLUMN_NAME
+        ]
+        plots = fractal_governance.plots.Plots(
+            dataset=dataset.derive(respect=2 * respect),
+            figsize=(4, 3),
+            render_cache=render_cache,
+        )
+        for plot_name in plot_names:
+            plots.render(plot_name, dpi=50)
+        self.assertEqual(render_cache.hit_count, 3)
+        self.assertEqual(render_cache.miss_count, 4)
+
 
 if __name__ == "__main__":
     unittest.main()
+
+    def test_granularity(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        render_cache = fractal_governance.render_cache.RenderCache()
+        for granularity in Granularity:
+            plots = fractal_governance.plots.Plots(
+                dataset=dataset,
+                figsize=(4, 3),
+                granularity=granularity,
+                render_cache=render_cache,
+            )
+            for plot_name in fractal_governance.plots.ROLLUP_PLOT_INPUTS_BY_PLOT_NAME:
+                plots.render(plot_name, dpi=50)
+        # Granularity.Auto resolves to Granularity.Week for this Dataset.
+        self.assertEqual(
+            render_cache.miss_count,
+            4 * len(fractal_governance.plots.ROLLUP_PLOT_INPUTS_BY_PLOT_NAME),
+        )
+
+        plots = fractal_governance.plots.Plots(
+            dataset=dataset, granularity=Granularity.Month
+        )
+        fig = plots.attendance_vs_time_stacked
+        self.assertEqual(
+            len(fig.axes[0].get_xticks()),
+            dataset.df_member_attendance_new_and_returning_by_meeting[
+                MEETING_DATE_COLUMN_NAME
+            ]
+            .dt.to_period("M")
+            .nunique(),
+        )
+
+        for max_bar_count, granularity in (
+            (dataset.total_meetings, Granularity.Week),
+            (dataset.total_meetings - 1, Granularity.Month),
+            (1, Granularity.Year),
+        ):
+            plots = fractal_governance.plots.Plots(
+                dataset=dataset,
+                granularity=Granularity.Auto,
+                max_bar_count=max_bar_count,
+            )
+            self.assertEqual(plots.resolved_granularity, granularity)
@@ -0,0 +1,52 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.progress module"""
+
+import concurrent.futures
+import unittest
+from typing import List
+
+from fractal_governance.progress import (
+    CancelledError,
+    Progress,
+    ProgressToken,
+    report,
+)
+
+
+class TestProgress(unittest.TestCase):
+    """Test fixture for the fractal_governance.progress module"""
+
+    def test_report(self) -> None:
+        progress_list: List[Progress] = []
+        progress = ProgressToken(progress_list.append)
+        for completed in range(4):
+            progress.report("stage", completed, 4)
+        self.assertEqual(
+            [progress.percent for progress in progress_list], [0, 25, 50, 75]
+        )
+        self.assertEqual(progress_list[0].stage, "stage")
+        self.assertEqual(Progress(stage="stage", completed=0, total=0).percent, 100)
+
+        # Reporting without a token is a no-op.
+        report(None, "stage", 0, 1)
+
+    def test_cancel(self) -> None:
+        progress = ProgressToken()
+        self.assertFalse(progress.is_cancelled)
+        progress.report("stage", 0, 2, lambda: self.fail("partial result created"))
+
+        progress.cancel()
+        self.assertTrue(progress.is_cancelled)
+        with self.assertRaises(CancelledError) as context:
+            progress.report("stage", 1, 2, lambda: "partial result")
+        self.assertEqual(context.exception.stage, "stage")
+        self.assertEqual(context.exception.partial_result, "partial result")
+        self.assertIsInstance(context.exception, concurrent.futures.CancelledError)
+
+        with self.assertRaises(CancelledError) as context:
+            progress.check("stage")
+        self.assertIsNone(context.exception.partial_result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,293 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.ranking_stability module"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+import scipy.stats
+
+import fractal_governance.dataset
+from fractal_governance.constants import (
+    ADVANCED_MEMBER_COUNT_COLUMN_NAME,
+    ATTENDANCE_COUNT_COLUMN_NAME,
+    GROUP_COLUMN_NAME,
+    GROUP_SIZE_COLUMN_NAME,
+    KENDALL_TAU_COLUMN_NAME,
+    KENDALLS_W_COLUMN_NAME,
+    LEVEL_COLUMN_NAME,
+    MEAN_RANK_CHANGE_COLUMN_NAME,
+    MEETING_DATE_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    NORMALIZED_RANK_COLUMN_NAME,
+    PAIRED_MEMBER_COUNT_COLUMN_NAME,
+    RANK_VOLATILITY_COLUMN_NAME,
+    RATED_MEMBER_COUNT_COLUMN_NAME,
+    ROUND_COLUMN_NAME,
+    SPEARMAN_RHO_COLUMN_NAME,
+)
+from fractal_governance.group_cube import (
+    GROUP_KEY_COLUMN_NAMES,
+    get_ranked_group_members,
+)
+from fractal_governance.ranking_stability import (
+    create_member_rank_volatility,
+    create_ranking_stability,
+    create_round_stability,
+    get_group_pairs,
+    get_kendalls_w,
+    get_normalized_ranks,
+    get_rank_correlations,
+)
+
+
+def kendalls_w(ratings: np.ndarray) -> float:
+    """Return Kendall's W, corrected for ties, of the given ratings with one row per
+    member and one column per rater"""
+    member_count, rater_count = ratings.shape
+    ranks = np.column_stack(
+        [scipy.stats.rankdata(ratings[:, rater]) for rater in range(rater_count)]
+    )
+    rank_sums = ranks.sum(axis=1)
+    tie_correction = sum(
+        (counts**3 - counts).sum()
+        for counts in (
+            np.unique(ratings[:, rater], return_counts=True)[1]
+            for rater in range(rater_count)
+        )
+    )
+    return (
+        12
+        * ((rank_sums - rank_sums.mean()) ** 2).sum()
+        / (
+            rater_count**2 * (member_count**3 - member_count)
+            - rater_count * tie_correction
+        )
+    )
+
+
+class TestRankingStability(unittest.TestCase):
+    """Test fixture for the fractal_governance.ranking_stability module"""
+
+    dataset: fractal_governance.dataset.Dataset
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+
+    def test_get_group_pairs(self) -> None:
+        np.testing.assert_array_equal(
+            get_group_pairs(np.array([0, 0, 0, 1, 2, 2])),
+            [[0, 0, 1, 4], [1, 2, 2, 5]],
+        )
+        self.assertEqual(get_group_pairs(np.array([], dtype=int)).shape, (2, 0))
+
+    def test_get_rank_correlations(self) -> None:
+        rng = np.random.default_rng(0)
+        group_count = 200
+        group_codes = np.sort(rng.integers(0, group_count, 1000))
+        x = rng.integers(1, 7, len(group_codes)).astype(float)
+        y = rng.integers(1, 7, len(group_codes)).astype(float)
+        df = get_rank_correlations(group_codes, x, y, group_count)
+        self.assertEqual(len(df), group_count)
+        np.testing.assert_array_equal(
+            df[PAIRED_MEMBER_COUNT_COLUMN_NAME],
+            np.bincount(group_codes, minlength=group_count),
+        )
+        for group_code in range(group_count):
+            is_group = group_codes == group_code
+            if is_group.sum() < 2 or len(np.unique(x[is_group])) < 2:
+                self.assertTrue(np.isnan(df.loc[group_code, KENDALL_TAU_COLUMN_NAME]))
+                continue
+            if len(np.unique(y[is_group])) < 2:
+                continue
+            self.assertAlmostEqual(
+                df.loc[group_code, KENDALL_TAU_COLUMN_NAME],
+                scipy.stats.kendalltau(x[is_group], y[is_group])[0],
+            )
+            self.assertAlmostEqual(
+                df.loc[group_code, SPEARMAN_RHO_COLUMN_NAME],
+                scipy.stats.spearmanr(x[is_group], y[is_group])[0],
+            )
+
+    def test_get_kendalls_w(self) -> None:
+        rng = np.random.default_rng(0)
+        group_count = 50
+        group_codes = np.sort(rng.integers(0, group_count, 300))
+        ratings = rng.integers(1, 7, (len(group_codes), 3)).astype(float)
+        df = get_kendalls_w(group_codes, ratings, group_count)
+        for group_code in range(group_count):
+            is_group = group_codes == group_code
+            if is_group.sum() < 2:
+                self.assertTrue(np.isnan(df.loc[group_code, KENDALLS_W_COLUMN_NAME]))
+                continue
+            self.assertAlmostEqual(
+                df.loc[group_code, KENDALLS_W_COLUMN_NAME],
+                kendalls_w(ratings[is_group]),
+            )
+
+        # Raters in complete agreement have a W of 1, and the W of two raters
+        # without ties is the mean of 1 and their Spearman rho.
+        levels = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+        group_codes = np.zeros(len(levels), dtype=int)
+        df = get_kendalls_w(group_codes, np.column_stack([levels, levels, levels]), 1)
+        self.assertAlmostEqual(df.loc[0, KENDALLS_W_COLUMN_NAME], 1)
+        shuffled_levels = np.array([2.0, 1.0, 5.0, 3.0, 6.0, 4.0])
+        df = get_kendalls_w(group_codes, np.column_stack([levels, shuffled_levels]), 1)
+        self.assertAlmostEqual(
+            df.loc[0, KENDALLS_W_COLUMN_NAME],
+            (1 + scipy.stats.spearmanr(levels, shuffled_levels)[0]) / 2,
+        )
+
+    def test_ranking_stability(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        df_stability = self.dataset.df_ranking_stability
+        self.assertEqual(df_stability.index.names, GROUP_KEY_COLUMN_NAMES)
+
+        # Every group that measured a Level has a row.
+        df_group_cube = self.dataset.df_group_cube
+        self.assertTrue(
+            df_stability.index.equals(
+                df_group_cube.index[
+                    df_group_cube[GROUP_SIZE_COLUMN_NAME]
+                    > df_group_cube[ADVANCED_MEMBER_COUNT_COLUMN_NAME]
+                ]
+            )
+        )
+        self.assertTrue(
+            (
+                df_stability[RATED_MEMBER_COUNT_COLUMN_NAME]
+                <= df_stability[PAIRED_MEMBER_COUNT_COLUMN_NAME]
+            ).all()
+        )
+        for column_name in [KENDALL_TAU_COLUMN_NAME, SPEARMAN_RHO_COLUMN_NAME]:
+            self.assertTrue(df_stability[column_name].dropna().between(-1, 1).all())
+        self.assertTrue(
+            df_stability[KENDALLS_W_COLUMN_NAME].dropna().between(0, 1).all()
+        )
+
+        # The members of a group are paired with their Levels at the previous
+        # meeting each of them attended.
+        df_ranked = get_ranked_group_members(df_group_members)
+        key = df_stability[KENDALL_TAU_COLUMN_NAME].dropna().index[-1]
+        meeting_id = key[0]
+        df_group = df_ranked.set_index(GROUP_KEY_COLUMN_NAMES).loc[key]
+        levels = []
+        previous_levels = []
+        for member_id, level in zip(
+            df_group[MEMBER_ID_COLUMN_NAME], df_group[LEVEL_COLUMN_NAME]
+        ):
+            df_member = df_ranked[
+                (df_ranked[MEMBER_ID_COLUMN_NAME] == member_id)
+                & (df_ranked[MEETING_ID_COLUMN_NAME] < meeting_id)
+            ]
+            if len(df_member) > 0:
+                levels.append(level)
+                previous_levels.append(
+                    df_member.sort_values(MEETING_ID_COLUMN_NAME)[
+                        LEVEL_COLUMN_NAME
+                    ].iloc[-1]
+                )
+        self.assertEqual(
+            df_stability.loc[key, PAIRED_MEMBER_COUNT_COLUMN_NAME], len(levels)
+        )
+        self.assertAlmostEqual(
+            df_stability.loc[key, KENDALL_TAU_COLUMN_NAME],
+            scipy.stats.kendalltau(levels, previous_levels)[0],
+        )
+        self.assertAlmostEqual(
+            df_stability.loc[key, SPEARMAN_RHO_COLUMN_NAME],
+            scipy.stats.spearmanr(levels, previous_levels)[0],
+        )
+
+        with self.assertRaises(ValueError):
+            create_ranking_stability(df_group_members, window=1)
+
+    def test_round_stability(self) -> None:
+        # The Genesis fractal records no Level for the members who advanced.
+        df_stability = create_round_stability(self.dataset.df_group_members)
+        self.assertGreater(len(df_stability), 0)
+        self.assertTrue(
+            (df_stability.index.get_level_values(ROUND_COLUMN_NAME) > 1).all()
+        )
+        self.assertEqual(df_stability[PAIRED_MEMBER_COUNT_COLUMN_NAME].sum(), 0)
+
+        # A fractal that records the Levels of every round.
+        df_group_members = pd.DataFrame(
+            {
+                MEETING_ID_COLUMN_NAME: [1] * 10,
+                GROUP_COLUMN_NAME: [1, 1, 1, 2, 2, 2, 1, 1, 1, 1],
+                ROUND_COLUMN_NAME: [1] * 6 + [2] * 4,
+                MEMBER_ID_COLUMN_NAME: ["a", "b", "c", "d", "e", "f", "a", "b", "d"]
+                + ["e"],
+                MEETING_DATE_COLUMN_NAME: pd.Timestamp("2022-08-06"),
+                LEVEL_COLUMN_NAME: [1.0, 5.0, 6.0, 4.0, 5.0, 6.0, 3.0, 4.0, 5.0, 6.0],
+            }
+        ).sort_values(by=GROUP_KEY_COLUMN_NAMES, kind="mergesort", ignore_index=True)
+        df_stability = create_round_stability(df_group_members)
+        self.assertEqual(list(df_stability.index), [(1, 1, 2)])
+        self.assertEqual(
+            df_stability.loc[(1, 1, 2), PAIRED_MEMBER_COUNT_COLUMN_NAME], 4
+        )
+        self.assertAlmostEqual(
+            df_stability.loc[(1, 1, 2), KENDALL_TAU_COLUMN_NAME],
+            scipy.stats.kendalltau([3, 4, 5, 6], [1, 5, 4, 5])[0],
+        )
+        self.assertAlmostEqual(
+            df_stability.loc[(1, 1, 2), SPEARMAN_RHO_COLUMN_NAME],
+            scipy.stats.spearmanr([3, 4, 5, 6], [1, 5, 4, 5])[0],
+        )
+
+    def test_member_rank_volatility(self) -> None:
+        df_group_members = self.dataset.df_group_members
+        df_volatility = self.dataset.df_member_rank_volatility
+        pd.testing.assert_frame_equal(
+            pd.DataFrame(df_volatility), create_member_rank_volatility(df_group_members)
+        )
+        df_member_leader_board = self.dataset.df_member_leader_board.set_index(
+            MEMBER_ID_COLUMN_NAME
+        )
+        pd.testing.assert_series_equal(
+            df_volatility[ATTENDANCE_COUNT_COLUMN_NAME],
+            df_member_leader_board[ATTENDANCE_COUNT_COLUMN_NAME]
+            .reindex(df_volatility.index)
+            .astype(int),
+        )
+        self.assertTrue(df_volatility[NORMALIZED_RANK_COLUMN_NAME].between(0, 1).all())
+        self.assertTrue(
+            df_volatility.loc[
+                df_volatility[ATTENDANCE_COUNT_COLUMN_NAME] == 1,
+                [RANK_VOLATILITY_COLUMN_NAME, MEAN_RANK_CHANGE_COLUMN_NAME],
+            ]
+            .isna()
+            .all(axis=None)
+        )
+
+        # The highest Level of a meeting has a NormalizedRank of 1.
+        df_ranked = get_ranked_group_members(df_group_members).assign(
+            **{NORMALIZED_RANK_COLUMN_NAME: get_normalized_ranks(df_group_members)}
+        )
+        is_highest_level = df_ranked[LEVEL_COLUMN_NAME] == df_ranked.groupby(
+            MEETING_ID_COLUMN_NAME
+        )[LEVEL_COLUMN_NAME].transform("max")
+        self.assertGreater(
+            df_ranked.loc[is_highest_level, NORMALIZED_RANK_COLUMN_NAME].min(), 0.9
+        )
+
+        member_id = df_volatility[ATTENDANCE_COUNT_COLUMN_NAME].idxmax()
+        normalized_ranks = df_ranked[
+            df_ranked[MEMBER_ID_COLUMN_NAME] == member_id
+        ].sort_values(MEETING_ID_COLUMN_NAME)[NORMALIZED_RANK_COLUMN_NAME]
+        self.assertAlmostEqual(
+            df_volatility.loc[member_id, RANK_VOLATILITY_COLUMN_NAME],
+            normalized_ranks.std(),
+        )
+        self.assertAlmostEqual(
+            df_volatility.loc[member_id, MEAN_RANK_CHANGE_COLUMN_NAME],
+            normalized_ranks.diff().abs().mean(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
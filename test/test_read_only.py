@@ -0,0 +1,109 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.read_only module"""
+
+import pickle
+import unittest
+
+import fractal_governance.dataset
+import numpy as np
+import pandas as pd
+from fractal_governance.read_only import (
+    ReadOnlyDataFrame,
+    ReadOnlyError,
+    ReadOnlySeries,
+    freeze,
+)
+
+
+class TestReadOnly(unittest.TestCase):
+    """Test fixture for the fractal_governance.read_only module"""
+
+    def setUp(self) -> None:
+        self.df = pd.DataFrame(
+            {
+                "a": [1, 2, 3],
+                "b": ["x", "y", "z"],
+                "c": pd.to_datetime(["2022-05-07", "2022-05-14", "2022-05-21"]),
+            }
+        )
+
+    def test_freeze_dataframe(self) -> None:
+        df = freeze(self.df)
+        self.assertIsInstance(df, ReadOnlyDataFrame)
+        self.assertIs(freeze(df), df)
+        self.assertTrue(df.equals(self.df))
+        # Freezing a consolidated frame shares its memory but leaves it writeable.
+        self.assertTrue(np.shares_memory(df["a"].values, self.df["a"].values))
+        for column_name in self.df.columns:
+            self.assertTrue(self.df[column_name].values.flags.writeable)
+
+        mutations = [
+            lambda: df.__setitem__("a", 0),
+            lambda: df.__delitem__("a"),
+            lambda: df.loc.__setitem__((0, "a"), 0),
+            lambda: df.iloc.__setitem__((0, 0), 0),
+            lambda: df.at.__setitem__((0, "a"), 0),
+            lambda: df.iat.__setitem__((0, 0), 0),
+            lambda: setattr(df, "index", [4, 5, 6]),
+            lambda: setattr(df, "columns", ["d", "e", "f"]),
+            lambda: df.insert(0, "d", 0),
+            lambda: df.pop("a"),
+            lambda: df.sort_values("a", inplace=True),
+            lambda: df.fillna(0, inplace=True),
+        ]
+        for mutation in mutations:
+            with self.assertRaises(ReadOnlyError):
+                mutation()
+
+        # The NumPy buffers are read-only, which also protects the columns.
+        for column_name in df.columns:
+            with self.assertRaises(ValueError):
+                df[column_name].values[0] = df[column_name].values[1]
+        self.assertEqual(list(df["a"]), [1, 2, 3])
+
+    def test_freeze_series(self) -> None:
+        series = freeze(self.df["a"])
+        self.assertIsInstance(series, ReadOnlySeries)
+        with self.assertRaises(ReadOnlyError):
+            series[0] = 0
+        with self.assertRaises(ReadOnlyError):
+            series.loc[0] = 0
+        with self.assertRaises(ReadOnlyError):
+            series.name = "d"
+        self.assertEqual(series.sum(), 6)
+        self.assertTrue(self.df["a"].values.flags.writeable)
+        with self.assertRaises(ValueError):
+            series.values[0] = 0
+
+    def test_derived_objects_are_writeable(self) -> None:
+        df = freeze(self.df)
+        for derived_df in [
+            df.copy(),
+            df[df["a"] > 1],
+            df.set_index("a"),
+            df.sort_values("a", ascending=False),
+            df.assign(d=0),
+        ]:
+            self.assertIs(type(derived_df), pd.DataFrame)
+            derived_df.iloc[0, 0] = 0
+        self.assertIs(type(df["a"].cumsum()), pd.Series)
+        self.assertEqual(list(df["a"]), [1, 2, 3])
+
+    def test_pickle(self) -> None:
+        df = pickle.loads(pickle.dumps(freeze(self.df)))
+        self.assertIsInstance(df, ReadOnlyDataFrame)
+        self.assertTrue(df.equals(self.df))
+        with self.assertRaises(ReadOnlyError):
+            df["a"] = 0
+
+    def test_dataset_is_read_only(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        self.assertIsInstance(dataset.df, ReadOnlyDataFrame)
+        self.assertIsInstance(dataset.tables.df_attendance, ReadOnlyDataFrame)
+        self.assertIsInstance(dataset.df_member_leader_board, ReadOnlyDataFrame)
+        with self.assertRaises(ReadOnlyError):
+            dataset.df_member_leader_board.index += 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.refresher module"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from fractal_governance.dashboard import DashboardView
+from fractal_governance.refresher import Refresher
+from fractal_governance.resources import ResourceRegistry
+from test_resources import copy_csv_paths
+
+
+class TestRefresher(unittest.TestCase):
+    """Test fixture for the fractal_governance.refresher module"""
+
+    def test_refresh(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            csv_paths = copy_csv_paths(Path(directory))
+            refresher = Refresher(csv_paths, registry=ResourceRegistry())
+            self.assertIsNone(refresher.snapshot)
+            self.assertTrue(refresher.refresh())
+            snapshot = refresher.snapshot
+            self.assertIsNotNone(snapshot)
+            self.assertEqual(set(snapshot.dataset_by_view), set(DashboardView))
+            self.assertIs(
+                snapshot.plots_by_view[DashboardView.Addendum1].dataset,
+                snapshot.dataset_by_view[DashboardView.Addendum1],
+            )
+            self.assertIs(
+                snapshot.measurement_uncertainty_plots.measurement_uncertainty_dataset,
+                snapshot.measurement_uncertainty_dataset,
+            )
+            # Nothing is rebuilt while the .csv files are unchanged.
+            self.assertFalse(refresher.refresh())
+            self.assertIs(refresher.snapshot, snapshot)
+
+            # A failed rebuild keeps the last good snapshot.
+            weekly_measurements = csv_paths.weekly_measurements.read_text()
+            csv_paths.weekly_measurements.write_text("garbage\n")
+            with self.assertRaises(Exception):
+                refresher.refresh()
+            self.assertIs(refresher.snapshot, snapshot)
+            self.assertEqual(refresher.error_count, 1)
+            self.assertIsNotNone(refresher.last_error)
+
+            # The new snapshot is swapped in once the .csv files are valid again.
+            csv_paths.weekly_measurements.write_text(weekly_measurements + "\n")
+            self.assertTrue(refresher.refresh())
+            self.assertIsNot(refresher.snapshot, snapshot)
+            self.assertEqual(refresher.refresh_count, 2)
+
+    def test_start(self) -> None:
+        refresher = Refresher(poll_interval=0.1, registry=ResourceRegistry())
+        refresher.start()
+        try:
+            snapshot = refresher.wait_for_snapshot(timeout=60)
+        finally:
+            refresher.stop()
+        self.assertIs(refresher.snapshot, snapshot)
+        self.assertEqual(refresher.refresh_count, 1)
+        with self.assertRaises(TimeoutError):
+            Refresher().wait_for_snapshot(timeout=0)
+
+    def test_wait_for_snapshot_error(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            csv_paths = copy_csv_paths(Path(directory))
+            csv_paths.weekly_measurements.write_text("garbage\n")
+            refresher = Refresher(
+                csv_paths, poll_interval=3600, registry=ResourceRegistry()
+            )
+            refresher.start()
+            try:
+                # The failed first build is raised instead of waiting for the next
+                # poll.
+                with self.assertRaises(Exception) as context:
+                    refresher.wait_for_snapshot(timeout=60)
+            finally:
+                refresher.stop()
+            self.assertNotIsInstance(context.exception, TimeoutError)
+            self.assertIs(context.exception, refresher.last_error)
+            self.assertIsNone(refresher.snapshot)
+            self.assertEqual(refresher.error_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
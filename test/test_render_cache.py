@@ -0,0 +1,58 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.render_cache module"""
+
+import tempfile
+import unittest
+
+import matplotlib.figure
+import pandas as pd
+from fractal_governance.read_only import freeze
+from fractal_governance.render_cache import (
+    RenderCache,
+    fingerprint,
+    make_key,
+    render_figure,
+)
+
+
+class TestRenderCache(unittest.TestCase):
+    """Test fixture for the fractal_governance.render_cache module"""
+
+    def test_fingerprint(self) -> None:
+        df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+        self.assertEqual(fingerprint(df), fingerprint(df.copy()))
+        self.assertEqual(fingerprint(df), fingerprint(freeze(df)))
+        self.assertNotEqual(fingerprint(df), fingerprint(df.assign(a=[1, 2, 4])))
+        self.assertNotEqual(fingerprint(df), fingerprint(df.rename(columns={"a": "c"})))
+        self.assertNotEqual(fingerprint(df), fingerprint(df.set_axis([1, 2, 3])))
+        self.assertNotEqual(fingerprint(df["a"]), fingerprint(df["a"].astype(float)))
+
+    def test_lru_eviction(self) -> None:
+        render_cache = RenderCache(max_entries=2)
+        self.assertEqual(render_cache.get_or_render("a", lambda: b"a"), b"a")
+        self.assertEqual(render_cache.get_or_render("b", lambda: b"b"), b"b")
+        self.assertEqual(render_cache.get_or_render("a", self.fail), b"a")
+        self.assertEqual(render_cache.get_or_render("c", lambda: b"c"), b"c")
+        self.assertEqual(len(render_cache), 2)
+        # "b" was the least recently used entry.
+        self.assertEqual(render_cache.get_or_render("b", lambda: b"B"), b"B")
+        self.assertEqual(render_cache.hit_count, 1)
+        self.assertEqual(render_cache.miss_count, 4)
+
+    def test_directory(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            key = make_key("plot", (1, 2))
+            RenderCache(directory=directory).get_or_render(key, lambda: b"plot")
+            render_cache = RenderCache(directory=directory)
+            self.assertEqual(render_cache.get_or_render(key, self.fail), b"plot")
+            self.assertEqual(render_cache.hit_count, 1)
+
+    def test_render_figure(self) -> None:
+        fig = matplotlib.figure.Figure()
+        fig.subplots().plot([1, 2, 3])
+        self.assertTrue(render_figure(fig, format="png").startswith(b"\x89PNG"))
+        self.assertEqual(fig.axes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.resources module"""
+
+import concurrent.futures
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import attrs
+import fractal_governance.util
+from fractal_governance.dashboard import DashboardView
+from fractal_governance.resources import (
+    ResourceRegistry,
+    get_dashboard_dataset,
+    get_dataset,
+    get_measurement_uncertainty_dataset,
+    get_measurement_uncertainty_plots,
+    get_plots,
+)
+
+
+def copy_csv_paths(
+    directory: Path,
+) -> fractal_governance.util.FractalDatasetCSVPaths:
+    """Copy the Genesis .csv files to the given directory and return their paths"""
+    paths = {}
+    for field in attrs.fields(fractal_governance.util.FractalDatasetCSVPaths):
+        paths[field.name] = Path(shutil.copy(field.default, directory))
+    return fractal_governance.util.FractalDatasetCSVPaths(**paths)
+
+
+class TestResources(unittest.TestCase):
+    """Test fixture for the fractal_governance.resources module"""
+
+    def test_get_or_create(self) -> None:
+        registry = ResourceRegistry(max_entries=2)
+        self.assertEqual(registry.get_or_create("a", lambda: "a"), "a")
+        self.assertEqual(registry.get_or_create("a", self.fail), "a")
+        self.assertEqual(registry.get_or_create("b", lambda: "b"), "b")
+        self.assertEqual(registry.get_or_create("c", lambda: "c"), "c")
+        self.assertEqual(len(registry), 2)
+        # "a" was the least recently used entry.
+        self.assertEqual(registry.get_or_create("a", lambda: "A"), "A")
+        self.assertEqual(registry.hit_count, 1)
+        self.assertEqual(registry.miss_count, 4)
+
+        def fail() -> str:
+            raise RuntimeError("fail")
+
+        with self.assertRaises(RuntimeError):
+            registry.get_or_create("d", fail)
+        self.assertEqual(registry.get_or_create("d", lambda: "d"), "d")
+
+    def test_get_or_create_concurrently(self) -> None:
+        registry = ResourceRegistry()
+        created = threading.Event()
+        create_count = 0
+
+        def create() -> object:
+            nonlocal create_count
+            create_count += 1
+            created.wait(timeout=1)
+            return object()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(registry.get_or_create, "key", create) for _ in range(4)
+            ]
+            created.set()
+            objs = [future.result() for future in futures]
+        self.assertEqual(create_count, 1)
+        self.assertTrue(all(obj is objs[0] for obj in objs))
+        self.assertEqual(registry.miss_count, 1)
+        self.assertEqual(registry.hit_count, 3)
+
+    def test_shared_resources(self) -> None:
+        registry = ResourceRegistry()
+        with tempfile.TemporaryDirectory() as directory:
+            csv_paths = copy_csv_paths(Path(directory))
+            dataset = get_dataset(csv_paths, registry=registry)
+            self.assertIs(get_dataset(csv_paths, registry=registry), dataset)
+            self.assertIs(
+                get_dashboard_dataset(
+                    DashboardView.Classic, csv_paths, registry=registry
+                ),
+                dataset,
+            )
+            plots = get_plots(DashboardView.Classic, csv_paths, registry=registry)
+            self.assertIs(plots.dataset, dataset)
+            self.assertIs(
+                get_plots(DashboardView.Classic, csv_paths, registry=registry), plots
+            )
+            mu_plots = get_measurement_uncertainty_plots(csv_paths, registry=registry)
+            # The measurement uncertainty Dataset is only calculated once.
+            self.assertIs(
+                mu_plots.measurement_uncertainty_dataset,
+                get_measurement_uncertainty_dataset(csv_paths, registry=registry),
+            )
+            self.assertIs(mu_plots.dataset, dataset)
+
+            # A change to one of the .csv files builds a new Dataset.
+            fingerprint = fractal_governance.util.csv_paths_fingerprint(csv_paths)
+            with open(csv_paths.late_consensus, "a") as file:
+                file.write("\n")
+            self.assertNotEqual(
+                fractal_governance.util.csv_paths_fingerprint(csv_paths), fingerprint
+            )
+            self.assertIsNot(get_dataset(csv_paths, registry=registry), dataset)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.result_cache module"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import uncertainties
+
+import fractal_governance.dataset
+from fractal_governance.addendum_1.constants import Addendum1Constants
+from fractal_governance.read_only import ReadOnlyError
+from fractal_governance.result_cache import (
+    ResultCache,
+    get_or_compute,
+    make_result_key,
+)
+
+
+class TestResultCache(unittest.TestCase):
+    """Test fixture for the fractal_governance.result_cache module"""
+
+    def test_lru_eviction(self) -> None:
+        result_cache = ResultCache(max_entries=2)
+        self.assertEqual(result_cache.get_or_compute("a", lambda: {"x": 1}), {"x": 1})
+        self.assertEqual(result_cache.get_or_compute("b", lambda: {"x": 2}), {"x": 2})
+        self.assertEqual(result_cache.get_or_compute("a", self.fail), {"x": 1})
+        self.assertEqual(result_cache.get_or_compute("c", lambda: {"x": 3}), {"x": 3})
+        self.assertEqual(len(result_cache), 2)
+        # "b" was the least recently used entry.
+        self.assertEqual(result_cache.get_or_compute("b", lambda: {"x": 4}), {"x": 4})
+        self.assertEqual(result_cache.hit_count, 1)
+        self.assertEqual(result_cache.miss_count, 4)
+
+    def test_compute_error_is_not_cached(self) -> None:
+        result_cache = ResultCache()
+
+        def compute() -> dict:
+            raise ValueError("error")
+
+        with self.assertRaises(ValueError):
+            result_cache.get_or_compute("a", compute)
+        self.assertEqual(len(result_cache), 0)
+        self.assertEqual(result_cache.get_or_compute("a", lambda: {"x": 1}), {"x": 1})
+
+    def test_directory(self) -> None:
+        df = pd.DataFrame(
+            {
+                "Name": ["a", "b", None],
+                "Value": [
+                    uncertainties.ufloat(1.5, 0.5),
+                    0,
+                    uncertainties.ufloat(2, 0),
+                ],
+            },
+            index=pd.Index([3, 1, 2], name="Id"),
+        )
+        series = pd.Series([1.0, 2.0], index=["x", "y"], name="Series")
+        with tempfile.TemporaryDirectory() as directory:
+            ResultCache(directory=directory).get_or_compute(
+                "key", lambda: {"df": df, "series": series, "total": np.int64(3)}
+            )
+            result_cache = ResultCache(directory=directory)
+            result = result_cache.get_or_compute("key", self.fail)
+            self.assertEqual(result_cache.hit_count, 1)
+
+        self.assertEqual(result["total"], 3)
+        pd.testing.assert_series_equal(
+            result["series"], series, check_series_type=False
+        )
+        pd.testing.assert_frame_equal(
+            result["df"][["Name"]], df[["Name"]], check_frame_type=False
+        )
+        values = result["df"]["Value"]
+        self.assertEqual(values.iloc[0].nominal_value, 1.5)
+        self.assertEqual(values.iloc[0].std_dev, 0.5)
+        # Plain numbers are read back as plain numbers.
+        self.assertNotIsInstance(values.iloc[1], uncertainties.UFloat)
+        self.assertEqual(values.iloc[1], 0)
+        self.assertIsInstance(values.iloc[2], uncertainties.UFloat)
+        with self.assertRaises(ReadOnlyError):
+            result["df"].loc[1, "Value"] = 1
+
+    def test_max_bytes(self) -> None:
+        df = pd.DataFrame({"Value": np.arange(1000.0)})
+        with tempfile.TemporaryDirectory() as directory:
+            result_cache = ResultCache(directory=directory, max_bytes=0)
+            result_cache.get_or_compute("a", lambda: {"df": df})
+            result_cache.get_or_compute("b", lambda: {"df": df})
+            self.assertEqual(list(Path(directory).iterdir()), [])
+            # The results are still kept in memory.
+            self.assertEqual(len(result_cache), 2)
+
+            result_cache = ResultCache(directory=directory)
+            result_cache.get_or_compute("a", lambda: {"df": df})
+            result_cache.max_bytes = sum(
+                path.stat().st_size for path in (Path(directory) / "a").iterdir()
+            )
+            result_cache.get_or_compute("b", lambda: {"df": df})
+            self.assertEqual([path.name for path in Path(directory).iterdir()], ["b"])
+
+    def test_get_or_compute_without_result_cache(self) -> None:
+        self.assertEqual(get_or_compute(None, self.fail, lambda: {"x": 1}), {"x": 1})
+
+    def test_addendum_1_constants(self) -> None:
+        dataset = fractal_governance.dataset.Dataset.from_csv()
+        self.assertEqual(
+            make_result_key("Addendum1Constants", dataset),
+            make_result_key("Addendum1Constants", dataset),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            addendum_1_constants = Addendum1Constants(
+                dataset=dataset, result_cache=ResultCache(directory=directory)
+            )
+            result_cache = ResultCache(directory=directory)
+            self.assertEqual(
+                Addendum1Constants(
+                    dataset=dataset, result_cache=result_cache
+                ).pro_rata_respect,
+                addendum_1_constants.pro_rata_respect,
+            )
+            self.assertEqual(result_cache.hit_count, 1)
+
+            # The overrides are part of the key.
+            addendum_1_constants = Addendum1Constants(
+                dataset=dataset,
+                total_respect_before_addendum_1_individual=1,
+                result_cache=result_cache,
+            )
+            self.assertEqual(result_cache.miss_count, 1)
+            self.assertEqual(
+                addendum_1_constants.total_respect_before_addendum_1_individual, 1
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
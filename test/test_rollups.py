@@ -0,0 +1,116 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.rollups module"""
+
+import unittest
+
+import pandas as pd
+from fractal_governance.constants import (
+    GRANULARITY_COLUMN_NAME,
+    MEETING_COUNT_COLUMN_NAME,
+    PERIOD_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+    TEAM_NAME_COLUMN_NAME,
+)
+from fractal_governance.rollups import (
+    ROLLUP_GRANULARITIES,
+    Granularity,
+    format_period,
+    get_rollup,
+    resolve_granularity,
+    roll_up,
+)
+
+MEETING_DATES = pd.Series(
+    pd.to_datetime(["2022-01-29", "2022-02-05", "2022-02-12", "2022-04-02"])
+)
+
+
+class TestRollups(unittest.TestCase):
+    """Test fixture for the fractal_governance.rollups module"""
+
+    def test_roll_up(self) -> None:
+        df = pd.DataFrame({RESPECT_COLUMN_NAME: [1.0, 2.0, 3.0, 4.0]})
+        df_rollup = roll_up(df, "sum", meeting_dates=MEETING_DATES)
+        self.assertEqual(
+            list(df_rollup.index.names), [GRANULARITY_COLUMN_NAME, PERIOD_COLUMN_NAME]
+        )
+        df_month = get_rollup(df_rollup, Granularity.Month)
+        self.assertEqual(
+            list(df_month.index),
+            list(pd.to_datetime(["2022-01", "2022-02", "2022-04"])),
+        )
+        self.assertEqual(df_month[RESPECT_COLUMN_NAME].to_list(), [1.0, 5.0, 4.0])
+        self.assertEqual(df_month[MEETING_COUNT_COLUMN_NAME].to_list(), [1, 2, 1])
+        df_quarter = get_rollup(df_rollup, Granularity.Quarter)
+        self.assertEqual(df_quarter[RESPECT_COLUMN_NAME].to_list(), [6.0, 4.0])
+        df_year = get_rollup(df_rollup, Granularity.Year)
+        self.assertEqual(df_year[RESPECT_COLUMN_NAME].to_list(), [10.0])
+        self.assertEqual(df_year[MEETING_COUNT_COLUMN_NAME].to_list(), [4])
+        with self.assertRaises(ValueError):
+            get_rollup(df_rollup, Granularity.Week)
+
+        series_rollup = roll_up(
+            df[RESPECT_COLUMN_NAME], "mean", meeting_dates=MEETING_DATES
+        )
+        self.assertEqual(
+            get_rollup(series_rollup, Granularity.Month).to_list(), [1.0, 2.5, 4.0]
+        )
+
+    def test_roll_up_group_by(self) -> None:
+        df = pd.DataFrame(
+            {
+                TEAM_NAME_COLUMN_NAME: ["a", "b", "a", "a"],
+                RESPECT_COLUMN_NAME: [1.0, 2.0, 3.0, 4.0],
+            }
+        )
+        df_rollup = roll_up(
+            df,
+            {RESPECT_COLUMN_NAME: "sum"},
+            meeting_dates=MEETING_DATES,
+            group_by=[TEAM_NAME_COLUMN_NAME],
+        )
+        df_quarter = get_rollup(df_rollup, Granularity.Quarter)
+        self.assertEqual(df_quarter[TEAM_NAME_COLUMN_NAME].to_list(), ["a", "b", "a"])
+        self.assertEqual(df_quarter[RESPECT_COLUMN_NAME].to_list(), [4.0, 2.0, 4.0])
+        self.assertEqual(df_quarter[MEETING_COUNT_COLUMN_NAME].to_list(), [2, 1, 1])
+
+    def test_format_period(self) -> None:
+        period = pd.Timestamp("2022-04-01")
+        self.assertEqual(format_period(period, Granularity.Week), "Apr 01 2022")
+        self.assertEqual(format_period(period, Granularity.Month), "Apr 2022")
+        self.assertEqual(format_period(period, Granularity.Quarter), "2022 Q2")
+        self.assertEqual(format_period(period, Granularity.Year), "2022")
+        with self.assertRaises(ValueError):
+            format_period(period, Granularity.Auto)
+
+    def test_resolve_granularity(self) -> None:
+        df_rollup = roll_up(
+            pd.DataFrame({RESPECT_COLUMN_NAME: [1.0, 2.0, 3.0, 4.0]}),
+            "sum",
+            meeting_dates=MEETING_DATES,
+        )
+        for granularity in ROLLUP_GRANULARITIES + (Granularity.Week,):
+            self.assertEqual(
+                resolve_granularity(granularity, df_rollup, meeting_count=4),
+                granularity,
+            )
+        for max_bar_count, granularity in (
+            (4, Granularity.Week),
+            (3, Granularity.Month),
+            (2, Granularity.Quarter),
+            (1, Granularity.Year),
+            (0, Granularity.Year),
+        ):
+            self.assertEqual(
+                resolve_granularity(
+                    Granularity.Auto,
+                    df_rollup,
+                    meeting_count=4,
+                    max_bar_count=max_bar_count,
+                ),
+                granularity,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
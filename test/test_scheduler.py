@@ -0,0 +1,72 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.scheduler module"""
+
+import threading
+import unittest
+from typing import List
+
+import fractal_governance.scheduler
+from fractal_governance.scheduler import Node
+
+
+class TestScheduler(unittest.TestCase):
+    """Test fixture for the fractal_governance.scheduler module"""
+
+    def test_run(self) -> None:
+        order: List[str] = []
+        lock = threading.Lock()
+
+        def visit(name: str) -> str:
+            with lock:
+                order.append(name)
+            return name.upper()
+
+        nodes = [
+            Node(name="d", run=lambda: visit("d"), dependencies=("b", "c")),
+            Node(name="b", run=lambda: visit("b"), dependencies=("a",)),
+            Node(name="c", run=lambda: visit("c"), dependencies=("a",)),
+            Node(name="a", run=lambda: visit("a")),
+        ]
+        result = fractal_governance.scheduler.run(nodes, max_workers=2)
+        self.assertEqual(result.values, {"a": "A", "b": "B", "c": "C", "d": "D"})
+        self.assertEqual(set(result.timings), {"a", "b", "c", "d"})
+        self.assertEqual(order[0], "a")
+        self.assertEqual(order[-1], "d")
+
+    def test_independent_nodes_run_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=10)
+        nodes = [
+            Node(name="a", run=barrier.wait),
+            Node(name="b", run=barrier.wait),
+        ]
+        result = fractal_governance.scheduler.run(nodes, max_workers=2)
+        self.assertEqual(set(result.values), {"a", "b"})
+
+    def test_invalid_graph(self) -> None:
+        with self.assertRaises(ValueError):
+            fractal_governance.scheduler.run(
+                [Node(name="a", run=lambda: None, dependencies=("z",))]
+            )
+        with self.assertRaises(ValueError):
+            fractal_governance.scheduler.run(
+                [
+                    Node(name="a", run=lambda: None, dependencies=("b",)),
+                    Node(name="b", run=lambda: None, dependencies=("a",)),
+                ]
+            )
+
+    def test_exception_is_propagated(self) -> None:
+        def fail() -> None:
+            raise RuntimeError("node failed")
+
+        with self.assertRaises(RuntimeError):
+            fractal_governance.scheduler.run(
+                [
+                    Node(name="a", run=fail),
+                    Node(name="b", run=lambda: None, dependencies=("a",)),
+                ]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.sqlite_store module"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+import fractal_governance.dataset
+import fractal_governance.util
+from fractal_governance.constants import (
+    GROUP_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    MEMBER_NAME_COLUMN_NAME,
+)
+from fractal_governance.sqlite_store import SQLiteStore
+
+
+class TestSQLiteStore(unittest.TestCase):
+    """Test fixture for the fractal_governance.sqlite_store module"""
+
+    dataset: fractal_governance.dataset.Dataset
+    directory: tempfile.TemporaryDirectory
+    store: SQLiteStore
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.dataset = fractal_governance.dataset.Dataset.from_csv()
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.store = SQLiteStore.from_csv(Path(cls.directory.name, "fractal.db"))
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.directory.cleanup()
+
+    def test_aggregates(self) -> None:
+        for df, df_expected in [
+            (
+                self.store.get_member_summary_stats_by_member_id(),
+                self.dataset.df_member_summary_stats_by_member_id,
+            ),
+            (
+                self.store.get_member_leader_board(),
+                self.dataset.df_member_leader_board,
+            ),
+            (
+                self.store.get_team_respect_by_meeting_date(),
+                self.dataset.df_team_respect_by_meeting_date,
+            ),
+            (
+                self.store.get_team_leader_board(),
+                self.dataset.df_team_leader_board,
+            ),
+        ]:
+            pd.testing.assert_frame_equal(df, pd.DataFrame(df_expected))
+
+    def test_get_member(self) -> None:
+        member_id = self.dataset.df_member_leader_board[MEMBER_ID_COLUMN_NAME].iloc[0]
+        pd.testing.assert_series_equal(
+            self.store.get_member(member_id),
+            self.dataset.tables.df_members.loc[member_id],
+        )
+        with self.assertRaises(KeyError):
+            self.store.get_member("no such member")
+
+    def test_get_attendance(self) -> None:
+        df_attendance = self.dataset.tables.df_attendance.copy()
+        member_id = self.dataset.df_member_leader_board[MEMBER_ID_COLUMN_NAME].iloc[0]
+        df = self.store.get_attendance(member_id=member_id)
+        df_expected = df_attendance[
+            df_attendance[MEMBER_ID_COLUMN_NAME] == member_id
+        ].reset_index(drop=True)
+        pd.testing.assert_frame_equal(df, df_expected, check_dtype=False)
+        self.assertEqual(self.store.get_attendance_count(member_id), len(df_expected))
+
+        df = self.store.get_attendance(meeting_id=1, group=1)
+        self.assertFalse(df.empty)
+        self.assertTrue((df[MEETING_ID_COLUMN_NAME] == 1).all())
+        self.assertTrue((df[GROUP_COLUMN_NAME] == 1).all())
+
+        df = self.store.get_attendance(member_id="no such member")
+        self.assertTrue(df.empty)
+        self.assertEqual(df.columns.tolist(), df_attendance.columns.tolist())
+
+    def test_iter_attendance(self) -> None:
+        chunks = list(self.store.iter_attendance(chunk_size=100))
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        self.assertEqual(
+            sum(len(chunk) for chunk in chunks),
+            len(self.dataset.tables.df_attendance),
+        )
+
+    def test_from_csv(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "fractal.db")
+            store = SQLiteStore.from_csv(path)
+            fingerprint = store.fingerprint
+            self.assertIsNotNone(fingerprint)
+
+            # The database is not built again while its .csv files are unchanged.
+            mtime_ns = path.stat().st_mtime_ns
+            self.assertEqual(SQLiteStore.from_csv(path), store)
+            self.assertEqual(path.stat().st_mtime_ns, mtime_ns)
+
+            # It is built again when its FractalRules change.
+            store = SQLiteStore.from_csv(
+                path,
+                fractal_rules=fractal_governance.util.FractalRules(
+                    meeting_id_when_hive_signature_required=None
+                ),
+            )
+            self.assertNotEqual(store.fingerprint, fingerprint)
+            self.assertEqual(os.listdir(directory), ["fractal.db"])
+
+    def test_is_read_only(self) -> None:
+        member_id = self.dataset.df_member_leader_board[MEMBER_ID_COLUMN_NAME].iloc[0]
+        with self.store._connect() as connection:
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute(
+                    f"UPDATE members SET {MEMBER_NAME_COLUMN_NAME} = ? "
+                    f"WHERE {MEMBER_ID_COLUMN_NAME} = ?",
+                    ("", member_id),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.static_site module"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import fractal_governance.progress
+from fractal_governance.static_site import (
+    UNCERTAINTY_PAGE_NAME,
+    DashboardView,
+    export,
+    get_page_name,
+    get_plot_jobs,
+)
+
+
+class TestStaticSite(unittest.TestCase):
+    """Test fixture for the fractal_governance.static_site module"""
+
+    def test_get_plot_jobs(self) -> None:
+        plot_jobs = get_plot_jobs()
+        self.assertEqual(len(set(plot_job.path for plot_job in plot_jobs)), 25)
+
+    def test_export(self) -> None:
+        stages = set()
+        progress = fractal_governance.progress.ProgressToken(
+            lambda progress: stages.add(progress.stage)
+        )
+        with tempfile.TemporaryDirectory() as output_dir:
+            paths = export(Path(output_dir), max_workers=2, dpi=20, progress=progress)
+            self.assertIn("static site plots", stages)
+            self.assertEqual(len(paths), len(set(paths)))
+            self.assertTrue(all(path.stat().st_size > 0 for path in paths))
+
+            page_names = [
+                get_page_name(dashboard_view) for dashboard_view in DashboardView
+            ] + [UNCERTAINTY_PAGE_NAME]
+            for page_name in ["index"] + page_names:
+                self.assertIn(Path(output_dir, f"{page_name}.html"), paths)
+
+            # Every image referenced by a page was rendered.
+            for plot_job in get_plot_jobs():
+                path = Path(output_dir, plot_job.path)
+                self.assertIn(path, paths)
+                self.assertIn(
+                    f'src="{plot_job.path.as_posix()}"',
+                    Path(output_dir, f"{plot_job.page_name}.html").read_text(),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# Copyright (C) 2022 Matt Langston. All Rights Reserved.
+"""Unit test for the fractal_governance.tables module"""
+
+import unittest
+
+import fractal_governance.util
+from fractal_governance.constants import (
+    LEVEL_COLUMN_NAME,
+    MEETING_ID_COLUMN_NAME,
+    MEMBER_ID_COLUMN_NAME,
+    RESPECT_COLUMN_NAME,
+)
+
+
+class TestTables(unittest.TestCase):
+    """Test fixture for the fractal_governance.tables module"""
+
+    def test_read_tables(self) -> None:
+        df = fractal_governance.util.read_csv()
+        tables = fractal_governance.util.read_tables()
+
+        df_attendance = tables.df_attendance
+        self.assertFalse(
+            df_attendance.duplicated(
+                [MEETING_ID_COLUMN_NAME, MEMBER_ID_COLUMN_NAME]
+            ).any()
+        )
+        self.assertTrue(df_attendance[LEVEL_COLUMN_NAME].notna().all())
+        self.assertEqual(len(df_attendance), df[LEVEL_COLUMN_NAME].notna().sum())
+        self.assertEqual(len(tables.df_round_results), len(df))
+        self.assertAlmostEqual(
+            tables.df_respect[RESPECT_COLUMN_NAME].sum(), df[RESPECT_COLUMN_NAME].sum()
+        )
+        self.assertEqual(
+            set(tables.df_members.index), set(df[MEMBER_ID_COLUMN_NAME].unique())
+        )
+        self.assertEqual(
+            list(tables.df_meetings.index),
+            sorted(df[MEETING_ID_COLUMN_NAME].unique()),
+        )
+        self.assertFalse(tables.df_teams.empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
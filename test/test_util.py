@@ -1,10 +1,16 @@
 # Copyright (C) 2022 Matt Langston. All Rights Reserved.
 """Unit test for the fractal_governance.util module"""
 
+import datetime
+import os
+import tempfile
 import unittest
+import unittest.mock
+from pathlib import Path
 
 import fractal_governance.util
 import pandas as pd
+from fractal_governance.constants import MEETING_ID_COLUMN_NAME, RESPECT_COLUMN_NAME
 
 
 class TestUtil(unittest.TestCase):
@@ -23,6 +29,108 @@ class TestUtil(unittest.TestCase):
         with self.assertRaises(ValueError):
             fractal_governance.util.meeting_id_to_timestamp(0)
 
+    def test_fractal_calendar(self) -> None:
+        fractal_calendar = fractal_governance.util.FractalCalendar()
+        for meeting_id in range(1, 12):
+            self.assertEqual(
+                fractal_calendar.meeting_id_to_timestamp(meeting_id),
+                fractal_governance.util.meeting_id_to_timestamp(meeting_id),
+            )
+        fractal_calendar = fractal_governance.util.FractalCalendar(
+            date_of_first_meeting=datetime.datetime(2022, 1, 1),
+            cancelled_week_offsets=(3, 1),
+        )
+        self.assertEqual(
+            [
+                fractal_calendar.meeting_id_to_timestamp(meeting_id)
+                for meeting_id in range(1, 5)
+            ],
+            [
+                pd.Timestamp(date)
+                for date in ["2022-01-01", "2022-01-15", "2022-01-29", "2022-02-05"]
+            ],
+        )
+
+    def test_fractal_rules(self) -> None:
+        df = fractal_governance.util.read_csv()
+        df_without_rules = fractal_governance.util.read_csv(
+            fractal_rules=fractal_governance.util.FractalRules(
+                meeting_id_when_hive_signature_required=None
+            )
+        )
+        self.assertGreater(
+            df_without_rules[RESPECT_COLUMN_NAME].sum(), df[RESPECT_COLUMN_NAME].sum()
+        )
+
+    def test_file_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "a.csv"
+            path.write_text("a\n1\n")
+            entry_count = len(fractal_governance.util._file_fingerprint_by_path)
+            fingerprint = fractal_governance.util.file_fingerprint(path)
+            self.assertEqual(
+                fractal_governance.util.file_fingerprint(path), fingerprint
+            )
+            path.write_text("a\n2\n")
+            self.assertNotEqual(
+                fractal_governance.util.file_fingerprint(path), fingerprint
+            )
+            path.write_text("a\n1\n")
+            self.assertEqual(
+                fractal_governance.util.file_fingerprint(path), fingerprint
+            )
+            # Only the latest version of each file is remembered.
+            self.assertEqual(
+                len(fractal_governance.util._file_fingerprint_by_path), entry_count + 1
+            )
+
+    def test_sharded_weekly_measurements(self) -> None:
+        csv_paths = fractal_governance.util.FractalDatasetCSVPaths()
+        df_expected = fractal_governance.util.read_csv(csv_paths)
+        df_weekly_measurements = pd.read_csv(csv_paths.weekly_measurements)
+        with tempfile.TemporaryDirectory() as directory:
+            # One shard per meeting, whose names do not sort by meeting ID.
+            for meeting_id, df in df_weekly_measurements.groupby(
+                MEETING_ID_COLUMN_NAME
+            ):
+                df.to_csv(Path(directory, f"meeting-{meeting_id}.csv"), index=False)
+            for weekly_measurements in [
+                Path(directory),
+                Path(directory, "meeting-*.csv"),
+            ]:
+                sharded_csv_paths = fractal_governance.util.FractalDatasetCSVPaths(
+                    weekly_measurements=weekly_measurements
+                )
+                pd.testing.assert_frame_equal(
+                    fractal_governance.util.read_csv(sharded_csv_paths, max_workers=4),
+                    df_expected,
+                )
+
+            # Only new or changed shards are parsed again.
+            fingerprint = fractal_governance.util.csv_paths_fingerprint(
+                sharded_csv_paths
+            )
+            path = Path(directory, "meeting-1.csv")
+            with open(path, "a") as file:
+                file.write("\n")
+            # The modification time may not change on file systems with a coarse
+            # timestamp resolution.
+            os.utime(path, ns=(0, path.stat().st_mtime_ns + 10**9))
+            with unittest.mock.patch.object(
+                pd, "read_csv", wraps=pd.read_csv
+            ) as read_csv:
+                fractal_governance.util.read_weekly_measurements(sharded_csv_paths)
+                read_csv.assert_called_once_with(path)
+            self.assertNotEqual(
+                fractal_governance.util.csv_paths_fingerprint(sharded_csv_paths),
+                fingerprint,
+            )
+
+        with self.assertRaises(FileNotFoundError):
+            fractal_governance.util.FractalDatasetCSVPaths(
+                weekly_measurements=Path(directory, "*.csv")
+            ).get_weekly_measurements_paths()
+
 
 if __name__ == "__main__":
     unittest.main()